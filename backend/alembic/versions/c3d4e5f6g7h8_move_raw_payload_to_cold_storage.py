@@ -0,0 +1,117 @@
+"""move crawled_contents.raw_payload to compressed cold storage
+
+Revision ID: c3d4e5f6g7h8
+Revises: b2c3d4e5f6g7
+Create Date: 2026-10-18 12:00:00
+
+Creates ``crawled_content_payloads``, copies every non-empty
+``raw_payload`` into it (zlib-compressed compact JSON, in id-ordered
+batches), then drops the column. The codec here must match
+``app.services.crawler.payload_store``.
+"""
+import json
+import zlib
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c3d4e5f6g7h8'
+down_revision = 'b2c3d4e5f6g7'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+MIN_COMPRESS_BYTES = 256
+
+
+def _encode(payload):
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return "json", raw, len(raw)
+    return "zlib", zlib.compress(raw, 6), len(raw)
+
+
+def _decode(codec, data):
+    return json.loads(zlib.decompress(data) if codec == "zlib" else data)
+
+
+def _as_dict(value):
+    if isinstance(value, (str, bytes)):
+        value = json.loads(value)
+    return value or {}
+
+
+def upgrade():
+    op.create_table(
+        'crawled_content_payloads',
+        sa.Column('content_id', sa.String(), nullable=False),
+        sa.Column('codec', sa.String(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('raw_size', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('content_id'),
+        sa.ForeignKeyConstraint(['content_id'], ['crawled_contents.id'], ondelete='CASCADE'),
+    )
+
+    conn = op.get_bind()
+    select_batch = sa.text(
+        "SELECT id, raw_payload FROM crawled_contents "
+        "WHERE id > :last AND raw_payload IS NOT NULL ORDER BY id LIMIT :n"
+    )
+    insert_payload = sa.text(
+        "INSERT INTO crawled_content_payloads (content_id, codec, data, raw_size, updated_at) "
+        "VALUES (:content_id, :codec, :data, :raw_size, :updated_at)"
+    ).bindparams(sa.bindparam('data', type_=sa.LargeBinary()))
+    now = datetime.utcnow()
+    last = ""
+    while True:
+        batch = conn.execute(select_batch, {"last": last, "n": BATCH_SIZE}).all()
+        if not batch:
+            break
+        last = batch[-1][0]
+        values = []
+        for content_id, payload in batch:
+            payload = _as_dict(payload)
+            if not payload:
+                continue
+            codec, data, raw_size = _encode(payload)
+            values.append(
+                {"content_id": content_id, "codec": codec, "data": data, "raw_size": raw_size, "updated_at": now}
+            )
+        if values:
+            conn.execute(insert_payload, values)
+
+    op.drop_column('crawled_contents', 'raw_payload')
+
+
+def downgrade():
+    op.add_column(
+        'crawled_contents',
+        sa.Column('raw_payload', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+    )
+
+    conn = op.get_bind()
+    select_batch = sa.text(
+        "SELECT content_id, codec, data FROM crawled_content_payloads "
+        "WHERE content_id > :last ORDER BY content_id LIMIT :n"
+    )
+    update_row = sa.text(
+        "UPDATE crawled_contents SET raw_payload = :payload WHERE id = :id"
+    ).bindparams(sa.bindparam('payload', type_=postgresql.JSON()))
+    last = ""
+    while True:
+        batch = conn.execute(select_batch, {"last": last, "n": BATCH_SIZE}).all()
+        if not batch:
+            break
+        last = batch[-1][0]
+        conn.execute(
+            update_row,
+            [{"id": content_id, "payload": _decode(codec, data)} for content_id, codec, data in batch],
+        )
+
+    conn.execute(sa.text("UPDATE crawled_contents SET raw_payload = '{}' WHERE raw_payload IS NULL"))
+    op.alter_column('crawled_contents', 'raw_payload', nullable=False)
+    op.drop_table('crawled_content_payloads')
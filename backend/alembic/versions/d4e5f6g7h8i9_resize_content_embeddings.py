@@ -0,0 +1,74 @@
+"""resize content_embeddings.embedding to 768 dims
+
+Revision ID: d4e5f6g7h8i9
+Revises: c3d4e5f6g7h8
+Create Date: 2026-10-18 18:00:00
+
+gemini-embedding-001 returns Matryoshka embeddings: the first N values of a
+stored vector, re-normalized, are the N-dim embedding. Shrinking the column
+therefore keeps every row (``l2_normalize(subvector(...))``, pgvector >= 0.7).
+A larger size cannot be derived from the stored prefix, so growing deletes
+the rows; they are rebuilt as content is embedded again.
+
+At 2000 dims or fewer the column also gets the HNSW cosine index that
+pgvector could not build at 3072. The target is pinned to 768, the
+``EMBEDDING_DIMENSIONS`` default, so the revision means the same schema in
+every environment; a deployment that sets another size adds its own
+revision. Downgrade goes back to 3072.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd4e5f6g7h8i9'
+down_revision = 'c3d4e5f6g7h8'
+branch_labels = None
+depends_on = None
+
+NATIVE_DIMENSIONS = 3072
+TARGET_DIMENSIONS = 768
+HNSW_MAX_DIMENSIONS = 2000  # pgvector index limit for the vector type
+INDEX_NAME = 'idx_embedding_vector'
+
+
+def _current_dimensions():
+    return op.get_bind().execute(
+        sa.text(
+            """
+            SELECT atttypmod FROM pg_attribute
+            WHERE attrelid = to_regclass('content_embeddings')
+              AND attname = 'embedding' AND NOT attisdropped
+            """
+        )
+    ).scalar()
+
+
+def _resize(dims):
+    current = _current_dimensions()
+    if current is None:
+        return  # no content_embeddings table
+
+    if current != dims:
+        op.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+        if current > dims:
+            using = f'l2_normalize(subvector(embedding, 1, {dims}))'
+        else:
+            op.execute('DELETE FROM content_embeddings')
+            using = f'embedding::vector({dims})'
+        op.execute(
+            f'ALTER TABLE content_embeddings ALTER COLUMN embedding TYPE vector({dims}) USING {using}'
+        )
+
+    if dims <= HNSW_MAX_DIMENSIONS:
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} '
+            'ON content_embeddings USING hnsw (embedding vector_cosine_ops)'
+        )
+
+
+def upgrade():
+    _resize(TARGET_DIMENSIONS)
+
+
+def downgrade():
+    _resize(NATIVE_DIMENSIONS)
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import select, func, and_, cast, Text
+from sqlalchemy.orm import load_only
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array
 from typing import Optional
 from datetime import datetime, timedelta
 
@@ -11,6 +12,17 @@ from app.services.vector.pipeline import EmbeddingPipeline
 
 router = APIRouter()
 
+# extra_data keys left out of list_content: generated text (legacy and edited
+# copies; GeneratedPost holds the current one) that only the detail view shows.
+LIST_OMITTED_EXTRA_KEYS = ("generated_post", "thread_parts", "analysis", "web_search_results")
+
+
+def list_extra_data():
+    """``extra_data`` without ``LIST_OMITTED_EXTRA_KEYS``, trimmed in Postgres."""
+    return cast(CrawledContent.extra_data, JSONB).op("-")(
+        cast(array(LIST_OMITTED_EXTRA_KEYS), ARRAY(Text))
+    )
+
 
 @router.post("/process/{content_id}")
 async def process_content(
@@ -48,9 +60,21 @@ async def list_content(
     """
     List crawled content with filters.
 
-    Useful for frontend to display content pipeline.
+    Useful for frontend to display content pipeline. Only the listed
+    columns are loaded (not the article body), and ``extra_data`` comes
+    without the generated text; ``GET /{content_id}`` returns it in full.
     """
-    query = select(CrawledContent)
+    query = select(CrawledContent, list_extra_data().label("extra_data")).options(
+        load_only(
+            CrawledContent.id,
+            CrawledContent.title,
+            CrawledContent.source_url,
+            CrawledContent.content_type,
+            CrawledContent.category_hint,
+            CrawledContent.thread_status,
+            CrawledContent.created_at,
+        )
+    )
 
     # Apply filters
     if status:
@@ -79,7 +103,7 @@ async def list_content(
     query = query.limit(limit).offset(offset)
 
     result = await session.execute(query)
-    contents = result.scalars().all()
+    contents = result.all()
 
     return {
         "items": [
@@ -91,9 +115,9 @@ async def list_content(
                 "category_hint": c.category_hint.value,
                 "thread_status": c.thread_status.value,
                 "created_at": c.created_at.isoformat(),
-                "extra_data": c.extra_data
+                "extra_data": extra_data or {}
             }
-            for c in contents
+            for c, extra_data in contents
         ],
         "total": len(contents),
         "limit": limit,
@@ -1,27 +1,70 @@
 from fastapi import APIRouter, HTTPException
 
+from app.services.crawler.work_queue import get_crawl_queue
+from app.tasks.scheduler import scheduler
+
 router = APIRouter()
 
 
 @router.get("/status")
-async def get_scheduler_status():
-    """Get current scheduler status."""
-    # TODO: Implement with APScheduler
-    return {
-        "running": False,
-        "jobs": [],
-    }
+async def get_scheduler_status(refresh: bool = False):
+    """Get current scheduler status.
+
+    Reports whether this replica holds the leader lease, the current
+    leader, and every job with its next run and last run (status,
+    duration, error). Also includes the adaptive crawl interval per source
+    and the expected fetches saved per day versus the configured
+    intervals. The plan is recomputed from the DB on first use or when
+    ``refresh`` is set; only the leader reschedules jobs to it.
+    """
+    adaptive = scheduler.adaptive_status()
+    if refresh or adaptive["computed_at"] is None:
+        try:
+            adaptive = await scheduler.refresh_adaptive_intervals()
+        except Exception as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Adaptive schedule unavailable: {str(e)}"
+            )
+    return {**await scheduler.status(), "adaptive": adaptive}
 
 
 @router.post("/start")
 async def start_scheduler():
-    """Start the background scheduler."""
-    # TODO: Implement with APScheduler
-    raise HTTPException(status_code=501, detail="Not implemented")
+    """Start the background scheduler.
+
+    Jobs only run once this replica holds the leader lease.
+    """
+    try:
+        await scheduler.start()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Scheduler unavailable: {str(e)}")
+    return await scheduler.status()
 
 
 @router.post("/stop")
 async def stop_scheduler():
-    """Stop the background scheduler."""
-    # TODO: Implement with APScheduler
-    raise HTTPException(status_code=501, detail="Not implemented")
+    """Stop the background scheduler on this replica.
+
+    Releases the leader lease so another replica takes over the jobs.
+    """
+    await scheduler.stop()
+    return await scheduler.status()
+
+
+@router.get("/queue")
+async def get_queue_status(dead: int = 10):
+    """Crawl work queue depth and age.
+
+    ``ready`` jobs are due now, ``delayed`` ones wait for a retry backoff,
+    ``leased`` ones are running on a worker (``lease_expired`` of them have
+    overrun their lease and will be handed to another worker). Also lists
+    the most recent ``dead`` jobs with their last error; the scheduler's
+    next enqueue revives a dead job once ``CRAWL_QUEUE_DEAD_COOLDOWN_SEC``
+    has passed (``revive_after``).
+    """
+    queue = get_crawl_queue()
+    try:
+        return {**await queue.stats(), "dead_jobs": await queue.dead_jobs(dead)}
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Crawl queue unavailable: {str(e)}")
@@ -37,6 +37,80 @@ class Settings(BaseSettings):
     # Qdrant Vector DB
     QDRANT_URL: str = "http://localhost:6333"  # Default local, or cloud URL
     QDRANT_API_KEY: str = ""  # For Qdrant Cloud
+    QDRANT_POOL_SIZE: int = 20  # keep-alive connections of the shared async client
+    QDRANT_TIMEOUT_SEC: int = 10
+    QDRANT_QUANTIZATION: str = "int8"  # int8 | none
+    QDRANT_ON_DISK: bool = False  # keep original vectors on disk (quantized copy stays in RAM)
+    QDRANT_SCHEMA_AUTOFIX: bool = True  # apply in-place schema drift (indexes, HNSW, quantization) at boot
+
+    # Embedding output size (gemini-embedding-001 Matryoshka truncation; pgvector column,
+    # Qdrant collection and cache keys follow it; changing it needs `alembic upgrade` and
+    # `python -m app.tasks.qdrant_bootstrap --resize`)
+    EMBEDDING_DIMENSIONS: int = 768  # 128-3072; 768 / 1536 / 3072 recommended; not 768: add a pgvector migration
+
+    # Embedding cache (in-process LRU -> Redis, keyed by model + normalized text)
+    EMBEDDING_CACHE_MEMORY_MB: int = 64  # 0 disables the local tier
+    EMBEDDING_CACHE_REDIS: bool = True
+    EMBEDDING_CACHE_PREFIX: str = "emb"
+    EMBEDDING_CACHE_TTL_SEC: int = 604800  # 7 days
+    EMBEDDING_CACHE_DTYPE: str = "float32"  # float32 | float16
+
+    # Embedding micro-batching (concurrent single-text calls merged into one request)
+    EMBEDDING_BATCH_MAX: int = 100  # Gemini embed_content limit
+    EMBEDDING_BATCH_LINGER_MS: float = 10.0  # wait for more texts after the first one
+    EMBEDDING_BATCH_CONCURRENCY: int = 4  # batch requests in flight
+
+    # Crawler HTTP session (shared, pooled)
+    CRAWLER_HTTP2: bool = False
+    CRAWLER_MAX_CONNECTIONS: int = 50
+    CRAWLER_MAX_PER_HOST: int = 6
+    CRAWLER_TIMEOUT_SEC: float = 25.0
+    CRAWLER_RETRIES: int = 2
+    CRAWLER_HOST_RATE_PER_SEC: float = 1.0  # token-bucket rate per host (0 = unlimited)
+    CRAWLER_HOST_BURST: float = 2.0
+    CRAWLER_RESPECT_ROBOTS: bool = True  # honour robots.txt Disallow / Crawl-delay
+    CRAWLER_ROBOTS_TTL_SEC: float = 3600.0
+    CRAWLER_HTML_PARSER: str = "html.parser"  # html.parser | lxml | selectolax
+    CRAWLER_EXTRACT_WORKERS: int = 2  # extraction processes; 0 = parse inline on the event loop
+    CRAWLER_ARCHIVE_ENABLED: bool = True  # keep fetched HTML for re-extraction
+    CRAWLER_ARCHIVE_DIR: str = ""  # default: backend/crawl_archive
+    CRAWLER_NEAR_DUP_ENABLED: bool = True  # SimHash near-duplicate check before rows are written
+    CRAWLER_NEAR_DUP_MAX_DISTANCE: int = 6  # max differing bits of the 64-bit SimHash
+    CRAWLER_NEAR_DUP_PATH: str = ""  # default: backend/crawl_targets/near_dup_index.jsonl
+
+    # Headless browser rendering (PlaywrightCrawler)
+    PLAYWRIGHT_POOL_SIZE: int = 2  # browser contexts/pages rendering concurrently
+    PLAYWRIGHT_HEADLESS: bool = True
+    PLAYWRIGHT_RENDER_TIMEOUT_SEC: float = 20.0  # per-page deadline (navigation + content)
+    PLAYWRIGHT_MAX_PAGE_USES: int = 50  # recycle a context after this many renders
+
+    # Adaptive crawl intervals (learned from per-source publish frequency)
+    CRAWL_ADAPTIVE_ENABLED: bool = True
+    CRAWL_ADAPTIVE_MIN_MINUTES: int = 5
+    CRAWL_ADAPTIVE_MAX_MINUTES: int = 720
+    CRAWL_ADAPTIVE_LOOKBACK_DAYS: float = 14.0
+    CRAWL_ADAPTIVE_PIVOT_MINUTES: float = 60.0  # publish gap that is polled at the same interval
+    CRAWL_ADAPTIVE_REFRESH_MINUTES: int = 60  # how often intervals are recomputed
+
+    # Background crawl scheduler (one leader replica runs the jobs)
+    SCHEDULER_AUTOSTART: bool = True  # start with the app (lifespan)
+    SCHEDULER_JOBSTORE: str = "redis"  # redis (persistent, shared) | memory (single process)
+    SCHEDULER_REDIS_PREFIX: str = "scheduler"
+    SCHEDULER_LEASE_TTL_SEC: float = 15.0  # leader lease; renewed every ttl/3
+    SCHEDULER_JITTER_SEC: int = 30  # random delay added to each run
+    SCHEDULER_MAX_INSTANCES: int = 1  # concurrent runs of the same job
+    SCHEDULER_COALESCE: bool = True  # run missed firings once, not once per firing
+    SCHEDULER_MISFIRE_GRACE_SEC: int = 300
+
+    # Redis crawl work queue (app.tasks.crawl_worker)
+    CRAWL_QUEUE_ENABLED: bool = False  # scheduler enqueues crawls for workers instead of running them
+    CRAWL_QUEUE_PREFIX: str = "crawlq"
+    CRAWL_QUEUE_VISIBILITY_SEC: float = 300.0  # lease length; workers extend it every third
+    CRAWL_QUEUE_MAX_ATTEMPTS: int = 5  # then the job is parked as dead
+    CRAWL_QUEUE_BACKOFF_BASE_SEC: float = 30.0  # retry delay doubles per attempt
+    CRAWL_QUEUE_BACKOFF_MAX_SEC: float = 3600.0
+    CRAWL_QUEUE_DEAD_COOLDOWN_SEC: float = 21600.0  # re-enqueue revives a dead job after this; 0 = never
+    CRAWL_WORKER_CONCURRENCY: int = 4  # jobs in flight per worker process
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,68 @@
+"""Redis lease used to elect one leader among app replicas.
+
+``SET key token NX PX ttl`` takes the lease; the holder renews it well
+before it expires and only the holder may extend or release it (checked
+atomically in Lua). A replica that stops renewing (crash, network split)
+loses the lease after ``ttl_sec`` and another replica takes over.
+"""
+from __future__ import annotations
+
+import os
+import socket
+import uuid
+
+import redis.asyncio as redis
+
+
+_RENEW = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def replica_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class LeaderLease:
+    """Expiring ownership of ``key`` for the replica identified by ``token``."""
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        key: str,
+        *,
+        ttl_sec: float = 15.0,
+        token: str | None = None,
+    ) -> None:
+        self.client = client
+        self.key = key
+        self.ttl_ms = int(ttl_sec * 1000)
+        self.token = token or replica_id()
+
+    async def acquire(self) -> bool:
+        """Take the lease if it is free, or extend it if we already hold it."""
+        if await self.client.set(self.key, self.token, nx=True, px=self.ttl_ms):
+            return True
+        return await self.renew()
+
+    async def renew(self) -> bool:
+        return bool(await self.client.eval(_RENEW, 1, self.key, self.token, self.ttl_ms))
+
+    async def release(self) -> bool:
+        return bool(await self.client.eval(_RELEASE, 1, self.key, self.token))
+
+    async def holder(self) -> str | None:
+        value = await self.client.get(self.key)
+        if isinstance(value, bytes):
+            value = value.decode()
+        return value
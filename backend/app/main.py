@@ -8,6 +8,15 @@ import logging
 from app.config import get_settings
 from app.api.routes import threads, sources, scheduler, content, generated_posts
 from app.middleware import RateLimitMiddleware
+from app.services.crawler.offload import shutdown_extraction_pool
+from app.services.crawler.playwright_scraper import browser_pool_stats, close_browser_pool
+from app.services.crawler.session import close_crawl_sessions
+from app.services.monitoring import loop_lag_monitor
+from app.services.vector.embedding_batcher import embedding_batcher_stats
+from app.services.vector.embedding_cache import close_embedding_cache, embedding_cache_stats
+from app.services.vector.qdrant_embedder import close_qdrant_client, get_qdrant_client
+from app.services.vector.qdrant_schema import bootstrap_collections
+from app.tasks.scheduler import scheduler as crawl_scheduler
 
 
 settings = get_settings()
@@ -42,9 +51,26 @@ async def lifespan(app: FastAPI):
     # Startup
     setup_logging()
     print(f"Starting {settings.APP_NAME}...")
+    loop_lag_monitor.start()
+    try:
+        await bootstrap_collections(get_qdrant_client())
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Qdrant schema bootstrap failed: {e}")
+    if settings.SCHEDULER_AUTOSTART:
+        try:
+            await crawl_scheduler.start()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Crawl scheduler not started: {e}")
     yield
     # Shutdown
     print(f"Shutting down {settings.APP_NAME}...")
+    await crawl_scheduler.stop()
+    await loop_lag_monitor.stop()
+    await close_crawl_sessions()
+    await close_qdrant_client()
+    await close_embedding_cache()
+    await close_browser_pool()
+    shutdown_extraction_pool()
 
 
 app = FastAPI(
@@ -94,4 +120,10 @@ app.include_router(generated_posts.router, prefix="/api/content", tags=["generat
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "event_loop_lag": loop_lag_monitor.snapshot(),
+        "browser_pool": browser_pool_stats(),
+        "embedding_cache": embedding_cache_stats(),
+        "embedding_batcher": embedding_batcher_stats(),
+    }
@@ -1,5 +1,5 @@
-from app.models.source import Source, CrawledContent, GeneratedPost, PostStatus
+from app.models.source import Source, CrawledContent, CrawledContentPayload, GeneratedPost, PostStatus
 from app.models.thread import Thread
 from app.models.embedding import ContentEmbedding
 
-__all__ = ["Source", "CrawledContent", "GeneratedPost", "PostStatus", "Thread", "ContentEmbedding"]
+__all__ = ["Source", "CrawledContent", "CrawledContentPayload", "GeneratedPost", "PostStatus", "Thread", "ContentEmbedding"]
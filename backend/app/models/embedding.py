@@ -3,6 +3,8 @@ from sqlalchemy import JSON
 from pgvector.sqlalchemy import Vector
 from datetime import datetime
 
+from app.config import get_settings
+
 
 class ContentEmbedding(SQLModel, table=True):
     """Vector embeddings for crawled content."""
@@ -13,6 +15,6 @@ class ContentEmbedding(SQLModel, table=True):
         foreign_key="crawled_contents.id",
         primary_key=True
     )
-    embedding: list[float] = Field(sa_column=Column(Vector(3072)))
+    embedding: list[float] = Field(sa_column=Column(Vector(get_settings().EMBEDDING_DIMENSIONS)))
     extra_data: dict = Field(default={}, sa_column=Column(JSON))
     created_at: datetime = Field(default_factory=datetime.utcnow)
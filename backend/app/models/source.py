@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Column, JSON, String
+from sqlalchemy import ForeignKey, LargeBinary
 from datetime import datetime
 from enum import Enum
 from typing import Any
@@ -91,8 +92,8 @@ class CrawledContent(SQLModel, table=True):
     source_url: str = Field(unique=True)
     published_at: datetime
 
-    # Raw data preservation
-    raw_payload: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
+    # Raw crawler payload lives in ``crawled_content_payloads`` (compressed,
+    # loaded on demand via app.services.crawler.payload_store).
     extra_data: dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
 
     # Classification
@@ -118,6 +119,22 @@ class CrawledContent(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class CrawledContentPayload(SQLModel, table=True):
+    """Compressed raw crawler payload of a crawled content (cold storage)."""
+
+    __tablename__ = "crawled_content_payloads"
+
+    content_id: str = Field(
+        sa_column=Column(
+            String, ForeignKey("crawled_contents.id", ondelete="CASCADE"), primary_key=True
+        )
+    )
+    codec: str = Field(default="zlib")  # zlib | json (small payloads stored as is)
+    data: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    raw_size: int = Field(default=0)  # bytes of the uncompressed JSON
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class GeneratedPost(SQLModel, table=True):
     """Generated social media posts for crawled content."""
 
@@ -0,0 +1,186 @@
+"""Content-addressed, zstd-compressed archive of fetched HTML bodies.
+
+Layout under the archive root::
+
+    objects/<aa>/<sha256>.html.zst   one object per distinct response body
+    index.jsonl                      one line per archived fetch (url -> sha256)
+
+Objects are keyed by the SHA-256 of the raw (undecoded) body, so refetching an
+unchanged page costs no extra disk. Crawlers record the returned ``ArchiveRef``
+under ``raw_payload["archive"]`` so rows can be re-extracted later
+(``python -m app.tasks.reextract``) without hitting the source site again.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+import zstandard
+
+from app.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DIR = Path(__file__).resolve().parents[3] / "crawl_archive"
+
+
+@dataclass
+class ArchiveRef:
+    sha256: str
+    size: int
+    stored_size: int
+    url: str
+    final_url: str
+    extractor: str
+    encoding: str | None = None
+    content_type: str | None = None
+    http_status: int | None = None
+    archived_at: str = ""
+
+    def as_payload(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_payload(cls, data: dict[str, Any]) -> "ArchiveRef":
+        fields = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in data.items() if k in fields})
+
+
+class HtmlArchive:
+    def __init__(self, root: Path, *, level: int = 10) -> None:
+        self.root = Path(root)
+        self.level = level
+        self._index_lock = threading.Lock()
+        # zstd (de)compressor objects are not thread-safe; keep one per thread.
+        self._local = threading.local()
+
+    @classmethod
+    def from_settings(cls) -> "HtmlArchive | None":
+        settings = get_settings()
+        if not settings.CRAWLER_ARCHIVE_ENABLED:
+            return None
+        return cls(Path(settings.CRAWLER_ARCHIVE_DIR or DEFAULT_ARCHIVE_DIR))
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.jsonl"
+
+    def object_path(self, sha256: str) -> Path:
+        return self.root / "objects" / sha256[:2] / f"{sha256}.html.zst"
+
+    def _compressor(self) -> zstandard.ZstdCompressor:
+        c = getattr(self._local, "compressor", None)
+        if c is None:
+            c = self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+        return c
+
+    def _decompressor(self) -> zstandard.ZstdDecompressor:
+        d = getattr(self._local, "decompressor", None)
+        if d is None:
+            d = self._local.decompressor = zstandard.ZstdDecompressor()
+        return d
+
+    def put(
+        self,
+        body: bytes,
+        *,
+        url: str,
+        final_url: str | None = None,
+        extractor: str,
+        encoding: str | None = None,
+        content_type: str | None = None,
+        http_status: int | None = None,
+    ) -> ArchiveRef:
+        """Store ``body`` (deduplicated by hash) and append an index line."""
+        sha = hashlib.sha256(body).hexdigest()
+        path = self.object_path(sha)
+        if path.exists():
+            stored_size = path.stat().st_size
+        else:
+            data = self._compressor().compress(body)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            stored_size = len(data)
+
+        ref = ArchiveRef(
+            sha256=sha,
+            size=len(body),
+            stored_size=stored_size,
+            url=url,
+            final_url=final_url or url,
+            extractor=extractor,
+            encoding=encoding,
+            content_type=content_type,
+            http_status=http_status,
+            archived_at=datetime.now(timezone.utc).isoformat(),
+        )
+        line = json.dumps(ref.as_payload(), ensure_ascii=False) + "\n"
+        with self._index_lock:
+            with self.index_path.open("a", encoding="utf-8") as f:
+                f.write(line)
+        return ref
+
+    def get(self, sha256: str) -> bytes:
+        data = self.object_path(sha256).read_bytes()
+        body = self._decompressor().decompress(data)
+        if hashlib.sha256(body).hexdigest() != sha256:
+            raise ValueError(f"Archive object {sha256} is corrupt")
+        return body
+
+    def has(self, sha256: str) -> bool:
+        return self.object_path(sha256).exists()
+
+    def iter_index(self) -> Iterator[ArchiveRef]:
+        if not self.index_path.exists():
+            return
+        with self.index_path.open(encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield ArchiveRef.from_payload(json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+
+
+_archive: HtmlArchive | None = None
+
+
+def get_html_archive() -> HtmlArchive | None:
+    """Process-wide archive, or None when ``CRAWLER_ARCHIVE_ENABLED`` is off."""
+    global _archive
+    if _archive is None:
+        _archive = HtmlArchive.from_settings()
+    return _archive
+
+
+async def archive_body(body: bytes | str, **meta: Any) -> dict[str, Any] | None:
+    """Archive a fetched body off the event loop; return the ``raw_payload`` ref.
+
+    Archiving is best-effort: a disabled or unwritable archive never fails
+    the crawl.
+    """
+    archive = get_html_archive()
+    if archive is None:
+        return None
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+        meta["encoding"] = "utf-8"
+    try:
+        ref = await asyncio.to_thread(archive.put, body, **meta)
+    except OSError as e:
+        logger.warning("HTML archive write failed for %s: %s", meta.get("url"), e)
+        return None
+    return ref.as_payload()
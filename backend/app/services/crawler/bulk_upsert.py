@@ -0,0 +1,171 @@
+"""Set-based upsert of ``crawled_contents`` rows.
+
+The seed tasks used to look each article up (``source_url = ? OR
+canonical_url = ?``), copy every attribute onto the ORM object and flush per
+row. ``bulk_upsert_crawled_contents`` writes a batch with one lookup and at
+most two statements:
+
+* rows whose ``canonical_url`` matches an existing row stored under a
+  different ``source_url`` are updated in place by primary key (the old
+  per-row behaviour; the stored ``source_url`` moves to the new one);
+* everything else goes through one ``INSERT ... ON CONFLICT (source_url) DO
+  UPDATE ... RETURNING (xmax = 0)``, which reports per row whether Postgres
+  inserted or updated it.
+
+Outcomes come back in input order: ``"inserted"``, ``"updated"`` or
+``"duplicate"`` (an earlier row in the same call that a later row with the
+same URL superseded).
+
+A ``raw_payload`` key in a row is not a column; it is written to the
+compressed payload table (``payload_store``) under the row's id.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.source import CrawledContent
+from app.services.crawler.payload_store import store_raw_payloads
+
+
+# Columns kept as they are when an existing row is updated.
+IMMUTABLE_COLUMNS = ("id", "created_at")
+
+
+@dataclass
+class UpsertPlan:
+    upserts: list[int] = field(default_factory=list)  # row indexes for INSERT ... ON CONFLICT
+    updates: list[tuple[int, str]] = field(default_factory=list)  # (row index, existing id)
+    duplicates: list[int] = field(default_factory=list)
+
+
+def plan_upsert(
+    rows: Sequence[dict[str, Any]],
+    existing: Iterable[tuple[str, str, str | None]],
+) -> UpsertPlan:
+    """Split ``rows`` given ``(id, source_url, canonical_url)`` of matching rows.
+
+    Later rows win when several rows target the same stored row, as they did
+    when rows were written one by one.
+    """
+    by_url: dict[str, str] = {}
+    by_canonical: dict[str, str] = {}
+    for row_id, source_url, canonical_url in existing:
+        by_url[source_url] = row_id
+        if canonical_url:
+            by_canonical.setdefault(canonical_url, row_id)
+
+    plan = UpsertPlan()
+    claimed_ids: set[str] = set()
+    claimed_urls: set[str] = set()
+    for idx in range(len(rows) - 1, -1, -1):
+        row = rows[idx]
+        url = row["source_url"]
+        target = by_url.get(url)
+        via_canonical = False
+        if target is None and row.get("canonical_url"):
+            target = by_canonical.get(row["canonical_url"])
+            via_canonical = target is not None
+        if url in claimed_urls or (target is not None and target in claimed_ids):
+            plan.duplicates.append(idx)
+            continue
+        claimed_urls.add(url)
+        if target is not None:
+            claimed_ids.add(target)
+        if via_canonical:
+            plan.updates.append((idx, target))
+        else:
+            plan.upserts.append(idx)
+
+    plan.upserts.reverse()
+    plan.updates.reverse()
+    plan.duplicates.reverse()
+    return plan
+
+
+def _full_row(row: dict[str, Any], now: datetime) -> dict[str, Any]:
+    """Row with every model default filled in, so all VALUES tuples match."""
+    columns = {k: v for k, v in row.items() if k != "raw_payload"}
+    values = CrawledContent(**{"created_at": now, "updated_at": now, **columns}).model_dump()
+    values["updated_at"] = now
+    return values
+
+
+def upsert_statement(values: list[dict[str, Any]], keep_existing: Sequence[str] = ()):
+    table = CrawledContent.__table__
+    stmt = pg_insert(table).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.source_url],
+        set_={
+            c.name: stmt.excluded[c.name]
+            for c in table.columns
+            if c.name not in IMMUTABLE_COLUMNS and c.name not in keep_existing and not c.primary_key
+        },
+    ).returning(table.c.source_url, table.c.id, literal_column("(xmax = 0)").label("inserted"))
+
+
+async def bulk_upsert_crawled_contents(
+    session: AsyncSession,
+    rows: Sequence[dict[str, Any]],
+    *,
+    batch_size: int = 500,
+    keep_existing: Sequence[str] = (),
+) -> list[str]:
+    """Upsert ``rows`` (``CrawledContent`` field dicts) and return per-row outcomes.
+
+    Columns in ``keep_existing`` are only written for new rows; existing
+    rows keep their stored value (e.g. ``thread_status`` of an article the
+    pipeline already processed). The caller owns the transaction; nothing
+    is committed here.
+    """
+    outcomes = [""] * len(rows)
+    payloads: dict[str, dict[str, Any]] = {}
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for start in range(0, len(rows), max(1, batch_size)):
+        chunk = rows[start : start + batch_size]
+        urls = {r["source_url"] for r in chunk}
+        canonicals = {r["canonical_url"] for r in chunk if r.get("canonical_url")}
+        lookup = select(
+            CrawledContent.id, CrawledContent.source_url, CrawledContent.canonical_url
+        ).where(
+            or_(
+                CrawledContent.source_url.in_(urls),
+                CrawledContent.canonical_url.in_(canonicals),
+            )
+        )
+        plan = plan_upsert(chunk, (await session.execute(lookup)).all())
+
+        for idx in plan.duplicates:
+            outcomes[start + idx] = "duplicate"
+
+        if plan.updates:
+            values = []
+            for idx, row_id in plan.updates:
+                full = _full_row(chunk[idx], now)
+                full["id"] = row_id
+                full.pop("created_at")
+                for name in keep_existing:
+                    full.pop(name, None)
+                values.append(full)
+                outcomes[start + idx] = "updated"
+                if "raw_payload" in chunk[idx]:
+                    payloads[row_id] = chunk[idx]["raw_payload"]
+            await session.execute(update(CrawledContent), values)
+
+        if plan.upserts:
+            values = [_full_row(chunk[idx], now) for idx in plan.upserts]
+            result = await session.execute(upsert_statement(values, keep_existing))
+            written = {url: (row_id, flag) for url, row_id, flag in result.all()}
+            for idx in plan.upserts:
+                row_id, inserted = written[chunk[idx]["source_url"]]
+                outcomes[start + idx] = "inserted" if inserted else "updated"
+                if "raw_payload" in chunk[idx]:
+                    payloads[row_id] = chunk[idx]["raw_payload"]
+    if payloads:
+        await store_raw_payloads(session, payloads)
+    return outcomes
@@ -0,0 +1,386 @@
+"""Single-pass HTML article extraction shared by the crawlers.
+
+The crawlers used to run many ``find``/``find_all``/``get_text`` passes over
+the same soup. ``extract_document`` walks the parsed document exactly once
+and records everything the article builders need: head metadata, JSON-LD,
+flow blocks (headings/paragraphs/list items/images) in document order,
+anchors, and date/byline text candidates. Builders then post-process these
+flat lists instead of re-traversing the tree.
+
+The tree itself can come from one of several parser backends
+(``CRAWLER_HTML_PARSER``): BeautifulSoup's ``html.parser`` (default, pure
+Python), ``lxml`` (libxml2) or ``selectolax`` (lexbor). Each backend has a
+small walker that feeds the same start/end/text events to ``_Collector``, so
+field logic lives in one place regardless of the parser.
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from bs4 import BeautifulSoup
+from bs4.element import CData, NavigableString, Tag
+
+from app.config import get_settings
+
+
+MONTH_RE = re.compile(
+    r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},\s+\d{4}\b"
+)
+TEAM_RE = re.compile(r"\bTeam\b|\bGoogle\b", re.I)
+
+TEXT_BLOCK_TAGS = frozenset({"h1", "h2", "h3", "p", "li"})
+SKIP_TAGS = frozenset({"script", "style", "noscript", "template"})
+
+# Scope bits: inside the first <article> / the first <main> of the document.
+IN_ARTICLE = 1
+IN_MAIN = 2
+
+_TEXT_TYPES = (NavigableString, CData)
+
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
+
+def norm_ws(text: str | None) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+@dataclass
+class FlowNode:
+    """A heading/paragraph/list item (``text``) or an image (``src``)."""
+
+    tag: str
+    scope: int
+    text: str = ""
+    src: str | None = None
+    alt: str | None = None
+
+
+@dataclass
+class LinkNode:
+    href: str
+    text: str
+    scope: int
+
+
+@dataclass
+class ArticleExtraction:
+    metas: dict[tuple[str, str], str | None] = field(default_factory=dict)
+    jsonld: list[dict[str, Any]] = field(default_factory=list)
+    canonical_href: str | None = None
+    title_text: str | None = None
+    html_lang: str | None = None
+    first_h1: str | None = None
+    first_time: str | None = None
+    visible_date: str | None = None
+    team_strings: list[str] = field(default_factory=list)
+    flow: list[FlowNode] = field(default_factory=list)
+    links: list[LinkNode] = field(default_factory=list)
+    has_article: bool = False
+    has_main: bool = False
+
+    def meta(self, key: str) -> str | None:
+        """First ``<meta property=key>`` else ``<meta name=key>`` content."""
+        for attr in ("property", "name"):
+            if (attr, key) in self.metas:
+                value = self.metas[(attr, key)]
+                if value:
+                    return value
+        return None
+
+    def root_scope(self, *, use_main: bool = True) -> int:
+        """Scope of ``article or main or document`` (0 = whole document)."""
+        if self.has_article:
+            return IN_ARTICLE
+        if use_main and self.has_main:
+            return IN_MAIN
+        return 0
+
+    def flow_in(self, scope: int) -> list[FlowNode]:
+        if not scope:
+            return self.flow
+        return [n for n in self.flow if n.scope & scope]
+
+    def text_blocks(self, scope: int) -> list[FlowNode]:
+        return [n for n in self.flow_in(scope) if n.tag != "img"]
+
+    def links_in(self, scope: int) -> list[LinkNode]:
+        if not scope:
+            return self.links
+        return [a for a in self.links if a.scope & scope]
+
+
+class _Collector:
+    """Receives start/end/text events from a parser walk and fills an extraction."""
+
+    def __init__(self) -> None:
+        self.out = ArticleExtraction()
+        self._depth = 0
+        self._scope = 0
+        self._article_depth = -1
+        self._main_depth = -1
+        # (depth, node, parts) for open text blocks and anchors.
+        self._blocks: list[tuple[int, FlowNode, list[str]]] = []
+        self._anchors: list[tuple[int, LinkNode, list[str]]] = []
+        self._h1_open = -1
+        self._h1_parts: list[str] = []
+        self._time_open = -1
+        self._time_parts: list[str] = []
+        self._title_open = -1
+        self._title_parts: list[str] = []
+
+    def start(self, tag: str, attrs: dict[str, Any], inner_text: Callable[[], str]) -> bool:
+        """Handle an opening tag; return True to descend into its children."""
+        out = self.out
+        if tag in SKIP_TAGS:
+            if tag == "script" and str(attrs.get("type") or "").lower() == "application/ld+json":
+                self._add_jsonld(inner_text())
+            return False
+
+        if tag == "meta":
+            for attr in ("property", "name"):
+                key = attrs.get(attr)
+                if isinstance(key, str) and (attr, key) not in out.metas:
+                    content = attrs.get("content")
+                    out.metas[(attr, key)] = str(content).strip() if content else None
+            return False
+        if tag == "link":
+            rel = attrs.get("rel") or []
+            rels = rel.split() if isinstance(rel, str) else rel
+            if out.canonical_href is None and "canonical" in [r.lower() for r in rels]:
+                out.canonical_href = attrs.get("href") or ""
+            return False
+        if tag == "img":
+            src = attrs.get("src") or attrs.get("data-src")
+            alt = attrs.get("alt")
+            out.flow.append(
+                FlowNode(tag="img", scope=self._scope, src=src or None, alt=alt or None)
+            )
+            return False
+
+        self._depth += 1
+        depth = self._depth
+        if tag == "html" and out.html_lang is None:
+            out.html_lang = str(attrs.get("lang") or "")
+        elif tag == "article" and not out.has_article:
+            out.has_article = True
+            self._article_depth = depth
+            self._scope |= IN_ARTICLE
+        elif tag == "main" and not out.has_main:
+            out.has_main = True
+            self._main_depth = depth
+            self._scope |= IN_MAIN
+        elif tag == "title" and out.title_text is None and self._title_open < 0:
+            self._title_open = depth
+        elif tag == "time" and out.first_time is None and self._time_open < 0:
+            dt_attr = attrs.get("datetime")
+            if dt_attr:
+                out.first_time = str(dt_attr)
+            else:
+                self._time_open = depth
+
+        if tag in TEXT_BLOCK_TAGS:
+            node = FlowNode(tag=tag, scope=self._scope)
+            out.flow.append(node)
+            self._blocks.append((depth, node, []))
+            if tag == "h1" and out.first_h1 is None and self._h1_open < 0:
+                self._h1_open = depth
+        elif tag == "a":
+            href = attrs.get("href")
+            if href is not None:
+                link = LinkNode(href=str(href), text="", scope=self._scope)
+                out.links.append(link)
+                self._anchors.append((depth, link, []))
+        return True
+
+    def end(self, tag: str) -> None:
+        depth = self._depth
+        out = self.out
+        if self._blocks and self._blocks[-1][0] == depth:
+            _, node, parts = self._blocks.pop()
+            node.text = norm_ws(" ".join(parts))
+        if self._anchors and self._anchors[-1][0] == depth:
+            _, link, parts = self._anchors.pop()
+            link.text = " ".join(parts)
+        if self._h1_open == depth:
+            out.first_h1 = " ".join(self._h1_parts)
+            self._h1_open = -1
+        if self._title_open == depth:
+            out.title_text = " ".join(self._title_parts)
+            self._title_open = -1
+        if self._time_open == depth:
+            out.first_time = " ".join(self._time_parts)
+            self._time_open = -1
+        if self._article_depth == depth:
+            self._scope &= ~IN_ARTICLE
+            self._article_depth = -1
+        if self._main_depth == depth:
+            self._scope &= ~IN_MAIN
+            self._main_depth = -1
+        self._depth -= 1
+
+    def text(self, raw: str) -> None:
+        stripped = raw.strip()
+        if not stripped:
+            return
+        out = self.out
+        for _, _, parts in self._blocks:
+            parts.append(stripped)
+        for _, _, parts in self._anchors:
+            parts.append(stripped)
+        if self._h1_open >= 0:
+            self._h1_parts.append(stripped)
+        if self._title_open >= 0:
+            self._title_parts.append(stripped)
+        if self._time_open >= 0:
+            self._time_parts.append(stripped)
+        if out.visible_date is None:
+            m = MONTH_RE.search(stripped)
+            if m:
+                out.visible_date = m.group(0)
+        if len(out.team_strings) < 30 and TEAM_RE.search(raw):
+            out.team_strings.append(norm_ws(raw))
+
+    def finish(self) -> ArticleExtraction:
+        # Close anything left open by truncated markup.
+        while self._depth > 0:
+            self.end("")
+        return self.out
+
+    def _add_jsonld(self, txt: str | None) -> None:
+        if not txt:
+            return
+        try:
+            data = json.loads(txt)
+        except Exception:
+            return
+        if isinstance(data, dict):
+            self.out.jsonld.append(data)
+        elif isinstance(data, list):
+            self.out.jsonld.extend([x for x in data if isinstance(x, dict)])
+
+
+def _walk_soup(root: Tag, sink: _Collector) -> None:
+    stack: list[tuple[Iterable[Any], str | None]] = [(iter(root.contents), None)]
+    while stack:
+        children, tag_name = stack[-1]
+        node = next(children, None)
+        if node is None:
+            stack.pop()
+            if tag_name is not None:
+                sink.end(tag_name)
+            continue
+        if isinstance(node, Tag):
+            descend = sink.start(
+                node.name,
+                node.attrs,
+                lambda node=node: node.string or node.get_text(),
+            )
+            if descend:
+                stack.append((iter(node.contents), node.name))
+        elif type(node) in _TEXT_TYPES:
+            sink.text(str(node))
+
+
+def _walk_lxml(root: Any, sink: _Collector) -> None:
+    # Elements carry their leading text in ``.text`` and the text that follows
+    # their closing tag in ``.tail``; comments/PIs have a non-string ``.tag``.
+    stack: list[tuple[Iterable[Any], Any]] = []
+    el = root
+    while True:
+        if el is not None:
+            tag = el.tag
+            if isinstance(tag, str):
+                tag = tag.lower()
+                descend = sink.start(tag, el.attrib, el.text_content)
+                if descend:
+                    if el.text:
+                        sink.text(el.text)
+                    stack.append((iter(el), el))
+                    el = next(stack[-1][0], None)
+                    continue
+            if el.tail:
+                sink.text(el.tail)
+            el = next(stack[-1][0], None) if stack else None
+            continue
+        if not stack:
+            return
+        _, parent = stack.pop()
+        sink.end(parent.tag.lower())
+        if parent.tail and stack:
+            sink.text(parent.tail)
+        el = next(stack[-1][0], None) if stack else None
+
+
+def _walk_lexbor(root: Any, sink: _Collector) -> None:
+    stack: list[tuple[Iterable[Any], str | None]] = [(iter([root]), None)]
+    while stack:
+        children, tag_name = stack[-1]
+        node = next(children, None)
+        if node is None:
+            stack.pop()
+            if tag_name is not None:
+                sink.end(tag_name)
+            continue
+        tag = node.tag
+        if tag == "-text":
+            sink.text(node.text_content or "")
+        elif tag and tag[0] not in "-!_":
+            descend = sink.start(
+                tag,
+                node.attributes,
+                lambda node=node: node.text(deep=True),
+            )
+            if descend:
+                stack.append((node.iter(include_text=True), tag))
+
+
+def _parse_and_walk(html: str, parser: str, sink: _Collector) -> None:
+    if parser == "html.parser":
+        _walk_soup(BeautifulSoup(html, "html.parser"), sink)
+    elif parser == "lxml":
+        import lxml.etree
+        import lxml.html
+
+        if not html.strip():
+            return
+        # lxml rejects str input that carries an XML encoding declaration,
+        # so hand it UTF-8 bytes with the encoding pinned.
+        doc = lxml.html.document_fromstring(
+            html.encode("utf-8", "surrogatepass"),
+            parser=lxml.html.HTMLParser(encoding="utf-8"),
+        )
+        _walk_lxml(doc, sink)
+    elif parser == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+
+        root = LexborHTMLParser(html).root
+        if root is not None:
+            _walk_lexbor(root, sink)
+    else:
+        raise ValueError(
+            f"Unknown HTML parser backend {parser!r} (expected one of {', '.join(PARSER_BACKENDS)})"
+        )
+
+
+def extract_document(html: str, *, parser: str | None = None) -> ArticleExtraction:
+    """Parse ``html`` and collect every article field in one document walk.
+
+    ``parser`` defaults to ``CRAWLER_HTML_PARSER``.
+    """
+    sink = _Collector()
+    _parse_and_walk(html, parser or get_settings().CRAWLER_HTML_PARSER, sink)
+    return sink.finish()
+
+
+def find_article_jsonld(objs: list[dict[str, Any]]) -> dict[str, Any] | None:
+    wanted = {"article", "newsarticle", "blogposting"}
+    for obj in objs:
+        t = obj.get("@type")
+        if isinstance(t, str) and t.lower() in wanted:
+            return obj
+        if isinstance(t, list) and any(isinstance(x, str) and x.lower() in wanted for x in t):
+            return obj
+    return None
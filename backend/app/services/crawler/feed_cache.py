@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+def body_sha256(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def config_fingerprint(src: dict[str, Any]) -> str:
+    """Hash of the catalog fields that shape extraction output.
+
+    Cached items are only reused when the source is still configured the
+    same way; editing limit/prefix/regex rules forces a full refetch.
+    """
+    keys = (
+        "type",
+        "limit",
+        "allow_prefixes",
+        "deny_prefixes",
+        "allow_regexes",
+        "deny_regexes",
+    )
+    basis = json.dumps({k: src.get(k) for k in keys}, sort_keys=True, default=str)
+    return hashlib.sha256(basis.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class FeedCacheEntry:
+    url: str
+    fingerprint: str
+    body_sha256: str
+    body_bytes: int
+    items: list[dict[str, Any]]
+    etag: str | None = None
+    last_modified: str | None = None
+    stored_at: str = ""
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class FeedCacheStats:
+    not_modified: int = 0
+    unchanged: int = 0
+    misses: int = 0
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0
+    parse_skipped_bytes: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.not_modified + self.unchanged
+
+    def as_dict(self) -> dict[str, int]:
+        out = asdict(self)
+        out["hits"] = self.hits
+        return out
+
+
+@dataclass
+class FeedValidatorCache:
+    """Persistent ETag / Last-Modified / body-hash cache for discovery.
+
+    Stored as one JSON file keyed by source URL. Entries also keep the
+    extracted items so a 304 or an identical body can skip parsing.
+    """
+
+    path: Path
+    entries: dict[str, FeedCacheEntry] = field(default_factory=dict)
+    stats: FeedCacheStats = field(default_factory=FeedCacheStats)
+
+    @classmethod
+    def load(cls, path: Path) -> "FeedValidatorCache":
+        cache = cls(path=path)
+        if not path.exists():
+            return cache
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8")) or {}
+        except (OSError, ValueError):
+            return cache
+        for url, data in (raw.get("entries") or {}).items():
+            try:
+                cache.entries[url] = FeedCacheEntry(**data)
+            except TypeError:
+                continue
+        return cache
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        payload = {
+            "version": 1,
+            "entries": {url: asdict(e) for url, e in self.entries.items()},
+        }
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def lookup(self, url: str, fingerprint: str) -> FeedCacheEntry | None:
+        entry = self.entries.get(url)
+        if entry is None or entry.fingerprint != fingerprint:
+            return None
+        return entry
+
+    def store(
+        self,
+        url: str,
+        *,
+        fingerprint: str,
+        body_hash: str,
+        body_bytes: int,
+        items: list[dict[str, Any]],
+        etag: str | None,
+        last_modified: str | None,
+    ) -> None:
+        self.entries[url] = FeedCacheEntry(
+            url=url,
+            fingerprint=fingerprint,
+            body_sha256=body_hash,
+            body_bytes=body_bytes,
+            items=items,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=datetime.now(timezone.utc).isoformat(),
+        )
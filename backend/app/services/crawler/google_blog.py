@@ -2,31 +2,30 @@
 from __future__ import annotations
 
 import hashlib
-import json
-import re
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse, urlunparse
 
-import httpx
-from bs4 import BeautifulSoup
-from dateutil import parser as dateparser
-
 from app.schemas.crawler_item import NormalizedItem, SourceType, ContentType, PipelineStatus
+from app.services.crawler.extract import (
+    ArticleExtraction,
+    extract_document,
+    find_article_jsonld,
+    norm_ws as _norm_ws,
+)
+from app.services.crawler.archive import archive_body
+from app.services.crawler.offload import ExtractionPool, get_extraction_pool
+from app.services.crawler.session import CrawlSession, close_crawl_sessions, get_crawl_session
+from app.services.crawler.timestamps import parse_timestamp
 
 
-MONTH_RE = re.compile(
-    r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},\s+\d{4}\b"
-)
+SHARE_TEXTS = {"share", "copy link", "mail"}
 
 def _now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
-def _norm_ws(s: str) -> str:
-    return re.sub(r"\s+", " ", s or "").strip()
-
 def _abs_url(base: str, maybe: str) -> Optional[str]:
     if not maybe:
         return None
@@ -39,69 +38,18 @@ def _abs_url(base: str, maybe: str) -> Optional[str]:
 def _sha256(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
-def _pick_meta(soup: BeautifulSoup, key: str) -> Optional[str]:
-    """
-    key examples:
-      - ('property', 'og:title')
-      - ('name', 'description')
-    """
-    # support both name= and property=
-    for attr in ("property", "name"):
-        tag = soup.find("meta", attrs={attr: key})
-        if tag and tag.get("content"):
-            return tag["content"].strip()
-    return None
-
-def _extract_jsonld(soup: BeautifulSoup) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
-        txt = script.string
-        if not txt:
-            continue
-        try:
-            data = json.loads(txt)
-        except Exception:
-            continue
-
-        # JSON-LD can be dict or list
-        if isinstance(data, dict):
-            out.append(data)
-        elif isinstance(data, list):
-            out.extend([x for x in data if isinstance(x, dict)])
-    return out
-
-def _find_article_jsonld(jsonlds: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    # look for common article types
-    wanted = {"NewsArticle", "BlogPosting", "Article"}
-    for obj in jsonlds:
-        t = obj.get("@type")
-        if isinstance(t, list):
-            if any(x in wanted for x in t):
-                return obj
-        elif isinstance(t, str) and t in wanted:
-            return obj
-    return None
-
-def _extract_main_text(soup: BeautifulSoup) -> str:
+def _extract_main_text(doc: ArticleExtraction) -> str:
     """
-    Heuristic: find <article>, then take headings + paragraphs + lists.
+    Heuristic: take headings + paragraphs + lists from <article>
+    (fallback: <main>, then the whole document).
     """
-    article = soup.find("article")
-    if not article:
-        # fallback: main content area
-        article = soup.find("main") or soup
-
-    # remove obvious noise
-    for tag in article.find_all(["script", "style", "noscript"]):
-        tag.decompose()
-
     chunks: List[str] = []
-    for el in article.find_all(["h1", "h2", "h3", "p", "li"]):
-        text = _norm_ws(el.get_text(" ", strip=True))
+    for el in doc.text_blocks(doc.root_scope()):
+        text = el.text
         if not text:
             continue
         # skip nav-like junk
-        if text.lower() in {"share", "copy link", "mail"}:
+        if text.lower() in SHARE_TEXTS:
             continue
         chunks.append(text)
 
@@ -114,51 +62,40 @@ def _extract_main_text(soup: BeautifulSoup) -> str:
 
     return "\n\n".join(cleaned).strip()
 
-def _extract_images_with_positions(base_url: str, soup: BeautifulSoup) -> Tuple[List[str], List[Dict[str, Any]]]:
-    article = soup.find("article") or soup.find("main") or soup
-    flow_tags = ["h1", "h2", "h3", "p", "li", "img"]
-
+def _extract_images_with_positions(base_url: str, doc: ArticleExtraction) -> Tuple[List[str], List[Dict[str, Any]]]:
     text_blocks: List[Tuple[int, str]] = []
     image_blocks: List[Dict[str, Any]] = []
 
-    for idx, el in enumerate(article.find_all(flow_tags)):
-        if el.name == "img":
-            src = el.get("src") or el.get("data-src")
-            full = _abs_url(base_url, src) if src else None
+    for idx, el in enumerate(doc.flow_in(doc.root_scope())):
+        if el.tag == "img":
+            full = _abs_url(base_url, el.src) if el.src else None
             if not full:
                 continue
             image_blocks.append(
                 {
                     "url": full,
                     "dom_index": idx,
-                    "alt": _norm_ws(el.get("alt", "")) or None,
+                    "alt": _norm_ws(el.alt or "") or None,
                 }
             )
             continue
 
-        text = _norm_ws(el.get_text(" ", strip=True))
+        text = el.text
         if not text:
             continue
-        if text.lower() in {"share", "copy link", "mail"}:
+        if text.lower() in SHARE_TEXTS:
             continue
         text_blocks.append((idx, text))
 
+    # flow order is document order, so a single forward sweep finds the
+    # nearest text block on each side of every image
+    t_pos = 0
     for img in image_blocks:
         dom_index = img["dom_index"]
-        before_text = None
-        after_text = None
-
-        for t_idx, t_text in reversed(text_blocks):
-            if t_idx < dom_index:
-                before_text = t_text
-                break
-        for t_idx, t_text in text_blocks:
-            if t_idx > dom_index:
-                after_text = t_text
-                break
-
-        img["before_text"] = before_text
-        img["after_text"] = after_text
+        while t_pos < len(text_blocks) and text_blocks[t_pos][0] < dom_index:
+            t_pos += 1
+        img["before_text"] = text_blocks[t_pos - 1][1] if t_pos > 0 else None
+        img["after_text"] = text_blocks[t_pos][1] if t_pos < len(text_blocks) else None
 
     # unique preserve order for existing image_urls field
     seen = set()
@@ -172,8 +109,7 @@ def _extract_images_with_positions(base_url: str, soup: BeautifulSoup) -> Tuple[
 
     return image_urls, image_blocks
 
-def _extract_outbound_links(base_url: str, soup: BeautifulSoup) -> List[str]:
-    article = soup.find("article") or soup
+def _extract_outbound_links(base_url: str, doc: ArticleExtraction) -> List[str]:
     base_host = (urlparse(base_url).hostname or "").lower()
 
     share_hosts = {
@@ -201,9 +137,8 @@ def _extract_outbound_links(base_url: str, soup: BeautifulSoup) -> List[str]:
         return urlunparse((p.scheme, p.netloc, p.path, p.params, p.query, ""))
 
     links = []
-    for a in article.find_all("a", href=True):
-        href = a["href"]
-        full = _abs_url(base_url, href)
+    for a in doc.links_in(doc.root_scope(use_main=False)):
+        full = _abs_url(base_url, a.href)
         if not full:
             continue
         parsed = urlparse(full)
@@ -226,36 +161,27 @@ def _extract_outbound_links(base_url: str, soup: BeautifulSoup) -> List[str]:
         uniq.append(u)
     return uniq
 
-def _guess_published_at(soup: BeautifulSoup, jsonld_article: Optional[Dict[str, Any]]) -> Optional[datetime]:
+def _guess_published_at(doc: ArticleExtraction, jsonld_article: Optional[Dict[str, Any]]) -> Optional[datetime]:
     # 1) JSON-LD datePublished
     if jsonld_article:
         dp = jsonld_article.get("datePublished") or jsonld_article.get("dateCreated")
-        if isinstance(dp, str) and dp.strip():
-            try:
-                return dateparser.parse(dp).astimezone(timezone.utc)
-            except Exception:
-                pass
+        dt = parse_timestamp(dp) if isinstance(dp, str) else None
+        if dt is not None:
+            return dt.astimezone(timezone.utc)
 
     # 2) meta article:published_time
-    meta_time = _pick_meta(soup, "article:published_time")
-    if meta_time:
-        try:
-            return dateparser.parse(meta_time).astimezone(timezone.utc)
-        except Exception:
-            pass
-
-    # 3) visible month day year somewhere near top
-    text = soup.get_text(" ", strip=True)
-    m = MONTH_RE.search(text)
-    if m:
-        try:
-            return dateparser.parse(m.group(0)).replace(tzinfo=timezone.utc)
-        except Exception:
-            pass
+    dt = parse_timestamp(doc.meta("article:published_time"))
+    if dt is not None:
+        return dt.astimezone(timezone.utc)
+
+    # 3) first visible "Mon D, YYYY" (captured during the document walk)
+    dt = parse_timestamp(doc.visible_date)
+    if dt is not None:
+        return dt.replace(tzinfo=timezone.utc)
 
     return None
 
-def _guess_author(soup: BeautifulSoup, jsonld_article: Optional[Dict[str, Any]]) -> Optional[str]:
+def _guess_author(doc: ArticleExtraction, jsonld_article: Optional[Dict[str, Any]]) -> Optional[str]:
     if jsonld_article:
         author = jsonld_article.get("author")
         # author can be dict or list
@@ -269,16 +195,13 @@ def _guess_author(soup: BeautifulSoup, jsonld_article: Optional[Dict[str, Any]])
                     return a["name"].strip()
 
     # meta author
-    meta_author = _pick_meta(soup, "author")
+    meta_author = doc.meta("author")
     if meta_author:
         return meta_author.strip()
 
     # fallback: look for a short "byline-ish" string in the header
     # (Google blog often shows something like "The Gemini Team")
-    # We'll search a small set of candidates
-    candidates = soup.find_all(string=re.compile(r"\bTeam\b|\bGoogle\b", re.I))
-    for c in candidates[:30]:
-        s = _norm_ws(str(c))
+    for s in doc.team_strings:
         if 2 <= len(s) <= 60 and ("team" in s.lower()):
             return s
 
@@ -316,36 +239,34 @@ def _classify(url: str, title: str, text: str) -> Tuple[ContentType, List[str]]:
 
     return ctype, hints_uniq
 
-def _build_item_from_html(url: str, html: str) -> NormalizedItem:
-    soup = BeautifulSoup(html, "html.parser")
-
-    jsonlds = _extract_jsonld(soup)
-    article_jsonld = _find_article_jsonld(jsonlds)
+def _build_item_from_html(url: str, html: str, *, parser: Optional[str] = None) -> NormalizedItem:
+    doc = extract_document(html, parser=parser)
+    article_jsonld = find_article_jsonld(doc.jsonld)
 
     title = (
         (article_jsonld.get("headline") if article_jsonld else None)
-        or _pick_meta(soup, "og:title")
-        or (soup.find("h1").get_text(strip=True) if soup.find("h1") else None)
+        or doc.meta("og:title")
+        or doc.first_h1
         or "Untitled"
     )
     title = _norm_ws(title)
 
     canonical = (
         (article_jsonld.get("mainEntityOfPage") if article_jsonld else None)
-        or soup.find("link", rel="canonical")["href"] if soup.find("link", rel="canonical") else None
+        or doc.canonical_href
     )
     if isinstance(canonical, dict):  # sometimes JSON-LD uses {"@id": "..."}
         canonical = canonical.get("@id")
     canonical = canonical or url
 
-    summary_hint = _pick_meta(soup, "og:description") or _pick_meta(soup, "description")
+    summary_hint = doc.meta("og:description") or doc.meta("description")
 
-    published_at = _guess_published_at(soup, article_jsonld)
-    author = _guess_author(soup, article_jsonld)
+    published_at = _guess_published_at(doc, article_jsonld)
+    author = _guess_author(doc, article_jsonld)
 
-    content_text = _extract_main_text(soup)
-    image_urls, image_positions = _extract_images_with_positions(canonical, soup)
-    outbound_urls = _extract_outbound_links(canonical, soup)
+    content_text = _extract_main_text(doc)
+    image_urls, image_positions = _extract_images_with_positions(canonical, doc)
+    outbound_urls = _extract_outbound_links(canonical, doc)
 
     content_type, category_hint = _classify(canonical, title, content_text)
 
@@ -394,23 +315,29 @@ async def crawl_google_blog_article(
     *,
     html: Optional[str] = None,
     trust_env: bool = False,
+    session: Optional[CrawlSession] = None,
+    pool: Optional[ExtractionPool] = None,
 ) -> NormalizedItem:
-    page_html = html
-    if page_html is None:
-        async with httpx.AsyncClient(
-            timeout=20,
-            headers={
-                "User-Agent": "TrendAIStudioBot/0.1 (contact: trendaistudio24@gmail.com)",
-                "Accept-Language": "en,ko;q=0.8",
-            },
-            follow_redirects=True,
-            trust_env=trust_env,
-        ) as client:
-            r = await client.get(url)
-            r.raise_for_status()
-            page_html = r.text
-
-    return _build_item_from_html(url, page_html)
+    extractor = pool or get_extraction_pool()
+    if html is not None:
+        item = await extractor.google_blog_item(url, html)
+        archive_ref = await archive_body(html, url=url, extractor="google_blog")
+    else:
+        http = session or get_crawl_session(trust_env=trust_env)
+        r = await http.get(url)
+        item = await extractor.google_blog_item(url, r.content, encoding=r.encoding)
+        archive_ref = await archive_body(
+            r.content,
+            url=url,
+            final_url=str(r.url),
+            extractor="google_blog",
+            encoding=r.encoding,
+            content_type=r.headers.get("content-type"),
+            http_status=r.status_code,
+        )
+    if archive_ref:
+        item.raw_payload["archive"] = archive_ref
+    return item
 
 if __name__ == "__main__":
     import argparse
@@ -439,7 +366,13 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     input_html = Path(args.html_file).read_text(encoding="utf-8") if args.html_file else None
-    item = asyncio.run(crawl_google_blog_article(args.url, html=input_html, trust_env=args.trust_env))
+    async def _crawl_once() -> NormalizedItem:
+        try:
+            return await crawl_google_blog_article(args.url, html=input_html, trust_env=args.trust_env)
+        finally:
+            await close_crawl_sessions()
+
+    item = asyncio.run(_crawl_once())
     payload = item.model_dump_json(indent=2, exclude_none=True)
 
     if args.out:
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from typing import Any
 from urllib.parse import urlparse
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.core.database import async_session
 from app.models.source import (
@@ -15,7 +15,11 @@ from app.models.source import (
     SourceType as SourceConfigType,
     ThreadStatus,
 )
+from app.schemas.crawler_item import NormalizedItem
+from app.services.crawler.bulk_upsert import bulk_upsert_crawled_contents
 from app.services.crawler.google_blog import crawl_google_blog_article
+from app.services.crawler.payload_store import store_raw_payloads
+from app.services.crawler.session import CrawlSession
 
 
 ALLOWED_HOSTS = {"blog.google", "www.blog.google"}
@@ -35,7 +39,7 @@ def _to_utc_naive(dt: datetime | None) -> datetime:
     return dt.astimezone(timezone.utc).replace(tzinfo=None)
 
 
-def _validate_google_blog_url(url: str) -> None:
+def validate_google_blog_url(url: str) -> None:
     parsed = urlparse(url)
     if parsed.scheme.lower() != "https":
         raise ValueError("Only https URLs are allowed.")
@@ -72,7 +76,7 @@ def _map_content_type(raw_type: str) -> ContentType:
     return mapped.get(raw_type, ContentType.GENERAL)
 
 
-async def _get_or_create_source() -> Source:
+async def get_google_blog_source() -> Source:
     async with async_session() as session:
         stmt = select(Source).where(
             Source.url == DEFAULT_SOURCE_URL,
@@ -97,26 +101,81 @@ async def _get_or_create_source() -> Source:
         return source
 
 
+def google_blog_summary(item: NormalizedItem) -> dict[str, Any]:
+    return {
+        "canonical_url": str(item.canonical_url or item.source_url),
+        "title": item.title,
+        "published_at": _to_utc_naive(item.published_at).isoformat(),
+        "summary_hint": item.summary_hint,
+        "content_hash": item.content_hash,
+        "image_count": len(item.image_urls),
+        "outbound_count": len(item.outbound_urls),
+    }
+
+
+def google_blog_row(item: NormalizedItem, source_id: str) -> dict[str, Any]:
+    """``crawled_contents`` values for a crawled Google Blog item."""
+    canonical_url = str(item.canonical_url or item.source_url)
+    return {
+        "source_id": source_id,
+        "title": item.title,
+        "content": item.content,
+        "summary_hint": item.summary_hint,
+        "image_urls": [str(u) for u in item.image_urls],
+        "source_url": canonical_url,
+        "published_at": _to_utc_naive(item.published_at),
+        "extra_data": {
+            "crawler": "google_blog",
+            "category_hint_raw": item.category_hint,
+            "metadata": item.metadata,
+        },
+        "category_hint": _map_category(item.category_hint),
+        "thread_status": ThreadStatus.PENDING,
+        "content_hash": item.content_hash,
+        "source_type": _map_source_type(),
+        "source_name": item.source_name,
+        "canonical_url": canonical_url,
+        "fetched_at": _to_utc_naive(item.fetched_at),
+        "author": item.author,
+        "image_positions": item.image_positions,
+        "outbound_urls": [str(u) for u in item.outbound_urls],
+        "content_type": _map_content_type(item.content_type.name),
+        "tags": item.tags,
+        "language": item.language or "en",
+        "raw_payload": item.raw_payload,
+    }
+
+
+async def upsert_google_blog_rows(rows: list[dict[str, Any]]) -> list[str]:
+    """Bulk-upsert rows from :func:`google_blog_row`; returns per-row outcomes."""
+    if not rows:
+        return []
+    now = _now_utc_naive()
+    async with async_session() as session:
+        outcomes = await bulk_upsert_crawled_contents(session, rows)
+        await session.execute(
+            update(Source)
+            .where(Source.id.in_({r["source_id"] for r in rows}))
+            .values(last_crawled_at=now, updated_at=now)
+        )
+        await session.commit()
+    return outcomes
+
+
 async def crawl_and_upsert_google_blog_article(
     url: str,
     *,
     dry_run: bool = False,
     html: str | None = None,
     trust_env: bool = False,
+    session: CrawlSession | None = None,
 ) -> dict[str, Any]:
-    _validate_google_blog_url(url)
-    item = await crawl_google_blog_article(url, html=html, trust_env=trust_env)
+    validate_google_blog_url(url)
+    item = await crawl_google_blog_article(
+        url, html=html, trust_env=trust_env, session=session
+    )
 
-    canonical_url = str(item.canonical_url or item.source_url)
-    payload = {
-        "canonical_url": canonical_url,
-        "title": item.title,
-        "published_at": _to_utc_naive(item.published_at).isoformat(),
-        "summary_hint": item.summary_hint,
-        "content_hash": item.content_hash,
-        "image_count": len(item.image_urls),
-        "outbound_count": len(item.outbound_urls),
-    }
+    payload = google_blog_summary(item)
 
     if dry_run:
         return {
@@ -125,78 +184,28 @@ async def crawl_and_upsert_google_blog_article(
             "result": payload,
         }
 
-    source = await _get_or_create_source()
+    source = await get_google_blog_source()
     now = _now_utc_naive()
-    category = _map_category(item.category_hint)
-    source_type = _map_source_type()
-    content_type = _map_content_type(item.content_type.name)
-    image_urls = [str(u) for u in item.image_urls]
-    outbound_urls = [str(u) for u in item.outbound_urls]
-
-    extra_data = {
-        "crawler": "google_blog",
-        "category_hint_raw": item.category_hint,
-        "metadata": item.metadata,
-    }
+    row = google_blog_row(item, source.id)
+    raw_payload = row.pop("raw_payload")
 
     async with async_session() as session:
-        stmt = select(CrawledContent).where(CrawledContent.source_url == canonical_url)
+        stmt = select(CrawledContent).where(CrawledContent.source_url == row["source_url"])
         existing = (await session.execute(stmt)).scalar_one_or_none()
 
         if existing:
-            existing.source_id = source.id
-            existing.title = item.title
-            existing.content = item.content
-            existing.summary_hint = item.summary_hint
-            existing.image_urls = image_urls
-            existing.published_at = _to_utc_naive(item.published_at)
-            existing.extra_data = extra_data
-            existing.category_hint = category
-            existing.thread_status = ThreadStatus.PENDING
-            existing.content_hash = item.content_hash
-            existing.source_type = source_type
-            existing.source_name = item.source_name
-            existing.canonical_url = canonical_url
-            existing.fetched_at = _to_utc_naive(item.fetched_at)
-            existing.author = item.author
-            existing.image_positions = item.image_positions
-            existing.outbound_urls = outbound_urls
-            existing.content_type = content_type
-            existing.tags = item.tags
-            existing.language = item.language or "en"
-            existing.raw_payload = item.raw_payload
+            for key, value in row.items():
+                setattr(existing, key, value)
             existing.updated_at = now
             action = "updated"
             db_id = existing.id
         else:
-            record = CrawledContent(
-                source_id=source.id,
-                title=item.title,
-                content=item.content,
-                summary_hint=item.summary_hint,
-                image_urls=image_urls,
-                source_url=canonical_url,
-                published_at=_to_utc_naive(item.published_at),
-                extra_data=extra_data,
-                category_hint=category,
-                thread_status=ThreadStatus.PENDING,
-                content_hash=item.content_hash,
-                source_type=source_type,
-                source_name=item.source_name,
-                canonical_url=canonical_url,
-                fetched_at=_to_utc_naive(item.fetched_at),
-                author=item.author,
-                image_positions=item.image_positions,
-                outbound_urls=outbound_urls,
-                content_type=content_type,
-                tags=item.tags,
-                language=item.language or "en",
-                raw_payload=item.raw_payload,
-            )
+            record = CrawledContent(**row)
             session.add(record)
             await session.flush()
             action = "inserted"
             db_id = record.id
+        await store_raw_payloads(session, {db_id: raw_payload})
 
         source_stmt = select(Source).where(Source.id == source.id)
         source_ref = (await session.execute(source_stmt)).scalar_one()
@@ -0,0 +1,306 @@
+"""Crawl-time near-duplicate detection.
+
+Syndicated copies and lightly edited re-posts of the same story are common
+across feeds; embedding and generating a post for each of them is wasted
+work. Every crawled article is reduced to a 64-bit SimHash over word
+3-shingles of its title and body. Two articles whose fingerprints differ in
+at most ``max_distance`` bits are near-duplicates.
+
+Lookups use banded LSH: the 64 bits are split into ``max_distance + 1``
+bands, so by the pigeonhole principle any fingerprint within the threshold
+shares at least one band exactly with the stored one. Only fingerprints in
+matching buckets are compared bit by bit.
+
+The index is an append-only JSONL log (``{"key", "fp"}``; later lines win)
+so it survives restarts. It is compacted when the log grows past twice the
+live entry count.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, MutableMapping
+
+from app.config import get_settings
+from app.models.source import ThreadStatus
+
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parents[3] / "crawl_targets" / "near_dup_index.jsonl"
+
+FP_BITS = 64
+SHINGLE_SIZE = 3
+MIN_TOKENS = 20  # shorter texts give unstable fingerprints; they are never flagged
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_BIT_TABLES = [bytes((b >> k) & 1 for b in range(256)) for k in range(8)]
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def simhash(text: str, *, shingle_size: int = SHINGLE_SIZE) -> int | None:
+    """64-bit SimHash of ``text``; ``None`` when it has fewer than ``MIN_TOKENS`` words."""
+    tokens = _tokens(text)
+    if len(tokens) < MIN_TOKENS:
+        return None
+    shingles = {" ".join(tokens[i : i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)}
+    blob = b"".join(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest() for s in shingles)
+    # Per-bit vote counts: for each byte position, take that byte of every
+    # digest and count set bits with translate()/count(), which run in C.
+    half = len(shingles) / 2
+    fp = 0
+    for j in range(8):
+        column = blob[j::8]
+        for k, table in enumerate(_BIT_TABLES):
+            if column.translate(table).count(1) > half:
+                fp |= 1 << ((7 - j) * 8 + k)
+    return fp
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def fingerprint_text(title: str | None, content: str | None) -> str:
+    return f"{title or ''}\n{content or ''}"
+
+
+def _band_masks(bands: int) -> list[tuple[int, int]]:
+    """``(shift, mask)`` per band, splitting 64 bits as evenly as possible."""
+    out = []
+    shift = 0
+    for i in range(bands):
+        width = FP_BITS // bands + (1 if i < FP_BITS % bands else 0)
+        out.append((shift, (1 << width) - 1))
+        shift += width
+    return out
+
+
+@dataclass
+class NearDuplicateMatch:
+    key: str
+    distance: int
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"url": self.key, "distance": self.distance, "method": "simhash"}
+
+
+@dataclass
+class StagedRows:
+    """Result of ``flag_rows``: fingerprints to index once the rows are stored."""
+
+    flagged: int = 0
+    entries: list[tuple[str, int]] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+class NearDuplicateIndex:
+    """SimHash index keyed by article URL, optionally persisted to ``path``."""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        max_distance: int = 6,
+        max_items: int = 200_000,
+    ) -> None:
+        if not 0 <= max_distance < FP_BITS // 2:
+            raise ValueError("max_distance must be between 0 and 31")
+        self.path = Path(path) if path is not None else None
+        self.max_distance = max_distance
+        self.max_items = max_items
+        self._bands = _band_masks(max_distance + 1)
+        self._fps: dict[str, int] = {}
+        self._buckets: defaultdict[tuple[int, int], set[str]] = defaultdict(set)
+        self._pending: list[tuple[str, int]] = []
+        self._log_lines = 0
+        self.checked = 0
+        self.flagged = 0
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._fps)
+
+    def _load(self) -> None:
+        assert self.path is not None
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                self._log_lines += 1
+                try:
+                    entry = json.loads(line)
+                    self._put(entry["key"], int(entry["fp"]))
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn last line after a crash
+
+    def _keys(self, fp: int) -> Iterable[tuple[int, int]]:
+        return ((i, (fp >> shift) & mask) for i, (shift, mask) in enumerate(self._bands))
+
+    def _remove(self, key: str) -> None:
+        old = self._fps.pop(key, None)
+        if old is None:
+            return
+        for bucket_key in self._keys(old):
+            bucket = self._buckets.get(bucket_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[bucket_key]
+
+    def _put(self, key: str, fp: int) -> None:
+        self._remove(key)
+        self._fps[key] = fp
+        for bucket_key in self._keys(fp):
+            self._buckets[bucket_key].add(key)
+        while len(self._fps) > self.max_items:
+            self._remove(next(iter(self._fps)))
+
+    def nearest(self, fp: int, *, exclude: str | None = None) -> NearDuplicateMatch | None:
+        best: NearDuplicateMatch | None = None
+        candidates: set[str] = set()
+        for bucket_key in self._keys(fp):
+            candidates.update(self._buckets.get(bucket_key, ()))
+        for key in candidates:
+            if key == exclude:
+                continue
+            distance = hamming(fp, self._fps[key])
+            if distance <= self.max_distance and (best is None or distance < best.distance):
+                best = NearDuplicateMatch(key, distance)
+        return best
+
+    def check(self, key: str, text: str) -> NearDuplicateMatch | None:
+        """Return the closest stored article ``text`` nearly duplicates, if any."""
+        fp = simhash(text)
+        self.checked += 1
+        if fp is None:
+            return None
+        return self.nearest(fp, exclude=key)
+
+    def add(self, key: str, text: str) -> None:
+        fp = simhash(text)
+        if fp is not None:
+            self._add_fp(key, fp)
+
+    def _add_fp(self, key: str, fp: int) -> None:
+        if self._fps.get(key) == fp:
+            return
+        self._put(key, fp)
+        if self.path is not None:
+            self._pending.append((key, fp))
+
+    def check_and_add(self, key: str, text: str) -> NearDuplicateMatch | None:
+        """Check ``text`` and index it unless it is a near-duplicate.
+
+        Near-duplicates are not indexed, so later copies are matched against
+        the original rather than drifting away through a chain of copies.
+        """
+        fp = simhash(text)
+        self.checked += 1
+        if fp is None:
+            return None
+        match = self.nearest(fp, exclude=key)
+        if match is not None:
+            self.flagged += 1
+            self._remove(key)
+            return match
+        self._add_fp(key, fp)
+        return None
+
+    def flag_rows(self, rows: Iterable[MutableMapping[str, Any]]) -> StagedRows:
+        """Mark near-duplicate ``CrawledContent`` row dicts before they are written.
+
+        Flagged rows get ``extra_data["duplicate_of"]`` and ``FAILED`` status,
+        the same marking the content stats and the generation pipeline use
+        for duplicates, so they are never embedded or sent to generation.
+        Rows are checked against the index and against each other, but
+        nothing is indexed yet: pass the result to ``commit`` once the rows
+        are stored, so a failed write never leaves a fingerprint that later
+        copies would be flagged against.
+        """
+        staged = StagedRows()
+        batch = NearDuplicateIndex(max_distance=self.max_distance)
+        for row in rows:
+            key = row.get("canonical_url") or row["source_url"]
+            fp = simhash(fingerprint_text(row.get("title"), row.get("content")))
+            self.checked += 1
+            match = None
+            if fp is not None:
+                match = self.nearest(fp, exclude=key) or batch.nearest(fp, exclude=key)
+            extra = dict(row.get("extra_data") or {})
+            if match is None:
+                if fp is not None:
+                    batch._put(key, fp)
+                    staged.entries.append((key, fp))
+                if extra.pop("duplicate_of", None) is not None:
+                    row["extra_data"] = extra
+                continue
+            extra["duplicate_of"] = match.as_dict()
+            row["extra_data"] = extra
+            row["thread_status"] = ThreadStatus.FAILED
+            staged.removed.append(key)
+            staged.flagged += 1
+        self.flagged += staged.flagged
+        return staged
+
+    def commit(self, staged: StagedRows) -> None:
+        """Index the rows of a ``flag_rows`` batch after they were written."""
+        for key in staged.removed:
+            self._remove(key)  # near-duplicates are not indexed (see check_and_add)
+        for key, fp in staged.entries:
+            self._add_fp(key, fp)
+
+    def save(self) -> None:
+        """Append new fingerprints to the log; compact it when mostly stale."""
+        if self.path is None or not self._pending:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self._log_lines + len(self._pending) > 2 * max(len(self._fps), 1):
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for key, fp in self._fps.items():
+                    f.write(json.dumps({"key": key, "fp": fp}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._log_lines = len(self._fps)
+        else:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for key, fp in self._pending:
+                    f.write(json.dumps({"key": key, "fp": fp}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._log_lines += len(self._pending)
+        self._pending.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "indexed": len(self._fps),
+            "checked": self.checked,
+            "near_duplicates": self.flagged,
+            "embedding_calls_avoided": self.flagged,
+            "max_distance": self.max_distance,
+            "path": str(self.path) if self.path else None,
+        }
+
+
+_index: NearDuplicateIndex | None = None
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex | None:
+    """Process-wide index at ``CRAWLER_NEAR_DUP_PATH``; ``None`` when disabled."""
+    global _index
+    settings = get_settings()
+    if not settings.CRAWLER_NEAR_DUP_ENABLED:
+        return None
+    if _index is None:
+        _index = NearDuplicateIndex(
+            Path(settings.CRAWLER_NEAR_DUP_PATH) if settings.CRAWLER_NEAR_DUP_PATH else DEFAULT_INDEX_PATH,
+            max_distance=settings.CRAWLER_NEAR_DUP_MAX_DISTANCE,
+        )
+    return _index
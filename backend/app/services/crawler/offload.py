@@ -0,0 +1,163 @@
+"""Run CPU-bound HTML extraction in a process pool instead of on the event loop.
+
+Parsing a large article page takes tens of milliseconds of pure CPU; doing it
+inside a coroutine stalls every other request and crawl in the process. The
+crawlers hand the raw response bytes to ``ExtractionPool`` which decodes,
+parses and builds the normalized result in a worker process.
+
+``CRAWLER_EXTRACT_WORKERS=0`` (or ``ExtractionPool(workers=0)``) keeps the old
+inline behaviour, which tests and one-off scripts can rely on.
+"""
+from __future__ import annotations
+
+import asyncio
+import codecs
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from app.config import get_settings
+
+if TYPE_CHECKING:
+    from app.schemas.crawler_item import NormalizedItem
+    from app.services.crawler.generic_article import GenericArticleResult
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def decode_html(body: bytes | str, encoding: str | None = None) -> str:
+    """Decode a response body the way ``httpx.Response.text`` does."""
+    if isinstance(body, str):
+        return body
+    try:
+        codecs.lookup(encoding or "utf-8")
+    except LookupError:
+        encoding = None
+    return body.decode(encoding or "utf-8", errors="replace")
+
+
+# Worker entry points: module-level so they pickle by reference. The crawler
+# modules import this one, so their builders are imported lazily here.
+
+def _google_blog_job(url: str, body: bytes | str, encoding: str | None) -> NormalizedItem:
+    from app.services.crawler.google_blog import _build_item_from_html
+
+    return _build_item_from_html(url, decode_html(body, encoding))
+
+
+def _generic_article_job(
+    final_url: str,
+    body: bytes | str,
+    encoding: str | None,
+    http_status: int | None,
+    content_type: str | None,
+) -> GenericArticleResult:
+    from app.services.crawler.generic_article import extract_generic_article
+
+    return extract_generic_article(
+        final_url,
+        decode_html(body, encoding),
+        http_status=http_status,
+        content_type=content_type,
+    )
+
+
+class ExtractionPool:
+    """Bounded process pool for page extraction.
+
+    At most ``max_pending`` pages are queued or running at once; further
+    callers wait on the event loop rather than piling HTML into the
+    executor's queue.
+    """
+
+    def __init__(self, *, workers: int = 2, max_pending: int | None = None) -> None:
+        self.workers = max(0, workers)
+        self.max_pending = max(1, max_pending or self.workers * 4 or 1)
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def from_settings(cls) -> "ExtractionPool":
+        return cls(workers=get_settings().CRAWLER_EXTRACT_WORKERS)
+
+    @property
+    def inline(self) -> bool:
+        return self.workers == 0
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and client
+            # threads is not safe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._loop = loop
+        return self._slots
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.inline:
+            return fn(*args)
+        async with self._slot():
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._ensure_executor(), fn, *args)
+            except BrokenProcessPool:
+                # A worker died (OOM, killed). Replace the pool for later
+                # calls and finish this page inline.
+                logger.warning("Extraction pool broken; restarting and running inline")
+                self.shutdown(wait=False)
+                return fn(*args)
+
+    async def google_blog_item(
+        self, url: str, body: bytes | str, *, encoding: str | None = None
+    ) -> NormalizedItem:
+        return await self.run(_google_blog_job, url, body, encoding)
+
+    async def generic_article(
+        self,
+        final_url: str,
+        body: bytes | str,
+        *,
+        encoding: str | None = None,
+        http_status: int | None = None,
+        content_type: str | None = None,
+    ) -> GenericArticleResult:
+        return await self.run(
+            _generic_article_job, final_url, body, encoding, http_status, content_type
+        )
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pool: ExtractionPool | None = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Process-wide pool sized by ``CRAWLER_EXTRACT_WORKERS``."""
+    global _pool
+    if _pool is None:
+        _pool = ExtractionPool.from_settings()
+    return _pool
+
+
+def shutdown_extraction_pool() -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,110 @@
+"""Compressed cold storage for ``crawled_contents`` raw payloads.
+
+``raw_payload`` (discovery data, JSON-LD, crawler metadata, archive refs) is
+written once per crawl and read back only by maintenance jobs such as
+``app.tasks.reextract``; keeping it inline made every ``SELECT`` and
+``session.get`` on the hot table drag it along. It now lives in
+``crawled_content_payloads``, one row per content id, as compact JSON
+compressed with zlib (payloads under ``MIN_COMPRESS_BYTES`` are stored
+uncompressed, where zlib only adds overhead).
+
+Nothing loads it implicitly: call ``load_raw_payload(s)`` when a payload is
+needed. Writers pass ``raw_payload`` in their row dicts as before;
+``bulk_upsert_crawled_contents`` hands it to ``store_raw_payloads``.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.source import CrawledContentPayload
+
+
+MIN_COMPRESS_BYTES = 256
+ZLIB_LEVEL = 6
+
+
+def encode_payload(payload: Mapping[str, Any]) -> tuple[str, bytes, int]:
+    """``(codec, data, raw_size)`` for ``payload``."""
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    if len(raw) < MIN_COMPRESS_BYTES:
+        return "json", raw, len(raw)
+    return "zlib", zlib.compress(raw, ZLIB_LEVEL), len(raw)
+
+
+def decode_payload(codec: str, data: bytes) -> dict[str, Any]:
+    if codec == "zlib":
+        data = zlib.decompress(data)
+    elif codec != "json":
+        raise ValueError(f"Unknown payload codec: {codec}")
+    return json.loads(data)
+
+
+def payload_rows(payloads: Mapping[str, Mapping[str, Any]], now: datetime) -> list[dict[str, Any]]:
+    rows = []
+    for content_id, payload in payloads.items():
+        codec, data, raw_size = encode_payload(payload)
+        rows.append(
+            {
+                "content_id": content_id,
+                "codec": codec,
+                "data": data,
+                "raw_size": raw_size,
+                "updated_at": now,
+            }
+        )
+    return rows
+
+
+async def store_raw_payloads(
+    session: AsyncSession,
+    payloads: Mapping[str, Mapping[str, Any] | None],
+    *,
+    batch_size: int = 500,
+) -> int:
+    """Write ``{content_id: raw_payload}``; an empty payload removes the stored one.
+
+    The caller owns the transaction. Returns the number of payloads written.
+    """
+    keep = {cid: p for cid, p in payloads.items() if p}
+    drop = [cid for cid, p in payloads.items() if not p]
+    if drop:
+        await session.execute(
+            delete(CrawledContentPayload).where(CrawledContentPayload.content_id.in_(drop))
+        )
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = payload_rows(keep, now)
+    table = CrawledContentPayload.__table__
+    for start in range(0, len(rows), max(1, batch_size)):
+        stmt = pg_insert(table).values(rows[start : start + batch_size])
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.content_id],
+                set_={c: stmt.excluded[c] for c in ("codec", "data", "raw_size", "updated_at")},
+            )
+        )
+    return len(rows)
+
+
+async def load_raw_payloads(session: AsyncSession, content_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """``{content_id: raw_payload}``; ids without a stored payload map to ``{}``."""
+    ids = list(dict.fromkeys(content_ids))
+    if not ids:
+        return {}
+    out: dict[str, dict[str, Any]] = {cid: {} for cid in ids}
+    stmt = select(
+        CrawledContentPayload.content_id, CrawledContentPayload.codec, CrawledContentPayload.data
+    ).where(CrawledContentPayload.content_id.in_(ids))
+    for content_id, codec, data in (await session.execute(stmt)).all():
+        out[content_id] = decode_payload(codec, data)
+    return out
+
+
+async def load_raw_payload(session: AsyncSession, content_id: str) -> dict[str, Any]:
+    return (await load_raw_payloads(session, [content_id]))[content_id]
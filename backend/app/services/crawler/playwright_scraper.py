@@ -1,17 +1,382 @@
-from typing import List
+"""Headless-browser rendering for JavaScript-heavy sources.
+
+One long-lived Chromium instance serves every render. ``BrowserPool`` keeps a
+bounded set of browser contexts (each with one page) that are handed out per
+render and recycled after ``max_page_uses`` renders or any failure, so a slow
+or broken page never leaks into the next URL. Images, fonts and media are
+blocked at the network layer and each render has a hard deadline. Every
+render takes a host slot from the crawl session's ``HostScheduler`` first,
+so browser fetches share the per-host rate limits and robots.txt rules of
+the HTTP crawlers.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, List
+from urllib.parse import urljoin
+
+from app.config import get_settings
+from app.schemas.source import CrawledContent, SourceType
+from app.services.crawler.archive import archive_body
 from app.services.crawler.base import BaseCrawler
-from app.schemas.source import CrawledContent
+from app.services.crawler.extract import extract_document
+from app.services.crawler.offload import get_extraction_pool
+from app.services.crawler.politeness import HostScheduler
+from app.services.crawler.session import get_crawl_session
+from app.services.crawler.url_filter import url_filter_for
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright, Route
+
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+class RenderTimeout(TimeoutError):
+    """The page did not finish rendering before the deadline."""
+
+
+@dataclass
+class RenderResult:
+    url: str
+    final_url: str
+    status: int | None
+    html: str
+    elapsed_ms: float
+
+
+@dataclass
+class _Slot:
+    context: BrowserContext
+    page: Page
+    uses: int = 0
+
+
+class BrowserPool:
+    """Long-lived browser with a bounded pool of recycled contexts/pages."""
+
+    def __init__(
+        self,
+        *,
+        size: int = 2,
+        headless: bool = True,
+        render_timeout_sec: float = 20.0,
+        max_page_uses: int = 50,
+        wait_until: str = "domcontentloaded",
+        blocked_resource_types: frozenset[str] = BLOCKED_RESOURCE_TYPES,
+        user_agent: str | None = None,
+        latency_window: int = 1000,
+        hosts: HostScheduler | None = None,
+    ) -> None:
+        self.size = max(1, size)
+        self.headless = headless
+        self.render_timeout_sec = render_timeout_sec
+        self.max_page_uses = max(1, max_page_uses)
+        self.wait_until = wait_until
+        self.blocked_resource_types = blocked_resource_types
+        self.user_agent = user_agent
+        self.hosts = hosts  # ``None``: the shared crawl session's scheduler
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        # ``None`` entries stand for slots whose recycle failed.
+        self._idle: asyncio.Queue[_Slot | None] | None = None
+        self._start_lock = asyncio.Lock()
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self.renders = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.recycled = 0
+        self.blocked_requests = 0
+
+    @classmethod
+    def from_settings(cls) -> "BrowserPool":
+        settings = get_settings()
+        return cls(
+            size=settings.PLAYWRIGHT_POOL_SIZE,
+            headless=settings.PLAYWRIGHT_HEADLESS,
+            render_timeout_sec=settings.PLAYWRIGHT_RENDER_TIMEOUT_SEC,
+            max_page_uses=settings.PLAYWRIGHT_MAX_PAGE_USES,
+        )
+
+    @property
+    def started(self) -> bool:
+        return self._browser is not None
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._browser is not None:
+                return
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                self._idle = asyncio.Queue()
+                for _ in range(self.size):
+                    self._idle.put_nowait(await self._new_slot())
+            except BaseException:
+                await self.close()
+                raise
+
+    async def _block_heavy_resources(self, route: Route) -> None:
+        if route.request.resource_type in self.blocked_resource_types:
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _new_slot(self) -> _Slot:
+        assert self._browser is not None
+        context = await self._browser.new_context(
+            user_agent=self.user_agent,
+            java_script_enabled=True,
+            service_workers="block",
+        )
+        await context.route("**/*", self._block_heavy_resources)
+        page = await context.new_page()
+        return _Slot(context=context, page=page)
+
+    async def _recycle(self, slot: _Slot) -> _Slot:
+        self.recycled += 1
+        try:
+            await slot.context.close()
+        except Exception:  # noqa: BLE001 - the context may already be gone
+            pass
+        return await self._new_slot()
+
+    async def render(self, url: str) -> RenderResult:
+        """Render ``url`` in a pooled page; raise ``RenderTimeout`` past the deadline.
+
+        Raises ``RobotsDisallowed`` (before a page is taken) when robots.txt
+        forbids the URL.
+        """
+        hosts = self.hosts or get_crawl_session().scheduler
+        async with hosts.slot(url):
+            return await self._render(url)
+
+    async def _render(self, url: str) -> RenderResult:
+        await self.start()
+        idle = self._idle
+        assert idle is not None
+        slot = await idle.get()
+        if slot is None:
+            # A slot whose recycle failed; launch its replacement now.
+            try:
+                slot = await self._new_slot()
+            except Exception:
+                idle.put_nowait(None)
+                raise
+        started = time.perf_counter()
+        healthy = False
+        try:
+            try:
+                async with asyncio.timeout(self.render_timeout_sec):
+                    res = await slot.page.goto(url, wait_until=self.wait_until)
+                    html = await slot.page.content()
+            except TimeoutError as e:
+                self.timeouts += 1
+                raise RenderTimeout(f"render exceeded {self.render_timeout_sec}s: {url}") from e
+            except Exception:
+                self.errors += 1
+                raise
+            healthy = True
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._latencies.append(elapsed_ms)
+            self.renders += 1
+            return RenderResult(
+                url=url,
+                final_url=slot.page.url,
+                status=res.status if res is not None else None,
+                html=html,
+                elapsed_ms=elapsed_ms,
+            )
+        finally:
+            slot.uses += 1
+            if not healthy or slot.uses >= self.max_page_uses:
+                try:
+                    slot = await self._recycle(slot)
+                except Exception:  # noqa: BLE001
+                    logger.exception("Failed to recycle browser context")
+                    slot = None  # relaunched by the next render
+            if self._idle is idle:
+                idle.put_nowait(slot)
+            elif slot is not None:
+                # The pool was closed while this render was in flight.
+                try:
+                    await slot.context.close()
+                except Exception:  # noqa: BLE001
+                    pass
+
+    def stats(self) -> dict[str, Any]:
+        ordered = sorted(self._latencies)
+
+        def pct(p: float) -> float | None:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+
+        return {
+            "pool_size": self.size,
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "renders": self.renders,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "recycled": self.recycled,
+            "blocked_requests": self.blocked_requests,
+            "render_ms": {"p50": pct(0.50), "p90": pct(0.90), "p99": pct(0.99), "max": pct(1.0)},
+        }
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, None
+        while idle is not None and not idle.empty():
+            slot = idle.get_nowait()
+            if slot is None:
+                continue
+            try:
+                await slot.context.close()
+            except Exception:  # noqa: BLE001
+                pass
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            await browser.close()
+        playwright, self._playwright = self._playwright, None
+        if playwright is not None:
+            await playwright.stop()
+
+
+_pool: BrowserPool | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide pool sized by ``PLAYWRIGHT_POOL_SIZE`` (started lazily)."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool.from_settings()
+    return _pool
+
+
+def browser_pool_stats() -> dict[str, Any] | None:
+    """Render stats of the shared pool, or ``None`` if it was never created."""
+    return _pool.stats() if _pool is not None else None
+
+
+async def close_browser_pool() -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
 
 
 class PlaywrightCrawler(BaseCrawler):
-    """Playwright-based web scraper for dynamic content."""
+    """Playwright-based web scraper for dynamic content.
+
+    ``config["mode"]``: ``"article"`` (default) renders one page and extracts
+    it; ``"index"`` renders a listing page, like an ``html_index`` source,
+    and crawls each article it links to (filtered by the catalog allow/deny
+    rules, at most ``limit``) as in article mode. ``index_links`` returns
+    only the links, for callers that skip articles they already have.
+    """
+
+    def __init__(self, pool: BrowserPool | None = None) -> None:
+        self.pool = pool
+
+    def _pool(self) -> BrowserPool:
+        return self.pool or get_browser_pool()
 
     async def crawl(self, url: str, config: dict | None = None) -> List[CrawledContent]:
         """Crawl dynamic website using Playwright."""
-        # TODO: Implement Playwright scraping
-        return []
+        config = config or {}
+        if config.get("mode") == "index":
+            return await self.crawl_links(await self.index_links(url, config), config)
+        return [await self._article(url, config)]
+
+    async def crawl_links(self, links: list[str], config: dict | None = None) -> List[CrawledContent]:
+        """Render and extract each of ``links``; a failed article is logged and skipped."""
+        config = config or {}
+        results = await asyncio.gather(
+            *(self._article(link, config) for link in links), return_exceptions=True
+        )
+        out: list[CrawledContent] = []
+        for link, result in zip(links, results):
+            if isinstance(result, Exception):
+                logger.warning("Playwright article %s failed: %s", link, result)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            out.append(result)
+        return out
+
+    async def _article(self, url: str, config: dict) -> CrawledContent:
+        rendered = await self._pool().render(url)
+        fetched_at = datetime.now(timezone.utc)
+        article = await get_extraction_pool().generic_article(
+            rendered.final_url, rendered.html, http_status=rendered.status
+        )
+        archive_ref = await archive_body(
+            rendered.html.encode("utf-8"),
+            url=url,
+            final_url=rendered.final_url,
+            extractor="generic_article",
+            encoding="utf-8",
+            content_type="text/html; charset=utf-8",
+            http_status=rendered.status,
+        )
+        if archive_ref:
+            article.raw_payload["archive"] = archive_ref
+        return CrawledContent(
+            source_id=str(config.get("source_id") or ""),
+            title=article.title or rendered.final_url,
+            content=article.content,
+            summary_hint=article.summary_hint,
+            image_urls=article.image_urls,
+            source_url=article.final_url,
+            canonical_url=article.canonical_url,
+            published_at=article.published_at or fetched_at,
+            fetched_at=fetched_at,
+            author=article.author,
+            outbound_urls=article.outbound_urls,
+            language=article.language,
+            source_type=SourceType.PLAYWRIGHT,
+            source_name=config.get("source_name"),
+            raw_payload={
+                **article.raw_payload,
+                "extractor": "playwright_generic_article_v1",
+                "render_ms": round(rendered.elapsed_ms, 1),
+            },
+        )
+
+    async def index_links(self, url: str, config: dict | None = None) -> list[str]:
+        """Render the listing page ``url`` and return its article links in page order."""
+        config = config or {}
+        rendered = await self._pool().render(url)
+        url_filter = url_filter_for(config)
+        limit = config.get("limit")
+        links: list[str] = []
+        seen: set[str] = set()
+        for link in extract_document(rendered.html).links:
+            href = urljoin(rendered.final_url, link.href).split("#", 1)[0]
+            if not href.startswith(("http://", "https://")) or href in seen:
+                continue
+            if not url_filter(href):
+                continue
+            seen.add(href)
+            links.append(href)
+            if limit and len(links) >= limit:
+                break
+        return links
 
     async def validate_source(self, url: str) -> bool:
         """Validate if the URL is accessible."""
-        # TODO: Implement validation
-        return True
+        try:
+            rendered = await self._pool().render(url)
+        except Exception:  # noqa: BLE001
+            return False
+        return rendered.status is None or rendered.status < 400
+
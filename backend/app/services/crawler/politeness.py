@@ -0,0 +1,321 @@
+"""Per-host politeness for crawlers: token-bucket rates, concurrency caps, robots.txt.
+
+``HostScheduler`` is the crawl-frontier gate every article fetch goes through::
+
+    async with scheduler.slot(url):
+        res = await client.get(url)
+
+A request first waits for its host (per-host concurrency, then the host's
+token bucket, whose rate is lowered to honour robots.txt ``Crawl-delay``),
+and only then takes a slot from the global budget. Waiting on a slow host
+never holds a global slot, so requests to other hosts keep the budget busy.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+
+ROBOTS_AGENT = "TrendAIStudioBot"
+
+# (status_code, body) for ``<origin>/robots.txt``; raise on network errors.
+RobotsFetcher = Callable[[str], Awaitable[tuple[int, str]]]
+
+
+class RobotsDisallowed(RuntimeError):
+    """robots.txt forbids fetching this URL."""
+
+
+def host_key(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme.lower()}://{(parsed.netloc or '').lower()}"
+
+
+class TokenBucket:
+    """Reservation-style token bucket: callers get the time to wait, FIFO."""
+
+    def __init__(self, rate_per_sec: float, burst: float = 1.0) -> None:
+        self.rate = rate_per_sec
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def set_rate(self, rate_per_sec: float, burst: float | None = None) -> None:
+        self._refill()
+        self.rate = rate_per_sec
+        if burst is not None:
+            self.burst = max(1.0, burst)
+            self.tokens = min(self.tokens, self.burst)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.rate > 0:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long to sleep before using it."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        self.tokens -= 1.0
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+def parse_crawl_delay(lines: list[str], agent: str = ROBOTS_AGENT) -> float | None:
+    """``Crawl-delay`` for ``agent`` (falling back to ``*``).
+
+    ``RobotFileParser`` only accepts integer delays; fractional values such
+    as ``0.5`` are common, so the directive is parsed here.
+    """
+    delays: dict[str, float] = {}
+    agents: list[str] = []
+    in_rules = False
+    for raw in lines:
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        key, _, value = line.partition(":")
+        key = key.strip().lower()
+        value = value.strip()
+        if key == "user-agent":
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+            continue
+        in_rules = True
+        if key == "crawl-delay":
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for a in agents:
+                delays.setdefault(a, delay)
+
+    wanted = agent.split("/")[0].lower()
+    for a, delay in delays.items():
+        if a != "*" and a in wanted:
+            return delay
+    return delays.get("*")
+
+
+@dataclass
+class RobotsEntry:
+    parser: RobotFileParser | None  # None = everything allowed
+    expires_at: float
+    delay: float | None = None
+
+    def can_fetch(self, url: str) -> bool:
+        return self.parser is None or self.parser.can_fetch(ROBOTS_AGENT, url)
+
+    def crawl_delay(self) -> float | None:
+        if self.parser is None or self.delay is not None:
+            return self.delay
+        rate = self.parser.request_rate(ROBOTS_AGENT)
+        if rate is not None and rate.requests:
+            return rate.seconds / rate.requests
+        return None
+
+
+class RobotsCache:
+    """robots.txt per origin with a TTL; concurrent lookups share one fetch."""
+
+    def __init__(self, fetch: RobotsFetcher, *, ttl_sec: float = 3600.0, error_ttl_sec: float = 300.0) -> None:
+        self.fetch = fetch
+        self.ttl_sec = ttl_sec
+        self.error_ttl_sec = error_ttl_sec
+        self._entries: dict[str, RobotsEntry] = {}
+        self._inflight: dict[str, asyncio.Future[RobotsEntry]] = {}
+        self.fetches = 0
+        self.hits = 0
+
+    async def get(self, url: str) -> RobotsEntry:
+        origin = host_key(url)
+        entry = self._entries.get(origin)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self.hits += 1
+            return entry
+        pending = self._inflight.get(origin)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        fut: asyncio.Future[RobotsEntry] = asyncio.get_running_loop().create_future()
+        self._inflight[origin] = fut
+        try:
+            entry = await self._load(origin)
+            self._entries[origin] = entry
+            fut.set_result(entry)
+            return entry
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight.pop(origin, None)
+
+    async def _load(self, origin: str) -> RobotsEntry:
+        self.fetches += 1
+        now = time.monotonic()
+        try:
+            status, body = await self.fetch(f"{origin}/robots.txt")
+        except Exception:  # noqa: BLE001 - unreachable robots.txt: allow, retry soon
+            return RobotsEntry(parser=None, expires_at=now + self.error_ttl_sec)
+        if status >= 500:
+            return RobotsEntry(parser=None, expires_at=now + self.error_ttl_sec)
+        if status >= 400:
+            # No robots.txt (404/410/403...): everything is allowed.
+            return RobotsEntry(parser=None, expires_at=now + self.ttl_sec)
+        lines = body.splitlines()
+        parser = RobotFileParser()
+        parser.parse(lines)
+        return RobotsEntry(parser=parser, expires_at=now + self.ttl_sec, delay=parse_crawl_delay(lines))
+
+
+@dataclass
+class _HostState:
+    slots: asyncio.Semaphore
+    bucket: TokenBucket
+    crawl_delay: float | None = None
+    queued: int = 0
+    in_flight: int = 0
+    acquired: int = 0
+    disallowed: int = 0
+    wait_sec: float = 0.0
+    max_wait_sec: float = 0.0
+
+
+@dataclass
+class HostLease:
+    host: str
+    waited_sec: float
+    _released: bool = field(default=False, repr=False)
+
+
+class HostScheduler:
+    """Async acquire/release gate enforcing per-host and global limits."""
+
+    def __init__(
+        self,
+        *,
+        global_limit: int = 50,
+        per_host_limit: int = 6,
+        host_rate_per_sec: float = 2.0,
+        host_burst: float = 2.0,
+        robots: RobotsCache | None = None,
+        max_crawl_delay_sec: float = 30.0,
+    ) -> None:
+        self.global_limit = max(1, global_limit)
+        self.per_host_limit = max(1, per_host_limit)
+        self.host_rate_per_sec = host_rate_per_sec
+        self.host_burst = host_burst
+        self.robots = robots
+        self.max_crawl_delay_sec = max_crawl_delay_sec
+        self._global = asyncio.Semaphore(self.global_limit)
+        self._hosts: dict[str, _HostState] = {}
+        self._global_wait_sec = 0.0
+        self._in_flight = 0
+
+    def _host(self, key: str) -> _HostState:
+        state = self._hosts.get(key)
+        if state is None:
+            state = _HostState(
+                slots=asyncio.Semaphore(self.per_host_limit),
+                bucket=TokenBucket(self.host_rate_per_sec, self.host_burst),
+            )
+            self._hosts[key] = state
+        return state
+
+    async def _apply_robots(self, url: str, state: _HostState) -> None:
+        if self.robots is None:
+            return
+        entry = await self.robots.get(url)
+        if not entry.can_fetch(url):
+            state.disallowed += 1
+            raise RobotsDisallowed(f"robots.txt disallows {url}")
+        delay = entry.crawl_delay()
+        if delay != state.crawl_delay:
+            state.crawl_delay = delay
+            if delay and delay > 0:
+                delay = min(delay, self.max_crawl_delay_sec)
+                rate = 1.0 / delay
+                if self.host_rate_per_sec > 0:
+                    rate = min(rate, self.host_rate_per_sec)
+                state.bucket.set_rate(rate, burst=1.0)
+            else:
+                state.bucket.set_rate(self.host_rate_per_sec, burst=self.host_burst)
+
+    async def acquire(self, url: str) -> HostLease:
+        key = host_key(url)
+        state = self._host(key)
+        started = time.monotonic()
+        state.queued += 1
+        try:
+            await state.slots.acquire()
+        finally:
+            state.queued -= 1
+        try:
+            await self._apply_robots(url, state)
+            delay = state.bucket.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            global_started = time.monotonic()
+            await self._global.acquire()
+        except BaseException:
+            state.slots.release()
+            raise
+        now = time.monotonic()
+        self._global_wait_sec += now - global_started
+        waited = now - started
+        state.wait_sec += waited
+        state.max_wait_sec = max(state.max_wait_sec, waited)
+        state.acquired += 1
+        state.in_flight += 1
+        self._in_flight += 1
+        return HostLease(host=key, waited_sec=waited)
+
+    def release(self, lease: HostLease) -> None:
+        if lease._released:
+            return
+        lease._released = True
+        state = self._hosts[lease.host]
+        state.in_flight -= 1
+        self._in_flight -= 1
+        self._global.release()
+        state.slots.release()
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[HostLease]:
+        lease = await self.acquire(url)
+        try:
+            yield lease
+        finally:
+            self.release(lease)
+
+    def stats(self) -> dict:
+        hosts = {
+            key: {
+                "queued": s.queued,
+                "in_flight": s.in_flight,
+                "acquired": s.acquired,
+                "disallowed": s.disallowed,
+                "crawl_delay_sec": s.crawl_delay,
+                "wait_sec": round(s.wait_sec, 3),
+                "max_wait_sec": round(s.max_wait_sec, 3),
+            }
+            for key, s in sorted(self._hosts.items())
+        }
+        out = {
+            "global_limit": self.global_limit,
+            "in_flight": self._in_flight,
+            "queued": sum(s.queued for s in self._hosts.values()),
+            "global_wait_sec": round(self._global_wait_sec, 3),
+            "hosts": hosts,
+        }
+        if self.robots is not None:
+            out["robots"] = {"fetches": self.robots.fetches, "cache_hits": self.robots.hits}
+        return out
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+
+from app.config import get_settings
+from app.services.crawler.politeness import HostScheduler, RobotsCache
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "TrendAIStudioBot/0.1 (contact: trendaistudio24@gmail.com)",
+    "Accept-Language": "en,ko;q=0.8",
+}
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar("T")
+
+
+@dataclass
+class RetryPolicy:
+    retries: int = 2
+    backoff_sec: float = 0.5
+
+    def delay(self, attempt: int) -> float:
+        return self.backoff_sec * (2**attempt)
+
+
+class CrawlSession:
+    """Pooled HTTP client shared by every article crawler.
+
+    Keeps TCP/TLS connections alive across articles, gates every request
+    through a per-host politeness scheduler (rate, concurrency, robots.txt)
+    and applies one timeout/retry policy.
+    """
+
+    def __init__(
+        self,
+        *,
+        trust_env: bool = False,
+        http2: bool = False,
+        max_connections: int = 50,
+        max_per_host: int = 6,
+        timeout_sec: float = 25.0,
+        retry: RetryPolicy | None = None,
+        host_rate_per_sec: float = 0.0,
+        host_burst: float = 1.0,
+        respect_robots: bool = False,
+        robots_ttl_sec: float = 3600.0,
+    ) -> None:
+        self.trust_env = trust_env
+        self.max_per_host = max(1, max_per_host)
+        self.retry = retry or RetryPolicy()
+        self.client = httpx.AsyncClient(
+            timeout=timeout_sec,
+            follow_redirects=True,
+            trust_env=trust_env,
+            http2=http2,
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=30.0,
+            ),
+        )
+        self.scheduler = HostScheduler(
+            global_limit=max_connections,
+            per_host_limit=self.max_per_host,
+            host_rate_per_sec=host_rate_per_sec,
+            host_burst=host_burst,
+            robots=RobotsCache(self._fetch_robots, ttl_sec=robots_ttl_sec) if respect_robots else None,
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def from_settings(cls, *, trust_env: bool = False) -> "CrawlSession":
+        settings = get_settings()
+        return cls(
+            trust_env=trust_env,
+            http2=settings.CRAWLER_HTTP2,
+            max_connections=settings.CRAWLER_MAX_CONNECTIONS,
+            max_per_host=settings.CRAWLER_MAX_PER_HOST,
+            timeout_sec=settings.CRAWLER_TIMEOUT_SEC,
+            retry=RetryPolicy(retries=settings.CRAWLER_RETRIES),
+            host_rate_per_sec=settings.CRAWLER_HOST_RATE_PER_SEC,
+            host_burst=settings.CRAWLER_HOST_BURST,
+            respect_robots=settings.CRAWLER_RESPECT_ROBOTS,
+            robots_ttl_sec=settings.CRAWLER_ROBOTS_TTL_SEC,
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        return self.client.is_closed
+
+    async def _fetch_robots(self, robots_url: str) -> tuple[int, str]:
+        res = await self.client.get(robots_url, timeout=10.0)
+        return res.status_code, res.text
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET with per-host politeness and retries on transient failures.
+
+        Raises ``RobotsDisallowed`` when robots.txt forbids the URL.
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+
+        last_err: Exception | None = None
+        for attempt in range(self.retry.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry.delay(attempt - 1))
+            try:
+                async with self.scheduler.slot(url):
+                    res = await self.client.get(url, **kwargs)
+                if res.status_code in RETRYABLE_STATUS and attempt < self.retry.retries:
+                    last_err = httpx.HTTPStatusError(
+                        f"retryable status {res.status_code}",
+                        request=res.request,
+                        response=res,
+                    )
+                    continue
+                if res.status_code == 304:
+                    # Conditional GET (If-None-Match / If-Modified-Since) hit.
+                    return res
+                res.raise_for_status()
+                return res
+            except httpx.TransportError as e:
+                last_err = e
+        if last_err:
+            raise last_err
+        raise RuntimeError("Unexpected retry state")
+
+    def stats(self) -> dict:
+        return self.scheduler.stats()
+
+    async def aclose(self) -> None:
+        if not self.client.is_closed:
+            await self.client.aclose()
+
+
+_sessions: dict[bool, CrawlSession] = {}
+_detached: set[asyncio.Task] = set()
+
+
+def close_detached(
+    aclose: Callable[[], Awaitable[object]],
+    bound_loop: asyncio.AbstractEventLoop | None,
+) -> None:
+    """Close a pooled async client that belongs to another event loop.
+
+    The close runs on ``bound_loop`` while that loop is still usable. Once it
+    is closed, closing from the current loop still empties the connection
+    pool before the transports fail with "Event loop is closed" (ignored), so
+    the sockets are released instead of leaking with the replaced client.
+    """
+
+    async def quietly() -> None:
+        try:
+            await aclose()
+        except RuntimeError:
+            pass
+
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    if bound_loop is not None and not bound_loop.is_closed():
+        if bound_loop.is_running():
+            asyncio.run_coroutine_threadsafe(quietly(), bound_loop)
+            return
+        if running is None:
+            bound_loop.run_until_complete(quietly())
+            return
+    if running is None:
+        asyncio.run(quietly())
+        return
+    task = running.create_task(quietly())
+    _detached.add(task)
+    task.add_done_callback(_detached.discard)
+
+
+def get_crawl_session(*, trust_env: bool = False) -> CrawlSession:
+    """Return the process-wide session for the given proxy mode.
+
+    A session is bound to the event loop that first used it; a new loop
+    (e.g. a second ``asyncio.run``) gets a fresh session and the old one is
+    closed.
+    """
+    session = _sessions.get(trust_env)
+    if session is not None and not session.is_closed:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if session._loop is None or session._loop is loop:
+            return session
+        close_detached(session.aclose, session._loop)
+
+    session = CrawlSession.from_settings(trust_env=trust_env)
+    _sessions[trust_env] = session
+    return session
+
+
+def crawl_session_stats() -> dict[str, dict]:
+    """Politeness stats (queue depth / wait per host) of the shared sessions."""
+    return {
+        ("trust_env" if trust_env else "direct"): session.stats()
+        for trust_env, session in _sessions.items()
+        if not session.is_closed
+    }
+
+
+async def close_crawl_sessions() -> None:
+    """Close all shared sessions (FastAPI shutdown / end of CLI runs)."""
+    sessions = list(_sessions.values())
+    _sessions.clear()
+    for session in sessions:
+        await session.aclose()
+
+
+async def closing_crawl_sessions(main: Awaitable[T]) -> T:
+    """Run a CLI entry coroutine and close shared sessions afterwards."""
+    try:
+        return await main
+    finally:
+        await close_crawl_sessions()
@@ -0,0 +1,153 @@
+"""Shared timestamp parsing for feed entries and article metadata.
+
+Feeds and article pages almost always carry one of a few formats:
+
+* ISO 8601 / RFC 3339 (Atom, JSON-LD, ``article:published_time``):
+  ``2026-02-05T18:00:00Z``, ``2026-02-05T18:00:00+09:00``;
+* RFC 822 (RSS ``pubDate``): ``Wed, 25 Feb 2026 00:00:00 -0500``, ``... GMT``;
+* the visible ``Feb 25, 2026`` byline date.
+
+These are parsed by ``datetime.fromisoformat`` or a precompiled regex.
+Anything else falls back to ``dateutil.parser.parse``, which handles every
+format but is one to two orders of magnitude slower. Results are memoized
+per raw string; the same timestamps recur across a feed, across
+re-discovery runs and in sort keys.
+
+``parse_timestamp`` keeps dateutil's contract: an aware datetime when the
+string carries a zone, a naive one otherwise, ``None`` when unparseable.
+"""
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from dateutil import parser as dt_parser
+
+
+CACHE_SIZE = 8192
+
+MONTHS = {
+    m: i
+    for i, m in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1,
+    )
+}
+
+# RFC 822 / 2822 zone names (military zones other than Z are not used in feeds)
+ZONES = {
+    "gmt": 0, "ut": 0, "utc": 0, "z": 0,
+    "est": -5, "edt": -4, "cst": -6, "cdt": -5,
+    "mst": -7, "mdt": -6, "pst": -8, "pdt": -7,
+}
+
+RFC822_RE = re.compile(
+    r"(?:[A-Za-z]{3,9},?\s+)?"
+    r"(\d{1,2})\s+([A-Za-z]{3})[a-z]*\.?\s+(\d{2}|\d{4})\s+"
+    r"(\d{1,2}):(\d{2})(?::(\d{2}))?"
+    r"(?:\s*([+-]\d{4}|[A-Za-z]{1,3}))?"
+)
+MONTH_DAY_YEAR_RE = re.compile(r"([A-Za-z]{3})[a-z]*\.?\s+(\d{1,2}),?\s+(\d{4})")
+
+
+def _zone(token: str | None) -> timezone | None:
+    if not token:
+        return None
+    if token[0] in "+-":
+        minutes = int(token[1:3]) * 60 + int(token[3:5])
+        return timezone(timedelta(minutes=-minutes if token[0] == "-" else minutes))
+    hours = ZONES.get(token.lower())
+    if hours is None:
+        raise ValueError(f"unknown zone {token!r}")
+    return timezone.utc if hours == 0 else timezone(timedelta(hours=hours))
+
+
+def _parse_rfc822(raw: str) -> datetime | None:
+    m = RFC822_RE.fullmatch(raw)
+    if m is None:
+        return None
+    day, mon, year, hour, minute, second, zone = m.groups()
+    month = MONTHS.get(mon.lower())
+    if month is None:
+        return None
+    y = int(year)
+    if len(year) == 2:
+        y += 2000 if y < 50 else 1900
+    try:
+        return datetime(
+            y, month, int(day), int(hour), int(minute), int(second or 0), tzinfo=_zone(zone)
+        )
+    except ValueError:
+        return None
+
+
+def _parse_month_day_year(raw: str) -> datetime | None:
+    m = MONTH_DAY_YEAR_RE.fullmatch(raw)
+    if m is None:
+        return None
+    month = MONTHS.get(m.group(1).lower())
+    if month is None:
+        return None
+    try:
+        return datetime(int(m.group(3)), month, int(m.group(2)))
+    except ValueError:
+        return None
+
+
+def _fast_parse(raw: str) -> datetime | None:
+    if len(raw) >= 10 and raw[0].isdigit() and raw[4] == "-":
+        try:
+            return datetime.fromisoformat(raw)
+        except ValueError:
+            return None
+    if raw[0].isalpha() or raw[0].isdigit():
+        return _parse_rfc822(raw) or _parse_month_day_year(raw)
+    return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(raw: str) -> datetime | None:
+    dt = _fast_parse(raw)
+    if dt is not None:
+        return dt
+    try:
+        return dt_parser.parse(raw)
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+
+def parse_timestamp(raw: str | None) -> datetime | None:
+    """Parse a feed/article timestamp (aware if it names a zone, else naive)."""
+    if not raw or not isinstance(raw, str):
+        return None
+    raw = raw.strip()
+    if not raw:
+        return None
+    return _parse(raw)
+
+
+def parse_timestamp_utc_naive(raw: str | None) -> datetime | None:
+    """``parse_timestamp`` converted to naive UTC (naive input is kept as is)."""
+    dt = parse_timestamp(raw)
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def parse_timestamp_utc(raw: str | None) -> datetime | None:
+    """``parse_timestamp`` as an aware datetime; naive input is taken as UTC."""
+    dt = parse_timestamp(raw)
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def timestamp_cache_info():
+    return _parse.cache_info()
+
+
+def clear_timestamp_cache() -> None:
+    _parse.cache_clear()
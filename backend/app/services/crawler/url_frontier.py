@@ -0,0 +1,327 @@
+"""Persistent cross-run URL frontier.
+
+URLs are canonicalized (tracking parameters dropped, query sorted, host and
+trailing slash normalized) and reduced to a 64-bit fingerprint. "Seen
+before?" is answered by an in-memory Bloom filter; only when the filter says
+"maybe" is the answer confirmed against the on-disk set, a sorted array of
+fingerprints that is memory-mapped and binary-searched instead of loaded.
+
+Layout under ``root``::
+
+    seen.u64     sorted little-endian uint64 fingerprints
+    bloom.bin    header + Bloom filter bits (rebuilt from seen.u64 if missing)
+"""
+from __future__ import annotations
+
+import bisect
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# URLs ingested by the seed tasks (``--skip-seen``); recorded after a successful upsert.
+DEFAULT_FRONTIER_DIR = Path(__file__).resolve().parents[3] / "crawl_targets" / "frontier"
+# URLs listed by ``discover_source_urls`` runs; never read as "ingested".
+DISCOVERY_FRONTIER_DIR = DEFAULT_FRONTIER_DIR.parent / "frontier_discovery"
+
+TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "gbraid",
+        "wbraid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_hsenc",
+        "_hsmi",
+        "mkt_tok",
+        "ref_src",
+        "ref_url",
+        "spm",
+    }
+)
+TRACKING_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """Stable form of ``url`` used as the frontier key.
+
+    Lower-cases scheme and host (IDNA-encoded, trailing dot and default port
+    removed), drops the fragment and tracking parameters, sorts the query and
+    strips the trailing slash from non-root paths.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    try:
+        host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        pass
+    host = host.lower()
+    if ":" in host:  # IPv6 literal
+        host = f"[{host}]"
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    if parts.username:
+        auth = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{auth}@{netloc}"
+
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+
+    query = ""
+    if parts.query:
+        pairs = [
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+        ]
+        query = urlencode(sorted(pairs), doseq=True)
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def url_fingerprint(canonical_url: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(canonical_url.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+class BloomFilter:
+    """Bloom filter over 64-bit fingerprints (double hashing, no rehash)."""
+
+    HEADER = struct.Struct("<4sQdQQI")  # magic, capacity, error_rate, count, bits, hashes
+    MAGIC = b"BLM1"
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _indexes(self, fp: int) -> Iterable[int]:
+        h1 = fp & 0xFFFFFFFF
+        h2 = (fp >> 32) | 1
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+    def add(self, fp: int) -> None:
+        bits = self.bits
+        for idx in self._indexes(fp):
+            bits[idx >> 3] |= 1 << (idx & 7)
+        self.count += 1
+
+    def __contains__(self, fp: int) -> bool:
+        bits = self.bits
+        return all(bits[idx >> 3] & (1 << (idx & 7)) for idx in self._indexes(fp))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+    def dump(self, path: Path) -> None:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(
+                self.HEADER.pack(
+                    self.MAGIC, self.capacity, self.error_rate, self.count, self.num_bits, self.num_hashes
+                )
+            )
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter | None":
+        try:
+            data = path.read_bytes()
+            magic, capacity, error_rate, count, num_bits, num_hashes = cls.HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return None
+        bloom = cls(capacity, error_rate)
+        if magic != cls.MAGIC or (bloom.num_bits, bloom.num_hashes) != (num_bits, num_hashes):
+            return None
+        body = data[cls.HEADER.size :]
+        if len(body) != len(bloom.bits):
+            return None
+        bloom.bits = bytearray(body)
+        bloom.count = count
+        return bloom
+
+
+class UrlFrontier:
+    """Cross-run seen-set of canonical URLs.
+
+    ``filter_new`` returns the canonical URLs that were never recorded and,
+    with ``mark=True``, records them. ``save`` merges newly recorded
+    fingerprints into ``seen.u64`` and persists the Bloom filter.
+    """
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_FRONTIER_DIR,
+        *,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.01,
+    ) -> None:
+        self.root = Path(root)
+        self.error_rate = error_rate
+        self.seen_path = self.root / "seen.u64"
+        self.bloom_path = self.root / "bloom.bin"
+        self._file = None
+        self._mmap: mmap.mmap | None = None
+        self._disk: memoryview | array = array("Q")
+        self._pending: set[int] = set()
+        self._open_disk()
+
+        bloom = BloomFilter.load(self.bloom_path)
+        if (
+            bloom is None
+            or bloom.count != len(self._disk)
+            or bloom.error_rate != error_rate
+            or bloom.capacity < capacity
+        ):
+            bloom = self._build_bloom(max(capacity, 2 * len(self._disk)))
+        self.bloom = bloom
+
+        self.lookups = 0
+        self.hits = 0
+        self.bloom_negatives = 0
+        self.false_positives = 0
+
+    def _open_disk(self) -> None:
+        if not self.seen_path.exists() or self.seen_path.stat().st_size == 0:
+            return
+        if sys.byteorder != "little":
+            disk = array("Q", self.seen_path.read_bytes())
+            disk.byteswap()
+            self._disk = disk
+            return
+        self._file = open(self.seen_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._disk = memoryview(self._mmap).cast("Q")
+
+    def _close_disk(self) -> None:
+        if isinstance(self._disk, memoryview):
+            self._disk.release()
+        self._disk = array("Q")
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _build_bloom(self, capacity: int) -> BloomFilter:
+        bloom = BloomFilter(capacity, self.error_rate)
+        for fp in self._disk:
+            bloom.add(fp)
+        for fp in self._pending:
+            bloom.add(fp)
+        return bloom
+
+    def __len__(self) -> int:
+        return len(self._disk) + len(self._pending)
+
+    def _on_disk(self, fp: int) -> bool:
+        disk = self._disk
+        i = bisect.bisect_left(disk, fp)
+        return i < len(disk) and disk[i] == fp
+
+    def _seen_fp(self, fp: int) -> bool:
+        self.lookups += 1
+        if fp not in self.bloom:
+            self.bloom_negatives += 1
+            return False
+        if fp in self._pending or self._on_disk(fp):
+            self.hits += 1
+            return True
+        self.false_positives += 1
+        return False
+
+    def _record(self, fp: int) -> None:
+        self._pending.add(fp)
+        self.bloom.add(fp)
+        if self.bloom.count > self.bloom.capacity:
+            self.bloom = self._build_bloom(2 * self.bloom.capacity)
+
+    def seen(self, url: str) -> bool:
+        return self._seen_fp(url_fingerprint(canonicalize_url(url)))
+
+    def add(self, url: str) -> bool:
+        """Record ``url``; return ``True`` if it was new."""
+        fp = url_fingerprint(canonicalize_url(url))
+        if self._seen_fp(fp):
+            return False
+        self._record(fp)
+        return True
+
+    def filter_new(self, urls: Iterable[str], *, mark: bool = True) -> list[str]:
+        """Canonical URLs from ``urls`` not seen in any earlier run, in order."""
+        out: list[str] = []
+        batch: set[int] = set()
+        for url in urls:
+            canonical = canonicalize_url(url)
+            fp = url_fingerprint(canonical)
+            if fp in batch or self._seen_fp(fp):
+                continue
+            batch.add(fp)
+            out.append(canonical)
+            if mark:
+                self._record(fp)
+        return out
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        if self._pending:
+            tmp = self.seen_path.with_suffix(".u64.tmp")
+            merged = array("Q", heapq.merge(self._disk, sorted(self._pending)))
+            if sys.byteorder != "little":
+                merged.byteswap()
+            with open(tmp, "wb") as f:
+                merged.tofile(f)
+            self._close_disk()
+            os.replace(tmp, self.seen_path)
+            self._pending.clear()
+            self._open_disk()
+        self.bloom.dump(self.bloom_path)
+
+    def close(self) -> None:
+        self._close_disk()
+
+    def stats(self) -> dict:
+        total = len(self)
+        bloom_bytes = self.bloom.nbytes
+        return {
+            "urls": total,
+            "pending": len(self._pending),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else None,
+            "bloom_negatives": self.bloom_negatives,
+            "bloom_false_positives": self.false_positives,
+            "bloom_capacity": self.bloom.capacity,
+            "bloom_hashes": self.bloom.num_hashes,
+            "bloom_bytes": bloom_bytes,
+            "disk_bytes": len(self._disk) * 8,
+            # Resident cost is the Bloom filter; seen.u64 is mmapped on demand.
+            "bloom_bytes_per_million_urls": round(bloom_bytes / self.bloom.capacity * 1_000_000),
+            "disk_bytes_per_million_urls": 8_000_000,
+        }
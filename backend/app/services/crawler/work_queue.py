@@ -0,0 +1,387 @@
+"""Redis-backed crawl work queue with leases, retries and backoff.
+
+Producers (the scheduler, CLIs, API handlers) enqueue small JSON jobs;
+any number of worker processes on any machine claim them. Keys under
+``prefix``::
+
+    {prefix}:jobs      HASH  job id -> job JSON (kind, args, attempts, ...)
+    {prefix}:ready     ZSET  job id -> time the job becomes claimable
+    {prefix}:leased    ZSET  job id -> lease deadline
+    {prefix}:owners    HASH  job id -> lease token of the claiming worker
+    {prefix}:dead      ZSET  job id -> time it exhausted its attempts
+    {prefix}:counters  HASH  enqueued / completed / retried / dead / lease_expired totals
+
+A claim atomically moves due jobs from ``ready`` to ``leased`` with a
+deadline ``visibility_sec`` ahead. A worker that crashes or stalls without
+extending its lease loses it: the next claim counts that as a failed
+attempt and puts the job back to ``ready`` for another worker, or in
+``dead`` once it has used up ``max_attempts``, so a job that keeps
+killing its worker is not re-leased forever. Only the current lease
+holder can complete, fail or extend a job, so a slow worker that lost
+its lease cannot ack a job someone else is running. Failures are retried with exponential backoff
+(with jitter) until ``max_attempts``, then parked in ``dead``.
+
+Job ids are derived from ``kind`` and ``args``; enqueuing a job that is
+already waiting or running is a no-op. Enqueuing a dead job is a no-op
+too until it has been dead for ``dead_cooldown_sec``; then the enqueue
+revives it with its attempts reset (counted as ``revived``), so a source
+whose crawls kept failing is picked up again by the scheduler.
+``requeue_dead`` revives every dead job at once.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.config import get_settings
+
+
+ENQUEUE_CHUNK = 500  # jobs per enqueue script call
+
+# ARGV: score, revive jobs dead since before this time ("" = never), then (id, job JSON) pairs
+_ENQUEUE = """
+local added, revived = {}, 0
+for i = 3, #ARGV, 2 do
+    if redis.call("hsetnx", KEYS[1], ARGV[i], ARGV[i + 1]) == 1 then
+        redis.call("zadd", KEYS[2], ARGV[1], ARGV[i])
+        table.insert(added, ARGV[i])
+    elseif ARGV[2] ~= "" then
+        local died = redis.call("zscore", KEYS[4], ARGV[i])
+        if died and tonumber(died) <= tonumber(ARGV[2]) then
+            redis.call("zrem", KEYS[4], ARGV[i])
+            redis.call("hset", KEYS[1], ARGV[i], ARGV[i + 1])
+            redis.call("zadd", KEYS[2], ARGV[1], ARGV[i])
+            table.insert(added, ARGV[i])
+            revived = revived + 1
+        end
+    end
+end
+if #added > revived then redis.call("hincrby", KEYS[3], "enqueued", #added - revived) end
+if revived > 0 then redis.call("hincrby", KEYS[3], "revived", revived) end
+return added
+"""
+
+# ARGV: now, lease deadline, limit, token, max_attempts
+_CLAIM = """
+local jobs, ready, leased, owners, counters, dead = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5], KEYS[6]
+local now, deadline, limit, token = tonumber(ARGV[1]), ARGV[2], tonumber(ARGV[3]), ARGV[4]
+local max_attempts = tonumber(ARGV[5])
+local expired = redis.call("zrangebyscore", leased, "-inf", now)
+local died = 0
+for _, id in ipairs(expired) do
+    redis.call("zrem", leased, id)
+    redis.call("hdel", owners, id)
+    local body = redis.call("hget", jobs, id)
+    if body then
+        -- The worker died or hung on this job: that counts as a failed attempt.
+        local job = cjson.decode(body)
+        job["attempts"] = (tonumber(job["attempts"]) or 0) + 1
+        job["last_error"] = "lease expired"
+        redis.call("hset", jobs, id, cjson.encode(job))
+        if job["attempts"] >= max_attempts then
+            redis.call("zadd", dead, now, id)
+            died = died + 1
+        else
+            redis.call("zadd", ready, now, id)
+        end
+    end
+end
+if #expired > 0 then redis.call("hincrby", counters, "lease_expired", #expired) end
+if died > 0 then redis.call("hincrby", counters, "dead", died) end
+local ids = redis.call("zrangebyscore", ready, "-inf", now, "LIMIT", 0, limit)
+local out = {}
+for _, id in ipairs(ids) do
+    redis.call("zrem", ready, id)
+    local body = redis.call("hget", jobs, id)
+    if body then
+        redis.call("zadd", leased, deadline, id)
+        redis.call("hset", owners, id, token)
+        table.insert(out, body)
+    end
+end
+return out
+"""
+
+_COMPLETE = """
+if redis.call("hget", KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call("zrem", KEYS[3], ARGV[1])
+redis.call("hdel", KEYS[2], ARGV[1])
+redis.call("hdel", KEYS[1], ARGV[1])
+redis.call("hincrby", KEYS[4], "completed", 1)
+return 1
+"""
+
+# ARGV: id, token, updated job JSON, retry_at ("" = dead), now
+_FAIL = """
+if redis.call("hget", KEYS[2], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call("zrem", KEYS[3], ARGV[1])
+redis.call("hdel", KEYS[2], ARGV[1])
+redis.call("hset", KEYS[1], ARGV[1], ARGV[3])
+if ARGV[4] == "" then
+    redis.call("zadd", KEYS[5], ARGV[5], ARGV[1])
+    redis.call("hincrby", KEYS[6], "dead", 1)
+else
+    redis.call("zadd", KEYS[4], ARGV[4], ARGV[1])
+    redis.call("hincrby", KEYS[6], "retried", 1)
+end
+return 1
+"""
+
+_EXTEND = """
+if redis.call("hget", KEYS[1], ARGV[1]) ~= ARGV[2] then return 0 end
+redis.call("zadd", KEYS[2], "XX", ARGV[3], ARGV[1])
+return 1
+"""
+
+
+def job_id(kind: str, args: dict[str, Any]) -> str:
+    raw = json.dumps([kind, args], sort_keys=True, separators=(",", ":"))
+    return f"{kind}:{hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()}"
+
+
+def backoff_delay(
+    attempts: int,
+    *,
+    base_sec: float,
+    max_sec: float,
+    rng: random.Random | None = None,
+) -> float:
+    """Delay before retry number ``attempts``: ``base * 2^(attempts-1)``, capped, +-25% jitter."""
+    delay = min(max_sec, base_sec * (2 ** max(0, attempts - 1)))
+    return delay * (0.75 + 0.5 * (rng or random).random())
+
+
+@dataclass
+class QueueJob:
+    id: str
+    kind: str
+    args: dict[str, Any]
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.time)
+    last_error: str | None = None
+    token: str = ""  # lease token, set on claim
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "id": self.id,
+                "kind": self.kind,
+                "args": self.args,
+                "attempts": self.attempts,
+                "enqueued_at": self.enqueued_at,
+                "last_error": self.last_error,
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str | bytes, token: str = "") -> "QueueJob":
+        data = json.loads(raw)
+        return cls(token=token, **data)
+
+
+class CrawlQueue:
+    """Work queue of crawl jobs stored in Redis."""
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        *,
+        prefix: str = "crawlq",
+        visibility_sec: float = 300.0,
+        max_attempts: int = 5,
+        backoff_base_sec: float = 30.0,
+        backoff_max_sec: float = 3600.0,
+        dead_cooldown_sec: float | None = None,
+    ) -> None:
+        self.client = client
+        self.prefix = prefix
+        self.visibility_sec = visibility_sec
+        self.max_attempts = max_attempts
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+        self.dead_cooldown_sec = dead_cooldown_sec
+        self.k_jobs = f"{prefix}:jobs"
+        self.k_ready = f"{prefix}:ready"
+        self.k_leased = f"{prefix}:leased"
+        self.k_owners = f"{prefix}:owners"
+        self.k_dead = f"{prefix}:dead"
+        self.k_counters = f"{prefix}:counters"
+        self._enqueue = client.register_script(_ENQUEUE)
+        self._claim = client.register_script(_CLAIM)
+        self._complete = client.register_script(_COMPLETE)
+        self._fail = client.register_script(_FAIL)
+        self._extend = client.register_script(_EXTEND)
+
+    @classmethod
+    def from_settings(cls, client: redis.Redis | None = None) -> "CrawlQueue":
+        settings = get_settings()
+        return cls(
+            client or redis.from_url(settings.REDIS_URL),
+            prefix=settings.CRAWL_QUEUE_PREFIX,
+            visibility_sec=settings.CRAWL_QUEUE_VISIBILITY_SEC,
+            max_attempts=settings.CRAWL_QUEUE_MAX_ATTEMPTS,
+            backoff_base_sec=settings.CRAWL_QUEUE_BACKOFF_BASE_SEC,
+            backoff_max_sec=settings.CRAWL_QUEUE_BACKOFF_MAX_SEC,
+            dead_cooldown_sec=settings.CRAWL_QUEUE_DEAD_COOLDOWN_SEC or None,
+        )
+
+    async def enqueue(self, kind: str, args: dict[str, Any], *, delay_sec: float = 0.0) -> str | None:
+        """Add a job; returns its id, or None if the same job is already queued."""
+        ids = await self.enqueue_many([(kind, args)], delay_sec=delay_sec)
+        return ids[0] if ids else None
+
+    async def enqueue_many(
+        self,
+        jobs: list[tuple[str, dict[str, Any]]],
+        *,
+        delay_sec: float = 0.0,
+    ) -> list[str]:
+        """Add jobs in one round trip; returns the ids that were not already queued.
+
+        Dead jobs past ``dead_cooldown_sec`` are revived and returned too.
+        """
+        now = time.time()
+        revive_before = now - self.dead_cooldown_sec if self.dead_cooldown_sec else ""
+        added: list[str] = []
+        for start in range(0, len(jobs), ENQUEUE_CHUNK):
+            argv: list[Any] = [now + delay_sec, revive_before]
+            for kind, args in jobs[start:start + ENQUEUE_CHUNK]:
+                job = QueueJob(id=job_id(kind, args), kind=kind, args=args, enqueued_at=now)
+                argv += [job.id, job.to_json()]
+            ids = await self._enqueue(
+                keys=[self.k_jobs, self.k_ready, self.k_counters, self.k_dead], args=argv
+            )
+            added += [i.decode() if isinstance(i, bytes) else i for i in ids]
+        return added
+
+    async def claim(self, limit: int, token: str) -> list[QueueJob]:
+        """Lease up to ``limit`` due jobs for the worker identified by ``token``."""
+        now = time.time()
+        bodies = await self._claim(
+            keys=[self.k_jobs, self.k_ready, self.k_leased, self.k_owners, self.k_counters, self.k_dead],
+            args=[now, now + self.visibility_sec, limit, token, self.max_attempts],
+        )
+        return [QueueJob.from_json(body, token) for body in bodies]
+
+    async def complete(self, job: QueueJob) -> bool:
+        return bool(
+            await self._complete(
+                keys=[self.k_jobs, self.k_owners, self.k_leased, self.k_counters],
+                args=[job.id, job.token],
+            )
+        )
+
+    async def fail(self, job: QueueJob, error: str) -> str | None:
+        """Schedule a retry or park the job in ``dead``; returns "retry", "dead" or None (lease lost)."""
+        now = time.time()
+        job.attempts += 1
+        job.last_error = error[:500]
+        retry_at = ""
+        if job.attempts < self.max_attempts:
+            retry_at = now + backoff_delay(
+                job.attempts, base_sec=self.backoff_base_sec, max_sec=self.backoff_max_sec
+            )
+        ok = await self._fail(
+            keys=[self.k_jobs, self.k_owners, self.k_leased, self.k_ready, self.k_dead, self.k_counters],
+            args=[job.id, job.token, job.to_json(), retry_at, now],
+        )
+        if not ok:
+            return None
+        return "retry" if retry_at else "dead"
+
+    async def extend(self, job: QueueJob) -> bool:
+        """Push the lease deadline ``visibility_sec`` ahead (heartbeat)."""
+        return bool(
+            await self._extend(
+                keys=[self.k_owners, self.k_leased],
+                args=[job.id, job.token, time.time() + self.visibility_sec],
+            )
+        )
+
+    async def requeue_dead(self) -> int:
+        """Move every dead job back to ``ready`` with its attempts reset."""
+        ids = await self.client.zrange(self.k_dead, 0, -1)
+        moved = 0
+        for raw_id in ids:
+            body = await self.client.hget(self.k_jobs, raw_id)
+            if body is None:
+                await self.client.zrem(self.k_dead, raw_id)
+                continue
+            job = QueueJob.from_json(body)
+            job.attempts = 0
+            pipe = self.client.pipeline(transaction=True)
+            pipe.zrem(self.k_dead, raw_id)
+            pipe.hset(self.k_jobs, raw_id, job.to_json())
+            pipe.zadd(self.k_ready, {raw_id: time.time()})
+            await pipe.execute()
+            moved += 1
+        return moved
+
+    async def stats(self) -> dict[str, Any]:
+        """Depth and age of the queue for operators."""
+        now = time.time()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zcount(self.k_ready, "-inf", now)
+        pipe.zcount(self.k_ready, f"({now}", "+inf")
+        pipe.zcard(self.k_leased)
+        pipe.zcount(self.k_leased, "-inf", now)
+        pipe.zcard(self.k_dead)
+        pipe.zrange(self.k_ready, 0, 0, withscores=True)
+        pipe.hgetall(self.k_counters)
+        due, delayed, leased, expired, dead, oldest, counters = await pipe.execute()
+        return {
+            "ready": due,
+            "delayed": delayed,
+            "leased": leased,
+            "lease_expired": expired,
+            "dead": dead,
+            "oldest_ready_age_sec": (
+                round(max(0.0, now - oldest[0][1]), 1) if oldest and oldest[0][1] <= now else 0.0
+            ),
+            "totals": {
+                (k.decode() if isinstance(k, bytes) else k): int(v) for k, v in counters.items()
+            },
+        }
+
+    async def dead_jobs(self, limit: int = 50) -> list[dict[str, Any]]:
+        if limit <= 0:
+            return []
+        dead = await self.client.zrevrange(self.k_dead, 0, limit - 1, withscores=True)
+        if not dead:
+            return []
+        bodies = await self.client.hmget(self.k_jobs, [raw_id for raw_id, _ in dead])
+        out = []
+        for (_, died), body in zip(dead, bodies):
+            if body is None:
+                continue
+            out.append(
+                {
+                    **json.loads(body),
+                    "dead_at": died,
+                    "revive_after": died + self.dead_cooldown_sec if self.dead_cooldown_sec else None,
+                }
+            )
+        return out
+
+    async def clear(self) -> None:
+        await self.client.delete(
+            self.k_jobs, self.k_ready, self.k_leased, self.k_owners, self.k_dead, self.k_counters
+        )
+
+
+_queue: CrawlQueue | None = None
+
+
+def get_crawl_queue() -> CrawlQueue:
+    """Process-wide queue built from the ``CRAWL_QUEUE_*`` settings."""
+    global _queue
+    if _queue is None:
+        _queue = CrawlQueue.from_settings()
+    return _queue
@@ -8,6 +8,7 @@ from sqlalchemy import asc, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.source import CrawledContent, Source
+from app.services.crawler.near_duplicate import NearDuplicateIndex, fingerprint_text
 from app.services.vector.embedder import VectorEmbedder
 
 
@@ -22,7 +23,11 @@ def _host_from_url(url: str | None) -> str:
 
 
 class TrendCandidateSelector:
-    """Select trend candidates using time window, semantic dedup, and source tiers."""
+    """Select trend candidates using time window, semantic dedup, and source tiers.
+
+    Near-duplicates (flagged at ingest, or caught by a SimHash pass over the
+    window) are dropped before any embedding call is made.
+    """
 
     def __init__(
         self,
@@ -52,13 +57,14 @@ class TrendCandidateSelector:
         except Exception:
             pass
 
+        # Same size as the embedder's vectors (and the alembic-managed column).
         await self.session.execute(
             text(
-                """
+                f"""
                 CREATE TABLE IF NOT EXISTS content_embeddings (
                     content_id TEXT PRIMARY KEY REFERENCES crawled_contents(id) ON DELETE CASCADE,
-                    embedding vector(768) NOT NULL,
-                    metadata JSONB NOT NULL DEFAULT '{}'::jsonb
+                    embedding vector({int(self.embedder.dimensions)}) NOT NULL,
+                    metadata JSONB NOT NULL DEFAULT '{{}}'::jsonb
                 )
                 """
             )
@@ -217,13 +223,20 @@ class TrendCandidateSelector:
                 "total_after_dedup": 0,
                 "selected_count": 0,
                 "duplicates_removed": 0,
+                "embedding_calls": 0,
+                "embedding_calls_avoided": 0,
                 "candidates": [],
                 "duplicates": [],
             }
 
         kept: list[dict[str, Any]] = []
         duplicates: list[dict[str, Any]] = []
+        near_dups = NearDuplicateIndex()
+        embedding_calls_avoided = 0
 
+        # Filter first, then embed every remaining row in one batched call;
+        # the similarity pass below still runs in row order.
+        to_embed: list[tuple[CrawledContent, Source | None, str]] = []
         for item, source in recent_rows:
             if not item.content and not item.title:
                 continue
@@ -232,8 +245,34 @@ class TrendCandidateSelector:
             if not content_for_embedding:
                 continue
 
-            embedding = await self.embedder.embed_text(content_for_embedding)
-            embedding_literal = self.embedder.to_vector_literal(embedding)
+            near = (item.extra_data or {}).get("duplicate_of")
+            if not near:
+                match = near_dups.check_and_add(
+                    item.canonical_url or item.source_url,
+                    fingerprint_text(item.title, item.content),
+                )
+                near = match.as_dict() if match else None
+            if near:
+                embedding_calls_avoided += 1
+                duplicates.append(
+                    {
+                        "id": item.id,
+                        "title": item.title,
+                        "source_url": item.source_url,
+                        "published_at": item.published_at.isoformat(),
+                        "duplicate_of": near,
+                    }
+                )
+                continue
+            to_embed.append((item, source, content_for_embedding))
+
+        embedded = await self.embedder.embed_batch(
+            [(item.id, content_for_embedding) for item, _, content_for_embedding in to_embed]
+        )
+        embedding_calls = len(embedded)
+
+        for (item, source, _), row in zip(to_embed, embedded):
+            embedding_literal = self.embedder.to_vector_literal(row["embedding"])
             await self._upsert_embedding(
                 content_id=item.id,
                 embedding_literal=embedding_literal,
@@ -300,6 +339,8 @@ class TrendCandidateSelector:
             "total_after_dedup": len(kept),
             "selected_count": len(selected),
             "duplicates_removed": len(duplicates),
+            "embedding_calls": embedding_calls,
+            "embedding_calls_avoided": embedding_calls_avoided,
             "similarity_threshold": similarity_threshold,
             "max_candidates": max_candidates,
             "limit": limit,
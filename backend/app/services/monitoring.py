@@ -1,3 +1,5 @@
+import asyncio
+from collections import deque
 from datetime import datetime
 import httpx
 from app.config import get_settings
@@ -78,3 +80,66 @@ class WorkflowMonitor:
                     )
             except Exception as e:
                 print(f"Telegram alert failed: {e}")
+
+
+class LoopLagMonitor:
+    """Measure event-loop lag: how late a periodic ``sleep`` wakes up.
+
+    A coroutine doing CPU work (e.g. parsing a large HTML page) blocks every
+    other task; the delay shows up here as lag.
+    """
+
+    def __init__(self, interval_sec: float = 0.05, window: int = 2400):
+        self.interval_sec = interval_sec
+        self.samples: deque[float] = deque(maxlen=window)
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval_sec)
+            self.samples.append(max(0.0, loop.time() - started - self.interval_sec))
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self):
+        self.samples.clear()
+
+    def snapshot(self) -> dict:
+        """Lag percentiles in milliseconds over the sample window."""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"samples": 0}
+
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+
+        return {
+            "samples": len(ordered),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+loop_lag_monitor = LoopLagMonitor()
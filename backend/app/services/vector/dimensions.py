@@ -0,0 +1,56 @@
+"""Embedding output size (Matryoshka truncation of gemini-embedding-001).
+
+gemini-embedding-001 is trained so that the first N values of its 3072-dim
+embedding are themselves a usable N-dim embedding. ``EMBEDDING_DIMENSIONS``
+picks N once for the whole app: it is sent as ``output_dimensionality``,
+sizes the pgvector column and the Qdrant collection, and is part of the
+embedding cache / batcher key so vectors of different sizes never mix.
+
+Only the full 3072-dim output comes back unit length, so every vector is
+re-normalized here before it is cached or stored; cosine scores and
+thresholds then mean the same thing at every size.
+"""
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+from google.genai import types
+
+from app.config import get_settings
+
+NATIVE_DIMENSIONS = 3072  # gemini-embedding-001
+MIN_DIMENSIONS = 128
+
+
+def embedding_dimensions() -> int:
+    """Configured embedding size, validated against what the model can return."""
+    dims = get_settings().EMBEDDING_DIMENSIONS
+    if not MIN_DIMENSIONS <= dims <= NATIVE_DIMENSIONS:
+        raise ValueError(
+            f"EMBEDDING_DIMENSIONS must be between {MIN_DIMENSIONS} and {NATIVE_DIMENSIONS}, got {dims}"
+        )
+    return dims
+
+
+def embed_config(dims: int) -> types.EmbedContentConfig:
+    return types.EmbedContentConfig(output_dimensionality=dims)
+
+
+def model_key(model: str, dims: int) -> str:
+    """Cache / batcher key for ``model`` at ``dims`` (e.g. ``models/gemini-embedding-001@768``)."""
+    return f"{model}@{dims}"
+
+
+def l2_normalize(values: Sequence[float]) -> list[float]:
+    norm = math.sqrt(math.fsum(v * v for v in values))
+    if norm == 0.0:
+        return list(values)
+    return [v / norm for v in values]
+
+
+def truncate_embedding(values: Sequence[float], dims: int) -> list[float]:
+    """First ``dims`` values of ``values``, re-normalized to unit length."""
+    if len(values) < dims:
+        raise ValueError(f"embedding has {len(values)} values, expected at least {dims}")
+    return l2_normalize(values[:dims])
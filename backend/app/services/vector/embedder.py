@@ -3,6 +3,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from app.config import get_settings
+from app.services.vector.dimensions import (
+    embed_config,
+    embedding_dimensions,
+    model_key,
+    truncate_embedding,
+)
+from app.services.vector.embedding_batcher import get_embedding_batcher
+from app.services.vector.embedding_cache import get_embedding_cache
 
 settings = get_settings()
 
@@ -10,13 +18,30 @@ settings = get_settings()
 client = genai.Client(api_key=settings.GEMINI_API_KEY)
 
 
+async def embed_texts(texts: list[str], model: str, dims: int) -> list[list[float]]:
+    """Call Gemini for ``texts``, 100 per request (API limit), at ``dims``."""
+    vectors = []
+    for i in range(0, len(texts), 100):
+        result = await client.aio.models.embed_content(
+            model=model,
+            contents=texts[i:i+100],
+            config=embed_config(dims),
+        )
+        vectors.extend(truncate_embedding(e.values, dims) for e in result.embeddings)
+    return vectors
+
+
 class VectorEmbedder:
     """Handle vector embeddings and similarity search with Gemini + pgvector."""
 
     def __init__(self, session: AsyncSession):
         self.session = session
         self.model = "models/gemini-embedding-001"
-        self.dimensions = 3072  # gemini-embedding-001 uses 3072 dimensions
+        self.dimensions = embedding_dimensions()
+        # Cache and batcher entries are per model and output size.
+        self.model_key = model_key(self.model, self.dimensions)
+        self.cache = get_embedding_cache()
+        self.batcher = get_embedding_batcher(self.model, self.dimensions, embed_texts)
 
     @staticmethod
     def to_vector_literal(values: list[float]) -> str:
@@ -24,20 +49,12 @@ class VectorEmbedder:
         return "[" + ",".join(f"{v:.8f}" for v in values) + "]"
 
     async def embed_text(self, content: str) -> list[float]:
-        """Generate embedding for a single text using Gemini."""
-        result = await client.aio.models.embed_content(
-            model=self.model,
-            contents=content
-        )
-        return result.embeddings[0].values
+        """Generate embedding for a single text using Gemini (cached)."""
+        return (await self.cache.get_or_embed(self.model_key, [content], self.batcher.embed))[0]
 
     async def embed_query(self, query: str) -> list[float]:
-        """Generate embedding for a search query."""
-        result = await client.aio.models.embed_content(
-            model=self.model,
-            contents=query
-        )
-        return result.embeddings[0].values
+        """Generate embedding for a search query (cached)."""
+        return (await self.cache.get_or_embed(self.model_key, [query], self.batcher.embed))[0]
 
     async def embed_and_store(
         self,
@@ -130,25 +147,13 @@ class VectorEmbedder:
         Returns:
             List of dicts with content_id and embedding
         """
-        embeddings = []
-
-        # Process in batches of 100 (Gemini API limit)
-        for i in range(0, len(contents), 100):
-            batch = contents[i:i+100]
-            texts = [text for _, text in batch]
-
-            # Gemini batch embedding
-            result = await client.aio.models.embed_content(
-                model=self.model,
-                contents=texts
-            )
-
-            # Match embeddings with content IDs
-            for idx, (content_id, _) in enumerate(batch):
-                embeddings.append({
-                    "content_id": content_id,
-                    "embedding": result.embeddings[idx].values
-                })
+        vectors = await self.cache.get_or_embed(
+            self.model_key, [text for _, text in contents], self.batcher.embed
+        )
+        embeddings = [
+            {"content_id": content_id, "embedding": vector}
+            for (content_id, _), vector in zip(contents, vectors)
+        ]
 
         return embeddings
 
@@ -158,38 +163,16 @@ class VectorEmbedder:
         content: str
     ) -> list[float]:
         """
-        Get embedding with Redis cache (7-day TTL) to reduce API calls.
+        Get embedding through the shared embedding cache.
+
+        Kept for callers of the old per-id Redis cache; entries are now keyed
+        by model + normalized text, so ``content_id`` is not used.
 
         Args:
-            content_id: Unique content identifier
+            content_id: Unique content identifier (unused)
             content: Text content to embed
 
         Returns:
             Embedding vector
         """
-        import json
-        import redis.asyncio as redis
-
-        redis_client = redis.from_url(settings.REDIS_URL)
-
-        try:
-            cache_key = f"embedding:{content_id}"
-
-            # Check cache
-            cached = await redis_client.get(cache_key)
-            if cached:
-                return json.loads(cached)
-
-            # Generate embedding
-            embedding = await self.embed_text(content)
-
-            # Cache for 7 days (604800 seconds)
-            await redis_client.setex(
-                cache_key,
-                604800,
-                json.dumps(embedding)
-            )
-
-            return embedding
-        finally:
-            await redis_client.aclose()
+        return await self.embed_text(content)
@@ -0,0 +1,158 @@
+"""Micro-batching for embedding calls.
+
+``embed_content`` accepts up to 100 texts per request, but ``embed_text``
+and ``embed_query`` sent one text each, so concurrent workflow runs paid a
+full request per text. ``EmbeddingBatcher`` collects texts submitted from
+any number of coroutines and sends them as one request once ``max_batch``
+texts are waiting or ``linger_ms`` after the first one arrived, whichever
+comes first; results (or the error) are fanned back out to each caller.
+At most ``max_concurrency`` batch requests are in flight.
+
+Embedders sit behind the embedding cache, so only cache misses reach the
+batcher. One batcher per model and output size is shared by every embedder
+in the process, so it is built from a module-level ``embed(texts, model,
+dims)`` function, never from an embedder (or its database session).
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from functools import partial
+from typing import Awaitable, Callable
+
+from app.config import get_settings
+from app.services.vector.dimensions import model_key
+
+Embed = Callable[[list[str]], Awaitable[list[list[float]]]]
+EmbedModel = Callable[[list[str], str, int], Awaitable[list[list[float]]]]
+
+
+@dataclass
+class _Pending:
+    text: str
+    future: asyncio.Future
+
+
+class EmbeddingBatcher:
+    def __init__(
+        self,
+        embed: Embed,
+        *,
+        max_batch: int = 100,
+        linger_ms: float = 10.0,
+        max_concurrency: int = 4,
+    ) -> None:
+        self._embed = embed
+        self.max_batch = max(1, max_batch)
+        self.linger_sec = max(0.0, linger_ms) / 1000
+        self.max_concurrency = max(1, max_concurrency)
+        self._pending: list[_Pending] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._gate: asyncio.Semaphore | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.counters = {"texts": 0, "batches": 0, "errors": 0, "full_batches": 0}
+
+    def _bind(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures and timers belong to one loop; a new loop starts clean.
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+            self._gate = asyncio.Semaphore(self.max_concurrency)
+            self._tasks = set()
+        return loop
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed ``texts`` as part of whatever batches they end up in."""
+        if not texts:
+            return []
+        loop = self._bind()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append(_Pending(text, future))
+            futures.append(future)
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+        if self._pending and self._timer is None:
+            self._timer = loop.call_later(self.linger_sec, self._flush)
+        return list(await asyncio.gather(*futures))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch, self._pending = self._pending[: self.max_batch], self._pending[self.max_batch :]
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[_Pending]) -> None:
+        try:
+            async with self._gate:
+                self.counters["batches"] += 1
+                self.counters["texts"] += len(batch)
+                if len(batch) == self.max_batch:
+                    self.counters["full_batches"] += 1
+                vectors = await self._embed([p.text for p in batch])
+                if len(vectors) != len(batch):
+                    raise RuntimeError(f"embedding batch returned {len(vectors)} vectors for {len(batch)} texts")
+        except Exception as e:  # noqa: BLE001
+            self.counters["errors"] += 1
+            self._fail(batch, e)
+            return
+        except BaseException as e:
+            # Cancelled (shutdown, loop closing) or interrupted: callers must
+            # not wait on their futures forever.
+            self.counters["errors"] += 1
+            error = RuntimeError("embedding batch was cancelled")
+            error.__cause__ = e
+            self._fail(batch, error)
+            raise
+        for p, vector in zip(batch, vectors):
+            if not p.future.done():
+                p.future.set_result(vector)
+
+    @staticmethod
+    def _fail(batch: list[_Pending], error: BaseException) -> None:
+        for p in batch:
+            if not p.future.done():
+                p.future.set_exception(error)
+
+    def stats(self) -> dict:
+        c = self.counters
+        return {
+            **c,
+            "avg_batch": round(c["texts"] / c["batches"], 2) if c["batches"] else 0.0,
+            "max_batch": self.max_batch,
+            "linger_ms": self.linger_sec * 1000,
+        }
+
+
+_batchers: dict[str, EmbeddingBatcher] = {}
+
+
+def get_embedding_batcher(model: str, dims: int, embed: EmbedModel) -> EmbeddingBatcher:
+    """Process-wide batcher for ``model`` at ``dims``, calling ``embed(texts, model, dims)``.
+
+    ``embed`` is used when the batcher is first created, so it must be a
+    module-level function that does not depend on the caller.
+    """
+    key = model_key(model, dims)
+    batcher = _batchers.get(key)
+    if batcher is None:
+        settings = get_settings()
+        batcher = _batchers[key] = EmbeddingBatcher(
+            partial(embed, model=model, dims=dims),
+            max_batch=settings.EMBEDDING_BATCH_MAX,
+            linger_ms=settings.EMBEDDING_BATCH_LINGER_MS,
+            max_concurrency=settings.EMBEDDING_BATCH_CONCURRENCY,
+        )
+    return batcher
+
+
+def embedding_batcher_stats() -> dict[str, dict]:
+    return {model: b.stats() for model, b in _batchers.items()}
@@ -0,0 +1,246 @@
+"""Two-tier embedding cache keyed by model + normalized text.
+
+Embeddings used to be cached per ``content_id`` as a JSON string in Redis,
+through a connection opened and closed on every call. Identical text under
+a new id missed, and every hit parsed ~60KB of JSON.
+
+``EmbeddingCache`` keys on ``blake2b(model, normalized text)``:
+
+* front tier: in-process LRU of packed vectors with a byte budget;
+* back tier: Redis, packed little-endian float32 (or float16) with a TTL,
+  over one pooled client per process (per event loop).
+
+Both embedders route every embed call through ``get_or_embed``, which
+serves what it can from the tiers, embeds the rest in one call (identical
+texts once) and writes the results back. Redis errors are logged and
+treated as misses, so the cache degrades to the local tier.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import struct
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, Sequence
+
+import redis.asyncio as redis
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+Embed = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+DTYPES = {"float32": "f", "float16": "e"}
+# Rough per-entry bookkeeping (key string + OrderedDict node) counted against the budget.
+ENTRY_OVERHEAD_BYTES = 160
+# After a Redis error, serve from the local tier only for this long.
+REDIS_RETRY_SEC = 30.0
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, text: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def pack_vector(values: Sequence[float], dtype: str = "float32") -> bytes:
+    return struct.pack(f"<{len(values)}{DTYPES[dtype]}", *values)
+
+
+def unpack_vector(data: bytes, dtype: str = "float32") -> list[float]:
+    code = DTYPES[dtype]
+    return list(struct.unpack(f"<{len(data) // struct.calcsize(code)}{code}", data))
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        redis_client: redis.Redis | None = None,
+        *,
+        redis_url: str | None = None,
+        prefix: str = "emb",
+        ttl_sec: int = 7 * 24 * 3600,
+        memory_bytes: int = 64 * 1024 * 1024,
+        dtype: str = "float32",
+    ) -> None:
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        self.prefix = prefix
+        self.ttl_sec = ttl_sec
+        self.memory_bytes = memory_bytes
+        self.dtype = dtype
+        self._redis = redis_client
+        self._redis_url = redis_url if redis_client is None else None
+        self._redis_loop: asyncio.AbstractEventLoop | None = None
+        self._redis_down_until = 0.0
+        self._lru: OrderedDict[str, bytes] = OrderedDict()
+        self._lru_bytes = 0
+        self.counters = {
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "redis_errors": 0,
+            "bytes_saved": 0,  # encoded size saved by packing instead of JSON
+        }
+
+    @classmethod
+    def from_settings(cls) -> "EmbeddingCache":
+        settings = get_settings()
+        return cls(
+            redis_url=settings.REDIS_URL if settings.EMBEDDING_CACHE_REDIS else None,
+            prefix=settings.EMBEDDING_CACHE_PREFIX,
+            ttl_sec=settings.EMBEDDING_CACHE_TTL_SEC,
+            memory_bytes=settings.EMBEDDING_CACHE_MEMORY_MB * 1024 * 1024,
+            dtype=settings.EMBEDDING_CACHE_DTYPE,
+        )
+
+    def _client(self) -> redis.Redis | None:
+        if time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis_url is None:
+            return self._redis
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._redis_loop is not loop:
+            # redis.asyncio pools are bound to the loop that opened them.
+            self._redis = redis.from_url(self._redis_url, socket_timeout=2.0, socket_connect_timeout=2.0)
+            self._redis_loop = loop
+        return self._redis
+
+    def _redis_failed(self, op: str, error: Exception) -> None:
+        self.counters["redis_errors"] += 1
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SEC
+        logger.warning(f"Embedding cache: Redis {op} failed, local tier only for {REDIS_RETRY_SEC:.0f}s: {error}")
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.prefix}:{self.dtype}:{key}"
+
+    # --- memory tier -----------------------------------------------------
+
+    def _lru_get(self, key: str) -> bytes | None:
+        data = self._lru.get(key)
+        if data is not None:
+            self._lru.move_to_end(key)
+        return data
+
+    def _lru_put(self, key: str, data: bytes) -> None:
+        size = len(data) + ENTRY_OVERHEAD_BYTES
+        if size > self.memory_bytes:
+            return
+        old = self._lru.pop(key, None)
+        if old is not None:
+            self._lru_bytes -= len(old) + ENTRY_OVERHEAD_BYTES
+        self._lru[key] = data
+        self._lru_bytes += size
+        while self._lru_bytes > self.memory_bytes:
+            _, evicted = self._lru.popitem(last=False)
+            self._lru_bytes -= len(evicted) + ENTRY_OVERHEAD_BYTES
+
+    # --- both tiers ------------------------------------------------------
+
+    async def get_many(self, keys: Sequence[str]) -> list[bytes | None]:
+        found = [self._lru_get(k) for k in keys]
+        self.counters["memory_hits"] += sum(1 for d in found if d is not None)
+        missing = [i for i, d in enumerate(found) if d is None]
+        client = self._client() if missing else None
+        if client is not None:
+            try:
+                values = await client.mget([self._redis_key(keys[i]) for i in missing])
+            except Exception as e:  # noqa: BLE001
+                self._redis_failed("read", e)
+                values = [None] * len(missing)
+            for i, data in zip(missing, values):
+                if data is not None:
+                    found[i] = data
+                    self._lru_put(keys[i], data)
+                    self.counters["redis_hits"] += 1
+        return found
+
+    async def put_many(self, items: dict[str, bytes]) -> None:
+        for key, data in items.items():
+            self._lru_put(key, data)
+        client = self._client() if items else None
+        if client is None:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, data in items.items():
+                    pipe.set(self._redis_key(key), data, ex=self.ttl_sec)
+                await pipe.execute()
+        except Exception as e:  # noqa: BLE001
+            self._redis_failed("write", e)
+
+    async def get_or_embed(self, model: str, texts: Sequence[str], embed: Embed) -> list[list[float]]:
+        """Embeddings for ``texts``; only texts missing from both tiers reach ``embed``."""
+        keys = [cache_key(model, t) for t in texts]
+        found = await self.get_many(keys)
+
+        pending: dict[str, str] = {}  # key -> first text with that key
+        for key, text, data in zip(keys, texts, found):
+            if data is None and key not in pending:
+                pending[key] = text
+        self.counters["misses"] += len(pending)
+
+        if pending:
+            vectors = await embed(list(pending.values()))
+            packed = {key: pack_vector(v, self.dtype) for key, v in zip(pending, vectors)}
+            # Versus the JSON text the old per-id cache stored for the same vectors.
+            self.counters["bytes_saved"] += sum(
+                len(json.dumps(list(v))) - len(packed[key]) for key, v in zip(pending, vectors)
+            )
+            await self.put_many(packed)
+            found = [data if data is not None else packed[key] for key, data in zip(keys, found)]
+        return [unpack_vector(data, self.dtype) for data in found]
+
+    def stats(self) -> dict:
+        c = self.counters
+        lookups = c["memory_hits"] + c["redis_hits"] + c["misses"]
+        return {
+            **c,
+            "hit_rate": round((c["memory_hits"] + c["redis_hits"]) / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._lru),
+            "memory_bytes": self._lru_bytes,
+            "memory_budget_bytes": self.memory_bytes,
+            "dtype": self.dtype,
+            "redis": self._redis is not None or self._redis_url is not None,
+        }
+
+    def clear_memory(self) -> None:
+        self._lru.clear()
+        self._lru_bytes = 0
+
+    async def aclose(self) -> None:
+        if self._redis is not None and self._redis_url is not None:
+            await self._redis.aclose()
+            self._redis = None
+            self._redis_loop = None
+
+
+_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide cache built from the ``EMBEDDING_CACHE_*`` settings."""
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache.from_settings()
+    return _cache
+
+
+def embedding_cache_stats() -> dict:
+    return _cache.stats() if _cache is not None else {}
+
+
+async def close_embedding_cache() -> None:
+    if _cache is not None:
+        await _cache.aclose()
@@ -52,7 +52,8 @@ class EmbeddingPipeline:
         3. Generate high-quality post
         4. Save to DB
 
-        No duplicate blocking - duplicates are only used for context.
+        No semantic duplicate blocking - similar content is only used for
+        context. Items flagged as near-duplicates at crawl time are skipped.
 
         Args:
             session: Database session
@@ -68,6 +69,17 @@ class EmbeddingPipeline:
         if not content:
             return {"status": "error", "reason": "content_not_found"}
 
+        # Near-duplicates flagged at crawl time are not worth an embedding
+        # and a generation run of their own
+        duplicate_of = (content.extra_data or {}).get("duplicate_of")
+        if duplicate_of:
+            return {
+                "status": "skipped",
+                "reason": "near_duplicate",
+                "content_id": content_id,
+                "duplicate_of": duplicate_of,
+            }
+
         # 2. Update status to ANALYZING (allow re-generation)
         content.thread_status = ThreadStatus.ANALYZING
 
@@ -1,63 +1,81 @@
-from google import genai
-from qdrant_client import QdrantClient, models
-from qdrant_client.models import Distance, VectorParams, PointStruct
+import asyncio
+
+from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.models import PointStruct
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.services.crawler.session import close_detached
+from app.services.vector.dimensions import embedding_dimensions, model_key
+from app.services.vector.embedder import embed_texts
+from app.services.vector.embedding_batcher import get_embedding_batcher
+from app.services.vector.embedding_cache import get_embedding_cache
+from app.services.vector.qdrant_schema import CONTENT_COLLECTION, ensure_collection_ready
 
 settings = get_settings()
 
-# Initialize Gemini client
-client = genai.Client(api_key=settings.GEMINI_API_KEY)
+COLLECTION_NAME = CONTENT_COLLECTION.name
+
+_qdrant: AsyncQdrantClient | None = None
+_qdrant_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_qdrant_client() -> AsyncQdrantClient:
+    """Return the process-wide async Qdrant client (pooled keep-alive connections).
+
+    Created on first use (the app lifespan opens it at startup). Like the
+    crawl sessions, it is bound to the event loop that created it; a new
+    loop (e.g. a second ``asyncio.run``) gets a fresh client and the old
+    one is closed.
+    """
+    global _qdrant, _qdrant_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if _qdrant is not None and (_qdrant_loop is None or _qdrant_loop is loop):
+        return _qdrant
+    if _qdrant is not None:
+        close_detached(_qdrant.close, _qdrant_loop)
+
+    _qdrant = AsyncQdrantClient(
+        url=settings.QDRANT_URL,
+        api_key=settings.QDRANT_API_KEY or None,
+        timeout=settings.QDRANT_TIMEOUT_SEC,
+        pool_size=settings.QDRANT_POOL_SIZE,
+    )
+    _qdrant_loop = loop
+    return _qdrant
 
-# Initialize Qdrant client
-qdrant_client = QdrantClient(
-    url=settings.QDRANT_URL,
-    api_key=settings.QDRANT_API_KEY,
-)
 
-COLLECTION_NAME = "content_embeddings"
+async def close_qdrant_client() -> None:
+    """Close the shared client (FastAPI shutdown / end of CLI runs)."""
+    global _qdrant, _qdrant_loop
+    qdrant, _qdrant, _qdrant_loop = _qdrant, None, None
+    if qdrant is not None:
+        await qdrant.close()
 
 
 class QdrantEmbedder:
     """Handle vector embeddings and similarity search with Gemini + Qdrant."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, qdrant: AsyncQdrantClient | None = None):
         self.session = session
         self.model = "models/gemini-embedding-001"
-        self.dimensions = 3072
-        self.client = qdrant_client
-        self._ensure_collection()
-
-    def _ensure_collection(self):
-        """Create collection if it doesn't exist."""
-        collections = self.client.get_collections().collections
-        collection_names = [c.name for c in collections]
-
-        if COLLECTION_NAME not in collection_names:
-            self.client.create_collection(
-                collection_name=COLLECTION_NAME,
-                vectors_config=VectorParams(
-                    size=self.dimensions,
-                    distance=Distance.COSINE
-                )
-            )
+        self.dimensions = embedding_dimensions()
+        # Cache and batcher entries are per model and output size.
+        self.model_key = model_key(self.model, self.dimensions)
+        self.client = qdrant or get_qdrant_client()
+        self.cache = get_embedding_cache()
+        self.batcher = get_embedding_batcher(self.model, self.dimensions, embed_texts)
 
     async def embed_text(self, content: str) -> list[float]:
-        """Generate embedding for a single text using Gemini."""
-        result = await client.aio.models.embed_content(
-            model=self.model,
-            contents=content
-        )
-        return result.embeddings[0].values
+        """Generate embedding for a single text using Gemini (cached)."""
+        return (await self.cache.get_or_embed(self.model_key, [content], self.batcher.embed))[0]
 
     async def embed_query(self, query: str) -> list[float]:
-        """Generate embedding for a search query."""
-        result = await client.aio.models.embed_content(
-            model=self.model,
-            contents=query
-        )
-        return result.embeddings[0].values
+        """Generate embedding for a search query (cached)."""
+        return (await self.cache.get_or_embed(self.model_key, [query], self.batcher.embed))[0]
 
     async def embed_and_store(
         self,
@@ -67,9 +85,10 @@ class QdrantEmbedder:
     ) -> None:
         """Embed text and store in Qdrant."""
         embedding = await self.embed_text(content)
+        await ensure_collection_ready(self.client)
 
         # Store in Qdrant
-        self.client.upsert(
+        await self.client.upsert(
             collection_name=COLLECTION_NAME,
             points=[
                 PointStruct(
@@ -88,9 +107,10 @@ class QdrantEmbedder:
     ) -> list[dict]:
         """Search for similar content using vector similarity."""
         query_embedding = await self.embed_query(query)
+        await ensure_collection_ready(self.client)
 
         # Search in Qdrant
-        results = self.client.query_points(
+        results = await self.client.query_points(
             collection_name=COLLECTION_NAME,
             query=query_embedding,
             limit=limit,
@@ -150,25 +170,13 @@ class QdrantEmbedder:
         Returns:
             List of dicts with content_id and embedding
         """
-        embeddings = []
-
-        # Process in batches of 100 (Gemini API limit)
-        for i in range(0, len(contents), 100):
-            batch = contents[i:i+100]
-            texts = [text for _, text in batch]
-
-            # Gemini batch embedding
-            result = await client.aio.models.embed_content(
-                model=self.model,
-                contents=texts
-            )
-
-            # Match embeddings with content IDs
-            for idx, (content_id, _) in enumerate(batch):
-                embeddings.append({
-                    "content_id": content_id,
-                    "embedding": result.embeddings[idx].values
-                })
+        vectors = await self.cache.get_or_embed(
+            self.model_key, [text for _, text in contents], self.batcher.embed
+        )
+        embeddings = [
+            {"content_id": content_id, "embedding": vector}
+            for (content_id, _), vector in zip(contents, vectors)
+        ]
 
         return embeddings
 
@@ -178,45 +186,24 @@ class QdrantEmbedder:
         content: str
     ) -> list[float]:
         """
-        Get embedding with Redis cache (7-day TTL) to reduce API calls.
+        Get embedding through the shared embedding cache.
+
+        Kept for callers of the old per-id Redis cache; entries are now keyed
+        by model + normalized text, so ``content_id`` is not used.
 
         Args:
-            content_id: Unique content identifier
+            content_id: Unique content identifier (unused)
             content: Text content to embed
 
         Returns:
             Embedding vector
         """
-        import json
-        import redis.asyncio as redis
-
-        redis_client = redis.from_url(settings.REDIS_URL)
-
-        try:
-            cache_key = f"embedding:{content_id}"
-
-            # Check cache
-            cached = await redis_client.get(cache_key)
-            if cached:
-                return json.loads(cached)
-
-            # Generate embedding
-            embedding = await self.embed_text(content)
-
-            # Cache for 7 days (604800 seconds)
-            await redis_client.setex(
-                cache_key,
-                604800,
-                json.dumps(embedding)
-            )
-
-            return embedding
-        finally:
-            await redis_client.aclose()
+        return await self.embed_text(content)
 
-    def delete_embedding(self, content_id: str):
+    async def delete_embedding(self, content_id: str):
         """Delete embedding from Qdrant."""
-        self.client.delete(
+        await ensure_collection_ready(self.client)
+        await self.client.delete(
             collection_name=COLLECTION_NAME,
             points_selector=models.PointIdsList(
                 points=[content_id]
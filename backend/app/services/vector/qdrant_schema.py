@@ -0,0 +1,382 @@
+"""Declarative Qdrant collection schema, provisioned once per process.
+
+``CONTENT_COLLECTION`` describes everything the embedders expect from the
+``content_embeddings`` collection: vector size and distance, HNSW params,
+quantization and payload indexes. ``ensure_collection`` creates the
+collection when missing, diffs the live config against the schema, fixes
+what Qdrant can change in place (payload indexes, HNSW, quantization,
+on-disk vectors) and reports the rest as drift: a different distance needs
+a new collection and a re-embed; a smaller ``EMBEDDING_DIMENSIONS`` is
+handled by ``resize_collection``, which truncates the stored vectors.
+
+A collection with size or distance drift is never marked ready: every
+upsert and search against it would fail, so ``ensure_collection_ready``
+raises ``CollectionSchemaError`` instead.
+
+The app lifespan runs ``bootstrap_collections`` at startup and logs drift;
+``python -m app.tasks.qdrant_bootstrap`` does the same from the shell.
+Embedders only call ``ensure_collection_ready``, which is a dict lookup
+once the collection has been provisioned.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from qdrant_client import AsyncQdrantClient, models
+
+from app.config import get_settings
+from app.services.vector.dimensions import embedding_dimensions, truncate_embedding
+
+logger = logging.getLogger(__name__)
+
+
+class CollectionSchemaError(RuntimeError):
+    """The live collection cannot serve the schema (size or distance differ)."""
+
+
+@dataclass(frozen=True)
+class CollectionSchema:
+    name: str
+    size: int
+    distance: models.Distance = models.Distance.COSINE
+    on_disk: bool = False
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    quantization: str | None = "int8"  # "int8" (scalar) or None
+    payload_indexes: dict[str, models.PayloadSchemaType] = field(default_factory=dict)
+
+    def spec(self) -> dict[str, Any]:
+        """Comparable form, same keys as ``live_spec``."""
+        return {
+            "size": self.size,
+            "distance": self.distance,
+            "on_disk": self.on_disk,
+            "hnsw_m": self.hnsw_m,
+            "hnsw_ef_construct": self.hnsw_ef_construct,
+            "quantization": self.quantization,
+            "payload_indexes": dict(self.payload_indexes),
+        }
+
+    def vectors_config(self) -> models.VectorParams:
+        return models.VectorParams(size=self.size, distance=self.distance, on_disk=self.on_disk)
+
+    def hnsw_config(self) -> models.HnswConfigDiff:
+        return models.HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def quantization_config(self):
+        if self.quantization == "int8":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        return None
+
+
+def content_collection_schema() -> CollectionSchema:
+    settings = get_settings()
+    return CollectionSchema(
+        name="content_embeddings",
+        size=embedding_dimensions(),
+        on_disk=settings.QDRANT_ON_DISK,
+        quantization=None if settings.QDRANT_QUANTIZATION == "none" else settings.QDRANT_QUANTIZATION,
+        payload_indexes={
+            "source_id": models.PayloadSchemaType.KEYWORD,
+            "category_hint": models.PayloadSchemaType.KEYWORD,
+            "content_type": models.PayloadSchemaType.KEYWORD,
+            "published_at": models.PayloadSchemaType.DATETIME,
+        },
+    )
+
+
+CONTENT_COLLECTION = content_collection_schema()
+SCHEMAS = (CONTENT_COLLECTION,)
+
+# Fields Qdrant cannot change on an existing collection.
+RECREATE_FIELDS = ("size", "distance")
+
+
+def _quantization_name(config) -> str | None:
+    if isinstance(config, models.ScalarQuantization):
+        return models.ScalarType(config.scalar.type).value
+    if isinstance(config, models.BinaryQuantization):
+        return "binary"
+    if isinstance(config, models.ProductQuantization):
+        return "product"
+    return None
+
+
+def live_spec(info: models.CollectionInfo) -> dict[str, Any]:
+    """``CollectionSchema.spec()``-shaped view of a live collection."""
+    vectors = info.config.params.vectors
+    if isinstance(vectors, dict):  # named vectors; the schema uses the unnamed one
+        vectors = vectors.get("")
+    hnsw = info.config.hnsw_config
+    quantization = (vectors.quantization_config if vectors else None) or info.config.quantization_config
+    return {
+        "size": vectors.size if vectors else None,
+        "distance": vectors.distance if vectors else None,
+        "on_disk": bool(vectors.on_disk) if vectors else False,
+        "hnsw_m": hnsw.m,
+        "hnsw_ef_construct": hnsw.ef_construct,
+        "quantization": _quantization_name(quantization),
+        "payload_indexes": {name: idx.data_type for name, idx in (info.payload_schema or {}).items()},
+    }
+
+
+def diff_spec(want: dict[str, Any], live: dict[str, Any]) -> dict[str, tuple[Any, Any]]:
+    """``{field: (expected, live)}`` for every field that differs.
+
+    Payload indexes are compared per field as ``payload_indexes.<name>``;
+    extra live indexes are not drift.
+    """
+    drift: dict[str, tuple[Any, Any]] = {}
+    for key, expected in want.items():
+        if key == "payload_indexes":
+            for name, index_type in expected.items():
+                actual = live["payload_indexes"].get(name)
+                if actual != index_type:
+                    drift[f"payload_indexes.{name}"] = (index_type, actual)
+        elif live.get(key) != expected:
+            drift[key] = (expected, live.get(key))
+    return drift
+
+
+@dataclass
+class SchemaReport:
+    collection: str
+    created: bool = False
+    applied: list[str] = field(default_factory=list)
+    drift: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.drift
+
+    @property
+    def usable(self) -> bool:
+        """Whether vectors of the schema can be written to and searched in the collection."""
+        return not any(key in self.drift for key in (*RECREATE_FIELDS, "exists"))
+
+    def error(self) -> CollectionSchemaError:
+        drift = ", ".join(
+            f"{key} expected {expected}, live {actual}"
+            for key, (expected, actual) in self.drift.items()
+            if key in (*RECREATE_FIELDS, "exists")
+        )
+        hint = " (python -m app.tasks.qdrant_bootstrap --resize)" if "size" in self.drift else ""
+        return CollectionSchemaError(f"Qdrant collection {self.collection} does not match its schema: {drift}{hint}")
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "collection": self.collection,
+            "created": self.created,
+            "applied": self.applied,
+            "drift": {k: [str(e), str(a)] for k, (e, a) in self.drift.items()},
+        }
+
+
+_ready: dict[str, SchemaReport] = {}
+
+
+def collection_report(name: str) -> SchemaReport | None:
+    """Report of the last provisioning of ``name`` in this process, if any."""
+    return _ready.get(name)
+
+
+def reset_schema_readiness() -> None:
+    _ready.clear()
+
+
+async def _apply(client: AsyncQdrantClient, schema: CollectionSchema, key: str) -> None:
+    if key.startswith("payload_indexes."):
+        name = key.split(".", 1)[1]
+        info = await client.get_collection(schema.name)
+        if name in (info.payload_schema or {}):
+            await client.delete_payload_index(schema.name, name, wait=True)
+        await client.create_payload_index(
+            schema.name, name, field_schema=schema.payload_indexes[name], wait=True
+        )
+    elif key in ("hnsw_m", "hnsw_ef_construct"):
+        await client.update_collection(schema.name, hnsw_config=schema.hnsw_config())
+    elif key == "quantization":
+        await client.update_collection(
+            schema.name, quantization_config=schema.quantization_config() or models.Disabled.DISABLED
+        )
+    elif key == "on_disk":
+        await client.update_collection(
+            schema.name, vectors_config={"": models.VectorParamsDiff(on_disk=schema.on_disk)}
+        )
+
+
+async def _create(client: AsyncQdrantClient, schema: CollectionSchema) -> None:
+    await client.create_collection(
+        collection_name=schema.name,
+        vectors_config=schema.vectors_config(),
+        hnsw_config=schema.hnsw_config(),
+        quantization_config=schema.quantization_config(),
+    )
+
+
+async def ensure_collection(
+    client: AsyncQdrantClient,
+    schema: CollectionSchema,
+    *,
+    apply: bool = True,
+    create: bool = True,
+) -> SchemaReport:
+    """Create ``schema`` if missing (``create``), diff it against the live
+    collection and fix in-place drift when ``apply``. Marks the collection
+    ready unless it is missing or its size or distance differ."""
+    report = SchemaReport(collection=schema.name)
+    if not await client.collection_exists(schema.name):
+        if not create:
+            report.drift = {"exists": (True, False)}
+            return report
+        try:
+            await _create(client, schema)
+            report.created = True
+        except Exception:
+            # Another replica created it between the check and the create.
+            if not await client.collection_exists(schema.name):
+                raise
+
+    drift = diff_spec(schema.spec(), live_spec(await client.get_collection(schema.name)))
+    for key in list(drift):
+        if not apply or key in RECREATE_FIELDS:
+            continue
+        if key == "hnsw_ef_construct" and "hnsw_m" in report.applied:
+            continue  # one update covers both
+        try:
+            await _apply(client, schema, key)
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Qdrant {schema.name}: could not apply {key}: {e}")
+            continue
+        report.applied.append(key)
+
+    if report.applied:
+        drift = diff_spec(schema.spec(), live_spec(await client.get_collection(schema.name)))
+    report.drift = drift
+    if report.usable:
+        _ready[schema.name] = report
+    return report
+
+
+async def ensure_collection_ready(client: AsyncQdrantClient, schema: CollectionSchema = CONTENT_COLLECTION) -> None:
+    """Provision ``schema`` unless this process already has.
+
+    Raises ``CollectionSchemaError`` if the live size or distance differ.
+    """
+    if schema.name not in _ready:
+        report = await ensure_collection(client, schema, apply=get_settings().QDRANT_SCHEMA_AUTOFIX)
+        if not report.usable:
+            raise report.error()
+
+
+async def bootstrap_collections(
+    client: AsyncQdrantClient,
+    *,
+    apply: bool | None = None,
+    create: bool = True,
+) -> list[SchemaReport]:
+    """Provision every schema and log drift (app startup / CLI)."""
+    if apply is None:
+        apply = get_settings().QDRANT_SCHEMA_AUTOFIX
+    reports = []
+    for schema in SCHEMAS:
+        report = await ensure_collection(client, schema, apply=apply, create=create)
+        if report.created:
+            logger.info(f"Qdrant collection {schema.name} created")
+        if report.applied:
+            logger.info(f"Qdrant collection {schema.name}: applied {', '.join(report.applied)}")
+        if not report.usable:
+            logger.error(f"{report.error()}; embedding writes and searches will fail")
+        for key, (expected, actual) in report.drift.items():
+            if key not in RECREATE_FIELDS:
+                logger.warning(f"Qdrant schema drift in {schema.name}.{key}: expected {expected}, live {actual}")
+        reports.append(report)
+    return reports
+
+
+async def _copy_points(
+    client: AsyncQdrantClient,
+    source: str,
+    target: str,
+    *,
+    size: int | None = None,
+    batch_size: int = 256,
+) -> int:
+    """Copy every point of ``source`` into ``target``, truncating vectors to ``size`` if given."""
+    copied = 0
+    offset = None
+    while True:
+        points, offset = await client.scroll(
+            source, limit=batch_size, offset=offset, with_payload=True, with_vectors=True
+        )
+        if points:
+            await client.upsert(
+                target,
+                points=[
+                    models.PointStruct(
+                        id=p.id,
+                        vector=truncate_embedding(p.vector, size) if size else p.vector,
+                        payload=p.payload,
+                    )
+                    for p in points
+                ],
+                wait=True,
+            )
+            copied += len(points)
+        if offset is None:
+            return copied
+
+
+async def resize_collection(
+    client: AsyncQdrantClient,
+    schema: CollectionSchema = CONTENT_COLLECTION,
+    *,
+    batch_size: int = 256,
+) -> dict[str, Any]:
+    """Shrink the live collection to ``schema.size`` without re-embedding.
+
+    Stored vectors are Matryoshka embeddings, so each one is cut to
+    ``schema.size`` values and re-normalized. Points go to a staging
+    collection first, the collection is recreated from the schema and the
+    points are copied back. The staging copy is complete once the original
+    is dropped, so a run that fails after that (before or during the copy
+    back) resumes from it. Growing needs a re-embed and is refused.
+    """
+    staging = replace(schema, name=f"{schema.name}__resize_{schema.size}", payload_indexes={})
+    result = {"collection": schema.name, "from": None, "to": schema.size, "points": 0}
+    staged = await client.collection_exists(staging.name)
+
+    if await client.collection_exists(schema.name):
+        live_size = live_spec(await client.get_collection(schema.name))["size"]
+        result["from"] = live_size
+        if live_size == schema.size:
+            if not staged:
+                return result
+            # Recreated, but the copy back did not finish: resume it below.
+        elif live_size < schema.size:
+            raise ValueError(
+                f"Qdrant {schema.name} holds {live_size}-dim vectors; growing to {schema.size} needs a re-embed"
+            )
+        else:
+            if staged:
+                await client.delete_collection(staging.name)  # leftover of an interrupted first pass
+            await _create(client, staging)
+            result["points"] = await _copy_points(
+                client, schema.name, staging.name, size=schema.size, batch_size=batch_size
+            )
+            await client.delete_collection(schema.name)
+    elif not staged:
+        return result
+
+    _ready.pop(schema.name, None)
+    await ensure_collection(client, schema)
+    result["points"] = await _copy_points(client, staging.name, schema.name, batch_size=batch_size)
+    await client.delete_collection(staging.name)
+    logger.info(f"Qdrant collection {schema.name} resized {result['from']} -> {schema.size} ({result['points']} points)")
+    return result
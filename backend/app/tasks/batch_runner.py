@@ -0,0 +1,235 @@
+"""Bounded-concurrency, resumable batch runner shared by the seed CLIs.
+
+``BatchRunner.run(items, work)`` runs ``work(item)`` on ``workers`` tasks,
+buffers successful results and hands them to ``flush`` (e.g. one bulk DB
+upsert) every ``flush_size`` results. A key is appended to the checkpoint
+only after its result was flushed, so a rerun with the same checkpoint skips
+finished work and retries everything else. Progress (throughput, ETA) is
+written to stderr while the batch runs.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Generic, Iterable, Sequence, TextIO, TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_CHECKPOINT_DIR = Path(__file__).resolve().parents[2] / "crawl_targets" / "checkpoints"
+
+
+class Checkpoint:
+    """Append-only JSONL record of completed keys."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.done: set[str] = set()
+        if self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                try:
+                    self.done.add(json.loads(line)["key"])
+                except (ValueError, KeyError, TypeError):
+                    continue  # torn last line after a crash
+
+    def reset(self) -> None:
+        self.done.clear()
+        self.path.unlink(missing_ok=True)
+
+    def mark(self, entries: Sequence[tuple[str, str | None]]) -> None:
+        """Record ``(key, outcome)`` pairs durably."""
+        if not entries:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        at = datetime.now(timezone.utc).isoformat()
+        with open(self.path, "a", encoding="utf-8") as f:
+            for key, outcome in entries:
+                f.write(json.dumps({"key": key, "outcome": outcome, "at": at}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(key for key, _ in entries)
+
+
+@dataclass
+class ItemResult(Generic[T, R]):
+    key: str
+    item: T
+    ok: bool
+    value: R | None = None
+    outcome: str | None = None
+    error: str | None = None
+
+
+@dataclass
+class BatchStats:
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    flushed: int = 0
+    flushes: int = 0
+    started: float = field(default_factory=time.monotonic)
+    stopped_early: bool = False
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def eta_sec(self) -> float | None:
+        rate = self.rate()
+        remaining = self.total - self.skipped - self.completed
+        return remaining / rate if rate > 0 else None
+
+    def as_dict(self) -> dict[str, Any]:
+        eta = self.eta_sec()
+        return {
+            "total": self.total,
+            "skipped_checkpointed": self.skipped,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "flushed": self.flushed,
+            "flushes": self.flushes,
+            "stopped_early": self.stopped_early,
+            "elapsed_sec": round(time.monotonic() - self.started, 2),
+            "items_per_sec": round(self.rate(), 2),
+            "eta_sec": round(eta, 1) if eta is not None else None,
+        }
+
+
+class BatchRunner(Generic[T, R]):
+    """Run ``work`` over items with bounded concurrency and batched flushes."""
+
+    def __init__(
+        self,
+        *,
+        workers: int = 4,
+        key: Callable[[T], str] = str,
+        flush: Callable[[list[R]], Awaitable[Sequence[str] | None]] | None = None,
+        flush_size: int = 50,
+        checkpoint: Checkpoint | None = None,
+        continue_on_error: bool = True,
+        progress_every_sec: float = 5.0,
+        progress_stream: TextIO | None = sys.stderr,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.key = key
+        self.flush = flush
+        self.flush_size = max(1, flush_size)
+        self.checkpoint = checkpoint
+        self.continue_on_error = continue_on_error
+        self.progress_every_sec = progress_every_sec
+        self.progress_stream = progress_stream
+        self.stats = BatchStats()
+
+    def _report(self) -> None:
+        if self.progress_stream is None:
+            return
+        s = self.stats
+        eta = s.eta_sec()
+        print(
+            f"[{s.skipped + s.completed}/{s.total}] ok={s.succeeded} failed={s.failed} "
+            f"{s.rate():.2f}/s eta={'?' if eta is None else f'{eta:.0f}s'}",
+            file=self.progress_stream,
+            flush=True,
+        )
+
+    async def run(
+        self,
+        items: Iterable[T],
+        work: Callable[[T], Awaitable[R]],
+    ) -> list[ItemResult[T, R]]:
+        """Process ``items``; results keep input order (checkpointed items omitted)."""
+        items = list(items)
+        done = self.checkpoint.done if self.checkpoint else set()
+        self.stats = stats = BatchStats(total=len(items))
+        todo: list[tuple[int, str, T]] = []
+        for item in items:
+            key = self.key(item)
+            if key in done:
+                stats.skipped += 1
+            else:
+                todo.append((len(todo), key, item))
+
+        results: list[ItemResult[T, R] | None] = [None] * len(todo)
+        queue: asyncio.Queue[tuple[int, str, T]] = asyncio.Queue()
+        for entry in todo:
+            queue.put_nowait(entry)
+        buffer: list[ItemResult[T, R]] = []
+        flush_lock = asyncio.Lock()
+        stop = asyncio.Event()
+
+        async def flush_buffer() -> None:
+            async with flush_lock:
+                batch = buffer[:]
+                del buffer[: len(batch)]
+                if not batch:
+                    return
+                try:
+                    outcomes = await self.flush([r.value for r in batch]) if self.flush else None
+                except Exception as e:  # noqa: BLE001 - the whole batch stays unfinished
+                    error = f"flush_failed: {type(e).__name__}: {e}"
+                    for r in batch:
+                        r.ok, r.error = False, error
+                    stats.succeeded -= len(batch)
+                    stats.failed += len(batch)
+                    if not self.continue_on_error:
+                        stop.set()
+                    return
+                for r, outcome in zip(batch, outcomes or [None] * len(batch)):
+                    r.outcome = outcome
+                stats.flushes += 1
+                stats.flushed += len(batch)
+                if self.checkpoint is not None:
+                    self.checkpoint.mark([(r.key, r.outcome) for r in batch])
+
+        async def worker() -> None:
+            while not stop.is_set():
+                try:
+                    idx, key, item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    value = await work(item)
+                except Exception as e:  # noqa: BLE001
+                    results[idx] = ItemResult(key, item, ok=False, error=f"{type(e).__name__}: {e}")
+                    stats.failed += 1
+                    if not self.continue_on_error:
+                        stop.set()
+                    continue
+                result = ItemResult(key, item, ok=True, value=value)
+                results[idx] = result
+                stats.succeeded += 1
+                buffer.append(result)
+                if len(buffer) >= self.flush_size:
+                    await flush_buffer()
+
+        async def reporter() -> None:
+            while True:
+                await asyncio.sleep(self.progress_every_sec)
+                self._report()
+
+        report_task = asyncio.create_task(reporter()) if self.progress_every_sec > 0 else None
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.workers, len(todo)) or 1)))
+            await flush_buffer()
+        finally:
+            if report_task is not None:
+                report_task.cancel()
+        stats.stopped_early = stop.is_set() and not queue.empty()
+        self._report()
+        return [r for r in results if r is not None]
+
+
+def default_checkpoint_path(task_name: str) -> Path:
+    return DEFAULT_CHECKPOINT_DIR / f"{task_name}.jsonl"
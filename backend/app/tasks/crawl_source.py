@@ -0,0 +1,253 @@
+"""Crawl one configured source and write its new items.
+
+This is the job the background scheduler runs for every enabled source
+(``crawl_<source_id>``). It can also be run by hand:
+
+    python -m app.tasks.crawl_source <source_id>
+
+The crawler is chosen from the source and its ``config``:
+
+* ``config["crawler"] == "google_blog"``: the listing page is rendered and
+  each article it links to is crawled with the Google Blog extractor;
+* RSS sources: new feed entries;
+* Playwright sources with ``config["catalog_kind"] == "html_index"`` (or
+  ``mode: index``): the index page is rendered and the articles it links to
+  are crawled, using the catalog entry's allow/deny rules and ``limit``;
+* Playwright sources with ``mode: article``: the page itself.
+
+Index pages only crawl links that are not stored yet. Any other source is
+skipped as ``unsupported``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import yaml
+from sqlalchemy import or_, select, update
+
+from app.core.database import async_session
+from app.models.source import CrawledContent, Source, SourceType
+from app.schemas.source import CrawledContent as CrawledItem
+from app.services.crawler.bulk_upsert import bulk_upsert_crawled_contents
+from app.services.crawler.google_blog import crawl_google_blog_article
+from app.services.crawler.google_blog_ingest import google_blog_row, validate_google_blog_url
+from app.services.crawler.near_duplicate import get_near_duplicate_index
+from app.services.crawler.playwright_scraper import PlaywrightCrawler
+from app.services.crawler.rss import FeedState, RSSCrawler
+from app.services.crawler.session import closing_crawl_sessions
+from app.services.crawler.url_filter import RULE_KEYS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG = Path(__file__).resolve().parents[2] / "crawl_targets" / "source_catalog.yaml"
+INDEX_LIMIT = 30  # links per index crawl when neither the source nor the catalog sets one
+
+_rss: RSSCrawler | None = None
+_playwright: PlaywrightCrawler | None = None
+
+
+def _now_utc_naive() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _rss_crawler() -> RSSCrawler:
+    """Shared RSS crawler (it keeps seen-entry state)."""
+    global _rss
+    if _rss is None:
+        _rss = RSSCrawler()
+    return _rss
+
+
+def _playwright_crawler() -> PlaywrightCrawler:
+    global _playwright
+    if _playwright is None:
+        _playwright = PlaywrightCrawler()
+    return _playwright
+
+
+def crawl_kind(source: Source) -> str | None:
+    """``google_blog``, ``rss``, ``index`` or ``article``; ``None`` if unsupported."""
+    config = source.config or {}
+    if config.get("crawler") == "google_blog":
+        return "google_blog"
+    if source.source_type == SourceType.RSS:
+        return "rss"
+    if source.source_type == SourceType.PLAYWRIGHT:
+        if config.get("catalog_kind") == "html_index" or config.get("mode") == "index":
+            return "index"
+        if config.get("mode") == "article":
+            return "article"
+    return None
+
+
+@lru_cache(maxsize=1)
+def _catalog_sources(path: Path = DEFAULT_CATALOG) -> dict[str, dict[str, Any]]:
+    try:
+        catalog = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    except OSError:
+        return {}
+    return {str(src.get("id")): src for src in catalog.get("sources") or [] if src.get("id")}
+
+
+def index_config(source: Source) -> dict[str, Any]:
+    """Link rules and ``limit`` for an index page: the source config, then its
+    catalog entry, else every link under the index URL."""
+    config = dict(source.config or {})
+    entry = _catalog_sources().get(str(config.get("catalog_id") or ""), {})
+    for key in (*RULE_KEYS, "limit"):
+        if key not in config and key in entry:
+            config[key] = entry[key]
+    if not any(config.get(key) for key in RULE_KEYS):
+        config["allow_prefixes"] = [source.url.rstrip("/") + "/"]
+    config.setdefault("limit", INDEX_LIMIT)
+    return config
+
+
+async def _unstored(links: list[str], index_url: str) -> list[str]:
+    """``links`` minus the index page itself and articles already stored."""
+    links = [link for link in links if link.rstrip("/") != index_url.rstrip("/")]
+    if not links:
+        return []
+    async with async_session() as session:
+        stored = (
+            await session.execute(
+                select(CrawledContent.source_url, CrawledContent.canonical_url).where(
+                    or_(CrawledContent.source_url.in_(links), CrawledContent.canonical_url.in_(links))
+                )
+            )
+        ).all()
+    known = {url for row in stored for url in row if url}
+    return [link for link in links if link not in known]
+
+
+def _is_google_blog_url(url: str) -> bool:
+    try:
+        validate_google_blog_url(url)
+    except ValueError:
+        return False
+    return True
+
+
+async def _google_blog_rows(source: Source) -> list[dict[str, Any]]:
+    links = await _playwright_crawler().index_links(source.url, index_config(source))
+    links = [link for link in await _unstored(links, source.url) if _is_google_blog_url(link)]
+    items = await asyncio.gather(*(crawl_google_blog_article(link) for link in links), return_exceptions=True)
+    rows = []
+    for link, item in zip(links, items):
+        if isinstance(item, Exception):
+            logger.warning("Google Blog article %s failed: %s", link, item)
+            continue
+        if isinstance(item, BaseException):
+            raise item
+        rows.append(google_blog_row(item, source.id))
+    return rows
+
+
+async def _crawl_rows(
+    kind: str, source: Source, config: dict[str, Any]
+) -> tuple[list[dict[str, Any]], FeedState | None]:
+    """Rows to upsert, and for RSS the feed state to apply once they are committed."""
+    if kind == "google_blog":
+        return await _google_blog_rows(source), None
+    feed_state = None
+    if kind == "rss":
+        items, feed_state = await _rss_crawler().crawl_pending(source.url, config)
+    elif kind == "index":
+        crawler = _playwright_crawler()
+        links = await crawler.index_links(source.url, index_config(source))
+        items = await crawler.crawl_links(await _unstored(links, source.url), config)
+    else:
+        items = await _playwright_crawler().crawl(source.url, {**config, "mode": "article"})
+    return [content_row(item) for item in items], feed_state
+
+
+def content_row(item: CrawledItem) -> dict[str, Any]:
+    """``crawled_contents`` row dict for a crawler result."""
+    row = item.model_dump(mode="python")
+    row["source_url"] = str(item.source_url)
+    row["canonical_url"] = str(item.canonical_url or item.source_url)
+    row["outbound_urls"] = [str(u) for u in item.outbound_urls]
+    row["published_at"] = _naive_utc(item.published_at)
+    row["fetched_at"] = _naive_utc(item.fetched_at)
+    return row
+
+
+async def crawl_source(source_id: str) -> dict[str, Any]:
+    """Crawl ``source_id`` once and upsert what it returns."""
+    async with async_session() as session:
+        source = await session.get(Source, source_id)
+    if source is None or not source.enabled:
+        reason = "not_found" if source is None else "disabled"
+        return {"source_id": source_id, "status": "skipped", "reason": reason}
+
+    kind = crawl_kind(source)
+    if kind is None:
+        return {
+            "source_id": source_id,
+            "status": "skipped",
+            "reason": "unsupported",
+            "detail": f"no crawler for {source.source_type.value} source with config {source.config or {}}",
+        }
+
+    config = {**(source.config or {}), "source_id": source.id, "source_name": source.name}
+    rows, feed_state = await _crawl_rows(kind, source, config)
+
+    near_dups = get_near_duplicate_index()
+    staged = near_dups.flag_rows(rows) if near_dups is not None else None
+    now = _now_utc_naive()
+    async with async_session() as session:
+        # Workers do not share the RSS seen-state, so a feed entry can come
+        # back after it was processed; re-crawling must not reset its status,
+        # nor move its publish time (the adaptive schedule counts those).
+        outcomes = await bulk_upsert_crawled_contents(
+            session, rows, keep_existing=("thread_status", "published_at")
+        )
+        await session.execute(
+            update(Source)
+            .where(Source.id == source.id)
+            .values(last_crawled_at=now, updated_at=now)
+        )
+        await session.commit()
+    if feed_state is not None:
+        # Only now: if the write failed, a retry must see these entries as new.
+        rss = _rss_crawler()
+        rss.apply(source.url, feed_state)
+        rss.save()
+    if near_dups is not None:
+        near_dups.commit(staged)
+        near_dups.save()
+
+    return {
+        "source_id": source_id,
+        "status": "ok",
+        "crawler": kind,
+        "items": len(rows),
+        "inserted": outcomes.count("inserted"),
+        "updated": outcomes.count("updated"),
+        "near_duplicates": staged.flagged if staged is not None else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Crawl one configured source now.")
+    parser.add_argument("source_id")
+    args = parser.parse_args()
+    result = asyncio.run(closing_crawl_sessions(crawl_source(args.source_id)))
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Crawl worker processes fed from the Redis work queue.
+
+Run one or more workers (on any machine that reaches Redis and the DB)::
+
+    python -m app.tasks.crawl_worker work --concurrency 4
+
+and feed them::
+
+    python -m app.tasks.crawl_worker enqueue-sources
+    python -m app.tasks.crawl_worker enqueue-url https://blog.google/...
+    python -m app.tasks.crawl_worker stats
+    python -m app.tasks.crawl_worker requeue-dead
+
+Job kinds map to the existing crawl functions (``HANDLERS``). A worker keeps
+up to ``--concurrency`` jobs in flight, extends their leases while they run
+and acks or fails each one; see ``app.services.crawler.work_queue``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.core.database import async_session
+from app.core.leader_lease import replica_id
+from app.models.source import Source
+from app.services.crawler.google_blog_ingest import crawl_and_upsert_google_blog_article
+from app.services.crawler.session import closing_crawl_sessions
+from app.services.crawler.work_queue import CrawlQueue, QueueJob, get_crawl_queue
+from app.tasks.crawl_source import crawl_source
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict[str, Any]], Awaitable[Any]]
+
+
+async def _run_source(args: dict[str, Any]) -> Any:
+    return await crawl_source(args["source_id"])
+
+
+async def _run_google_blog(args: dict[str, Any]) -> Any:
+    return await crawl_and_upsert_google_blog_article(args["url"])
+
+
+HANDLERS: dict[str, Handler] = {
+    "source": _run_source,
+    "google_blog": _run_google_blog,
+}
+
+
+async def enqueue_source_crawl(source_id: str) -> str | None:
+    """Scheduler job used when ``CRAWL_QUEUE_ENABLED``: hand the crawl to the workers."""
+    return await get_crawl_queue().enqueue("source", {"source_id": source_id})
+
+
+class CrawlWorker:
+    """Claims queued jobs and runs them with bounded concurrency."""
+
+    def __init__(
+        self,
+        queue: CrawlQueue,
+        handlers: dict[str, Handler] | None = None,
+        *,
+        concurrency: int = 4,
+        poll_sec: float = 1.0,
+        token: str | None = None,
+    ) -> None:
+        self.queue = queue
+        self.handlers = handlers or HANDLERS
+        self.concurrency = max(1, concurrency)
+        self.poll_sec = poll_sec
+        self.token = token or replica_id()
+        self.counts = {"completed": 0, "retried": 0, "dead": 0, "lease_lost": 0}
+        self._running: dict[asyncio.Task, QueueJob] = {}
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming; jobs in flight are finished."""
+        self._stopping.set()
+
+    async def _execute(self, job: QueueJob) -> None:
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise LookupError(f"no handler for job kind {job.kind!r}")
+            await handler(job.args)
+        except Exception as e:  # noqa: BLE001 - every failure goes back to the queue
+            outcome = await self.queue.fail(job, f"{type(e).__name__}: {e}")
+            if outcome is None:
+                self.counts["lease_lost"] += 1
+            else:
+                self.counts["retried" if outcome == "retry" else "dead"] += 1
+                logger.warning("Job %s failed (%s, attempt %d): %s", job.id, outcome, job.attempts, e)
+            return
+        if await self.queue.complete(job):
+            self.counts["completed"] += 1
+        else:
+            self.counts["lease_lost"] += 1
+
+    async def _heartbeat(self) -> None:
+        interval = max(self.queue.visibility_sec / 3, 0.5)
+        while True:
+            await asyncio.sleep(interval)
+            for job in list(self._running.values()):
+                try:
+                    await self.queue.extend(job)
+                except Exception as e:  # noqa: BLE001 - the lease may still expire; the job is retried
+                    logger.warning("Could not extend lease of %s: %s", job.id, e)
+
+    async def run(self, *, until_idle: bool = False) -> dict[str, int]:
+        """Work until ``stop()`` (or, with ``until_idle``, until no job is due or running)."""
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            while not self._stopping.is_set():
+                free = self.concurrency - len(self._running)
+                jobs = await self.queue.claim(free, self.token) if free else []
+                for job in jobs:
+                    self._running[asyncio.create_task(self._execute(job))] = job
+                if not self._running:
+                    if until_idle:
+                        break
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_sec)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                # Full: wait for a slot. Otherwise poll again for newly due jobs.
+                full = len(self._running) >= self.concurrency
+                done, _ = await asyncio.wait(
+                    self._running,
+                    timeout=None if full else self.poll_sec,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    self._running.pop(task)
+            if self._running:
+                await asyncio.wait(self._running)
+                self._running.clear()
+        finally:
+            heartbeat.cancel()
+        return dict(self.counts)
+
+
+async def _work(args: argparse.Namespace) -> dict[str, Any]:
+    worker = CrawlWorker(get_crawl_queue(), concurrency=args.concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    return {"worker": worker.token, **await worker.run(until_idle=args.until_idle)}
+
+
+async def _enqueue_sources(args: argparse.Namespace) -> dict[str, Any]:
+    async with async_session() as session:
+        stmt = select(Source.id).where(Source.enabled.is_(True))
+        if args.source_id:
+            stmt = stmt.where(Source.id.in_(args.source_id))
+        ids = (await session.execute(stmt)).scalars().all()
+    added = await get_crawl_queue().enqueue_many([("source", {"source_id": i}) for i in ids])
+    return {"sources": len(ids), "enqueued": len(added)}
+
+
+async def _enqueue_urls(args: argparse.Namespace) -> dict[str, Any]:
+    added = await get_crawl_queue().enqueue_many([(args.kind, {"url": u}) for u in args.urls])
+    return {"urls": len(args.urls), "enqueued": len(added)}
+
+
+async def _stats(args: argparse.Namespace) -> dict[str, Any]:
+    queue = get_crawl_queue()
+    return {**await queue.stats(), "dead_jobs": await queue.dead_jobs(args.dead)}
+
+
+async def _requeue_dead(args: argparse.Namespace) -> dict[str, Any]:
+    return {"requeued": await get_crawl_queue().requeue_dead()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Crawl worker and work queue tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    work = sub.add_parser("work", help="Claim and run queued crawl jobs.")
+    work.add_argument("--concurrency", type=int, default=get_settings().CRAWL_WORKER_CONCURRENCY)
+    work.add_argument("--until-idle", action="store_true", help="Exit when nothing is due or running.")
+    work.set_defaults(run=_work)
+
+    sources = sub.add_parser("enqueue-sources", help="Queue a crawl of every enabled source.")
+    sources.add_argument("--source-id", action="append", help="Only these sources (repeatable).")
+    sources.set_defaults(run=_enqueue_sources)
+
+    urls = sub.add_parser("enqueue-url", help="Queue single-article crawls.")
+    urls.add_argument("urls", nargs="+")
+    urls.add_argument("--kind", default="google_blog", choices=sorted(k for k in HANDLERS if k != "source"))
+    urls.set_defaults(run=_enqueue_urls)
+
+    stats = sub.add_parser("stats", help="Queue depth, age and totals.")
+    stats.add_argument("--dead", type=int, default=10, help="Dead jobs to list.")
+    stats.set_defaults(run=_stats)
+
+    requeue = sub.add_parser("requeue-dead", help="Retry every dead job from scratch.")
+    requeue.set_defaults(run=_requeue_dead)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    args = parser.parse_args()
+    result = asyncio.run(closing_crawl_sessions(args.run(args)))
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
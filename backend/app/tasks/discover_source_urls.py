@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
-import re
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
 from urllib.parse import urljoin, urlparse, urlunparse
 
 import feedparser
@@ -13,6 +15,24 @@ import httpx
 import yaml
 from bs4 import BeautifulSoup
 
+from app.services.crawler.feed_cache import (
+    FeedCacheEntry,
+    FeedValidatorCache,
+    body_sha256,
+    config_fingerprint,
+)
+from app.services.crawler.url_filter import UrlFilter, url_filter_for
+from app.services.crawler.url_frontier import (
+    DISCOVERY_FRONTIER_DIR,
+    UrlFrontier,
+    canonicalize_url,
+)
+
+
+DEFAULT_FEED_CACHE = (
+    Path(__file__).resolve().parents[2] / "crawl_targets" / "feed_cache.json"
+)
+
 
 @dataclass
 class HttpDefaults:
@@ -20,9 +40,17 @@ class HttpDefaults:
     retries: int = 2
     user_agent: str = "TrendAIStudioBot/0.1"
     trust_env: bool = False
+    max_concurrency: int = 16
+    per_host_limit: int = 2
+    source_deadline_sec: float = 60.0
 
 
 def _normalize_url(url: str) -> str:
+    """Form of ``url`` that is fetched, filtered and stored (fragment dropped).
+
+    The frontier keys on ``canonicalize_url`` instead; rewriting the stored
+    URL itself would change ``allow_prefixes`` matching and ``source_url``.
+    """
     p = urlparse(url)
     return urlunparse((p.scheme, p.netloc, p.path, p.params, p.query, ""))
 
@@ -32,16 +60,23 @@ def _is_http_url(url: str) -> bool:
     return scheme in {"http", "https"}
 
 
-def _extract_feed_items(text: str, limit: int | None) -> list[dict[str, Any]]:
+def _extract_feed_items(
+    text: str,
+    limit: int | None,
+    url_filter: UrlFilter | None = None,
+) -> list[dict[str, Any]]:
     parsed = feedparser.parse(text)
     out: list[dict[str, Any]] = []
     for ent in parsed.entries:
         link = getattr(ent, "link", None)
         if not link:
             continue
+        norm = _normalize_url(str(link))
+        if url_filter is not None and not url_filter(norm):
+            continue
         out.append(
             {
-                "url": _normalize_url(str(link)),
+                "url": norm,
                 "title": getattr(ent, "title", None),
                 "published": getattr(ent, "published", None)
                 or getattr(ent, "updated", None),
@@ -56,21 +91,11 @@ def _extract_index_items(
     base_url: str,
     html: str,
     *,
-    allow_prefixes: list[str] | None,
-    deny_prefixes: list[str] | None,
-    allow_regexes: list[str] | None,
-    deny_regexes: list[str] | None,
+    url_filter: UrlFilter | None,
     limit: int | None,
 ) -> list[dict[str, Any]]:
     soup = BeautifulSoup(html, "html.parser")
 
-    allow_prefixes = allow_prefixes or []
-    deny_prefixes = deny_prefixes or []
-    allow_regexes = allow_regexes or []
-    deny_regexes = deny_regexes or []
-    allow_patterns = [re.compile(p) for p in allow_regexes]
-    deny_patterns = [re.compile(p) for p in deny_regexes]
-
     seen: set[str] = set()
     out: list[dict[str, Any]] = []
 
@@ -80,16 +105,10 @@ def _extract_index_items(
             continue
         norm = _normalize_url(full)
 
-        if allow_prefixes and not any(norm.startswith(p) for p in allow_prefixes):
-            continue
-        if any(norm.startswith(p) for p in deny_prefixes):
-            continue
-        if allow_patterns and not any(p.search(norm) for p in allow_patterns):
-            continue
-        if any(p.search(norm) for p in deny_patterns):
-            continue
         if norm in seen:
             continue
+        if url_filter is not None and not url_filter(norm):
+            continue
 
         seen.add(norm)
         title = a.get_text(" ", strip=True) or None
@@ -100,16 +119,20 @@ def _extract_index_items(
     return out
 
 
-def _request_with_retries(
-    client: httpx.Client,
+async def _request_with_retries(
+    client: httpx.AsyncClient,
     url: str,
     *,
     retries: int,
+    validators: FeedCacheEntry | None = None,
 ) -> httpx.Response:
+    headers = validators.conditional_headers() if validators else None
     last_err: Exception | None = None
     for _ in range(max(1, retries + 1)):
         try:
-            res = client.get(url)
+            res = await client.get(url, headers=headers)
+            if res.status_code == 304 and validators is not None:
+                return res
             res.raise_for_status()
             return res
         except Exception as e:  # noqa: BLE001
@@ -119,118 +142,239 @@ def _request_with_retries(
     raise RuntimeError("Unexpected retry state")
 
 
-def discover_from_catalog(
-    catalog: dict[str, Any],
+def _extract_source_items(
+    stype: str,
+    base_url: str,
+    text: str,
     *,
-    only_ids: set[str] | None = None,
-) -> dict[str, Any]:
+    url_filter: UrlFilter,
+    limit: int,
+) -> list[dict[str, Any]]:
+    if stype in {"rss", "atom"}:
+        return _extract_feed_items(text, limit, url_filter)
+    return _extract_index_items(base_url, text, url_filter=url_filter, limit=limit)
+
+
+def _http_defaults(catalog: dict[str, Any]) -> HttpDefaults:
     http_cfg = (catalog.get("defaults") or {}).get("http") or {}
-    defaults = HttpDefaults(
+    return HttpDefaults(
         timeout_sec=float(http_cfg.get("timeout_sec", 20)),
         retries=int(http_cfg.get("retries", 2)),
         user_agent=str(http_cfg.get("user_agent", "TrendAIStudioBot/0.1")),
         trust_env=bool(http_cfg.get("trust_env", False)),
+        max_concurrency=int(http_cfg.get("max_concurrency", 16)),
+        per_host_limit=int(http_cfg.get("per_host_limit", 2)),
+        source_deadline_sec=float(http_cfg.get("source_deadline_sec", 60)),
     )
 
+
+class _HostLimiter:
+    """Global concurrency cap plus a per-host (scheme://host:port) cap."""
+
+    def __init__(self, max_concurrency: int, per_host_limit: int) -> None:
+        self._global = asyncio.Semaphore(max(1, max_concurrency))
+        self._per_host_limit = max(1, per_host_limit)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        p = urlparse(url)
+        key = f"{p.scheme}://{p.netloc}".lower()
+        sem = self._hosts.get(key)
+        if sem is None:
+            sem = asyncio.Semaphore(self._per_host_limit)
+            self._hosts[key] = sem
+        return sem
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        # Take the host slot first so a busy host does not pin global slots.
+        async with self._host_semaphore(url):
+            async with self._global:
+                yield
+
+
+async def _discover_source(
+    client: httpx.AsyncClient,
+    limiter: _HostLimiter,
+    src: dict[str, Any],
+    defaults: HttpDefaults,
+    cache: FeedValidatorCache | None,
+) -> dict[str, Any]:
+    sid = str(src.get("id"))
+    stype = str(src.get("type", "")).lower()
+    url = str(src.get("url", "")).strip()
+    limit = int(src.get("limit", 30))
+    deadline = float(src.get("deadline_sec", defaults.source_deadline_sec))
+
+    if not url:
+        return {"id": sid, "ok": False, "error": "missing url", "items": []}
+
+    if stype not in {"rss", "atom", "html_index"}:
+        return {
+            "id": sid,
+            "ok": False,
+            "error": f"unsupported source type: {stype}",
+            "items": [],
+        }
+
+    fingerprint = config_fingerprint(src)
+    cached = cache.lookup(url, fingerprint) if cache else None
+    started = time.perf_counter()
+    try:
+        async with limiter.slot(url):
+            started = time.perf_counter()
+            res = await asyncio.wait_for(
+                _request_with_retries(
+                    client, url, retries=defaults.retries, validators=cached
+                ),
+                timeout=deadline,
+            )
+
+        body = res.content
+        body_hash = body_sha256(body) if cache else ""
+        if cached and res.status_code == 304:
+            cache_status = "not_modified"
+            cache.stats.not_modified += 1
+            cache.stats.bytes_saved += cached.body_bytes
+            cache.stats.parse_skipped_bytes += cached.body_bytes
+            items = cached.items
+        elif cached and body_hash == cached.body_sha256:
+            cache_status = "unchanged"
+            cache.stats.unchanged += 1
+            cache.stats.parse_skipped_bytes += len(body)
+            items = cached.items
+        else:
+            cache_status = "miss"
+            items = _extract_source_items(
+                stype,
+                str(res.url),
+                res.text,
+                url_filter=url_filter_for(src),
+                limit=limit,
+            )
+            if cache:
+                cache.stats.misses += 1
+
+        if cache:
+            cache.stats.bytes_downloaded += len(body)
+            if res.status_code != 304:
+                cache.store(
+                    url,
+                    fingerprint=fingerprint,
+                    body_hash=body_hash,
+                    body_bytes=len(body),
+                    items=items,
+                    etag=res.headers.get("etag"),
+                    last_modified=res.headers.get("last-modified"),
+                )
+
+        return {
+            "id": sid,
+            "name": src.get("name"),
+            "type": stype,
+            "ok": True,
+            "count": len(items),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "cache": cache_status if cache else None,
+            "items": items,
+        }
+    except asyncio.TimeoutError:
+        error = f"TimeoutError: source deadline of {deadline:g}s exceeded"
+    except Exception as e:  # noqa: BLE001
+        error = f"{type(e).__name__}: {e}"
+
+    return {
+        "id": sid,
+        "name": src.get("name"),
+        "type": stype,
+        "ok": False,
+        "error": error,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "items": [],
+    }
+
+
+async def discover_from_catalog_async(
+    catalog: dict[str, Any],
+    *,
+    only_ids: set[str] | None = None,
+    cache: FeedValidatorCache | None = None,
+    frontier: UrlFrontier | None = None,
+    mark_seen: bool = False,
+) -> dict[str, Any]:
+    """Fetch every enabled catalog source concurrently.
+
+    Concurrency is bounded globally (``max_concurrency``) and per host
+    (``per_host_limit``); each source gets its own ``source_deadline_sec``
+    so one slow feed cannot stall the run. Results keep catalog order.
+
+    With a ``cache``, requests are conditional and sources that answer 304
+    or return an identical body reuse their cached items without parsing.
+    The cache is saved before returning.
+
+    With a ``frontier``, every item gets a ``seen`` flag (recorded by an
+    earlier run) and ``new_urls`` lists only never-seen URLs. ``mark_seen``
+    also records those URLs and saves the frontier. Only a frontier of
+    *discovered* URLs may be marked here: the seed tasks' ``--skip-seen``
+    frontier means "ingested" and is recorded by them after the upsert.
+    """
+    defaults = _http_defaults(catalog)
+
     sources = catalog.get("sources") or []
     selected_sources = [
         src
         for src in sources
         if not only_ids or str(src.get("id", "")).strip() in only_ids
     ]
-    results: list[dict[str, Any]] = []
-    flat_urls: list[str] = []
-    skipped_ids: list[str] = []
+    skipped_ids = [
+        str(src.get("id"))
+        for src in selected_sources
+        if not bool(src.get("enabled", True))
+    ]
+    enabled_sources = [
+        src for src in selected_sources if bool(src.get("enabled", True))
+    ]
 
-    with httpx.Client(
+    limiter = _HostLimiter(defaults.max_concurrency, defaults.per_host_limit)
+    started = time.perf_counter()
+    async with httpx.AsyncClient(
         timeout=defaults.timeout_sec,
         follow_redirects=True,
         headers={"User-Agent": defaults.user_agent},
         trust_env=defaults.trust_env,
+        limits=httpx.Limits(
+            max_connections=max(1, defaults.max_concurrency),
+            max_keepalive_connections=max(1, defaults.max_concurrency),
+        ),
     ) as client:
-        for src in selected_sources:
-            sid = str(src.get("id"))
-            enabled = bool(src.get("enabled", True))
-            if not enabled:
-                skipped_ids.append(sid)
-                continue
-
-            stype = str(src.get("type", "")).lower()
-            url = str(src.get("url", "")).strip()
-            limit = int(src.get("limit", 30))
-            allow_prefixes = src.get("allow_prefixes") or []
-            deny_prefixes = src.get("deny_prefixes") or []
-            allow_regexes = src.get("allow_regexes") or []
-            deny_regexes = src.get("deny_regexes") or []
-
-            if not url:
-                results.append(
-                    {"id": sid, "ok": False, "error": "missing url", "items": []}
-                )
-                continue
-
-            try:
-                res = _request_with_retries(client, url, retries=defaults.retries)
-
-                if stype in {"rss", "atom"}:
-                    items = _extract_feed_items(res.text, limit)
-                    if allow_prefixes:
-                        items = [
-                            it
-                            for it in items
-                            if any(it["url"].startswith(p) for p in allow_prefixes)
-                        ]
-                    if deny_prefixes:
-                        items = [
-                            it
-                            for it in items
-                            if not any(it["url"].startswith(p) for p in deny_prefixes)
-                        ]
-                elif stype == "html_index":
-                    items = _extract_index_items(
-                        str(res.url),
-                        res.text,
-                        allow_prefixes=allow_prefixes,
-                        deny_prefixes=deny_prefixes,
-                        allow_regexes=allow_regexes,
-                        deny_regexes=deny_regexes,
-                        limit=limit,
-                    )
-                else:
-                    results.append(
-                        {
-                            "id": sid,
-                            "ok": False,
-                            "error": f"unsupported source type: {stype}",
-                            "items": [],
-                        }
-                    )
-                    continue
-
-                results.append(
-                    {
-                        "id": sid,
-                        "name": src.get("name"),
-                        "type": stype,
-                        "ok": True,
-                        "count": len(items),
-                        "items": items,
-                    }
-                )
-                flat_urls.extend([it["url"] for it in items])
-            except Exception as e:  # noqa: BLE001
-                results.append(
-                    {
-                        "id": sid,
-                        "name": src.get("name"),
-                        "type": stype,
-                        "ok": False,
-                        "error": f"{type(e).__name__}: {e}",
-                        "items": [],
-                    }
+        results: list[dict[str, Any]] = list(
+            await asyncio.gather(
+                *(
+                    _discover_source(client, limiter, src, defaults, cache)
+                    for src in enabled_sources
                 )
+            )
+        )
+    if cache:
+        cache.save()
 
+    flat_urls = [it["url"] for r in results for it in r.get("items") or []]
     unique_urls = list(dict.fromkeys(flat_urls))
+    new_urls: list[str] | None = None
+    if frontier is not None:
+        fresh = set(frontier.filter_new(unique_urls, mark=mark_seen))  # canonical form
+        new_urls = []
+        for url in unique_urls:
+            canonical = canonicalize_url(url)
+            if canonical in fresh:
+                fresh.discard(canonical)  # first spelling of each canonical URL
+                new_urls.append(url)
+        listed = set(new_urls)
+        for r in results:
+            for it in r.get("items") or []:
+                it["seen"] = it["url"] not in listed
+        if mark_seen:
+            frontier.save()
     return {
         "version": catalog.get("version"),
         "configured_sources": len(selected_sources),
@@ -239,12 +383,37 @@ def discover_from_catalog(
         "skipped_ids": skipped_ids,
         "ok_sources": sum(1 for r in results if r.get("ok")),
         "failed_sources": sum(1 for r in results if not r.get("ok")),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "cache": cache.stats.as_dict() if cache else None,
         "unique_url_count": len(unique_urls),
         "urls": unique_urls,
+        "frontier": frontier.stats() if frontier is not None else None,
+        "new_url_count": len(new_urls) if new_urls is not None else None,
+        "new_urls": new_urls,
         "sources": results,
     }
 
 
+def discover_from_catalog(
+    catalog: dict[str, Any],
+    *,
+    only_ids: set[str] | None = None,
+    cache: FeedValidatorCache | None = None,
+    frontier: UrlFrontier | None = None,
+    mark_seen: bool = False,
+) -> dict[str, Any]:
+    """Blocking wrapper around :func:`discover_from_catalog_async`."""
+    return asyncio.run(
+        discover_from_catalog_async(
+            catalog,
+            only_ids=only_ids,
+            cache=cache,
+            frontier=frontier,
+            mark_seen=mark_seen,
+        )
+    )
+
+
 def main() -> None:
     default_catalog = (
         Path(__file__).resolve().parents[2] / "crawl_targets" / "source_catalog.yaml"
@@ -268,10 +437,31 @@ def main() -> None:
         default="",
         help="Optional output JSON path.",
     )
+    parser.add_argument(
+        "--cache-file",
+        default=str(DEFAULT_FEED_CACHE),
+        help="ETag/Last-Modified validator cache file.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download and parse every source in full.",
+    )
+    parser.add_argument(
+        "--frontier-dir",
+        default=str(DISCOVERY_FRONTIER_DIR),
+        help="Persistent frontier of URLs listed by earlier discovery runs "
+        "(separate from the seed tasks' ingested-URL frontier).",
+    )
+    parser.add_argument(
+        "--no-frontier",
+        action="store_true",
+        help="Do not track URLs across runs; --out-urls lists every URL.",
+    )
     parser.add_argument(
         "--out-urls",
         default="",
-        help="Optional output plain-text URL list path.",
+        help="Optional output plain-text URL list path (only new URLs with the frontier).",
     )
     args = parser.parse_args()
 
@@ -281,7 +471,11 @@ def main() -> None:
 
     catalog = yaml.safe_load(catalog_path.read_text(encoding="utf-8"))
     only_ids = set(args.only) if args.only else None
-    result = discover_from_catalog(catalog, only_ids=only_ids)
+    cache = None if args.no_cache else FeedValidatorCache.load(Path(args.cache_file))
+    frontier = None if args.no_frontier else UrlFrontier(Path(args.frontier_dir))
+    result = discover_from_catalog(
+        catalog, only_ids=only_ids, cache=cache, frontier=frontier, mark_seen=True
+    )
 
     if args.out_json:
         out_json = Path(args.out_json)
@@ -294,7 +488,8 @@ def main() -> None:
     if args.out_urls:
         out_urls = Path(args.out_urls)
         out_urls.parent.mkdir(parents=True, exist_ok=True)
-        out_urls.write_text("\n".join(result["urls"]) + "\n", encoding="utf-8")
+        urls = result["new_urls"] if frontier is not None else result["urls"]
+        out_urls.write_text("\n".join(urls) + "\n", encoding="utf-8")
 
     # Windows CP949 consoles can fail on non-ASCII feed text/emojis.
     print(json.dumps(result, indent=2, ensure_ascii=True))
@@ -0,0 +1,45 @@
+"""Provision the Qdrant collections or check them for schema drift.
+
+Usage:
+    python -m app.tasks.qdrant_bootstrap           # create / fix in place
+    python -m app.tasks.qdrant_bootstrap --check   # report only, exit 1 on drift
+    python -m app.tasks.qdrant_bootstrap --resize  # truncate stored vectors to EMBEDDING_DIMENSIONS first
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+
+from app.services.vector.qdrant_embedder import close_qdrant_client, get_qdrant_client
+from app.services.vector.qdrant_schema import bootstrap_collections, resize_collection
+
+
+async def _run(apply: bool, resize: bool) -> list[dict]:
+    try:
+        if resize:
+            print(json.dumps(await resize_collection(get_qdrant_client())))
+        reports = await bootstrap_collections(get_qdrant_client(), apply=apply, create=apply)
+    finally:
+        await close_qdrant_client()
+    return [r.as_dict() for r in reports]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="do not change anything, exit 1 on drift")
+    parser.add_argument(
+        "--resize", action="store_true", help="shrink the content collection to EMBEDDING_DIMENSIONS (no re-embed)"
+    )
+    args = parser.parse_args()
+    if args.check and args.resize:
+        parser.error("--check and --resize are exclusive")
+    reports = asyncio.run(_run(apply=not args.check, resize=args.resize))
+    print(json.dumps(reports, indent=2))
+    if any(r["drift"] for r in reports):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import select, update
+
+from app.core.database import async_session
+from app.models.source import CrawledContent
+from app.services.crawler.archive import ArchiveRef, HtmlArchive, get_html_archive
+from app.services.crawler.offload import ExtractionPool
+from app.services.crawler.payload_store import load_raw_payloads, store_raw_payloads
+
+
+def _now_utc_naive() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _to_utc_naive(dt: datetime | None) -> datetime | None:
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _archive_ref(raw_payload: dict[str, Any] | None) -> tuple[ArchiveRef | None, list[str]]:
+    """Find the archive ref and the key path it lives under in ``raw_payload``.
+
+    Google Blog rows keep it at ``raw_payload.archive``; catalog seed rows
+    nest the crawler payload under ``raw_payload.crawl``.
+    """
+    payload = raw_payload or {}
+    for path in (["archive"], ["crawl", "archive"]):
+        node: Any = payload
+        for key in path:
+            node = node.get(key) if isinstance(node, dict) else None
+        if isinstance(node, dict) and node.get("sha256"):
+            return ArchiveRef.from_payload(node), path[:-1]
+    return None, []
+
+
+def _content_hash(canonical_url: str, title: str, published_at: datetime, content: str) -> str:
+    basis = f"{canonical_url}\n{title}\n{published_at.isoformat()}\n{content[:800]}"
+    return hashlib.sha256(basis.encode("utf-8")).hexdigest()
+
+
+async def _reextract_row(
+    row: CrawledContent,
+    stored_payload: dict[str, Any],
+    ref: ArchiveRef,
+    payload_path: list[str],
+    archive: HtmlArchive,
+    pool: ExtractionPool,
+) -> dict[str, Any] | None:
+    body = await asyncio.to_thread(archive.get, ref.sha256)
+    if ref.extractor == "google_blog":
+        item = await pool.google_blog_item(ref.url, body, encoding=ref.encoding)
+        fields: dict[str, Any] = {
+            "title": item.title,
+            "content": item.content,
+            "summary_hint": item.summary_hint,
+            "author": item.author,
+            "image_urls": [str(u) for u in item.image_urls],
+            "image_positions": item.image_positions,
+            "outbound_urls": [str(u) for u in item.outbound_urls],
+            "content_hash": item.content_hash,
+        }
+        published_at = _to_utc_naive(item.published_at)
+        extracted_payload = item.raw_payload
+    else:
+        result = await pool.generic_article(
+            ref.final_url,
+            body,
+            encoding=ref.encoding,
+            http_status=ref.http_status,
+            content_type=ref.content_type,
+        )
+        published_at = _to_utc_naive(result.published_at) or row.published_at
+        fields = {
+            "title": result.title,
+            "content": result.content,
+            "summary_hint": result.summary_hint,
+            "author": result.author,
+            "image_urls": result.image_urls,
+            "outbound_urls": result.outbound_urls,
+            "language": result.language or "en",
+            "content_hash": _content_hash(
+                row.canonical_url or result.canonical_url,
+                result.title,
+                published_at,
+                result.content,
+            ),
+        }
+        extracted_payload = result.raw_payload
+
+    if not (fields["content"] or "").strip():
+        return None
+    if published_at is not None:
+        fields["published_at"] = published_at
+
+    changed = {k: v for k, v in fields.items() if getattr(row, k) != v}
+    if not changed:
+        return None
+
+    # Keep the archive ref (and any discovery data around it) and refresh
+    # the extractor's own payload.
+    raw_payload = json.loads(json.dumps(stored_payload or {}, default=str))
+    target = raw_payload
+    for key in payload_path:
+        target = target.setdefault(key, {})
+    target.update(extracted_payload)
+    target["archive"] = ref.as_payload()
+
+    return {"id": row.id, **changed, "raw_payload": raw_payload}
+
+
+async def _run(args: argparse.Namespace) -> None:
+    archive = get_html_archive() if not args.archive_dir else HtmlArchive(args.archive_dir)
+    if archive is None:
+        raise SystemExit("HTML archive is disabled (CRAWLER_ARCHIVE_ENABLED=false).")
+    pool = ExtractionPool(workers=args.workers)
+
+    stats = {"scanned": 0, "archived": 0, "missing_object": 0, "unchanged": 0, "updated": 0, "failed": 0}
+    errors: list[dict[str, str]] = []
+    last_id: str | None = None
+    sem = asyncio.Semaphore(max(1, args.workers) * 4)
+
+    async def one(row: CrawledContent, payload: dict[str, Any]) -> dict[str, Any] | None:
+        ref, path = _archive_ref(payload)
+        if ref is None:
+            return None
+        stats["archived"] += 1
+        if not archive.has(ref.sha256):
+            stats["missing_object"] += 1
+            return None
+        async with sem:
+            try:
+                update_row = await _reextract_row(row, payload, ref, path, archive, pool)
+            except Exception as e:  # noqa: BLE001
+                stats["failed"] += 1
+                errors.append({"id": row.id, "error": f"{type(e).__name__}: {e}"})
+                return None
+        if update_row is None:
+            stats["unchanged"] += 1
+        return update_row
+
+    try:
+        while True:
+            async with async_session() as session:
+                stmt = select(CrawledContent).order_by(CrawledContent.id).limit(args.batch_size)
+                if last_id is not None:
+                    stmt = stmt.where(CrawledContent.id > last_id)
+                if args.source_id:
+                    stmt = stmt.where(CrawledContent.source_id == args.source_id)
+                rows = list((await session.execute(stmt)).scalars().all())
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                stats["scanned"] += len(rows)
+
+                payloads = await load_raw_payloads(session, [r.id for r in rows])
+                updates = [
+                    u for u in await asyncio.gather(*(one(r, payloads[r.id]) for r in rows)) if u
+                ]
+                if updates and not args.dry_run:
+                    now = _now_utc_naive()
+                    new_payloads = {u["id"]: u.pop("raw_payload") for u in updates}
+                    for u in updates:
+                        u["updated_at"] = now
+                    # ORM bulk UPDATE by primary key: one executemany per batch.
+                    await session.execute(update(CrawledContent), updates)
+                    await store_raw_payloads(session, new_payloads)
+                    await session.commit()
+                stats["updated"] += len(updates)
+
+            if args.limit and stats["scanned"] >= args.limit:
+                break
+    finally:
+        pool.shutdown()
+
+    print(
+        json.dumps(
+            {
+                "dry_run": args.dry_run,
+                "archive_dir": str(archive.root),
+                "workers": args.workers,
+                **stats,
+                "errors": errors[:20],
+            },
+            indent=2,
+            ensure_ascii=False,
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Re-run the current extractors over archived HTML and bulk-update crawled_contents."
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Extraction processes (0 = inline).")
+    parser.add_argument("--batch-size", type=int, default=200, help="Rows per DB read/update batch.")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after scanning about N rows.")
+    parser.add_argument("--source-id", default=None, help="Only rows for this sources.id.")
+    parser.add_argument("--archive-dir", default=None, help="Override CRAWLER_ARCHIVE_DIR.")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing.")
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
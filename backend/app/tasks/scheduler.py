@@ -1,61 +1,404 @@
+"""Background crawl scheduler.
+
+Jobs live in a persistent APScheduler job store (Redis by default), so they
+survive restarts and every replica sees the same schedule. Every replica
+starts its scheduler paused; a Redis leader lease decides which one resumes
+it and actually runs jobs. When the leader stops renewing, another replica
+takes the lease and resumes from the shared job store.
+
+With ``SCHEDULER_JOBSTORE=memory`` there is no lease and the process runs
+its jobs itself (single-process deployments and tests).
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import redis.asyncio as redis
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_SUBMITTED,
+    JobEvent,
+)
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.redis import RedisJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from redis import Redis
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.core.database import async_session
+from app.core.leader_lease import LeaderLease, replica_id
+from app.models.source import Source
+from app.services.crawler.adaptive_schedule import (
+    IntervalEstimate,
+    compute_adaptive_schedule,
+    schedule_savings,
+)
+from app.tasks.crawl_source import crawl_source
+from app.tasks.crawl_worker import enqueue_source_crawl
+
+logger = logging.getLogger(__name__)
+
+ADAPTIVE_JOB_ID = "adaptive_intervals"
+CRAWL_JOB_PREFIX = "crawl_"
+RESCHEDULE_TOLERANCE = 0.1  # ignore interval changes smaller than 10%
+
+
+async def refresh_adaptive_intervals() -> dict[str, Any]:
+    """Job entry point (job stores keep a reference to a module-level function)."""
+    return await scheduler.refresh_adaptive_intervals()
 
 
 class CrawlScheduler:
     """Background scheduler for crawling tasks."""
 
-    def __init__(self):
-        self.scheduler = AsyncIOScheduler()
+    def __init__(self, jobstore: str | None = None):
+        self.settings = get_settings()
+        self.jobstore = jobstore or self.settings.SCHEDULER_JOBSTORE
+        self.replica = replica_id()
+        self._prefix = self.settings.SCHEDULER_REDIS_PREFIX
+        self._sync_redis: Redis | None = None
+        self.scheduler = self._build_scheduler()
         self._is_running = False
+        self._is_leader = False
+        self._lease: LeaderLease | None = None
+        self._lease_task: asyncio.Task | None = None
+        self._started: dict[str, float] = {}
+        self._runs: dict[str, dict[str, Any]] = {}
+        self._configured: dict[str, int] = {}
+        self._intervals: dict[str, int] = {}
+        self._plan: list[IntervalEstimate] = []
+        self._plan_computed_at: str | None = None
 
-    def start(self):
-        """Start the scheduler."""
-        if not self._is_running:
+    def _build_scheduler(self) -> AsyncIOScheduler:
+        if self.jobstore == "redis":
+            store = RedisJobStore(
+                jobs_key=f"{self._prefix}:jobs",
+                run_times_key=f"{self._prefix}:run_times",
+            )
+            store.redis = self._sync_redis = Redis.from_url(self.settings.REDIS_URL)
+        elif self.jobstore == "memory":
+            store = MemoryJobStore()
+        else:
+            raise ValueError(f"Unknown SCHEDULER_JOBSTORE: {self.jobstore}")
+        sched = AsyncIOScheduler(
+            jobstores={"default": store},
+            job_defaults={
+                "coalesce": self.settings.SCHEDULER_COALESCE,
+                "max_instances": self.settings.SCHEDULER_MAX_INSTANCES,
+                "misfire_grace_time": self.settings.SCHEDULER_MISFIRE_GRACE_SEC,
+            },
+            timezone=timezone.utc,
+        )
+        sched.add_listener(self._on_submitted, EVENT_JOB_SUBMITTED)
+        sched.add_listener(
+            self._on_finished,
+            EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES,
+        )
+        return sched
+
+    # Run bookkeeping -----------------------------------------------------
+
+    def _on_submitted(self, event: JobEvent) -> None:
+        self._started[event.job_id] = time.perf_counter()
+
+    def _on_finished(self, event: JobEvent) -> None:
+        started = None
+        if event.code == EVENT_JOB_EXECUTED:
+            status = "ok"
+        elif event.code == EVENT_JOB_ERROR:
+            status = "error"
+        elif event.code == EVENT_JOB_MISSED:
+            status = "missed"
+        else:
+            status = "skipped_max_instances"
+        if status in {"ok", "error"}:
+            # A skipped firing must not consume the start time of the run in flight
+            started = self._started.pop(event.job_id, None)
+        run = {
+            "status": status,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "scheduled_run_time": str(getattr(event, "scheduled_run_time", None)),
+            "duration_sec": (
+                round(time.perf_counter() - started, 3) if started is not None else None
+            ),
+            "error": repr(event.exception) if getattr(event, "exception", None) else None,
+            "replica": self.replica,
+        }
+        self._runs[event.job_id] = run
+        if self._sync_redis is not None:
+            try:
+                self._sync_redis.hset(f"{self._prefix}:runs", event.job_id, json.dumps(run))
+            except Exception as e:  # noqa: BLE001 - bookkeeping must not fail the job
+                logger.warning("Could not record run of %s: %s", event.job_id, e)
+
+    def _last_runs(self) -> dict[str, dict[str, Any]]:
+        if self._sync_redis is None:
+            return dict(self._runs)
+        try:
+            raw = self._sync_redis.hgetall(f"{self._prefix}:runs")
+        except Exception:  # noqa: BLE001
+            return dict(self._runs)
+        return {k.decode(): json.loads(v) for k, v in raw.items()}
+
+    # Lifecycle -----------------------------------------------------------
+
+    async def start(self):
+        """Start the scheduler (paused until this replica holds the lease)."""
+        if self._is_running:
+            return
+        if self.jobstore == "memory":
             self.scheduler.start()
             self._is_running = True
+            await self._become_leader()
+            return
+        self.scheduler.start(paused=True)
+        self._is_running = True
+        self._lease = LeaderLease(
+            redis.from_url(self.settings.REDIS_URL),
+            f"{self._prefix}:leader",
+            ttl_sec=self.settings.SCHEDULER_LEASE_TTL_SEC,
+            token=self.replica,
+        )
+        self._lease_task = asyncio.create_task(self._lease_loop())
 
-    def stop(self):
-        """Stop the scheduler."""
-        if self._is_running:
-            self.scheduler.shutdown()
-            self._is_running = False
+    async def stop(self):
+        """Stop the scheduler and hand the lease to another replica."""
+        if not self._is_running:
+            return
+        if self._lease_task is not None:
+            self._lease_task.cancel()
+            try:
+                await self._lease_task
+            except asyncio.CancelledError:
+                pass
+            self._lease_task = None
+        if self._lease is not None:
+            try:
+                if self._is_leader:
+                    await self._lease.release()
+                await self._lease.client.aclose()
+            except Exception as e:  # noqa: BLE001
+                logger.warning("Could not release scheduler lease: %s", e)
+            self._lease = None
+        self._is_leader = False
+        self.scheduler.shutdown(wait=False)
+        self._is_running = False
+        self.scheduler = self._build_scheduler()
+
+    async def _lease_loop(self) -> None:
+        assert self._lease is not None
+        interval = max(self.settings.SCHEDULER_LEASE_TTL_SEC / 3, 0.5)
+        while True:
+            try:
+                held = await (self._lease.renew() if self._is_leader else self._lease.acquire())
+            except Exception as e:  # noqa: BLE001 - Redis unavailable: stand down
+                logger.warning("Scheduler lease check failed: %s", e)
+                held = False
+            if held and not self._is_leader:
+                await self._become_leader()
+            elif not held and self._is_leader:
+                logger.warning("Scheduler lease lost; pausing jobs on %s", self.replica)
+                self.scheduler.pause()
+                self._is_leader = False
+            if self._is_leader:
+                # Pick up jobs other replicas added to the shared store
+                self.scheduler.wakeup()
+            await asyncio.sleep(interval)
+
+    async def _become_leader(self) -> None:
+        logger.info("Scheduler leader: %s", self.replica)
+        self._is_leader = True
+        if self.settings.CRAWL_ADAPTIVE_ENABLED:
+            self.scheduler.add_job(
+                refresh_adaptive_intervals,
+                trigger=IntervalTrigger(minutes=self.settings.CRAWL_ADAPTIVE_REFRESH_MINUTES),
+                id=ADAPTIVE_JOB_ID,
+                replace_existing=True,
+            )
+        try:
+            await self.sync_source_jobs()
+        except Exception as e:  # noqa: BLE001 - keep running the stored jobs
+            logger.warning("Could not sync crawl jobs from sources: %s", e)
+        self.scheduler.resume()
+
+    async def sync_source_jobs(self) -> dict[str, int]:
+        """Add a crawl job per enabled source and drop jobs of the others.
+
+        With ``CRAWL_QUEUE_ENABLED`` the jobs only enqueue the crawl for the
+        worker pool; switching the setting re-targets the stored jobs.
+        """
+        func = enqueue_source_crawl if self.settings.CRAWL_QUEUE_ENABLED else crawl_source
+        async with async_session() as session:
+            sources = (
+                await session.execute(select(Source).where(Source.enabled.is_(True)))
+            ).scalars().all()
+        wanted = {s.id: s for s in sources}
+        added = removed = 0
+        for job in self.scheduler.get_jobs():
+            if job.id.startswith(CRAWL_JOB_PREFIX):
+                source_id = job.id[len(CRAWL_JOB_PREFIX):]
+                if source_id not in wanted:
+                    self.scheduler.remove_job(job.id)
+                    removed += 1
+                else:
+                    self._configured[source_id] = wanted.pop(source_id).crawl_interval_minutes
+                    if job.func is not func:
+                        job.modify(func=func)
+        for source in wanted.values():
+            self.add_crawl_job(source.id, func, source.crawl_interval_minutes)
+            added += 1
+        if self.settings.CRAWL_ADAPTIVE_ENABLED:
+            await self.refresh_adaptive_intervals()
+        return {"added": added, "removed": removed}
+
+    # Jobs ----------------------------------------------------------------
+
+    def _trigger(self, minutes: int) -> IntervalTrigger:
+        return IntervalTrigger(minutes=minutes, jitter=self.settings.SCHEDULER_JITTER_SEC or None)
 
     def add_crawl_job(
         self,
         source_id: str,
-        crawl_func,
+        crawl_func=crawl_source,
         interval_minutes: int = 5,
     ):
-        """Add a new crawling job."""
+        """Add a new crawling job.
+
+        ``interval_minutes`` is the configured interval; once an adaptive plan
+        exists the job runs at the learned interval instead.
+        """
+        self._configured[source_id] = interval_minutes
+        minutes = self._intervals.get(source_id, interval_minutes)
         self.scheduler.add_job(
             crawl_func,
-            trigger=IntervalTrigger(minutes=interval_minutes),
-            id=f"crawl_{source_id}",
+            trigger=self._trigger(minutes),
+            id=f"{CRAWL_JOB_PREFIX}{source_id}",
             replace_existing=True,
             kwargs={"source_id": source_id},
         )
 
     def remove_crawl_job(self, source_id: str):
         """Remove a crawling job."""
-        job_id = f"crawl_{source_id}"
+        job_id = f"{CRAWL_JOB_PREFIX}{source_id}"
+        self._configured.pop(source_id, None)
         if self.scheduler.get_job(job_id):
             self.scheduler.remove_job(job_id)
 
+    def _job_minutes(self, source_id: str) -> float | None:
+        """Interval the crawl job of ``source_id`` actually runs at, if scheduled."""
+        job = self.scheduler.get_job(f"{CRAWL_JOB_PREFIX}{source_id}")
+        if job is None or not isinstance(job.trigger, IntervalTrigger):
+            return None
+        return job.trigger.interval.total_seconds() / 60
+
+    def apply_plan(self, plan: list[IntervalEstimate], computed_at: str | None = None) -> int:
+        """Reschedule crawl jobs to the planned intervals; returns jobs changed.
+
+        Each estimate is compared with the job's current trigger, not with
+        the previous plan, so small moves that add up past the tolerance
+        still reschedule the job.
+        """
+        self._plan = plan
+        self._plan_computed_at = computed_at
+        changed = 0
+        for estimate in plan:
+            current = self._job_minutes(estimate.source_id)
+            if current is None:
+                continue
+            if abs(estimate.minutes - current) <= RESCHEDULE_TOLERANCE * current:
+                continue
+            self.scheduler.reschedule_job(
+                f"{CRAWL_JOB_PREFIX}{estimate.source_id}", trigger=self._trigger(estimate.minutes)
+            )
+            self._intervals[estimate.source_id] = estimate.minutes
+            changed += 1
+        return changed
+
+    async def refresh_adaptive_intervals(self) -> dict[str, Any]:
+        """Recompute intervals from the DB and reschedule the crawl jobs.
+
+        Only the leader reschedules: the job store is shared, and a reschedule
+        resets the job's next run time. Other replicas just report the plan.
+        """
+        async with async_session() as session:
+            plan = await compute_adaptive_schedule(session)
+        computed_at = datetime.now(timezone.utc).isoformat()
+        if not self._is_leader:
+            self._plan = plan
+            self._plan_computed_at = computed_at
+            return self.adaptive_status()
+        changed = self.apply_plan(plan, computed_at)
+        if changed:
+            logger.info("Adaptive scheduling: rescheduled %d crawl jobs", changed)
+        return self.adaptive_status()
+
+    # Status --------------------------------------------------------------
+
+    def adaptive_status(self) -> dict[str, Any]:
+        return {
+            "enabled": self.settings.CRAWL_ADAPTIVE_ENABLED,
+            "computed_at": self._plan_computed_at,
+            "savings": schedule_savings(self._plan),
+            "sources": [
+                {**e.as_dict(), "scheduled_minutes": self._job_minutes(e.source_id)}
+                for e in sorted(self._plan, key=lambda e: (e.minutes, e.source_id))
+            ],
+        }
+
     def get_jobs(self) -> list[dict]:
-        """Get all scheduled jobs."""
+        """Get all scheduled jobs with their last run."""
+        runs = self._last_runs()
         return [
             {
                 "id": job.id,
                 "next_run": str(job.next_run_time),
+                "interval_minutes": (
+                    job.trigger.interval.total_seconds() / 60
+                    if isinstance(job.trigger, IntervalTrigger)
+                    else None
+                ),
+                "jitter_sec": getattr(job.trigger, "jitter", None),
+                "max_instances": job.max_instances,
+                "coalesce": job.coalesce,
+                "last_run": runs.get(job.id),
             }
             for job in self.scheduler.get_jobs()
         ]
 
+    async def status(self) -> dict[str, Any]:
+        leader = None
+        if self._lease is not None:
+            try:
+                leader = await self._lease.holder()
+            except Exception as e:  # noqa: BLE001
+                leader = f"unknown ({type(e).__name__})"
+        elif self._is_leader:
+            leader = self.replica
+        return {
+            "running": self._is_running,
+            "jobstore": self.jobstore,
+            "replica": self.replica,
+            "is_leader": self._is_leader,
+            "leader": leader,
+            "jobs": self.get_jobs() if self._is_running else [],
+        }
+
     @property
     def is_running(self) -> bool:
         return self._is_running
 
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
 
 # Global scheduler instance
 scheduler = CrawlScheduler()
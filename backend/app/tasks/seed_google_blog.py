@@ -6,6 +6,7 @@ import json
 from pathlib import Path
 
 from app.services.crawler.google_blog_ingest import crawl_and_upsert_google_blog_article
+from app.services.crawler.session import closing_crawl_sessions
 
 
 async def _run(url: str, dry_run: bool, html_file: str | None, trust_env: bool) -> None:
@@ -39,7 +40,11 @@ def main() -> None:
         help="Crawl only, do not write to DB.",
     )
     args = parser.parse_args()
-    asyncio.run(_run(args.url, args.dry_run, args.html_file, args.trust_env))
+    asyncio.run(
+        closing_crawl_sessions(
+            _run(args.url, args.dry_run, args.html_file, args.trust_env)
+        )
+    )
 
 
 if __name__ == "__main__":
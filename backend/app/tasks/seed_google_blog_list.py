@@ -6,12 +6,23 @@ import json
 from pathlib import Path
 from typing import Any
 
-from app.services.crawler.google_blog_ingest import crawl_and_upsert_google_blog_article
+from app.services.crawler.google_blog import crawl_google_blog_article
+from app.services.crawler.google_blog_ingest import (
+    get_google_blog_source,
+    google_blog_row,
+    google_blog_summary,
+    upsert_google_blog_rows,
+    validate_google_blog_url,
+)
+from app.services.crawler.near_duplicate import get_near_duplicate_index
+from app.services.crawler.session import closing_crawl_sessions, crawl_session_stats
+from app.tasks.batch_runner import BatchRunner, Checkpoint, default_checkpoint_path
 
 
 DEFAULT_LIST_FILE = (
     Path(__file__).resolve().parents[2] / "crawl_targets" / "google_blog_urls.txt"
 )
+DEFAULT_CHECKPOINT = default_checkpoint_path("seed_google_blog_list")
 
 
 def _load_urls(path: Path) -> list[str]:
@@ -38,6 +49,10 @@ async def _run(
     trust_env: bool,
     limit: int | None,
     continue_on_error: bool,
+    workers: int,
+    flush_size: int,
+    checkpoint: Checkpoint | None,
+    near_dup: bool = True,
 ) -> None:
     urls = _load_urls(list_file)
     if limit is not None:
@@ -57,21 +72,46 @@ async def _run(
         )
         return
 
+    source_id = "" if dry_run else (await get_google_blog_source()).id
+
+    async def crawl(url: str) -> tuple[dict[str, Any], dict[str, Any]]:
+        validate_google_blog_url(url)
+        item = await crawl_google_blog_article(url, trust_env=trust_env)
+        return google_blog_row(item, source_id), google_blog_summary(item)
+
+    near_dups = get_near_duplicate_index() if near_dup and not dry_run else None
+
+    async def flush(batch: list[tuple[dict[str, Any], dict[str, Any]]]) -> list[str]:
+        rows = [row for row, _ in batch]
+        staged = near_dups.flag_rows(rows) if near_dups is not None else None
+        outcomes = await upsert_google_blog_rows(rows)
+        if near_dups is not None:
+            near_dups.commit(staged)
+            near_dups.save()
+        return outcomes
+
+    runner: BatchRunner[str, tuple[dict[str, Any], dict[str, Any]]] = BatchRunner(
+        workers=workers,
+        flush=None if dry_run else flush,
+        flush_size=flush_size,
+        checkpoint=None if dry_run else checkpoint,
+        continue_on_error=continue_on_error,
+    )
+    processed = await runner.run(urls, crawl)
+
     results: list[dict[str, Any]] = []
-    for idx, url in enumerate(urls, start=1):
-        print(f"[{idx}/{len(urls)}] {url}")
-        try:
-            res = await crawl_and_upsert_google_blog_article(
-                url,
-                dry_run=dry_run,
-                trust_env=trust_env,
+    for r in processed:
+        if r.ok and r.value is not None:
+            results.append(
+                {
+                    "url": r.key,
+                    "ok": True,
+                    "status": "dry_run" if dry_run else r.outcome,
+                    "result": r.value[1],
+                }
             )
-            results.append({"url": url, "ok": True, "result": res})
-        except Exception as e:  # noqa: BLE001
-            err = {"url": url, "ok": False, "error": f"{type(e).__name__}: {e}"}
-            results.append(err)
-            if not continue_on_error:
-                break
+        else:
+            results.append({"url": r.key, "ok": False, "error": r.error})
 
     success = sum(1 for r in results if r.get("ok"))
     failed = len(results) - success
@@ -81,7 +121,11 @@ async def _run(
         "processed": len(results),
         "success": success,
         "failed": failed,
+        "batch": runner.stats.as_dict(),
+        "near_duplicates": near_dups.stats() if near_dups is not None else None,
+        "checkpoint": str(checkpoint.path) if checkpoint and not dry_run else None,
         "results": results,
+        "politeness": crawl_session_stats(),
     }
     print(json.dumps(summary, indent=2, ensure_ascii=False))
 
@@ -116,14 +160,56 @@ def main() -> None:
         action="store_true",
         help="Continue processing other URLs even if one fails.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="URLs crawled concurrently (per-host politeness still applies).",
+    )
+    parser.add_argument(
+        "--flush-size",
+        type=int,
+        default=25,
+        help="Crawled articles written to the DB per bulk upsert.",
+    )
+    parser.add_argument(
+        "--no-near-dup",
+        action="store_true",
+        help="Skip the SimHash near-duplicate check before rows are written.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=str(DEFAULT_CHECKPOINT),
+        help="JSONL file of finished URLs; a rerun skips them.",
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not read or write the checkpoint file.",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Clear the checkpoint before running.",
+    )
     args = parser.parse_args()
+
+    checkpoint = None if args.no_checkpoint else Checkpoint(Path(args.checkpoint))
+    if checkpoint is not None and args.fresh:
+        checkpoint.reset()
     asyncio.run(
-        _run(
-            Path(args.list_file),
-            dry_run=args.dry_run,
-            trust_env=args.trust_env,
-            limit=args.limit,
-            continue_on_error=args.continue_on_error,
+        closing_crawl_sessions(
+            _run(
+                Path(args.list_file),
+                dry_run=args.dry_run,
+                trust_env=args.trust_env,
+                limit=args.limit,
+                continue_on_error=args.continue_on_error,
+                workers=args.workers,
+                flush_size=args.flush_size,
+                checkpoint=checkpoint,
+                near_dup=not args.no_near_dup,
+            )
         )
     )
 
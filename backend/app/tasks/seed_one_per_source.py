@@ -9,21 +9,26 @@ import hashlib
 from pathlib import Path
 from typing import Any
 
-from dateutil import parser as dt_parser
-from sqlalchemy import or_, select
+from sqlalchemy import select
 import yaml
 
 from app.core.database import async_session
 from app.models.source import (
     CategoryHint,
     ContentType,
-    CrawledContent,
     Source,
     SourceType,
     ThreadStatus,
 )
+from app.services.crawler.bulk_upsert import bulk_upsert_crawled_contents
 from app.services.crawler.generic_article import crawl_generic_article
-from app.tasks.discover_source_urls import discover_from_catalog
+from app.services.crawler.near_duplicate import get_near_duplicate_index
+from app.services.crawler.session import closing_crawl_sessions, crawl_session_stats
+from app.services.crawler.timestamps import parse_timestamp_utc_naive as _parse_datetime
+from app.services.crawler.feed_cache import FeedValidatorCache
+from app.services.crawler.url_frontier import DEFAULT_FRONTIER_DIR, UrlFrontier
+from app.tasks.batch_runner import BatchRunner, Checkpoint
+from app.tasks.discover_source_urls import DEFAULT_FEED_CACHE, discover_from_catalog_async
 
 
 DEFAULT_CATALOG = (
@@ -74,18 +79,6 @@ def _content_looks_valid(content: str, title: str) -> bool:
     return True
 
 
-def _parse_datetime(raw: str | None) -> datetime | None:
-    if not raw:
-        return None
-    try:
-        dt = dt_parser.parse(raw)
-    except Exception:
-        return None
-    if dt.tzinfo is None:
-        return dt
-    return dt.astimezone(timezone.utc).replace(tzinfo=None)
-
-
 def _load_yaml(path: Path) -> dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
@@ -119,6 +112,7 @@ def _collect_one_each(
     discovery: dict[str, Any],
     *,
     catalog: dict[str, Any],
+    skip_seen: bool = False,
 ) -> tuple[list[SourceSample], list[dict[str, Any]]]:
     source_map = {str(s.get("id")): s for s in (catalog.get("sources") or [])}
     samples: list[SourceSample] = []
@@ -145,6 +139,16 @@ def _collect_one_each(
                 }
             )
             continue
+        if skip_seen:
+            items = [it for it in items if not it.get("seen")]
+            if not items:
+                skipped.append(
+                    {
+                        "source_catalog_id": sid,
+                        "reason": "no_new_items",
+                    }
+                )
+                continue
         ranked = _sorted_items_by_recency(items)
         best: dict[str, Any] | None = None
         for item in ranked:
@@ -251,24 +255,16 @@ async def _get_or_create_source(
     return source
 
 
-async def _upsert_one(
-    session,
-    source_cache: dict[tuple[str, str], Source],
+async def _build_row(
+    source: Source,
     sample: SourceSample,
     *,
     crawl_details: bool,
     allow_fallback: bool,
     trust_env: bool,
-) -> str:
+) -> dict[str, Any]:
+    """Crawl ``sample`` and return its ``crawled_contents`` row values."""
     now = _now_utc_naive()
-    source = await _get_or_create_source(
-        session,
-        source_cache,
-        source_name=sample.source_name,
-        source_url=sample.source_feed_url,
-        source_kind=sample.source_kind,
-        source_catalog_id=sample.source_catalog_id,
-    )
     crawl: SampleCrawlResult | None = None
     crawl_error: str | None = None
 
@@ -309,15 +305,7 @@ async def _upsert_one(
     hash_basis = f"{canonical_url}\n{title}\n{published_at.isoformat()}\n{content[:800]}"
     content_hash = hashlib.sha256(hash_basis.encode("utf-8")).hexdigest()
 
-    stmt = select(CrawledContent).where(
-        or_(
-            CrawledContent.source_url == effective_url,
-            CrawledContent.canonical_url == canonical_url,
-        )
-    )
-    existing = (await session.execute(stmt)).scalar_one_or_none()
-
-    common = {
+    return {
         "source_id": source.id,
         "title": title,
         "content": content,
@@ -356,38 +344,17 @@ async def _upsert_one(
         },
     }
 
-    if existing:
-        existing.source_id = common["source_id"]
-        existing.title = common["title"]
-        existing.content = common["content"]
-        existing.summary_hint = common["summary_hint"]
-        existing.source_url = common["source_url"]
-        existing.canonical_url = common["canonical_url"]
-        existing.published_at = common["published_at"]
-        existing.category_hint = common["category_hint"]
-        existing.thread_status = common["thread_status"]
-        existing.content_hash = common["content_hash"]
-        existing.source_type = common["source_type"]
-        existing.source_name = common["source_name"]
-        existing.fetched_at = common["fetched_at"]
-        existing.content_type = common["content_type"]
-        existing.language = common["language"]
-        existing.author = common["author"]
-        existing.image_urls = common["image_urls"]
-        existing.outbound_urls = common["outbound_urls"]
-        existing.extra_data = common["extra_data"]
-        existing.raw_payload = common["raw_payload"]
-        existing.updated_at = now
-        return "updated"
-
-    session.add(CrawledContent(**common))
-    return "inserted"
-
 
 async def _run(args: argparse.Namespace) -> None:
     catalog = _load_yaml(Path(args.catalog))
-    discovery = discover_from_catalog(catalog)
-    samples, skipped = _collect_one_each(discovery, catalog=catalog)
+    feed_cache = None if args.no_feed_cache else FeedValidatorCache.load(DEFAULT_FEED_CACHE)
+    frontier = UrlFrontier(Path(args.frontier_dir)) if args.skip_seen else None
+    discovery = await discover_from_catalog_async(
+        catalog, cache=feed_cache, frontier=frontier, mark_seen=False
+    )
+    samples, skipped = _collect_one_each(
+        discovery, catalog=catalog, skip_seen=args.skip_seen
+    )
     if args.limit_sources and args.limit_sources > 0:
         samples = samples[: args.limit_sources]
 
@@ -416,42 +383,87 @@ async def _run(args: argparse.Namespace) -> None:
     if not args.dry_run:
         inserted = 0
         updated = 0
+        duplicates = 0
         failed = 0
         errors: list[dict[str, str]] = []
 
         async with async_session() as session:
             source_cache: dict[tuple[str, str], Source] = {}
+            sources: dict[str, Source] = {}
             for sample in samples:
-                try:
-                    action = await _upsert_one(
-                        session,
-                        source_cache,
-                        sample,
-                        crawl_details=not args.no_crawl_details,
-                        allow_fallback=args.allow_fallback,
-                        trust_env=args.trust_env,
-                    )
-                    if action == "inserted":
-                        inserted += 1
-                    else:
-                        updated += 1
-                except Exception as e:  # noqa: BLE001
-                    failed += 1
-                    errors.append(
-                        {
-                            "source_catalog_id": sample.source_catalog_id,
-                            "url": sample.url,
-                            "error": f"{type(e).__name__}: {e}",
-                        }
-                    )
+                sources[sample.url] = await _get_or_create_source(
+                    session,
+                    source_cache,
+                    source_name=sample.source_name,
+                    source_url=sample.source_feed_url,
+                    source_kind=sample.source_kind,
+                    source_catalog_id=sample.source_catalog_id,
+                )
             await session.commit()
 
+        async def crawl(sample: SourceSample) -> dict[str, Any]:
+            return await _build_row(
+                sources[sample.url],
+                sample,
+                crawl_details=not args.no_crawl_details,
+                allow_fallback=args.allow_fallback,
+                trust_env=args.trust_env,
+            )
+
+        near_dups = None if args.no_near_dup else get_near_duplicate_index()
+
+        async def flush(rows: list[dict[str, Any]]) -> list[str]:
+            staged = near_dups.flag_rows(rows) if near_dups is not None else None
+            async with async_session() as session:
+                outcomes = await bulk_upsert_crawled_contents(session, rows)
+                await session.commit()
+            if near_dups is not None:
+                near_dups.commit(staged)
+                near_dups.save()
+            return outcomes
+
+        runner: BatchRunner[SourceSample, dict[str, Any]] = BatchRunner(
+            workers=args.workers,
+            key=lambda sample: sample.url,
+            flush=flush,
+            flush_size=args.flush_size,
+            checkpoint=Checkpoint(Path(args.checkpoint)) if args.checkpoint else None,
+        )
+        for r in await runner.run(samples, crawl):
+            if not r.ok:
+                failed += 1
+                errors.append(
+                    {
+                        "source_catalog_id": r.item.source_catalog_id,
+                        "url": r.item.url,
+                        "error": r.error or "",
+                    }
+                )
+                continue
+            if r.outcome == "inserted":
+                inserted += 1
+            elif r.outcome == "duplicate":
+                duplicates += 1  # superseded by a later row with the same URL
+            else:
+                updated += 1
+            if frontier is not None:
+                frontier.add(r.item.url)
+
         result["db_result"] = {
             "inserted": inserted,
             "updated": updated,
+            "duplicates": duplicates,
             "failed": failed,
             "errors": errors,
         }
+        result["batch"] = runner.stats.as_dict()
+        if near_dups is not None:
+            result["near_duplicates"] = near_dups.stats()
+        result["politeness"] = crawl_session_stats()
+        if frontier is not None:
+            frontier.save()
+    if frontier is not None:
+        result["frontier"] = frontier.stats()
 
     if args.out_json:
         out = Path(args.out_json)
@@ -467,6 +479,21 @@ def main() -> None:
     )
     parser.add_argument("--catalog", default=str(DEFAULT_CATALOG))
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--no-feed-cache",
+        action="store_true",
+        help="Ignore the discovery validator cache and refetch every source.",
+    )
+    parser.add_argument(
+        "--skip-seen",
+        action="store_true",
+        help="Skip URLs ingested by earlier runs (persistent URL frontier).",
+    )
+    parser.add_argument(
+        "--frontier-dir",
+        default=str(DEFAULT_FRONTIER_DIR),
+        help="Seen-URL frontier directory used with --skip-seen.",
+    )
     parser.add_argument(
         "--out-json",
         default="",
@@ -487,6 +514,28 @@ def main() -> None:
         action="store_true",
         help="Allow metadata-only fallback insert when detail crawling fails.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Articles crawled concurrently (per-host politeness still applies).",
+    )
+    parser.add_argument(
+        "--flush-size",
+        type=int,
+        default=50,
+        help="Crawled articles written to the DB per bulk upsert.",
+    )
+    parser.add_argument(
+        "--no-near-dup",
+        action="store_true",
+        help="Skip the SimHash near-duplicate check before rows are written.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default="",
+        help="Optional JSONL file of finished URLs; a rerun skips them.",
+    )
     parser.add_argument(
         "--limit-sources",
         type=int,
@@ -494,7 +543,7 @@ def main() -> None:
         help="Optional: process only first N sampled sources (for quick tests).",
     )
     args = parser.parse_args()
-    asyncio.run(_run(args))
+    asyncio.run(closing_crawl_sessions(_run(args)))
 
 
 if __name__ == "__main__":
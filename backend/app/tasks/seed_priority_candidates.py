@@ -10,21 +10,26 @@ from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
 
-from dateutil import parser as dt_parser
-from sqlalchemy import or_, select
+from sqlalchemy import select
 import yaml
 
 from app.core.database import async_session
 from app.models.source import (
     CategoryHint,
     ContentType,
-    CrawledContent,
     Source,
     SourceType,
     ThreadStatus,
 )
+from app.services.crawler.bulk_upsert import bulk_upsert_crawled_contents
 from app.services.crawler.generic_article import crawl_generic_article
-from app.tasks.discover_source_urls import discover_from_catalog
+from app.services.crawler.near_duplicate import get_near_duplicate_index
+from app.services.crawler.session import closing_crawl_sessions, crawl_session_stats
+from app.services.crawler.timestamps import parse_timestamp_utc_naive as _parse_datetime
+from app.services.crawler.feed_cache import FeedValidatorCache
+from app.services.crawler.url_frontier import DEFAULT_FRONTIER_DIR, UrlFrontier
+from app.tasks.batch_runner import BatchRunner, Checkpoint
+from app.tasks.discover_source_urls import DEFAULT_FEED_CACHE, discover_from_catalog_async
 
 
 DEFAULT_CATALOG = Path(__file__).resolve().parents[2] / "crawl_targets" / "source_catalog.yaml"
@@ -47,18 +52,6 @@ def _content_looks_valid(content: str, title: str) -> bool:
     return True
 
 
-def _parse_datetime(raw: str | None) -> datetime | None:
-    if not raw:
-        return None
-    try:
-        dt = dt_parser.parse(raw)
-    except Exception:
-        return None
-    if dt.tzinfo is None:
-        return dt
-    return dt.astimezone(timezone.utc).replace(tzinfo=None)
-
-
 def _host_from_url(url: str) -> str:
     return (urlparse(url).hostname or "").lower()
 
@@ -120,6 +113,7 @@ def _rank_top_candidates(
     catalog: dict[str, Any],
     tier_cfg: dict[str, Any],
     limit: int,
+    skip_seen: bool = False,
 ) -> list[RankedCandidate]:
     source_meta = {str(s.get("id")): s for s in (catalog.get("sources") or [])}
     dedup_seen: set[str] = set()
@@ -136,7 +130,7 @@ def _rank_top_candidates(
 
         for item in src.get("items") or []:
             url = str(item.get("url") or "").strip()
-            if not url or url in dedup_seen:
+            if not url or url in dedup_seen or (skip_seen and item.get("seen")):
                 continue
             dedup_seen.add(url)
 
@@ -219,19 +213,15 @@ async def _get_or_create_source(
         return source
 
 
-async def _upsert_candidate(
+async def _build_candidate_row(
+    source: Source,
     candidate: RankedCandidate,
     *,
     allow_fallback: bool,
     trust_env: bool,
-) -> str:
+) -> dict[str, Any]:
+    """Crawl ``candidate`` and return its ``crawled_contents`` row values."""
     now = _now_utc_naive()
-    source = await _get_or_create_source(
-        source_name=candidate.source_name,
-        source_url=candidate.source_feed_url,
-        source_kind=candidate.source_kind,
-        source_catalog_id=candidate.source_catalog_id,
-    )
 
     crawl_error: str | None = None
     try:
@@ -270,96 +260,61 @@ async def _upsert_candidate(
     hash_basis = f"{canonical_url}\n{title}\n{published_at.isoformat()}\n{content_text[:800]}"
     content_hash = hashlib.sha256(hash_basis.encode("utf-8")).hexdigest()
 
-    async with async_session() as session:
-        stmt = select(CrawledContent).where(
-            or_(
-                CrawledContent.source_url == final_url,
-                CrawledContent.canonical_url == canonical_url,
-            )
-        )
-        existing = (await session.execute(stmt)).scalar_one_or_none()
-
-        common_payload = {
-            "source_id": source.id,
-            "title": title,
-            "content": content_text,
-            "summary_hint": summary_hint,
-            "source_url": final_url,
-            "canonical_url": canonical_url,
-            "published_at": published_at,
-            "category_hint": CategoryHint.GENERAL,
-            "thread_status": ThreadStatus.PENDING,
-            "content_hash": content_hash,
-            "source_type": content_source_type,
-            "source_name": candidate.source_name,
-            "fetched_at": now,
-            "content_type": ContentType.GENERAL,
-            "language": language,
-            "author": author,
-            "image_urls": image_urls,
-            "outbound_urls": outbound_urls,
-            "extra_data": {
-                "discovery": {
-                    "source_catalog_id": candidate.source_catalog_id,
-                    "source_kind": candidate.source_kind,
-                    "published_raw": candidate.published_raw,
-                    "tier": candidate.tier,
-                },
-                "crawl_error": crawl_error,
+    return {
+        "source_id": source.id,
+        "title": title,
+        "content": content_text,
+        "summary_hint": summary_hint,
+        "source_url": final_url,
+        "canonical_url": canonical_url,
+        "published_at": published_at,
+        "category_hint": CategoryHint.GENERAL,
+        "thread_status": ThreadStatus.PENDING,
+        "content_hash": content_hash,
+        "source_type": content_source_type,
+        "source_name": candidate.source_name,
+        "fetched_at": now,
+        "content_type": ContentType.GENERAL,
+        "language": language,
+        "author": author,
+        "image_urls": image_urls,
+        "outbound_urls": outbound_urls,
+        "extra_data": {
+            "discovery": {
+                "source_catalog_id": candidate.source_catalog_id,
+                "source_kind": candidate.source_kind,
+                "published_raw": candidate.published_raw,
+                "tier": candidate.tier,
             },
-            "raw_payload": {
-                "candidate": {
-                    "url": candidate.url,
-                    "title": candidate.title,
-                    "published_raw": candidate.published_raw,
-                    "tier": candidate.tier,
-                },
-                "crawl": raw_crawl,
+            "crawl_error": crawl_error,
+        },
+        "raw_payload": {
+            "candidate": {
+                "url": candidate.url,
+                "title": candidate.title,
+                "published_raw": candidate.published_raw,
+                "tier": candidate.tier,
             },
-        }
-
-        if existing:
-            existing.source_id = common_payload["source_id"]
-            existing.title = common_payload["title"]
-            existing.content = common_payload["content"]
-            existing.summary_hint = common_payload["summary_hint"]
-            existing.source_url = common_payload["source_url"]
-            existing.canonical_url = common_payload["canonical_url"]
-            existing.published_at = common_payload["published_at"]
-            existing.category_hint = common_payload["category_hint"]
-            existing.thread_status = common_payload["thread_status"]
-            existing.content_hash = common_payload["content_hash"]
-            existing.source_type = common_payload["source_type"]
-            existing.source_name = common_payload["source_name"]
-            existing.fetched_at = common_payload["fetched_at"]
-            existing.content_type = common_payload["content_type"]
-            existing.language = common_payload["language"]
-            existing.author = common_payload["author"]
-            existing.image_urls = common_payload["image_urls"]
-            existing.outbound_urls = common_payload["outbound_urls"]
-            existing.extra_data = common_payload["extra_data"]
-            existing.raw_payload = common_payload["raw_payload"]
-            existing.updated_at = now
-            action = "updated"
-        else:
-            record = CrawledContent(**common_payload)
-            session.add(record)
-            action = "inserted"
-
-        await session.commit()
-        return action
+            "crawl": raw_crawl,
+        },
+    }
 
 
 async def _run(args: argparse.Namespace) -> None:
     catalog = _load_yaml(Path(args.catalog))
     tiers = _load_yaml(Path(args.tiers))
 
-    discovery = discover_from_catalog(catalog)
+    feed_cache = None if args.no_feed_cache else FeedValidatorCache.load(DEFAULT_FEED_CACHE)
+    frontier = UrlFrontier(Path(args.frontier_dir)) if args.skip_seen else None
+    discovery = await discover_from_catalog_async(
+        catalog, cache=feed_cache, frontier=frontier, mark_seen=False
+    )
     selected = _rank_top_candidates(
         discovery,
         catalog=catalog,
         tier_cfg=tiers,
         limit=args.limit,
+        skip_seen=args.skip_seen,
     )
 
     result: dict[str, Any] = {
@@ -384,29 +339,76 @@ async def _run(args: argparse.Namespace) -> None:
     if not args.dry_run:
         inserted = 0
         updated = 0
+        duplicates = 0
         failed = 0
         errors: list[dict[str, str]] = []
+        sources: dict[tuple[str, str], Source] = {}
         for c in selected:
-            try:
-                action = await _upsert_candidate(
-                    c,
-                    allow_fallback=args.allow_fallback,
-                    trust_env=args.trust_env,
+            key = (c.source_name, c.source_feed_url)
+            if key not in sources:
+                sources[key] = await _get_or_create_source(
+                    source_name=c.source_name,
+                    source_url=c.source_feed_url,
+                    source_kind=c.source_kind,
+                    source_catalog_id=c.source_catalog_id,
                 )
-                if action == "inserted":
-                    inserted += 1
-                elif action == "updated":
-                    updated += 1
-            except Exception as e:  # noqa: BLE001
+
+        async def crawl(c: RankedCandidate) -> dict[str, Any]:
+            return await _build_candidate_row(
+                sources[(c.source_name, c.source_feed_url)],
+                c,
+                allow_fallback=args.allow_fallback,
+                trust_env=args.trust_env,
+            )
+
+        near_dups = None if args.no_near_dup else get_near_duplicate_index()
+
+        async def flush(rows: list[dict[str, Any]]) -> list[str]:
+            staged = near_dups.flag_rows(rows) if near_dups is not None else None
+            async with async_session() as session:
+                outcomes = await bulk_upsert_crawled_contents(session, rows)
+                await session.commit()
+            if near_dups is not None:
+                near_dups.commit(staged)
+                near_dups.save()
+            return outcomes
+
+        runner: BatchRunner[RankedCandidate, dict[str, Any]] = BatchRunner(
+            workers=args.workers,
+            key=lambda c: c.url,
+            flush=flush,
+            flush_size=args.flush_size,
+            checkpoint=Checkpoint(Path(args.checkpoint)) if args.checkpoint else None,
+        )
+        for r in await runner.run(selected, crawl):
+            if not r.ok:
                 failed += 1
-                errors.append({"url": c.url, "error": f"{type(e).__name__}: {e}"})
+                errors.append({"url": r.item.url, "error": r.error or ""})
+                continue
+            if r.outcome == "inserted":
+                inserted += 1
+            elif r.outcome == "duplicate":
+                duplicates += 1  # superseded by a later row with the same URL
+            else:
+                updated += 1
+            if frontier is not None:
+                frontier.add(r.item.url)
 
         result["db_result"] = {
             "inserted": inserted,
             "updated": updated,
+            "duplicates": duplicates,
             "failed": failed,
             "errors": errors,
         }
+        result["batch"] = runner.stats.as_dict()
+        if near_dups is not None:
+            result["near_duplicates"] = near_dups.stats()
+        result["politeness"] = crawl_session_stats()
+        if frontier is not None:
+            frontier.save()
+    if frontier is not None:
+        result["frontier"] = frontier.stats()
 
     if args.out_json:
         out_path = Path(args.out_json)
@@ -425,6 +427,21 @@ def main() -> None:
     parser.add_argument("--tiers", default=str(DEFAULT_TIERS))
     parser.add_argument("--limit", type=int, default=20)
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--no-feed-cache",
+        action="store_true",
+        help="Ignore the discovery validator cache and refetch every source.",
+    )
+    parser.add_argument(
+        "--skip-seen",
+        action="store_true",
+        help="Skip URLs ingested by earlier runs (persistent URL frontier).",
+    )
+    parser.add_argument(
+        "--frontier-dir",
+        default=str(DEFAULT_FRONTIER_DIR),
+        help="Seen-URL frontier directory used with --skip-seen.",
+    )
     parser.add_argument(
         "--out-json",
         default="",
@@ -435,13 +452,35 @@ def main() -> None:
         action="store_true",
         help="Allow metadata-only fallback insert when detail crawling fails.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Articles crawled concurrently (per-host politeness still applies).",
+    )
+    parser.add_argument(
+        "--flush-size",
+        type=int,
+        default=50,
+        help="Crawled articles written to the DB per bulk upsert.",
+    )
+    parser.add_argument(
+        "--no-near-dup",
+        action="store_true",
+        help="Skip the SimHash near-duplicate check before rows are written.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default="",
+        help="Optional JSONL file of finished URLs; a rerun skips them.",
+    )
     parser.add_argument(
         "--trust-env",
         action="store_true",
         help="Allow httpx to use environment proxy variables for article crawling.",
     )
     args = parser.parse_args()
-    asyncio.run(_run(args))
+    asyncio.run(closing_crawl_sessions(_run(args)))
 
 
 if __name__ == "__main__":
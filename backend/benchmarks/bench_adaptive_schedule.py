@@ -0,0 +1,154 @@
+"""Static vs adaptive crawl intervals on simulated publish streams.
+
+Each source publishes as a Poisson process at its own rate (from several
+items an hour down to one a month; some sources go quiet halfway through).
+After ``--history-days`` of warm-up, ``--days`` are simulated. The static
+policy polls every source every ``--static-minutes``. The adaptive policy
+polls at the interval ``plan_intervals`` learns from the items seen so far,
+recomputed every ``--refresh-minutes``. Reports fetches per day and the
+delay between an item's publish time and the poll that picks it up.
+
+Usage:
+    python -m benchmarks.bench_adaptive_schedule --sources 60 --days 7
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import random
+import statistics
+from datetime import datetime, timedelta
+from typing import Any
+
+from app.models.source import Source
+from app.services.crawler.adaptive_schedule import MINUTES_PER_DAY, plan_intervals
+
+RATES_PER_DAY = [96.0, 24.0, 8.0, 2.0, 0.5, 0.1, 0.03]
+START = datetime(2026, 1, 1)
+
+
+def _stream(rng: random.Random, rate_per_day: float, until_min: float, quiet_from: float | None) -> list[float]:
+    times, t = [], 0.0
+    while True:
+        t += rng.expovariate(rate_per_day / MINUTES_PER_DAY)
+        if t >= until_min:
+            return times
+        if quiet_from is None or t < quiet_from:
+            times.append(t)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _delays(polls: list[float], items: list[float]) -> list[float]:
+    out = []
+    for t in items:
+        i = bisect.bisect_left(polls, t)
+        if i < len(polls):
+            out.append(polls[i] - t)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, default=60)
+    parser.add_argument("--days", type=float, default=7)
+    parser.add_argument("--history-days", type=float, default=14)
+    parser.add_argument("--static-minutes", type=int, default=60)
+    parser.add_argument("--min-minutes", type=int, default=5)
+    parser.add_argument("--max-minutes", type=int, default=720)
+    parser.add_argument("--pivot-minutes", type=float, default=60.0)
+    parser.add_argument("--refresh-minutes", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    begin = args.history_days * MINUTES_PER_DAY
+    end = begin + args.days * MINUTES_PER_DAY
+    sources, streams, rates = [], {}, {}
+    for i in range(args.sources):
+        rate = RATES_PER_DAY[i % len(RATES_PER_DAY)]
+        quiet_from = begin - MINUTES_PER_DAY * 3 if i % 10 == 9 else None
+        sid = f"s{i}"
+        sources.append(Source(id=sid, name=sid, url="", crawl_interval_minutes=args.static_minutes))
+        streams[sid] = _stream(rng, rate, end, quiet_from)
+        rates[sid] = rate
+
+    static_polls = {
+        s.id: [begin + k * args.static_minutes for k in range(int((end - begin) / args.static_minutes) + 2)]
+        for s in sources
+    }
+
+    adaptive_polls: dict[str, list[float]] = {s.id: [] for s in sources}
+    next_poll = {s.id: begin for s in sources}
+    t = begin
+    while t < end:
+        now = START + timedelta(minutes=t)
+        stats = {}
+        for sid, times in streams.items():
+            lo = bisect.bisect_left(times, t - args.history_days * MINUTES_PER_DAY)
+            hi = bisect.bisect_right(times, t)
+            stats[sid] = (hi - lo, START + timedelta(minutes=times[hi - 1]) if hi else None)
+        plan = {
+            e.source_id: e.minutes
+            for e in plan_intervals(
+                sources,
+                stats,
+                now=now,
+                lookback_days=args.history_days,
+                min_minutes=args.min_minutes,
+                max_minutes=args.max_minutes,
+                pivot_minutes=args.pivot_minutes,
+            )
+        }
+        window_end = min(t + args.refresh_minutes, end)
+        for sid, minutes in plan.items():
+            while next_poll[sid] < window_end:
+                adaptive_polls[sid].append(next_poll[sid])
+                next_poll[sid] += minutes
+        t = window_end
+    for sid in adaptive_polls:
+        adaptive_polls[sid].append(next_poll[sid])  # the poll after the window closes
+
+    def summarize(polls: dict[str, list[float]], ids: list[str]) -> dict[str, Any]:
+        delays = []
+        fetches = 0
+        for sid in ids:
+            new_items = [x for x in streams[sid] if begin <= x < end]
+            delays += _delays(polls[sid], new_items)
+            fetches += sum(1 for p in polls[sid] if p < end)
+        return {
+            "fetches_per_day": round(fetches / args.days, 1),
+            "items": len(delays),
+            "mean_delay_min": round(statistics.fmean(delays), 1) if delays else None,
+            "p90_delay_min": round(_percentile(delays, 0.9), 1),
+        }
+
+    groups = {
+        "all": [s.id for s in sources],
+        "fast (>=8/day)": [s.id for s in sources if rates[s.id] >= 8],
+        "slow (<8/day)": [s.id for s in sources if rates[s.id] < 8],
+    }
+    print(
+        json.dumps(
+            {
+                "sources": args.sources,
+                "days": args.days,
+                "static_minutes": args.static_minutes,
+                "results": {
+                    name: {"static": summarize(static_polls, ids), "adaptive": summarize(adaptive_polls, ids)}
+                    for name, ids in groups.items()
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""crawled_contents writes: per-row lookup + ORM copy vs bulk ON CONFLICT upsert.
+
+Needs the Postgres database from ``DATABASE_URL``. Each round writes
+``--items`` synthetic articles twice (an insert pass, then an update pass
+over the same URLs) under a throw-away source, and deletes them afterwards.
+
+Usage:
+    python -m benchmarks.bench_bulk_upsert --items 1000 10000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import delete, or_, select
+
+from app.core.database import async_session
+from app.models.source import CrawledContent, Source, SourceType
+from app.services.crawler.bulk_upsert import bulk_upsert_crawled_contents
+
+
+def _rows(source_id: str, run: str, count: int, revision: int) -> list[dict[str, Any]]:
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return [
+        {
+            "source_id": source_id,
+            "title": f"Article {i} r{revision}",
+            "content": f"Body of article {i}, revision {revision}. " * 20,
+            "summary_hint": f"Summary {i}",
+            "source_url": f"https://bench.example.com/{run}/{i}",
+            "canonical_url": f"https://bench.example.com/{run}/{i}",
+            "published_at": now,
+            "fetched_at": now,
+            "source_type": SourceType.HTML_ARTICLE,
+            "source_name": "bench",
+            "image_urls": [],
+            "outbound_urls": [f"https://example.org/{i}"],
+            "extra_data": {"revision": revision},
+            "raw_payload": {"bench": True},
+        }
+        for i in range(count)
+    ]
+
+
+async def _per_row(rows: list[dict[str, Any]]) -> list[str]:
+    """The seed tasks' previous path: one SELECT and ORM copy per article."""
+    outcomes = []
+    async with async_session() as session:
+        for row in rows:
+            stmt = select(CrawledContent).where(
+                or_(
+                    CrawledContent.source_url == row["source_url"],
+                    CrawledContent.canonical_url == row["canonical_url"],
+                )
+            )
+            existing = (await session.execute(stmt)).scalar_one_or_none()
+            if existing:
+                for key, value in row.items():
+                    setattr(existing, key, value)
+                outcomes.append("updated")
+            else:
+                session.add(CrawledContent(**row))
+                outcomes.append("inserted")
+            await session.flush()
+        await session.commit()
+    return outcomes
+
+
+async def _bulk(rows: list[dict[str, Any]]) -> list[str]:
+    async with async_session() as session:
+        outcomes = await bulk_upsert_crawled_contents(session, rows)
+        await session.commit()
+    return outcomes
+
+
+async def _round(source_id: str, count: int, label: str, write) -> dict[str, Any]:
+    run = f"{label}-{uuid.uuid4().hex[:8]}"
+    out: dict[str, Any] = {}
+    for phase, revision in (("insert", 1), ("update", 2)):
+        rows = _rows(source_id, run, count, revision)
+        started = time.perf_counter()
+        outcomes = await write(rows)
+        elapsed = time.perf_counter() - started
+        out[phase] = {
+            "sec": round(elapsed, 3),
+            "rows_per_sec": round(count / elapsed),
+            "inserted": outcomes.count("inserted"),
+            "updated": outcomes.count("updated"),
+        }
+    return out
+
+
+async def _main(sizes: list[int]) -> dict[str, Any]:
+    async with async_session() as session:
+        source = Source(
+            name=f"bench-bulk-upsert-{uuid.uuid4().hex[:8]}",
+            url="https://bench.example.com/",
+            source_type=SourceType.RSS,
+            enabled=False,
+            config={"bench": True},
+        )
+        session.add(source)
+        await session.commit()
+
+    results: dict[str, Any] = {}
+    try:
+        for count in sizes:
+            results[str(count)] = {
+                "per_row": await _round(source.id, count, "row", _per_row),
+                "bulk": await _round(source.id, count, "bulk", _bulk),
+            }
+    finally:
+        async with async_session() as session:
+            await session.execute(delete(CrawledContent).where(CrawledContent.source_id == source.id))
+            await session.execute(delete(Source).where(Source.id == source.id))
+            await session.commit()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+    print(json.dumps({"items": args.items, "results": asyncio.run(_main(args.items))}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""crawled_contents layout: raw_payload inline vs compressed payload table.
+
+Needs the Postgres database from ``DATABASE_URL``. Builds both layouts in a
+throw-away schema with ``--rows`` synthetic articles (payloads shaped like
+discovery metadata + JSON-LD), then reports on-disk size
+(``pg_total_relation_size``) and latency of the ``list_content`` query and
+of a by-id row fetch. The schema is dropped afterwards.
+
+Usage:
+    python -m benchmarks.bench_cold_storage --rows 20000 --queries 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.types import LargeBinary
+
+from app.core.database import engine
+from app.services.crawler.payload_store import encode_payload
+
+HOT_COLUMNS = (
+    "id text primary key, title text, source_url text, content text, content_type text,"
+    " category_hint text, thread_status text, created_at timestamp, extra_data json"
+)
+LIST_SQL = (
+    "SELECT id, title, source_url, content_type, category_hint, thread_status, created_at, extra_data"
+    " FROM {table} ORDER BY created_at DESC LIMIT 100 OFFSET :offset"
+)
+
+
+def _payload(i: int) -> dict[str, Any]:
+    return {
+        "discovery": {
+            "feed_url": f"https://bench.example.com/feed.xml?page={i % 7}",
+            "published": "Wed, 25 Feb 2026 00:00:00 -0500",
+            "tags": [f"tag-{(i + k) % 40}" for k in range(6)],
+        },
+        "json_ld": {
+            "@context": "https://schema.org",
+            "@type": "NewsArticle",
+            "headline": f"Article {i} headline about model releases and benchmarks",
+            "author": [{"@type": "Person", "name": f"Author {i % 50}"}],
+            "articleBody": f"Paragraph {i} on evaluation methodology and results. " * 40,
+        },
+        "archive": {"path": f"crawl_archive/2026/02/{i:06d}.html.gz", "sha256": uuid.uuid4().hex * 2},
+    }
+
+
+def _rows(count: int) -> list[dict[str, Any]]:
+    base = datetime(2026, 2, 1)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Article {i}",
+            "source_url": f"https://bench.example.com/a/{i}",
+            "content": f"Body of article {i}. " * 150,
+            "content_type": "news",
+            "category_hint": "research",
+            "thread_status": "pending",
+            "created_at": base + timedelta(minutes=i),
+            "extra_data": json.dumps({"lang": "en", "word_count": 600 + i % 300}),
+            "raw_payload": _payload(i),
+        }
+        for i in range(count)
+    ]
+
+
+async def _setup(conn, schema: str, rows: list[dict[str, Any]]) -> None:
+    await conn.execute(text(f"CREATE SCHEMA {schema}"))
+    await conn.execute(text(f"CREATE TABLE {schema}.inline ({HOT_COLUMNS}, raw_payload json)"))
+    await conn.execute(text(f"CREATE TABLE {schema}.hot ({HOT_COLUMNS})"))
+    await conn.execute(
+        text(
+            f"CREATE TABLE {schema}.payloads (content_id text primary key"
+            f" references {schema}.hot(id) on delete cascade, codec text, data bytea, raw_size int)"
+        )
+    )
+    hot_cols = [c.split()[0] for c in HOT_COLUMNS.split(",")]
+    names = ", ".join(hot_cols)
+    params = ", ".join(f":{c}" for c in hot_cols)
+    inline = [{**r, "raw_payload": json.dumps(r["raw_payload"])} for r in rows]
+    await conn.execute(
+        text(f"INSERT INTO {schema}.inline ({names}, raw_payload) VALUES ({params}, :raw_payload)"), inline
+    )
+    await conn.execute(text(f"INSERT INTO {schema}.hot ({names}) VALUES ({params})"), rows)
+    payloads = []
+    for r in rows:
+        codec, data, raw_size = encode_payload(r["raw_payload"])
+        payloads.append({"content_id": r["id"], "codec": codec, "data": data, "raw_size": raw_size})
+    await conn.execute(
+        text(
+            f"INSERT INTO {schema}.payloads (content_id, codec, data, raw_size)"
+            " VALUES (:content_id, :codec, :data, :raw_size)"
+        ).bindparams(bindparam("data", type_=LargeBinary())),
+        payloads,
+    )
+    for table in ("inline", "hot"):
+        await conn.execute(text(f"CREATE INDEX ON {schema}.{table} (created_at)"))
+        await conn.execute(text(f"ANALYZE {schema}.{table}"))
+    await conn.execute(text(f"ANALYZE {schema}.payloads"))
+
+
+async def _size(conn, relation: str) -> int:
+    return (await conn.execute(text("SELECT pg_total_relation_size(:r)"), {"r": relation})).scalar_one()
+
+
+async def _latency(conn, sql: str, params: list[dict[str, Any]]) -> dict[str, float]:
+    stmt = text(sql)
+    timings = []
+    for p in params:
+        started = time.perf_counter()
+        (await conn.execute(stmt, p)).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+    }
+
+
+async def _main(count: int, queries: int) -> dict[str, Any]:
+    schema = f"bench_cold_{uuid.uuid4().hex[:8]}"
+    rows = _rows(count)
+    rng = random.Random(7)
+    offsets = [{"offset": rng.randrange(0, max(1, count - 100))} for _ in range(queries)]
+    ids = [{"id": rng.choice(rows)["id"]} for _ in range(queries)]
+    async with engine.begin() as conn:
+        try:
+            await _setup(conn, schema, rows)
+            hot = await _size(conn, f"{schema}.hot")
+            payloads = await _size(conn, f"{schema}.payloads")
+            return {
+                "rows": count,
+                "bytes": {
+                    "inline_table": await _size(conn, f"{schema}.inline"),
+                    "hot_table": hot,
+                    "payload_table": payloads,
+                    "split_total": hot + payloads,
+                },
+                "list_content": {
+                    "inline": await _latency(conn, LIST_SQL.format(table=f"{schema}.inline"), offsets),
+                    "split": await _latency(conn, LIST_SQL.format(table=f"{schema}.hot"), offsets),
+                },
+                "get_by_id": {
+                    "inline": await _latency(conn, f"SELECT * FROM {schema}.inline WHERE id = :id", ids),
+                    "split": await _latency(conn, f"SELECT * FROM {schema}.hot WHERE id = :id", ids),
+                },
+            }
+        finally:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_main(args.rows, args.queries)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
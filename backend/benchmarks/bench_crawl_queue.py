@@ -0,0 +1,142 @@
+"""Crawl throughput vs number of worker processes sharing the Redis queue.
+
+Enqueues ``--jobs`` article fetches against the local fake server (fixed
+per-request latency) and drains the queue with 1, 2, 4, ... worker
+processes, each running ``CrawlWorker`` with ``--concurrency`` jobs in
+flight (fetch + extraction, no DB writes; ``--no-extract`` fetches only,
+which isolates the queue from CPU limits on small machines). Workers import
+and connect before the clock starts. Needs a Redis server (``--redis-url``); keys go
+under a throwaway prefix that is deleted afterwards.
+
+Usage:
+    python -m benchmarks.bench_crawl_queue --jobs 2000 --workers 1 2 4 8 --concurrency 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import time
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.services.crawler.generic_article import extract_generic_article
+from app.services.crawler.session import CrawlSession, RetryPolicy
+from app.services.crawler.work_queue import CrawlQueue
+from app.tasks.crawl_worker import CrawlWorker
+from tests.helpers import FakeFeedServer
+
+
+async def _worker(
+    redis_url: str, prefix: str, concurrency: int, extract: bool, start: Any, results: Any
+) -> None:
+    client = redis.from_url(redis_url)
+    queue = CrawlQueue(client, prefix=prefix, visibility_sec=30)
+    session = CrawlSession(
+        max_connections=concurrency, max_per_host=concurrency, retry=RetryPolicy(retries=0)
+    )
+
+    async def fetch(args: dict[str, Any]) -> None:
+        res = await session.get(args["url"])
+        if extract:
+            extract_generic_article(str(res.url), res.text, http_status=res.status_code)
+
+    await client.ping()
+    results.put(("ready", os.getpid()))
+    await asyncio.to_thread(start.wait)
+    worker = CrawlWorker(queue, {"fetch": fetch}, concurrency=concurrency, poll_sec=0.05)
+    counts = await worker.run(until_idle=True)
+    await session.aclose()
+    await client.aclose()
+    results.put(("done", counts))
+
+
+def _worker_main(*args: Any) -> None:
+    asyncio.run(_worker(*args))
+
+
+async def _enqueue(redis_url: str, prefix: str, base_url: str, jobs: int) -> None:
+    queue = CrawlQueue(redis.from_url(redis_url), prefix=prefix)
+    await queue.clear()
+    await queue.enqueue_many(
+        [("fetch", {"url": f"{base_url}/articles/{i % 97}/{i}"}) for i in range(jobs)]
+    )
+    await queue.client.aclose()
+
+
+async def _finish(redis_url: str, prefix: str) -> dict[str, Any]:
+    queue = CrawlQueue(redis.from_url(redis_url), prefix=prefix)
+    stats = await queue.stats()
+    await queue.clear()
+    await queue.client.aclose()
+    return stats
+
+
+def _run(args: argparse.Namespace, base_url: str, workers: int) -> dict[str, Any]:
+    prefix = f"bench:crawlq:{os.getpid()}"
+    asyncio.run(_enqueue(args.redis_url, prefix, base_url, args.jobs))
+    ctx = mp.get_context("spawn")
+    start, results = ctx.Event(), ctx.Queue()
+    procs = [
+        ctx.Process(
+            target=_worker_main,
+            args=(args.redis_url, prefix, args.concurrency, args.extract, start, results),
+        )
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        assert results.get(timeout=60)[0] == "ready"
+    started = time.perf_counter()
+    start.set()
+    counts = [results.get(timeout=600)[1] for _ in procs]
+    elapsed = time.perf_counter() - started
+    for p in procs:
+        p.join()
+    stats = asyncio.run(_finish(args.redis_url, prefix))
+    completed = sum(c["completed"] for c in counts)
+    return {
+        "workers": workers,
+        "elapsed_sec": round(elapsed, 3),
+        "jobs_per_sec": round(completed / elapsed, 1),
+        "completed": completed,
+        "per_worker": [c["completed"] for c in counts],
+        "left_in_queue": stats["ready"] + stats["delayed"] + stats["leased"] + stats["dead"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--no-extract", dest="extract", action="store_false")
+    parser.add_argument("--redis-url", default=os.environ.get("REDIS_URL", "redis://localhost:6379"))
+    args = parser.parse_args()
+
+    with FakeFeedServer(latency_sec=args.latency_ms / 1000) as server:
+        runs = [_run(args, server.base_url, w) for w in args.workers]
+    base = runs[0]["jobs_per_sec"] / runs[0]["workers"]
+    for run in runs:
+        run["scaling_efficiency"] = round(run["jobs_per_sec"] / (base * run["workers"]), 2)
+    print(
+        json.dumps(
+            {
+                "jobs": args.jobs,
+                "concurrency_per_worker": args.concurrency,
+                "latency_ms": args.latency_ms,
+                "extract": args.extract,
+                "runs": runs,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Wall-clock benchmark for catalog discovery against a local fake feed server.
+
+Usage:
+    python -m benchmarks.bench_discovery --sources 10 25 50 100 --latency-ms 100
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from contextlib import ExitStack
+from typing import Any
+
+from app.tasks.discover_source_urls import discover_from_catalog_async
+from tests.helpers import FakeFeedServer
+
+
+def _build_catalog(
+    servers: list[FakeFeedServer],
+    n_sources: int,
+    *,
+    max_concurrency: int,
+    per_host_limit: int,
+) -> dict[str, Any]:
+    sources = []
+    for n in range(n_sources):
+        base = servers[n % len(servers)].base_url
+        if n % 4 == 3:
+            sources.append(
+                {
+                    "id": f"index_{n}",
+                    "type": "html_index",
+                    "url": f"{base}/index/{n}",
+                    "allow_prefixes": [f"{base}/articles/"],
+                    "limit": 30,
+                }
+            )
+        else:
+            sources.append(
+                {
+                    "id": f"rss_{n}",
+                    "type": "rss",
+                    "url": f"{base}/feed/{n}.xml",
+                    "limit": 30,
+                }
+            )
+    return {
+        "version": 2,
+        "defaults": {
+            "http": {
+                "timeout_sec": 10,
+                "retries": 0,
+                "max_concurrency": max_concurrency,
+                "per_host_limit": per_host_limit,
+                "source_deadline_sec": 30,
+            }
+        },
+        "sources": sources,
+    }
+
+
+async def _timed(catalog: dict[str, Any]) -> tuple[float, dict[str, Any]]:
+    started = time.perf_counter()
+    result = await discover_from_catalog_async(catalog)
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sources", type=int, nargs="+", default=[10, 25, 50, 100])
+    parser.add_argument("--hosts", type=int, default=8, help="Number of fake hosts.")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    parser.add_argument("--per-host-limit", type=int, default=4)
+    args = parser.parse_args()
+
+    rows: list[dict[str, Any]] = []
+    with ExitStack() as stack:
+        servers = [
+            stack.enter_context(FakeFeedServer(latency_sec=args.latency_ms / 1000))
+            for _ in range(args.hosts)
+        ]
+        for n in args.sources:
+            serial_sec, serial = asyncio.run(
+                _timed(_build_catalog(servers, n, max_concurrency=1, per_host_limit=1))
+            )
+            conc_sec, conc = asyncio.run(
+                _timed(
+                    _build_catalog(
+                        servers,
+                        n,
+                        max_concurrency=args.max_concurrency,
+                        per_host_limit=args.per_host_limit,
+                    )
+                )
+            )
+            rows.append(
+                {
+                    "sources": n,
+                    "serial_sec": round(serial_sec, 3),
+                    "concurrent_sec": round(conc_sec, 3),
+                    "speedup": round(serial_sec / conc_sec, 2) if conc_sec else None,
+                    "ok_sources": conc["ok_sources"],
+                    "unique_urls": conc["unique_url_count"],
+                    "serial_unique_urls": serial["unique_url_count"],
+                }
+            )
+
+    print(
+        json.dumps(
+            {
+                "latency_ms": args.latency_ms,
+                "hosts": args.hosts,
+                "max_concurrency": args.max_concurrency,
+                "per_host_limit": args.per_host_limit,
+                "results": rows,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
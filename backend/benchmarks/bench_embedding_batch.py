@@ -0,0 +1,186 @@
+"""Embedding throughput: one request per text vs the micro-batching coalescer.
+
+Runs the real ``google-genai`` async client against a local fake
+``:batchEmbedContents`` server whose latency is ``--base-ms`` plus
+``--per-text-ms`` per text and which serves at most ``--server-concurrency``
+requests at a time (standing in for API rate limits).
+
+Scenarios:
+  concurrent  ``--callers`` coroutines each embedding ``--texts`` single
+              texts back to back (concurrent workflow runs)
+  serial      one loop embedding ``--serial`` texts one by one, as
+              ``TrendCandidateSelector`` did, vs one batched call
+
+Usage:
+    python -m benchmarks.bench_embedding_batch --callers 32 --texts 10 --serial 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from google import genai
+from google.genai import types
+
+from app.services.vector.embedding_batcher import EmbeddingBatcher
+
+MODEL = "models/gemini-embedding-001"
+DIM = 768
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+    def __init__(self, addr, handler, *, base_sec: float, per_text_sec: float, concurrency: int):
+        super().__init__(addr, handler)
+        self.base_sec = base_sec
+        self.per_text_sec = per_text_sec
+        self.gate = threading.Semaphore(concurrency)
+        self.requests = 0
+        self.texts = 0
+        self.lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _Server
+
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+        n = len(body.get("requests", []))
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.texts += n
+        with self.server.gate:
+            time.sleep(self.server.base_sec + self.server.per_text_sec * n)
+        vector = [0.01] * DIM
+        out = json.dumps({"embeddings": [{"values": vector} for _ in range(n)]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start(args) -> _Server:
+    server = _Server(
+        ("127.0.0.1", 0),
+        _Handler,
+        base_sec=args.base_ms / 1000,
+        per_text_sec=args.per_text_ms / 1000,
+        concurrency=args.server_concurrency,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _client(server: _Server) -> genai.Client:
+    return genai.Client(
+        api_key="bench",
+        http_options=types.HttpOptions(base_url=f"http://127.0.0.1:{server.server_address[1]}"),
+    )
+
+
+def _pct(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 1)
+
+
+async def _concurrent(server: _Server, args, batched: bool) -> dict[str, Any]:
+    client = _client(server)
+
+    async def raw(texts: list[str]) -> list[list[float]]:
+        result = await client.aio.models.embed_content(model=MODEL, contents=texts)
+        return [e.values for e in result.embeddings]
+
+    batcher = EmbeddingBatcher(raw, max_batch=args.max_batch, linger_ms=args.linger_ms)
+    embed = batcher.embed if batched else raw
+    latencies: list[float] = []
+
+    async def caller(c: int) -> None:
+        for i in range(args.texts):
+            started = time.perf_counter()
+            await embed([f"caller {c} text {i}"])
+            latencies.append(time.perf_counter() - started)
+
+    server.requests = server.texts = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(caller(c) for c in range(args.callers)))
+    elapsed = time.perf_counter() - started
+    return {
+        "texts": len(latencies),
+        "requests": server.requests,
+        "texts_per_sec": round(len(latencies) / elapsed, 1),
+        "latency_p50_ms": _pct(latencies, 0.5),
+        "latency_p95_ms": _pct(latencies, 0.95),
+    }
+
+
+async def _serial(server: _Server, args, batched: bool) -> dict[str, Any]:
+    client = _client(server)
+    texts = [f"selector row {i}" for i in range(args.serial)]
+    server.requests = server.texts = 0
+    started = time.perf_counter()
+    if batched:
+        for i in range(0, len(texts), args.max_batch):
+            await client.aio.models.embed_content(model=MODEL, contents=texts[i : i + args.max_batch])
+    else:
+        for t in texts:
+            await client.aio.models.embed_content(model=MODEL, contents=t)
+    return {"requests": server.requests, "sec": round(time.perf_counter() - started, 3)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=32)
+    parser.add_argument("--texts", type=int, default=10)
+    parser.add_argument("--serial", type=int, default=200)
+    parser.add_argument("--base-ms", type=float, default=80.0)
+    parser.add_argument("--per-text-ms", type=float, default=0.5)
+    parser.add_argument("--server-concurrency", type=int, default=8)
+    parser.add_argument("--max-batch", type=int, default=100)
+    parser.add_argument("--linger-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    server = _start(args)
+    try:
+        results = {
+            "concurrent": {
+                "unbatched": asyncio.run(_concurrent(server, args, batched=False)),
+                "batched": asyncio.run(_concurrent(server, args, batched=True)),
+            },
+            "serial": {
+                "one_per_text": asyncio.run(_serial(server, args, batched=False)),
+                "batched": asyncio.run(_serial(server, args, batched=True)),
+            },
+        }
+    finally:
+        server.shutdown()
+    print(
+        json.dumps(
+            {
+                "server": {
+                    "base_ms": args.base_ms,
+                    "per_text_ms": args.per_text_ms,
+                    "concurrency": args.server_concurrency,
+                },
+                "max_batch": args.max_batch,
+                "linger_ms": args.linger_ms,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
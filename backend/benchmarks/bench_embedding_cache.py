@@ -0,0 +1,199 @@
+"""Embedding cache: old per-id JSON Redis cache vs two-tier (LRU + packed Redis).
+
+Replays ``--lookups`` embed calls over ``--distinct`` texts (Zipf-like
+popularity; every call carries a fresh content id, as re-crawled or
+cross-posted articles do) against a stubbed embedding call of
+``--embed-ms``. Reports model calls, wall time, hit rates, Redis bytes and
+the encode/decode cost of one 3072-dim vector as JSON vs packed float32.
+
+The Redis-backed paths need ``--redis-url`` (default ``REDIS_URL``) to be
+reachable; otherwise only the in-process tier is measured.
+
+Usage:
+    python -m benchmarks.bench_embedding_cache --lookups 2000 --distinct 300
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.config import get_settings
+from app.services.vector.embedding_cache import EmbeddingCache, pack_vector, unpack_vector
+
+MODEL = "models/gemini-embedding-001"
+DIM = 3072
+
+
+def _vector(text: str) -> list[float]:
+    rng = random.Random(text)
+    return [rng.uniform(-0.05, 0.05) for _ in range(DIM)]
+
+
+def _workload(lookups: int, distinct: int) -> list[str]:
+    rng = random.Random(3)
+    texts = [f"Article {i}: model release notes and benchmark results. " * 8 for i in range(distinct)]
+    weights = [1 / (i + 1) for i in range(distinct)]
+    return rng.choices(texts, weights=weights, k=lookups)
+
+
+def _codec_us(repeat: int = 200) -> dict[str, Any]:
+    vector = _vector("codec")
+    encoded_json = json.dumps(vector)
+    packed = pack_vector(vector)
+
+    def timed(fn) -> float:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return round((time.perf_counter() - started) / repeat * 1e6, 1)
+
+    return {
+        "json_bytes": len(encoded_json),
+        "float32_bytes": len(packed),
+        "float16_bytes": len(pack_vector(vector, "float16")),
+        "json_dumps_us": timed(lambda: json.dumps(vector)),
+        "json_loads_us": timed(lambda: json.loads(encoded_json)),
+        "pack_us": timed(lambda: pack_vector(vector)),
+        "unpack_us": timed(lambda: unpack_vector(packed)),
+    }
+
+
+class _Model:
+    def __init__(self, latency_sec: float):
+        self.latency_sec = latency_sec
+        self.calls = 0
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        await asyncio.sleep(self.latency_sec)
+        return [_vector(t) for t in texts]
+
+
+async def _per_id_json(texts: list[str], model: _Model, url: str, prefix: str) -> dict[str, Any]:
+    """The old ``get_embedding_cached``: new connection per call, key per content id."""
+    hits = 0
+    started = time.perf_counter()
+    for text in texts:
+        client = redis.from_url(url)
+        try:
+            key = f"{prefix}:embedding:{uuid.uuid4()}"
+            cached = await client.get(key)
+            if cached:
+                hits += 1
+                json.loads(cached)
+                continue
+            vector = (await model.embed([text]))[0]
+            await client.set(key, json.dumps(vector), ex=604800)
+        finally:
+            await client.aclose()
+    return {"sec": time.perf_counter() - started, "hits": hits}
+
+
+async def _two_tier(texts: list[str], model: _Model, cache: EmbeddingCache) -> dict[str, Any]:
+    started = time.perf_counter()
+    for text in texts:
+        await cache.get_or_embed(MODEL, [text], model.embed)
+    return {"sec": time.perf_counter() - started, **cache.stats()}
+
+
+async def _redis_bytes(url: str, prefix: str) -> int:
+    client = redis.from_url(url)
+    try:
+        total = 0
+        async for key in client.scan_iter(f"{prefix}:*"):
+            total += await client.strlen(key)
+        return total
+    finally:
+        await client.aclose()
+
+
+async def _cleanup(url: str, prefix: str) -> None:
+    client = redis.from_url(url)
+    try:
+        keys = [k async for k in client.scan_iter(f"{prefix}:*")]
+        for i in range(0, len(keys), 500):
+            await client.delete(*keys[i : i + 500])
+    finally:
+        await client.aclose()
+
+
+async def _reachable(url: str) -> bool:
+    client = redis.from_url(url, socket_connect_timeout=1.0)
+    try:
+        await client.ping()
+        return True
+    except Exception:
+        return False
+    finally:
+        await client.aclose()
+
+
+async def _main(args) -> dict[str, Any]:
+    texts = _workload(args.lookups, args.distinct)
+    latency = args.embed_ms / 1000
+    results: dict[str, Any] = {"codec_per_vector": _codec_us()}
+
+    def summary(model: _Model, run: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "model_calls": model.calls,
+            "sec": round(run.pop("sec"), 3),
+            **{k: run[k] for k in ("hit_rate", "memory_hits", "redis_hits", "memory_bytes") if k in run},
+        }
+
+    model = _Model(latency)
+    run = await _two_tier(texts, model, EmbeddingCache(memory_bytes=args.memory_mb << 20))
+    results["memory_only"] = summary(model, run)
+
+    if await _reachable(args.redis_url):
+        prefix = f"bench:emb:{uuid.uuid4().hex[:8]}"
+        try:
+            model = _Model(latency)
+            run = await _per_id_json(texts, model, args.redis_url, f"{prefix}:old")
+            results["per_id_json"] = {
+                "model_calls": model.calls,
+                "sec": round(run["sec"], 3),
+                "hit_rate": round(run["hits"] / len(texts), 4),
+                "redis_bytes": await _redis_bytes(args.redis_url, f"{prefix}:old"),
+            }
+
+            client = redis.from_url(args.redis_url)
+            model = _Model(latency)
+            cache = EmbeddingCache(client, prefix=f"{prefix}:new", memory_bytes=args.memory_mb << 20)
+            run = await _two_tier(texts, model, cache)
+            results["two_tier"] = {
+                **summary(model, run),
+                "redis_bytes": await _redis_bytes(args.redis_url, f"{prefix}:new"),
+            }
+
+            # A second process: cold local tier, warm Redis.
+            model = _Model(latency)
+            cold = EmbeddingCache(client, prefix=f"{prefix}:new", memory_bytes=args.memory_mb << 20)
+            results["two_tier_new_process"] = summary(model, await _two_tier(texts, model, cold))
+            await client.aclose()
+        finally:
+            await _cleanup(args.redis_url, prefix)
+    else:
+        results["redis"] = f"unreachable at {args.redis_url}; Redis paths skipped"
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=300)
+    parser.add_argument("--embed-ms", type=float, default=5.0, help="stubbed model call latency")
+    parser.add_argument("--memory-mb", type=int, default=64)
+    parser.add_argument("--redis-url", default=get_settings().REDIS_URL)
+    args = parser.parse_args()
+    print(json.dumps({"lookups": args.lookups, "distinct": args.distinct, **asyncio.run(_main(args))}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Embedding size: storage, memory and search latency at 768 / 1536 / 3072 dims.
+
+For each size, loads ``--points`` unit vectors (truncated + re-normalized
+from one set of 3072-dim vectors, as the Matryoshka resize does) into a
+Qdrant collection built from the content schema, then times ``--queries``
+top-10 searches. Also times an exact NumPy scan over the same matrix as a
+stand-in for pgvector's sequential scan, and reports per-vector bytes for
+the pgvector column, the embedding cache and the JSON request body.
+
+Defaults to an in-process ``:memory:`` Qdrant (brute force, no HNSW or
+quantization); pass ``--url`` to measure a real server.
+
+Usage:
+    python -m benchmarks.bench_embedding_dimensions --points 5000 --queries 200
+    python -m benchmarks.bench_embedding_dimensions --url http://localhost:6333
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import time
+import uuid
+from typing import Any
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient, models
+
+from app.services.vector.dimensions import NATIVE_DIMENSIONS
+from app.services.vector.embedding_cache import pack_vector
+from app.services.vector.qdrant_schema import CONTENT_COLLECTION, ensure_collection, reset_schema_readiness
+
+
+def _unit(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def _pct(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+
+
+def _storage(dims: int, points: int) -> dict[str, Any]:
+    vector = [0.0123456789] * dims
+    return {
+        "pgvector_bytes": 4 * dims + 8,  # float4 values + varlena header / dim count
+        "cache_float32_bytes": len(pack_vector(vector)),
+        "cache_float16_bytes": len(pack_vector(vector, "float16")),
+        "request_json_bytes": len(json.dumps(vector)),
+        "qdrant_ram_mb": {
+            # Original vectors in RAM, or only the int8 copy when QDRANT_ON_DISK.
+            "float32": round(4 * dims * points / 2**20, 1),
+            "int8_quantized": round(dims * points / 2**20, 1),
+        },
+    }
+
+
+async def _qdrant(client: AsyncQdrantClient, dims: int, data: np.ndarray, queries: np.ndarray) -> dict[str, Any]:
+    schema = dataclasses.replace(CONTENT_COLLECTION, name=f"bench_dims_{dims}_{uuid.uuid4().hex[:6]}", size=dims)
+    reset_schema_readiness()
+    await ensure_collection(client, schema)
+    try:
+        started = time.perf_counter()
+        for i in range(0, len(data), 256):
+            await client.upsert(
+                schema.name,
+                points=[
+                    models.PointStruct(id=i + j, vector=row.tolist(), payload={"n": i + j})
+                    for j, row in enumerate(data[i : i + 256])
+                ],
+                wait=True,
+            )
+        load_sec = time.perf_counter() - started
+
+        latencies = []
+        for q in queries:
+            started = time.perf_counter()
+            await client.query_points(schema.name, query=q.tolist(), limit=10)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        await client.delete_collection(schema.name)
+    return {
+        "load_sec": round(load_sec, 2),
+        "search_p50_ms": _pct(latencies, 0.5),
+        "search_p95_ms": _pct(latencies, 0.95),
+    }
+
+
+def _scan(data: np.ndarray, queries: np.ndarray) -> dict[str, Any]:
+    latencies = []
+    for q in queries:
+        started = time.perf_counter()
+        scores = data @ q
+        np.argpartition(-scores, 10)[:10]
+        latencies.append(time.perf_counter() - started)
+    return {"scan_p50_ms": _pct(latencies, 0.5), "scan_p95_ms": _pct(latencies, 0.95)}
+
+
+async def _main(args) -> dict[str, Any]:
+    rng = np.random.default_rng(7)
+    full = rng.standard_normal((args.points, NATIVE_DIMENSIONS), dtype=np.float32)
+    full_queries = rng.standard_normal((args.queries, NATIVE_DIMENSIONS), dtype=np.float32)
+    client = AsyncQdrantClient(url=args.url) if args.url else AsyncQdrantClient(location=":memory:")
+    results = {}
+    try:
+        for dims in args.dims:
+            data = _unit(full[:, :dims])
+            queries = _unit(full_queries[:, :dims])
+            results[dims] = {
+                **_storage(dims, args.points),
+                **await _qdrant(client, dims, data, queries),
+                **_scan(data, queries),
+            }
+    finally:
+        await client.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dims", type=int, nargs="+", default=[768, 1536, 3072])
+    parser.add_argument("--url", default=None, help="Qdrant server (default: in-process :memory:)")
+    args = parser.parse_args()
+    results = asyncio.run(_main(args))
+    print(
+        json.dumps(
+            {"points": args.points, "queries": args.queries, "qdrant": args.url or ":memory:", "results": results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""CPU time per page: legacy multi-pass extraction vs the single-pass extractor.
+
+Usage:
+    python -m benchmarks.bench_extraction --repeat 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from app.services.crawler.generic_article import extract_generic_article
+from app.services.crawler.google_blog import _build_item_from_html
+from benchmarks.legacy_extract import legacy_generic_article, legacy_google_item
+
+FIXTURES = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "html"
+
+GOOGLE_URL = "https://blog.google/technology/ai/example/"
+GENERIC_URL = "https://www.example.com/news/example"
+
+
+def _cpu_ms_per_page(fn: Callable[[], Any], repeat: int) -> float:
+    fn()  # warm-up
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - started) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES)
+    args = parser.parse_args()
+
+    rows: list[dict[str, Any]] = []
+    for path in sorted(args.fixtures.glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        cases = {
+            "google_blog": (
+                lambda: legacy_google_item(GOOGLE_URL, html),
+                lambda: _build_item_from_html(GOOGLE_URL, html),
+            ),
+            "generic": (
+                lambda: legacy_generic_article(GENERIC_URL, html),
+                lambda: extract_generic_article(GENERIC_URL, html),
+            ),
+        }
+        for name, (legacy, single) in cases.items():
+            legacy_ms = _cpu_ms_per_page(legacy, args.repeat)
+            single_ms = _cpu_ms_per_page(single, args.repeat)
+            rows.append(
+                {
+                    "fixture": path.name,
+                    "kb": round(len(html.encode("utf-8")) / 1024, 1),
+                    "builder": name,
+                    "legacy_ms": round(legacy_ms, 2),
+                    "single_pass_ms": round(single_ms, 2),
+                    "saved_pct": round(100 * (1 - single_ms / legacy_ms), 1) if legacy_ms else None,
+                }
+            )
+
+    print(json.dumps({"repeat": args.repeat, "results": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Cross-run URL dedup: UrlFrontier vs an in-memory ``set`` of URL strings.
+
+Run 1 records ``--urls`` article URLs; run 2 reopens the frontier from disk
+and checks a batch where ``--overlap`` of the URLs were seen before (with
+tracking parameters and trailing slashes added, so canonicalization has to
+match them). Reports lookup throughput, hit rate and resident memory per
+million URLs.
+
+Usage:
+    python -m benchmarks.bench_frontier --urls 200000 --overlap 0.8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.services.crawler.url_frontier import UrlFrontier
+
+
+def _url(i: int) -> str:
+    return f"https://news{i % 97}.example.com/posts/{i}"
+
+
+def _noisy(url: str, rng: random.Random) -> str:
+    variant = rng.randrange(3)
+    if variant == 0:
+        return url + "/"
+    if variant == 1:
+        return url + "?utm_source=feed&utm_medium=rss"
+    return url.replace("https://news", "https://NEWS") + "#comments"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=200_000)
+    parser.add_argument("--overlap", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    first = [_url(i) for i in range(args.urls)]
+    seen_count = int(args.urls * args.overlap)
+    second = [_noisy(u, rng) for u in rng.sample(first, seen_count)]
+    second += [_url(args.urls + i) for i in range(args.urls - seen_count)]
+    rng.shuffle(second)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        frontier = UrlFrontier(root, capacity=args.urls * 2)
+        started = time.perf_counter()
+        frontier.filter_new(first)
+        frontier.save()
+        record_sec = time.perf_counter() - started
+        frontier.close()
+
+        started = time.perf_counter()
+        tracemalloc.start()
+        reopened = UrlFrontier(root, capacity=args.urls * 2)
+        open_sec = time.perf_counter() - started
+        resident, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        started = time.perf_counter()
+        new = reopened.filter_new(second, mark=False)
+        lookup_sec = time.perf_counter() - started
+        stats = reopened.stats()
+        reopened.close()
+
+    tracemalloc.start()
+    plain = set(first)
+    set_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    naive_new = [u for u in second if u not in plain]
+
+    per_million = 1_000_000 / args.urls
+    print(
+        json.dumps(
+            {
+                "urls": args.urls,
+                "overlap": args.overlap,
+                "frontier": {
+                    "record_urls_per_sec": round(args.urls / record_sec),
+                    "reopen_ms": round(open_sec * 1000, 1),
+                    "lookup_urls_per_sec": round(len(second) / lookup_sec),
+                    "new_urls": len(new),
+                    "hit_rate": stats["hit_rate"],
+                    "bloom_false_positives": stats["bloom_false_positives"],
+                    "resident_mb_per_million_urls": round(resident * per_million / 2**20, 2),
+                    "disk_mb_per_million_urls": round(stats["disk_bytes"] * per_million / 2**20, 2),
+                },
+                "python_set": {
+                    "new_urls_without_canonicalization": len(naive_new),
+                    "resident_mb_per_million_urls": round(set_bytes * per_million / 2**20, 2),
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Near-duplicate check cost vs the embedding calls it avoids.
+
+Builds an index of ``--articles`` synthetic articles, then checks a batch
+where ``--dup-share`` of the items are syndicated copies (another byline and
+footer around the same body) and the rest are new. Reports indexing and
+lookup throughput, recall on the copies, false positives on the new items
+and how many embedding calls the check would have saved.
+
+Usage:
+    python -m benchmarks.bench_near_dup --articles 50000 --batch 2000 --dup-share 0.3
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from app.services.crawler.near_duplicate import NearDuplicateIndex
+
+VOCAB = [f"w{i}" for i in range(20_000)]
+
+
+def _article(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCAB) for _ in range(words))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=50_000)
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument("--dup-share", type=float, default=0.3)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--max-distance", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [_article(rng, args.words) for _ in range(args.articles)]
+
+    index = NearDuplicateIndex(max_distance=args.max_distance, max_items=args.articles * 2)
+    started = time.perf_counter()
+    for i, text in enumerate(corpus):
+        index.add(f"https://old.example.com/{i}", text)
+    index_sec = time.perf_counter() - started
+
+    dup_count = int(args.batch * args.dup_share)
+    batch = [
+        (True, f"By Wire Desk {corpus[rng.randrange(args.articles)]} All rights reserved")
+        for _ in range(dup_count)
+    ]
+    batch += [(False, _article(rng, args.words)) for _ in range(args.batch - dup_count)]
+    rng.shuffle(batch)
+
+    started = time.perf_counter()
+    matches = [index.check(f"https://new.example.com/{i}", text) for i, (_, text) in enumerate(batch)]
+    check_sec = time.perf_counter() - started
+
+    caught = sum(1 for (is_dup, _), m in zip(batch, matches) if is_dup and m)
+    false_pos = sum(1 for (is_dup, _), m in zip(batch, matches) if not is_dup and m)
+    print(
+        json.dumps(
+            {
+                "articles": args.articles,
+                "batch": args.batch,
+                "max_distance": args.max_distance,
+                "indexed_per_sec": round(args.articles / index_sec),
+                "checks_per_sec": round(args.batch / check_sec),
+                "check_ms_per_item": round(check_sec * 1000 / args.batch, 3),
+                "recall": round(caught / dup_count, 3) if dup_count else None,
+                "false_positives": false_pos,
+                "embedding_calls_avoided": caught + false_pos,
+                "embedding_calls_avoided_share": round((caught + false_pos) / args.batch, 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Event-loop lag under concurrent crawl load: inline parsing vs the process pool.
+
+Serves a saved article page from the local fake server and crawls it
+``--pages`` times with ``--concurrency`` tasks while sampling loop lag.
+
+Usage:
+    python -m benchmarks.bench_offload --pages 200 --concurrency 16 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from app.services.crawler.generic_article import crawl_generic_article
+from app.services.crawler.offload import ExtractionPool
+from app.services.crawler.session import CrawlSession, RetryPolicy
+from app.services.monitoring import LoopLagMonitor
+from tests.helpers import FakeFeedServer
+
+FIXTURE = (
+    Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "html" / "google_blog_gemini3.html"
+)
+
+
+async def _run(base_url: str, pages: int, concurrency: int, pool: ExtractionPool) -> dict[str, Any]:
+    session = CrawlSession(max_connections=concurrency, max_per_host=concurrency, retry=RetryPolicy(retries=0))
+    # Warm the pool so process start-up is not counted.
+    await crawl_generic_article(f"{base_url}/articles/0/0", session=session, pool=pool)
+
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(pages):
+        queue.put_nowait(i)
+
+    async def worker() -> None:
+        while not queue.empty():
+            i = queue.get_nowait()
+            await crawl_generic_article(f"{base_url}/articles/1/{i}", session=session, pool=pool)
+
+    monitor = LoopLagMonitor(interval_sec=0.01, window=100_000)
+    async with monitor:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    await session.aclose()
+    return {
+        "elapsed_sec": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 1),
+        "loop_lag": monitor.snapshot(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--html-file", type=Path, default=FIXTURE)
+    args = parser.parse_args()
+
+    html = args.html_file.read_text(encoding="utf-8")
+    results: dict[str, Any] = {}
+    with FakeFeedServer(latency_sec=args.latency_ms / 1000, article_html=html) as server:
+        for label, workers in (("inline", 0), ("process_pool", args.workers)):
+            pool = ExtractionPool(workers=workers)
+            try:
+                results[label] = asyncio.run(
+                    _run(server.base_url, args.pages, args.concurrency, pool)
+                )
+            finally:
+                pool.shutdown()
+
+    print(
+        json.dumps(
+            {
+                "page_kb": round(len(html.encode("utf-8")) / 1024, 1),
+                "pages": args.pages,
+                "concurrency": args.concurrency,
+                "workers": args.workers,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
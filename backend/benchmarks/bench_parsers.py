@@ -0,0 +1,104 @@
+"""Pages per second for each HTML parser backend on the saved fixture pages.
+
+Usage:
+    python -m benchmarks.bench_parsers --repeat 50
+    python -m benchmarks.bench_parsers --archive-dir crawl_archive --max-pages 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from app.services.crawler.archive import HtmlArchive
+from app.services.crawler.extract import PARSER_BACKENDS
+from app.services.crawler.offload import decode_html
+from app.services.crawler.generic_article import extract_generic_article
+from app.services.crawler.google_blog import _build_item_from_html
+
+FIXTURES = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "html"
+URL = "https://blog.google/technology/ai/example/"
+
+
+def _pages_per_sec(pages: list[str], build: Callable[[str], Any], repeat: int) -> float:
+    for html in pages:  # warm-up (and lazy parser imports)
+        build(html)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            build(html)
+    elapsed = time.perf_counter() - started
+    return repeat * len(pages) / elapsed if elapsed else float("inf")
+
+
+def _archived_pages(root: Path, max_pages: int) -> list[str]:
+    """Distinct pages from the crawl archive (a realistic local corpus)."""
+    archive = HtmlArchive(root)
+    seen: set[str] = set()
+    pages: list[str] = []
+    for ref in archive.iter_index():
+        if ref.sha256 in seen or not archive.has(ref.sha256):
+            continue
+        seen.add(ref.sha256)
+        pages.append(decode_html(archive.get(ref.sha256), ref.encoding))
+        if len(pages) >= max_pages:
+            break
+    return pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES)
+    parser.add_argument("--archive-dir", type=Path, default=None, help="Use archived crawl pages instead of fixtures.")
+    parser.add_argument("--max-pages", type=int, default=200)
+    parser.add_argument("--backends", nargs="+", default=list(PARSER_BACKENDS))
+    args = parser.parse_args()
+
+    if args.archive_dir:
+        pages = _archived_pages(args.archive_dir, args.max_pages)
+    else:
+        pages = [p.read_text(encoding="utf-8") for p in sorted(args.fixtures.glob("*.html"))]
+    if not pages:
+        raise SystemExit("No pages to benchmark.")
+    rows: list[dict[str, Any]] = []
+    baseline: float | None = None
+    for backend in args.backends:
+        try:
+            google = _pages_per_sec(
+                pages, lambda html: _build_item_from_html(URL, html, parser=backend), args.repeat
+            )
+            generic = _pages_per_sec(
+                pages, lambda html: extract_generic_article(URL, html, parser=backend), args.repeat
+            )
+        except ImportError as e:
+            rows.append({"backend": backend, "error": str(e)})
+            continue
+        if backend == "html.parser":
+            baseline = generic
+        rows.append(
+            {
+                "backend": backend,
+                "google_blog_pages_per_sec": round(google, 1),
+                "generic_pages_per_sec": round(generic, 1),
+                "generic_vs_html_parser": round(generic / baseline, 2) if baseline else None,
+            }
+        )
+
+    print(
+        json.dumps(
+            {
+                "pages": len(pages),
+                "kb_total": round(sum(len(p.encode("utf-8")) for p in pages) / 1024, 1),
+                "repeat": args.repeat,
+                "results": rows,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
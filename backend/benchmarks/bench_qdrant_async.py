@@ -0,0 +1,186 @@
+"""Vector search under concurrent workflow runs: sync QdrantClient vs shared AsyncQdrantClient.
+
+Each simulated ``_search_node`` awaits a stubbed query embedding
+(``--embed-ms``) and then runs ``query_points``. The old path calls the
+synchronous client inside ``async def`` (blocking the loop for the whole
+round-trip); the new path awaits the shared pooled ``AsyncQdrantClient``.
+``async_list`` additionally lists collections before every search, as the
+per-embedder ``_ensure_collection`` used to before the schema bootstrap.
+Reports event-loop lag (``LoopLagMonitor``), per-search latency and
+throughput.
+
+By default Qdrant is a local stand-in REST server answering ``query_points``
+after ``--latency-ms``; pass ``--url`` to use a real Qdrant instead (a
+throw-away collection is created and dropped).
+
+Usage:
+    python -m benchmarks.bench_qdrant_async --searches 400 --concurrency 1 8 32
+    python -m benchmarks.bench_qdrant_async --url http://localhost:6333
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from app.services.monitoring import LoopLagMonitor
+
+DIM = 64
+
+
+def _handler(latency_sec: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, result: Any) -> None:
+            body = json.dumps({"result": result, "status": "ok", "time": latency_sec}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):  # noqa: N802
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            time.sleep(latency_sec)
+            points = [
+                {"id": str(uuid.UUID(int=i + 1)), "version": 0, "score": 0.9 - i * 0.01, "payload": {}}
+                for i in range(5)
+            ]
+            self._reply({"points": points})
+
+        def do_GET(self):  # noqa: N802
+            if self.path.rstrip("/").endswith("/collections"):
+                self._reply({"collections": [{"name": f"collection_{i}"} for i in range(20)]})
+            else:
+                self._reply({"exists": True})
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class _StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def _start_stand_in(latency_sec: float) -> tuple[ThreadingHTTPServer, str]:
+    server = _StandInServer(("127.0.0.1", 0), _handler(latency_sec))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _vector(rng: random.Random) -> list[float]:
+    return [rng.random() for _ in range(DIM)]
+
+
+async def _run(mode: str, url: str, collection: str, searches: int, concurrency: int, embed_sec: float):
+    rng = random.Random(7)
+    queries = [_vector(rng) for _ in range(searches)]
+    sync_client = QdrantClient(url=url, check_compatibility=False) if mode == "sync" else None
+    async_client = (
+        AsyncQdrantClient(url=url, check_compatibility=False, pool_size=concurrency) if mode != "sync" else None
+    )
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def search(vector: list[float]) -> None:
+        async with gate:
+            started = time.perf_counter()
+            await asyncio.sleep(embed_sec)  # Gemini query embedding
+            if sync_client is not None:
+                sync_client.query_points(collection_name=collection, query=vector, limit=5)
+            else:
+                if mode == "async_list":
+                    await async_client.get_collections()
+                await async_client.query_points(collection_name=collection, query=vector, limit=5)
+            latencies.append(time.perf_counter() - started)
+
+    monitor = LoopLagMonitor(interval_sec=0.01)
+    started = time.perf_counter()
+    async with monitor:
+        await asyncio.gather(*(search(v) for v in queries))
+    elapsed = time.perf_counter() - started
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None:
+        await async_client.close()
+
+    latencies.sort()
+    return {
+        "searches_per_sec": round(searches / elapsed, 1),
+        "latency_p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+        "latency_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        "loop_lag": monitor.snapshot(),
+    }
+
+
+def _prepare_real(url: str, collection: str, points: int) -> None:
+    client = QdrantClient(url=url)
+    client.create_collection(collection, vectors_config=VectorParams(size=DIM, distance=Distance.COSINE))
+    rng = random.Random(1)
+    client.upsert(
+        collection,
+        points=[PointStruct(id=i, vector=_vector(rng), payload={"i": i}) for i in range(points)],
+    )
+    client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency-ms", type=float, default=15.0, help="stand-in server latency")
+    parser.add_argument("--embed-ms", type=float, default=30.0, help="stubbed query embedding time")
+    parser.add_argument("--url", help="real Qdrant URL instead of the stand-in server")
+    args = parser.parse_args()
+
+    server = None
+    collection = f"bench_async_{uuid.uuid4().hex[:8]}"
+    if args.url:
+        url = args.url
+        _prepare_real(url, collection, points=5000)
+    else:
+        server, url = _start_stand_in(args.latency_ms / 1000)
+
+    results: dict[str, Any] = {}
+    try:
+        for concurrency in args.concurrency:
+            results[str(concurrency)] = {
+                mode: asyncio.run(
+                    _run(mode, url, collection, args.searches, concurrency, args.embed_ms / 1000)
+                )
+                for mode in ("sync", "async_list", "async")
+            }
+    finally:
+        if server is not None:
+            server.shutdown()
+        else:
+            QdrantClient(url=url).delete_collection(collection)
+
+    print(
+        json.dumps(
+            {
+                "qdrant": args.url or f"stand-in ({args.latency_ms} ms)",
+                "searches": args.searches,
+                "embed_ms": args.embed_ms,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Cost of polling a large feed: full parse vs incremental RSSCrawler polls.
+
+Builds a recorded RSS feed with ``--entries`` items and measures CPU per poll
+for a cold poll, a poll with a few new entries on top, an unchanged body and
+a 304, against a full ``feedparser`` parse of the same body.
+
+Usage:
+    python -m benchmarks.bench_rss --entries 5000 --new 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Callable
+
+import feedparser
+
+from app.services.crawler.rss import FeedState, RSSCrawler
+from app.services.crawler.session import CrawlSession, RetryPolicy
+from tests.helpers import FakeFeedServer, recorded_feed
+
+
+def _cpu_ms(fn: Callable[[], Any], repeat: int) -> float:
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - started) * 1000 / repeat
+
+
+def _primed_state(crawler: RSSCrawler, body: bytes) -> FeedState:
+    state = FeedState()
+    entries, _ = crawler._select_new(body, state)
+    state.seen = [e.key for e in entries][: crawler.max_seen]
+    state.newest_published = max(e.published for e in entries if e.published).isoformat()
+    state.body_sha256 = hashlib.sha256(body).hexdigest()
+    return state
+
+
+async def _http_polls(entries: int) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    for label, etags in (("etag_304", True), ("no_etag_same_body", False)):
+        with FakeFeedServer(latency_sec=0.0, items_per_feed=entries, etags=etags) as server:
+            session = CrawlSession(retry=RetryPolicy(retries=0))
+            crawler = RSSCrawler(None, session=session)
+            url = f"{server.base_url}/feed/1.xml"
+            first = await crawler.poll(url)
+            crawler.apply(url, first.state)
+            # Wall time includes the in-process fake server rendering the feed.
+            started = time.perf_counter()
+            second = await crawler.poll(url)
+            out[label] = {
+                "status": second.status,
+                "wall_ms": round((time.perf_counter() - started) * 1000, 2),
+                "bytes": second.bytes,
+            }
+            await session.aclose()
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--new", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    old_body = recorded_feed(args.entries, args.entries)
+    new_body = recorded_feed(args.entries + args.new, args.entries)
+    crawler = RSSCrawler(None)
+    primed = _primed_state(crawler, old_body)
+
+    def incremental() -> None:
+        entries, _ = crawler._select_new(new_body, primed)
+        assert len(entries) == args.new
+
+    results = {
+        "feedparser_full_ms": round(_cpu_ms(lambda: feedparser.parse(new_body), args.repeat), 2),
+        "cold_poll_ms": round(_cpu_ms(lambda: crawler._select_new(new_body, FeedState()), args.repeat), 2),
+        "incremental_poll_ms": round(_cpu_ms(incremental, args.repeat), 3),
+        "unchanged_body_hash_ms": round(
+            _cpu_ms(lambda: hashlib.sha256(old_body).hexdigest() == primed.body_sha256, args.repeat), 3
+        ),
+        "entries_scanned_incremental": crawler._select_new(new_body, primed)[1],
+    }
+    results["http"] = asyncio.run(_http_polls(args.entries))
+
+    print(
+        json.dumps(
+            {
+                "entries": args.entries,
+                "new_entries": args.new,
+                "feed_kb": round(len(new_body) / 1024, 1),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
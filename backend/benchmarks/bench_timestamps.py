@@ -0,0 +1,122 @@
+"""Timestamp parsing: dateutil vs the fast-path parser (cold and memoized).
+
+Collects every ``published`` / ``published_at`` / ``updated`` string from a
+discovery result (``crawl_targets/discovered_latest.json`` by default),
+parses the whole list ``--repeat`` times with each parser and checks that
+both agree on every value (same instant, same aware/naive kind).
+
+Usage:
+    python -m benchmarks.bench_timestamps --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+import re
+import time
+import warnings
+from pathlib import Path
+from typing import Any
+
+from dateutil import parser as dt_parser
+
+from app.services.crawler.timestamps import (
+    _fast_parse,
+    clear_timestamp_cache,
+    parse_timestamp,
+    timestamp_cache_info,
+)
+
+DEFAULT_INPUT = Path(__file__).resolve().parents[1] / "crawl_targets" / "discovered_latest.json"
+KEYS = {"published", "published_at", "updated"}
+
+
+def _collect(node: Any, out: list[str]) -> list[str]:
+    if isinstance(node, dict):
+        for k, v in node.items():
+            if k in KEYS and isinstance(v, str) and v.strip():
+                out.append(v)
+            else:
+                _collect(v, out)
+    elif isinstance(node, list):
+        for v in node:
+            _collect(v, out)
+    return out
+
+
+def _dateutil(raw: str):
+    try:
+        return dt_parser.parse(raw.strip())
+    except (ValueError, OverflowError):
+        return None
+
+
+def _same(a, b) -> bool:
+    if a is None or b is None:
+        return a is b
+    if (a.tzinfo is None) != (b.tzinfo is None):
+        return False
+    return a == b
+
+
+def _time(fn, values: list[str], repeat: int, *, cold: bool = False) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        if cold:
+            clear_timestamp_cache()
+        for v in values:
+            fn(v)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", type=Path, default=DEFAULT_INPUT)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    values = _collect(json.loads(args.input.read_text(encoding="utf-8")), [])
+    shapes = collections.Counter(
+        re.sub(r"\d", "9", re.sub(r"[A-Za-z]+", "A", v)) for v in values
+    )
+    warnings.simplefilter("ignore")  # dateutil warns on unknown zone names
+
+    mismatches = [v for v in set(values) if not _same(_dateutil(v), parse_timestamp(v))]
+    fast_hits = sum(1 for v in values if _fast_parse(v.strip()) is not None)
+
+    n = len(values) * args.repeat
+    t_dateutil = _time(_dateutil, values, args.repeat)
+    t_cold = _time(parse_timestamp, values, args.repeat, cold=True)
+    clear_timestamp_cache()
+    t_warm = _time(parse_timestamp, values, args.repeat)
+
+    def per_call(t: float) -> float:
+        return round(t / n * 1e6, 2)
+
+    print(
+        json.dumps(
+            {
+                "timestamps": len(values),
+                "distinct": len(set(values)),
+                "formats": dict(shapes.most_common(8)),
+                "fast_path_share": round(fast_hits / len(values), 3) if values else 0.0,
+                "mismatches": mismatches[:10],
+                "us_per_call": {
+                    "dateutil": per_call(t_dateutil),
+                    "fast_path_cold_cache": per_call(t_cold),
+                    "fast_path_memoized": per_call(t_warm),
+                },
+                "speedup": {
+                    "cold_cache": round(t_dateutil / t_cold, 1),
+                    "memoized": round(t_dateutil / t_warm, 1),
+                },
+                "cache": timestamp_cache_info()._asdict(),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
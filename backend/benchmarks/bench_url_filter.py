@@ -0,0 +1,152 @@
+"""Catalog allow/deny rules: per-call regex lists + ``any()`` loops vs the compiled filter.
+
+Builds an index page with ``--links`` anchors spread over many hosts and a
+rule set of ``--prefixes`` allow prefixes (plus deny prefixes and a few
+regexes, like the Hugging Face / GitHub catalog entries). Times the filter
+alone over the canonical URLs and the whole ``html_index`` extraction.
+
+Usage:
+    python -m benchmarks.bench_url_filter --links 5000 --prefixes 5 50 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from typing import Any, Callable
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from app.services.crawler.url_filter import UrlFilter, url_filter_for
+from app.tasks.discover_source_urls import _extract_index_items, _is_http_url, _normalize_url
+
+BASE = "https://news.example.com/"
+
+
+def _rules(prefixes: int) -> dict[str, list[str]]:
+    return {
+        "allow_prefixes": [f"https://site{i}.example.com/articles/" for i in range(prefixes)]
+        + [f"{BASE}articles/"],
+        "deny_prefixes": [f"https://site{i}.example.com/articles/sponsored/" for i in range(0, prefixes, 4)],
+        "allow_regexes": [r"/articles/[^/?#]+/\d+$", r"/articles/[a-z]+-\d+$"],
+        "deny_regexes": ["/tag/", "/author/", r"\?page=\d+$"],
+    }
+
+
+def _page(links: int, prefixes: int) -> str:
+    anchors = []
+    for i in range(links):
+        host = f"site{i % (prefixes * 2 or 1)}.example.com"
+        kind = i % 5
+        if kind == 0:
+            href = f"https://{host}/articles/topic/{i}"
+        elif kind == 1:
+            href = f"https://{host}/tag/ai-{i}"
+        elif kind == 2:
+            href = f"/articles/story-{i}"
+        elif kind == 3:
+            href = f"https://{host}/articles/sponsored/{i}"
+        else:
+            href = f"https://{host}/about?page={i}"
+        anchors.append(f'<li><a href="{href}">Story {i}</a></li>')
+    return f"<html><body><ul>{''.join(anchors)}</ul></body></html>"
+
+
+def _legacy_allows(url: str, rules: dict[str, list[str]]) -> bool:
+    """The pre-compiled check: regexes built per call, prefixes tried one by one."""
+    allow_patterns = [re.compile(p) for p in rules["allow_regexes"]]
+    deny_patterns = [re.compile(p) for p in rules["deny_regexes"]]
+    if rules["allow_prefixes"] and not any(url.startswith(p) for p in rules["allow_prefixes"]):
+        return False
+    if any(url.startswith(p) for p in rules["deny_prefixes"]):
+        return False
+    if allow_patterns and not any(p.search(url) for p in allow_patterns):
+        return False
+    if any(p.search(url) for p in deny_patterns):
+        return False
+    return True
+
+
+def _legacy_extract(html: str, rules: dict[str, list[str]]) -> list[str]:
+    soup = BeautifulSoup(html, "html.parser")
+    allow_patterns = [re.compile(p) for p in rules["allow_regexes"]]
+    deny_patterns = [re.compile(p) for p in rules["deny_regexes"]]
+    seen: set[str] = set()
+    for a in soup.find_all("a", href=True):
+        full = urljoin(BASE, a.get("href", ""))
+        if not _is_http_url(full):
+            continue
+        norm = _normalize_url(full)
+        if not any(norm.startswith(p) for p in rules["allow_prefixes"]):
+            continue
+        if any(norm.startswith(p) for p in rules["deny_prefixes"]):
+            continue
+        if not any(p.search(norm) for p in allow_patterns):
+            continue
+        if any(p.search(norm) for p in deny_patterns):
+            continue
+        seen.add(norm)
+    return sorted(seen)
+
+
+def _best_ms(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--links", type=int, default=5000)
+    parser.add_argument("--prefixes", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {}
+    for count in args.prefixes:
+        rules = _rules(count)
+        html = _page(args.links, count)
+        urls = [_normalize_url(urljoin(BASE, a["href"])) for a in BeautifulSoup(html, "html.parser").find_all("a")]
+
+        compiled_started = time.perf_counter()
+        url_filter = UrlFilter(*(rules[k] for k in ("allow_prefixes", "deny_prefixes", "allow_regexes", "deny_regexes")))
+        compile_ms = (time.perf_counter() - compiled_started) * 1000
+
+        legacy_kept = [u for u in urls if _legacy_allows(u, rules)]
+        kept = [u for u in urls if url_filter(u)]
+        assert kept == legacy_kept
+        new_items = _extract_index_items(BASE, html, url_filter=url_filter_for(rules), limit=None)
+        assert sorted(it["url"] for it in new_items) == _legacy_extract(html, rules)
+
+        legacy_filter_ms = _best_ms(lambda: [u for u in urls if _legacy_allows(u, rules)], args.repeat)
+        filter_ms = _best_ms(lambda: [u for u in urls if url_filter(u)], args.repeat)
+        legacy_page_ms = _best_ms(lambda: _legacy_extract(html, rules), args.repeat)
+        page_ms = _best_ms(
+            lambda: _extract_index_items(BASE, html, url_filter=url_filter_for(rules), limit=None),
+            args.repeat,
+        )
+        results[str(count)] = {
+            "links": len(urls),
+            "kept": len(kept),
+            "compile_ms": round(compile_ms, 2),
+            "filter_only": {
+                "legacy_ms": round(legacy_filter_ms, 2),
+                "compiled_ms": round(filter_ms, 2),
+                "speedup": round(legacy_filter_ms / filter_ms, 1),
+            },
+            "index_page": {
+                "legacy_ms": round(legacy_page_ms, 1),
+                "compiled_ms": round(page_ms, 1),
+                "speedup": round(legacy_page_ms / page_ms, 2),
+            },
+        }
+    print(json.dumps({"links": args.links, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
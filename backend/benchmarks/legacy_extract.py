@@ -0,0 +1,525 @@
+"""Pre-refactor multi-pass extraction, kept only as a benchmark baseline.
+
+These are the soup-traversal helpers the crawlers used before
+``app.services.crawler.extract`` (one ``find``/``find_all``/``get_text`` pass
+per field). ``bench_extraction`` runs them side by side with the
+single-pass extractor on the stored HTML fixtures.
+"""
+from __future__ import annotations
+
+import json
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, urlunparse
+
+from bs4 import BeautifulSoup
+from dateutil import parser as dt_parser
+
+from app.schemas.crawler_item import NormalizedItem, PipelineStatus, SourceType
+from app.services.crawler.extract import MONTH_RE, norm_ws as _norm_ws
+from app.services.crawler.generic_article import (
+    GenericArticleResult,
+    _abs_url,
+    _parse_dt,
+    _strip_fragment,
+)
+from app.services.crawler.google_blog import _classify, _now_utc, _sha256
+
+
+# --- google_blog.py (before single-pass extraction) ---------------------
+
+def _g_pick_meta(soup: BeautifulSoup, key: str) -> Optional[str]:
+    """
+    key examples:
+      - ('property', 'og:title')
+      - ('name', 'description')
+    """
+    # support both name= and property=
+    for attr in ("property", "name"):
+        tag = soup.find("meta", attrs={attr: key})
+        if tag and tag.get("content"):
+            return tag["content"].strip()
+    return None
+
+
+def _g_extract_jsonld(soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        txt = script.string
+        if not txt:
+            continue
+        try:
+            data = json.loads(txt)
+        except Exception:
+            continue
+
+        # JSON-LD can be dict or list
+        if isinstance(data, dict):
+            out.append(data)
+        elif isinstance(data, list):
+            out.extend([x for x in data if isinstance(x, dict)])
+    return out
+
+
+def _g_find_article_jsonld(jsonlds: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # look for common article types
+    wanted = {"NewsArticle", "BlogPosting", "Article"}
+    for obj in jsonlds:
+        t = obj.get("@type")
+        if isinstance(t, list):
+            if any(x in wanted for x in t):
+                return obj
+        elif isinstance(t, str) and t in wanted:
+            return obj
+    return None
+
+
+def _g_extract_main_text(soup: BeautifulSoup) -> str:
+    """
+    Heuristic: find <article>, then take headings + paragraphs + lists.
+    """
+    article = soup.find("article")
+    if not article:
+        # fallback: main content area
+        article = soup.find("main") or soup
+
+    # remove obvious noise
+    for tag in article.find_all(["script", "style", "noscript"]):
+        tag.decompose()
+
+    chunks: List[str] = []
+    for el in article.find_all(["h1", "h2", "h3", "p", "li"]):
+        text = _norm_ws(el.get_text(" ", strip=True))
+        if not text:
+            continue
+        # skip nav-like junk
+        if text.lower() in {"share", "copy link", "mail"}:
+            continue
+        chunks.append(text)
+
+    # de-duplicate adjacent repeats
+    cleaned: List[str] = []
+    for c in chunks:
+        if cleaned and cleaned[-1] == c:
+            continue
+        cleaned.append(c)
+
+    return "\n\n".join(cleaned).strip()
+
+
+def _g_extract_images_with_positions(base_url: str, soup: BeautifulSoup) -> Tuple[List[str], List[Dict[str, Any]]]:
+    article = soup.find("article") or soup.find("main") or soup
+    flow_tags = ["h1", "h2", "h3", "p", "li", "img"]
+
+    text_blocks: List[Tuple[int, str]] = []
+    image_blocks: List[Dict[str, Any]] = []
+
+    for idx, el in enumerate(article.find_all(flow_tags)):
+        if el.name == "img":
+            src = el.get("src") or el.get("data-src")
+            full = _abs_url(base_url, src) if src else None
+            if not full:
+                continue
+            image_blocks.append(
+                {
+                    "url": full,
+                    "dom_index": idx,
+                    "alt": _norm_ws(el.get("alt", "")) or None,
+                }
+            )
+            continue
+
+        text = _norm_ws(el.get_text(" ", strip=True))
+        if not text:
+            continue
+        if text.lower() in {"share", "copy link", "mail"}:
+            continue
+        text_blocks.append((idx, text))
+
+    for img in image_blocks:
+        dom_index = img["dom_index"]
+        before_text = None
+        after_text = None
+
+        for t_idx, t_text in reversed(text_blocks):
+            if t_idx < dom_index:
+                before_text = t_text
+                break
+        for t_idx, t_text in text_blocks:
+            if t_idx > dom_index:
+                after_text = t_text
+                break
+
+        img["before_text"] = before_text
+        img["after_text"] = after_text
+
+    # unique preserve order for existing image_urls field
+    seen = set()
+    image_urls = []
+    for block in image_blocks:
+        u = block["url"]
+        if u in seen:
+            continue
+        seen.add(u)
+        image_urls.append(u)
+
+    return image_urls, image_blocks
+
+
+def _g_extract_outbound_links(base_url: str, soup: BeautifulSoup) -> List[str]:
+    article = soup.find("article") or soup
+    base_host = (urlparse(base_url).hostname or "").lower()
+
+    share_hosts = {
+        "twitter.com",
+        "x.com",
+        "www.facebook.com",
+        "facebook.com",
+        "www.linkedin.com",
+        "linkedin.com",
+    }
+
+    def _is_share_url(parsed) -> bool:
+        host = (parsed.hostname or "").lower()
+        path = (parsed.path or "").lower()
+        if host in share_hosts:
+            return True
+        return (
+            "/intent/tweet" in path
+            or "/sharer" in path
+            or "/sharearticle" in path
+        )
+
+    def _normalized_no_fragment(u: str) -> str:
+        p = urlparse(u)
+        return urlunparse((p.scheme, p.netloc, p.path, p.params, p.query, ""))
+
+    links = []
+    for a in article.find_all("a", href=True):
+        href = a["href"]
+        full = _abs_url(base_url, href)
+        if not full:
+            continue
+        parsed = urlparse(full)
+        host = (parsed.hostname or "").lower()
+
+        # keep outbound links only (exclude same-site navigation links)
+        if host == base_host:
+            continue
+        # remove social/share-style links
+        if _is_share_url(parsed):
+            continue
+        links.append(_normalized_no_fragment(full))
+
+    seen = set()
+    uniq = []
+    for u in links:
+        if u in seen:
+            continue
+        seen.add(u)
+        uniq.append(u)
+    return uniq
+
+
+def _g_guess_published_at(soup: BeautifulSoup, jsonld_article: Optional[Dict[str, Any]]) -> Optional[datetime]:
+    # 1) JSON-LD datePublished
+    if jsonld_article:
+        dp = jsonld_article.get("datePublished") or jsonld_article.get("dateCreated")
+        if isinstance(dp, str) and dp.strip():
+            try:
+                return dt_parser.parse(dp).astimezone(timezone.utc)
+            except Exception:
+                pass
+
+    # 2) meta article:published_time
+    meta_time = _g_pick_meta(soup, "article:published_time")
+    if meta_time:
+        try:
+            return dt_parser.parse(meta_time).astimezone(timezone.utc)
+        except Exception:
+            pass
+
+    # 3) visible month day year somewhere near top
+    text = soup.get_text(" ", strip=True)
+    m = MONTH_RE.search(text)
+    if m:
+        try:
+            return dt_parser.parse(m.group(0)).replace(tzinfo=timezone.utc)
+        except Exception:
+            pass
+
+    return None
+
+
+def _g_guess_author(soup: BeautifulSoup, jsonld_article: Optional[Dict[str, Any]]) -> Optional[str]:
+    if jsonld_article:
+        author = jsonld_article.get("author")
+        # author can be dict or list
+        if isinstance(author, dict):
+            name = author.get("name")
+            if isinstance(name, str) and name.strip():
+                return name.strip()
+        if isinstance(author, list):
+            for a in author:
+                if isinstance(a, dict) and isinstance(a.get("name"), str):
+                    return a["name"].strip()
+
+    # meta author
+    meta_author = _g_pick_meta(soup, "author")
+    if meta_author:
+        return meta_author.strip()
+
+    # fallback: look for a short "byline-ish" string in the header
+    # (Google blog often shows something like "The Gemini Team")
+    # We'll search a small set of candidates
+    candidates = soup.find_all(string=re.compile(r"\bTeam\b|\bGoogle\b", re.I))
+    for c in candidates[:30]:
+        s = _norm_ws(str(c))
+        if 2 <= len(s) <= 60 and ("team" in s.lower()):
+            return s
+
+    return None
+
+
+# --- generic_article.py (before single-pass extraction) -----------------
+
+def _a_pick_meta(soup: BeautifulSoup, key: str) -> str | None:
+    for attr in ("property", "name"):
+        tag = soup.find("meta", attrs={attr: key})
+        if tag and tag.get("content"):
+            return _norm_ws(str(tag.get("content")))
+    return None
+
+
+def _a_extract_jsonld_objects(soup: BeautifulSoup) -> list[dict[str, Any]]:
+    out: list[dict[str, Any]] = []
+    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        txt = script.string or script.get_text()
+        if not txt:
+            continue
+        try:
+            data = json.loads(txt)
+        except Exception:
+            continue
+        if isinstance(data, dict):
+            out.append(data)
+        elif isinstance(data, list):
+            out.extend([x for x in data if isinstance(x, dict)])
+    return out
+
+
+def _a_extract_article_jsonld(objs: list[dict[str, Any]]) -> dict[str, Any] | None:
+    wanted = {"article", "newsarticle", "blogposting"}
+    for obj in objs:
+        t = obj.get("@type")
+        if isinstance(t, str) and t.lower() in wanted:
+            return obj
+        if isinstance(t, list) and any(isinstance(x, str) and x.lower() in wanted for x in t):
+            return obj
+    return None
+
+
+def _a_extract_author(soup: BeautifulSoup, article_jsonld: dict[str, Any] | None) -> str | None:
+    if article_jsonld:
+        author = article_jsonld.get("author")
+        if isinstance(author, dict):
+            name = author.get("name")
+            if isinstance(name, str):
+                return _norm_ws(name)
+        elif isinstance(author, list):
+            for item in author:
+                if isinstance(item, dict) and isinstance(item.get("name"), str):
+                    return _norm_ws(item["name"])
+
+    for k in ("author", "article:author", "parsely-author"):
+        val = _a_pick_meta(soup, k)
+        if val:
+            return val
+    return None
+
+
+def _a_extract_published_at(soup: BeautifulSoup, article_jsonld: dict[str, Any] | None) -> datetime | None:
+    if article_jsonld:
+        for key in ("datePublished", "dateCreated", "dateModified"):
+            val = article_jsonld.get(key)
+            parsed = _parse_dt(val if isinstance(val, str) else None)
+            if parsed:
+                return parsed
+
+    meta_keys = (
+        "article:published_time",
+        "og:published_time",
+        "publish_date",
+        "pubdate",
+        "date",
+        "parsely-pub-date",
+    )
+    for k in meta_keys:
+        parsed = _parse_dt(_a_pick_meta(soup, k))
+        if parsed:
+            return parsed
+
+    time_tag = soup.find("time")
+    if time_tag:
+        parsed = _parse_dt(time_tag.get("datetime") or time_tag.get_text(" ", strip=True))
+        if parsed:
+            return parsed
+
+    return None
+
+
+def _a_extract_main_content(soup: BeautifulSoup) -> str:
+    root = soup.find("article") or soup.find("main") or soup.body or soup
+
+    for bad in root.find_all(["script", "style", "noscript"]):
+        bad.decompose()
+
+    chunks: list[str] = []
+    for el in root.find_all(["h1", "h2", "h3", "p", "li"]):
+        text = _norm_ws(el.get_text(" ", strip=True))
+        if not text:
+            continue
+        if len(text) < 2:
+            continue
+        chunks.append(text)
+
+    dedup: list[str] = []
+    seen = set()
+    for c in chunks:
+        if c in seen:
+            continue
+        seen.add(c)
+        dedup.append(c)
+
+    content = "\n\n".join(dedup).strip()
+    return content[:50000]
+
+
+def _a_extract_images(base_url: str, soup: BeautifulSoup) -> list[str]:
+    root = soup.find("article") or soup.find("main") or soup
+    urls: list[str] = []
+    seen: set[str] = set()
+    for img in root.find_all("img"):
+        src = img.get("src") or img.get("data-src")
+        full = _abs_url(base_url, src)
+        if not full:
+            continue
+        full = _strip_fragment(full)
+        if full in seen:
+            continue
+        seen.add(full)
+        urls.append(full)
+    return urls
+
+
+def _a_extract_outbound(base_url: str, soup: BeautifulSoup) -> list[str]:
+    root = soup.find("article") or soup.find("main") or soup
+    base_host = (urlparse(base_url).hostname or "").lower()
+    urls: list[str] = []
+    seen: set[str] = set()
+    for a in root.find_all("a", href=True):
+        full = _abs_url(base_url, a.get("href"))
+        if not full:
+            continue
+        host = (urlparse(full).hostname or "").lower()
+        if host == base_host:
+            continue
+        full = _strip_fragment(full)
+        if full in seen:
+            continue
+        seen.add(full)
+        urls.append(full)
+    return urls
+
+
+def legacy_google_item(url: str, html: str) -> NormalizedItem:
+    soup = BeautifulSoup(html, "html.parser")
+    article_jsonld = _g_find_article_jsonld(_g_extract_jsonld(soup))
+
+    title = (
+        (article_jsonld.get("headline") if article_jsonld else None)
+        or _g_pick_meta(soup, "og:title")
+        or (soup.find("h1").get_text(strip=True) if soup.find("h1") else None)
+        or "Untitled"
+    )
+    title = _norm_ws(title)
+    canonical = (
+        (article_jsonld.get("mainEntityOfPage") if article_jsonld else None)
+        or soup.find("link", rel="canonical")["href"] if soup.find("link", rel="canonical") else None
+    )
+    if isinstance(canonical, dict):
+        canonical = canonical.get("@id")
+    canonical = canonical or url
+
+    summary_hint = _g_pick_meta(soup, "og:description") or _g_pick_meta(soup, "description")
+    published_at = _g_guess_published_at(soup, article_jsonld)
+    author = _g_guess_author(soup, article_jsonld)
+    content_text = _g_extract_main_text(soup)
+    image_urls, image_positions = _g_extract_images_with_positions(canonical, soup)
+    outbound_urls = _g_extract_outbound_links(canonical, soup)
+    content_type, category_hint = _classify(canonical, title, content_text)
+    dedup_basis = f"{canonical}\n{title}\n{published_at.isoformat() if published_at else ''}\n{content_text[:800]}"
+
+    return NormalizedItem(
+        item_id=str(uuid.uuid4()),
+        source_id=_sha256(canonical),
+        content_hash=_sha256(dedup_basis),
+        source_type=SourceType.HTML_ARTICLE,
+        source_name="Google Blog (Innovation & AI)",
+        source_url=url,
+        canonical_url=canonical,
+        fetched_at=_now_utc(),
+        title=title,
+        content=content_text,
+        summary_hint=summary_hint,
+        language="en",
+        author=author,
+        published_at=published_at,
+        image_urls=image_urls,
+        image_positions=image_positions,
+        outbound_urls=outbound_urls,
+        content_type=content_type,
+        category_hint=category_hint,
+        tags=["google", "ai", "gemini"],
+        thread_status=PipelineStatus.PENDING,
+        metadata={},
+        raw_payload={"jsonld": article_jsonld or {}},
+    )
+
+
+def legacy_generic_article(final_url: str, html: str) -> GenericArticleResult:
+    soup = BeautifulSoup(html, "html.parser")
+    article_jsonld = _a_extract_article_jsonld(_a_extract_jsonld_objects(soup))
+
+    canonical = (
+        _abs_url(final_url, _a_pick_meta(soup, "og:url"))
+        or _abs_url(final_url, (soup.find("link", rel="canonical") or {}).get("href") if soup.find("link", rel="canonical") else None)
+        or final_url
+    )
+    canonical = _strip_fragment(canonical)
+    title = (
+        _norm_ws(article_jsonld.get("headline")) if article_jsonld and isinstance(article_jsonld.get("headline"), str) else ""
+    )
+    if not title:
+        title = _a_pick_meta(soup, "og:title") or _norm_ws(soup.title.get_text(" ", strip=True) if soup.title else "") or canonical
+    summary_hint = _a_pick_meta(soup, "description") or _a_pick_meta(soup, "og:description") or None
+    content = _a_extract_main_content(soup)
+    if len(content) < 40:
+        content = title
+    language = _norm_ws((soup.find("html") or {}).get("lang") if soup.find("html") else "") or "en"
+
+    return GenericArticleResult(
+        final_url=final_url,
+        canonical_url=canonical,
+        title=title,
+        summary_hint=summary_hint,
+        content=content,
+        author=_a_extract_author(soup, article_jsonld),
+        published_at=_a_extract_published_at(soup, article_jsonld),
+        image_urls=_a_extract_images(canonical, soup),
+        outbound_urls=_a_extract_outbound(canonical, soup),
+        language=language.split("-")[0].lower(),
+        raw_payload={},
+    )
@@ -0,0 +1,184 @@
+"""Fixtures shared by the tests and the benchmarks.
+
+``FakeFeedServer`` is a local fake feed/article HTTP server. Routes:
+  /feed/<n>.xml      RSS 2.0 feed with ``items_per_feed`` entries
+  /index/<n>         HTML index page linking to the same articles
+  /articles/<n>/<i>  Small article page (or ``article_html`` when given)
+
+``recorded_feed`` builds a large RSS body in memory.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def render_feed(base_url: str, n: int, items: int) -> str:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    entries = []
+    for i in range(items):
+        published = format_datetime(now - timedelta(hours=i))
+        entries.append(
+            "<item>"
+            f"<title>Feed {n} item {i}</title>"
+            f"<link>{base_url}/articles/{n}/{i}</link>"
+            f"<guid>{base_url}/articles/{n}/{i}</guid>"
+            f"<pubDate>{published}</pubDate>"
+            f"<description>Summary for feed {n} item {i}</description>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel>'
+        f"<title>Feed {n}</title><link>{base_url}/</link>"
+        + "".join(entries)
+        + "</channel></rss>"
+    )
+
+
+def render_index(base_url: str, n: int, items: int) -> str:
+    links = "".join(
+        f'<li><a href="/articles/{n}/{i}">Article {n}-{i}</a></li>' for i in range(items)
+    )
+    nav = '<a href="/about">About</a><a href="https://twitter.com/x">Twitter</a>'
+    return f"<html><body><nav>{nav}</nav><ul>{links}</ul></body></html>"
+
+
+def render_article(n: int, i: int) -> str:
+    paragraphs = "".join(
+        f"<p>Paragraph {k} of article {n}-{i}. "
+        "Models, benchmarks and product updates are discussed here.</p>"
+        for k in range(12)
+    )
+    return (
+        "<html lang=\"en\"><head>"
+        f"<title>Article {n}-{i}</title>"
+        f'<meta property="og:title" content="Article {n}-{i}">'
+        '<meta property="article:published_time" content="2026-01-01T00:00:00Z">'
+        "</head><body><article>"
+        f"<h1>Article {n}-{i}</h1>{paragraphs}"
+        "</article></body></html>"
+    )
+
+
+def recorded_feed(newest_id: int, count: int) -> bytes:
+    """RSS 2.0 body listing ids ``newest_id`` down to ``newest_id - count + 1``."""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    items = []
+    for i in range(newest_id, newest_id - count, -1):
+        items.append(
+            "<item>"
+            f"<title>Entry {i}</title>"
+            f"<link>https://example.com/posts/{i}</link>"
+            f"<guid>https://example.com/posts/{i}</guid>"
+            f"<pubDate>{format_datetime(base + timedelta(minutes=i))}</pubDate>"
+            f"<description>&lt;p&gt;Summary of entry {i} with some text.&lt;/p&gt;</description>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        "<title>Recorded</title><link>https://example.com/</link>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+class FakeFeedServer:
+    """Threaded HTTP server with a fixed per-request latency.
+
+    ``slow_paths`` maps a path prefix to the latency of matching requests
+    instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_sec: float = 0.05,
+        items_per_feed: int = 20,
+        etags: bool = True,
+        article_html: str | None = None,
+        slow_paths: dict[str, float] | None = None,
+    ) -> None:
+        self.latency_sec = latency_sec
+        self.slow_paths = slow_paths or {}
+        self.items_per_feed = items_per_feed
+        self.etags = etags
+        self.article_html = article_html
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        outer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args) -> None:  # noqa: A002
+                return
+
+            def do_GET(self) -> None:  # noqa: N802
+                with outer._lock:
+                    outer.requests += 1
+                latency = next(
+                    (sec for prefix, sec in outer.slow_paths.items() if self.path.startswith(prefix)),
+                    outer.latency_sec,
+                )
+                if latency:
+                    time.sleep(latency)
+
+                parts = [p for p in self.path.split("?")[0].split("/") if p]
+                body: str | None = None
+                ctype = "text/html; charset=utf-8"
+                try:
+                    if len(parts) == 2 and parts[0] == "feed":
+                        body = render_feed(outer.base_url, int(parts[1].split(".")[0]), outer.items_per_feed)
+                        ctype = "application/rss+xml; charset=utf-8"
+                    elif len(parts) == 2 and parts[0] == "index":
+                        body = render_index(outer.base_url, int(parts[1]), outer.items_per_feed)
+                    elif len(parts) == 3 and parts[0] == "articles":
+                        body = outer.article_html or render_article(int(parts[1]), int(parts[2]))
+                except ValueError:
+                    body = None
+
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                data = body.encode("utf-8")
+                etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                if outer.etags and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(data)))
+                if outer.etags:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def __enter__(self) -> "FakeFeedServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
@@ -0,0 +1,139 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from app.models.source import Source
+from app.services.crawler.adaptive_schedule import (
+    IntervalEstimate,
+    adaptive_interval,
+    plan_intervals,
+    schedule_savings,
+)
+from app.tasks import scheduler as scheduler_module
+from app.tasks.scheduler import CrawlScheduler
+
+NOW = datetime(2026, 10, 1, 12, 0)
+WINDOW = 14 * 24 * 60
+
+
+def _interval(items: int, silent_minutes: float | None = 0) -> tuple[int, str]:
+    last = NOW - timedelta(minutes=silent_minutes) if silent_minutes is not None else None
+    return adaptive_interval(
+        items=items, window_minutes=WINDOW, last_published=last, now=NOW, min_minutes=5, max_minutes=720
+    )
+
+
+class TestAdaptiveInterval:
+    def test_interval_follows_publish_rate_within_bounds(self):
+        # sqrt(gap * 60): an item every 4 hours -> poll every 2 hours
+        assert _interval(14 * 6) == (120, "rate")
+        assert _interval(14 * 24) == (60, "rate")
+        assert _interval(14 * 24 * 200) == (5, "rate:min_bound")
+        assert _interval(1) == (720, "rate:max_bound")
+        assert _interval(0, None) == (720, "dormant")
+
+    def test_long_silence_widens_a_stale_rate(self):
+        # Usually every 4 hours, but nothing for the last 20 hours
+        assert _interval(14 * 6, silent_minutes=20 * 60) == (268, "quiet")
+
+    def test_plan_applies_per_source_bounds_and_reports_savings(self):
+        fast = Source(id="fast", name="fast", url="u", crawl_interval_minutes=60)
+        slow = Source(id="slow", name="slow", url="u", crawl_interval_minutes=60, config={"max_interval_minutes": 240})
+        plan = plan_intervals(
+            [fast, slow],
+            {"fast": (14 * 24 * 2, NOW)},
+            now=NOW,
+            lookback_days=14,
+            min_minutes=5,
+            max_minutes=720,
+            pivot_minutes=60,
+        )
+        assert [(e.source_id, e.minutes) for e in plan] == [("fast", 42), ("slow", 240)]
+        savings = schedule_savings(plan)
+        assert savings["static_fetches_per_day"] == 48.0
+        assert savings["adaptive_fetches_per_day"] == 40.3
+
+
+class TestCrawlScheduler:
+    def test_apply_plan_reschedules_registered_jobs(self):
+        async def crawl(source_id: str) -> None:
+            return None
+
+        async def run() -> list[dict]:
+            sched = CrawlScheduler(jobstore="memory")
+            sched.scheduler.start(paused=True)
+            sched.add_crawl_job("a", crawl, interval_minutes=60)
+            sched.add_crawl_job("b", crawl, interval_minutes=60)
+            sched.add_crawl_job("c", crawl, interval_minutes=60)
+            plan = plan_intervals(
+                [Source(id=sid, name=sid, url="u", crawl_interval_minutes=60) for sid in "abc"],
+                {"a": (0, None), "b": (14 * 24, NOW), "c": (14 * 12, NOW)},
+                now=NOW,
+                lookback_days=14,
+                min_minutes=5,
+                max_minutes=720,
+                pivot_minutes=60,
+            )
+            assert sched.apply_plan(plan) == 2  # b already polls at its learned interval
+            jobs = sched.get_jobs()
+            sched.scheduler.shutdown(wait=False)
+            return jobs
+
+        jobs = {j["id"]: j["interval_minutes"] for j in asyncio.run(run())}
+        assert jobs == {"crawl_a": 720, "crawl_b": 60, "crawl_c": 85}
+
+    def test_small_plan_moves_add_up_to_a_reschedule(self):
+        async def crawl(source_id: str) -> None:
+            return None
+
+        def estimate(minutes: int) -> IntervalEstimate:
+            return IntervalEstimate("a", "a", 60, minutes, 0, 0.0, None, "test")
+
+        async def run() -> list[tuple[int, float, float]]:
+            sched = CrawlScheduler(jobstore="memory")
+            sched.scheduler.start(paused=True)
+            sched.add_crawl_job("a", crawl, interval_minutes=60)
+            steps = []
+            for minutes in (65, 70, 76, 83, 90):
+                changed = sched.apply_plan([estimate(minutes)])
+                status = sched.adaptive_status()["sources"][0]
+                steps.append((changed, status["minutes"], status["scheduled_minutes"]))
+            sched.scheduler.shutdown(wait=False)
+            return steps
+
+        assert asyncio.run(run()) == [
+            (0, 65, 60),
+            (1, 70, 70),  # 70 is more than 10% off the 60 the job runs at
+            (0, 76, 70),
+            (1, 83, 83),
+            (0, 90, 83),
+        ]
+
+    def test_only_the_leader_reschedules_on_refresh(self, monkeypatch):
+        async def crawl(source_id: str) -> None:
+            return None
+
+        @asynccontextmanager
+        async def no_session():
+            yield None
+
+        async def plan(session):
+            return [IntervalEstimate("a", "a", 60, 240, 0, 0.0, None, "test")]
+
+        monkeypatch.setattr(scheduler_module, "async_session", no_session)
+        monkeypatch.setattr(scheduler_module, "compute_adaptive_schedule", plan)
+
+        async def run() -> list[float]:
+            sched = CrawlScheduler(jobstore="memory")
+            sched.scheduler.start(paused=True)
+            sched.add_crawl_job("a", crawl, interval_minutes=60)
+            scheduled = []
+            for leader in (False, True):
+                sched._is_leader = leader
+                status = await sched.refresh_adaptive_intervals()
+                assert status["sources"][0]["minutes"] == 240
+                scheduled.append(status["sources"][0]["scheduled_minutes"])
+            sched.scheduler.shutdown(wait=False)
+            return scheduled
+
+        assert asyncio.run(run()) == [60, 240]
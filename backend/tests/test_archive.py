@@ -0,0 +1,42 @@
+import asyncio
+
+from app.services.crawler import archive as archive_mod
+from app.services.crawler.archive import HtmlArchive
+from app.services.crawler.generic_article import crawl_generic_article
+from app.services.crawler.offload import ExtractionPool
+from app.services.crawler.session import CrawlSession, RetryPolicy
+from app.tasks.reextract import _archive_ref
+from tests.helpers import FakeFeedServer, render_article
+
+
+class TestHtmlArchive:
+    def test_put_is_content_addressed(self, tmp_path):
+        archive = HtmlArchive(tmp_path)
+        body = render_article(1, 2).encode("utf-8")
+        first = archive.put(body, url="https://a.test/1", extractor="generic_article")
+        second = archive.put(body, url="https://a.test/1?ref=x", extractor="generic_article")
+
+        assert first.sha256 == second.sha256
+        assert first.stored_size < first.size
+        assert archive.get(first.sha256) == body
+        assert len(list((tmp_path / "objects").rglob("*.zst"))) == 1
+        assert [r.url for r in archive.iter_index()] == ["https://a.test/1", "https://a.test/1?ref=x"]
+
+    def test_crawl_links_archived_body_from_raw_payload(self, tmp_path, monkeypatch):
+        archive = HtmlArchive(tmp_path)
+        monkeypatch.setattr(archive_mod, "_archive", archive)
+
+        async def crawl(url: str):
+            session = CrawlSession(retry=RetryPolicy(retries=0))
+            try:
+                return await crawl_generic_article(url, session=session, pool=ExtractionPool(workers=0))
+            finally:
+                await session.aclose()
+
+        with FakeFeedServer(latency_sec=0.0) as server:
+            result = asyncio.run(crawl(f"{server.base_url}/articles/3/4"))
+
+        ref, path = _archive_ref({"candidate": {}, "crawl": result.raw_payload})
+        assert path == ["crawl"]
+        assert ref.extractor == "generic_article"
+        assert archive.get(ref.sha256).decode("utf-8") == render_article(3, 4)
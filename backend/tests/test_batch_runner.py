@@ -0,0 +1,71 @@
+import asyncio
+
+from app.tasks.batch_runner import BatchRunner, Checkpoint
+
+
+class TestBatchRunner:
+    def test_bounded_workers_batched_flush_and_resume(self, tmp_path):
+        checkpoint_path = tmp_path / "run.jsonl"
+        flushed: list[list[int]] = []
+        active = peak = 0
+
+        async def work(n: int) -> int:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if n == 7:
+                raise ValueError("boom")
+            return n * 10
+
+        async def flush(values: list[int]) -> list[str]:
+            flushed.append(values)
+            return ["inserted"] * len(values)
+
+        def runner() -> BatchRunner[int, int]:
+            return BatchRunner(
+                workers=3,
+                flush=flush,
+                flush_size=4,
+                checkpoint=Checkpoint(checkpoint_path),
+                progress_stream=None,
+            )
+
+        first = runner()
+        results = asyncio.run(first.run(range(10), work))
+
+        assert peak == 3
+        assert [r.key for r in results] == [str(n) for n in range(10)]
+        assert sorted(v for batch in flushed for v in batch) == [n * 10 for n in range(10) if n != 7]
+        assert all(len(batch) <= 4 for batch in flushed)
+        assert [r.error for r in results if not r.ok] == ["ValueError: boom"]
+        assert first.stats.as_dict()["flushed"] == 9
+
+        second = runner()
+        rerun = asyncio.run(second.run(range(10), work))
+        assert [r.key for r in rerun] == ["7"]
+        assert second.stats.skipped == 9
+
+    def test_failed_flush_is_not_checkpointed_and_stops_the_run(self, tmp_path):
+        async def work(n: int) -> int:
+            return n
+
+        async def flush(values: list[int]) -> None:
+            raise ConnectionError("db down")
+
+        checkpoint = Checkpoint(tmp_path / "run.jsonl")
+        runner: BatchRunner[int, int] = BatchRunner(
+            workers=1,
+            flush=flush,
+            flush_size=2,
+            checkpoint=checkpoint,
+            continue_on_error=False,
+            progress_stream=None,
+        )
+        results = asyncio.run(runner.run(range(6), work))
+
+        assert [r.key for r in results] == ["0", "1"]
+        assert all(r.error == "flush_failed: ConnectionError: db down" for r in results)
+        assert runner.stats.stopped_early
+        assert checkpoint.done == set() and not (tmp_path / "run.jsonl").exists()
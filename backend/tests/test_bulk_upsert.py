@@ -0,0 +1,62 @@
+from sqlalchemy.dialects import postgresql
+
+from app.services.crawler.bulk_upsert import plan_upsert, upsert_statement
+
+
+def _row(url: str, canonical: str | None = None) -> dict:
+    return {"source_url": url, "canonical_url": canonical or url}
+
+
+class TestPlanUpsert:
+    def test_splits_conflict_upserts_canonical_updates_and_duplicates(self):
+        rows = [
+            _row("https://a.test/1"),  # new
+            _row("https://a.test/2"),  # stored under the same source_url
+            _row("https://a.test/3?amp=1", "https://a.test/3"),  # stored under another URL
+            _row("https://a.test/1"),  # same URL again: the later row wins
+        ]
+        existing = [
+            ("id-2", "https://a.test/2", "https://a.test/2"),
+            ("id-3", "https://a.test/3", "https://a.test/3"),
+        ]
+
+        plan = plan_upsert(rows, existing)
+
+        assert plan.upserts == [1, 3]
+        assert plan.updates == [(2, "id-3")]
+        assert plan.duplicates == [0]
+
+    def test_one_stored_row_is_claimed_once(self):
+        rows = [
+            _row("https://a.test/x", "https://a.test/c"),
+            _row("https://a.test/y", "https://a.test/c"),
+        ]
+        plan = plan_upsert(rows, [("id-c", "https://a.test/c", "https://a.test/c")])
+        assert plan.updates == [(1, "id-c")]
+        assert plan.duplicates == [0]
+
+
+def test_upsert_statement_reports_insert_or_update_per_row():
+    sql = str(
+        upsert_statement([{"id": "1", "source_url": "https://a.test/1", "title": "t"}]).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "ON CONFLICT (source_url) DO UPDATE" in sql
+    assert "title = excluded.title" in sql
+    assert "created_at = excluded" not in sql and "id = excluded.id" not in sql
+    assert sql.endswith(
+        "RETURNING crawled_contents.source_url, crawled_contents.id, (xmax = 0) AS inserted"
+    )
+    assert "raw_payload" not in sql
+
+
+def test_upsert_statement_can_keep_existing_columns():
+    sql = str(
+        upsert_statement(
+            [{"id": "1", "source_url": "https://a.test/1", "thread_status": "pending"}],
+            keep_existing=("thread_status",),
+        ).compile(dialect=postgresql.dialect())
+    )
+    assert "thread_status = excluded" not in sql
+    assert "title = excluded.title" in sql
@@ -0,0 +1,180 @@
+import asyncio
+import os
+import random
+import uuid
+
+import pytest
+
+from app.services.crawler.work_queue import CrawlQueue, backoff_delay, job_id
+from app.tasks.crawl_worker import CrawlWorker
+
+
+def test_job_id_is_stable_per_kind_and_args():
+    assert job_id("source", {"source_id": "a"}) == job_id("source", {"source_id": "a"})
+    assert job_id("source", {"source_id": "a"}) != job_id("source", {"source_id": "b"})
+    assert job_id("source", {"a": 1, "b": 2}) == job_id("source", {"b": 2, "a": 1})
+    assert job_id("source", {"url": "x"}).startswith("source:")
+
+
+def test_backoff_doubles_with_jitter_and_cap():
+    rng = random.Random(1)
+    for attempt, base in [(1, 30), (2, 60), (3, 120), (8, 1000)]:
+        delay = backoff_delay(attempt, base_sec=30, max_sec=1000, rng=rng)
+        assert 0.75 * base <= delay <= 1.25 * base
+
+
+async def _queue_or_skip(**kwargs) -> CrawlQueue:
+    redis = pytest.importorskip("redis.asyncio")
+    client = redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379"))
+    try:
+        await client.ping()
+    except Exception as e:
+        await client.aclose()
+        pytest.skip(f"redis unavailable: {e}")
+    queue = CrawlQueue(client, prefix=f"test:crawlq:{uuid.uuid4().hex[:8]}", **kwargs)
+    await queue.clear()
+    return queue
+
+
+async def _close(queue: CrawlQueue) -> None:
+    await queue.clear()
+    await queue.client.aclose()
+
+
+class TestCrawlQueue:
+    def test_enqueue_is_idempotent_until_done(self):
+        async def run() -> None:
+            queue = await _queue_or_skip()
+            try:
+                assert await queue.enqueue("source", {"source_id": "a"})
+                assert await queue.enqueue("source", {"source_id": "a"}) is None
+                [job] = await queue.claim(10, "w1")
+                assert await queue.enqueue("source", {"source_id": "a"}) is None
+                assert await queue.complete(job)
+                assert await queue.enqueue("source", {"source_id": "a"})
+                stats = await queue.stats()
+                assert stats["ready"] == 1
+                assert stats["totals"] == {"enqueued": 2, "completed": 1}
+            finally:
+                await _close(queue)
+
+        asyncio.run(run())
+
+    def test_only_lease_holder_can_ack_and_expired_leases_return(self):
+        async def run() -> None:
+            queue = await _queue_or_skip(visibility_sec=0.2)
+            try:
+                await queue.enqueue_many([("source", {"source_id": s}) for s in "abc"])
+                first = await queue.claim(2, "w1")
+                assert len(first) == 2
+                assert len(await queue.claim(5, "w2")) == 1
+                assert await queue.extend(first[0])
+                await asyncio.sleep(0.3)
+                # w1 stalled: its jobs go to w3, and w1 can no longer ack them
+                reclaimed = await queue.claim(5, "w3")
+                assert {j.id for j in reclaimed} >= {first[1].id}
+                assert not await queue.complete(first[1])
+                assert await queue.complete(next(j for j in reclaimed if j.id == first[1].id))
+                assert (await queue.stats())["totals"]["lease_expired"] >= 1
+            finally:
+                await _close(queue)
+
+        asyncio.run(run())
+
+    def test_expired_leases_count_as_attempts(self):
+        async def run() -> None:
+            queue = await _queue_or_skip(visibility_sec=0.1, max_attempts=2)
+            try:
+                await queue.enqueue("source", {"source_id": "a"})
+                await queue.claim(1, "w1")  # w1 dies without acking
+                await asyncio.sleep(0.15)
+                [job] = await queue.claim(1, "w2")
+                assert job.attempts == 1 and job.last_error == "lease expired"
+                assert job.args == {"source_id": "a"}
+                await asyncio.sleep(0.15)  # w2 dies too
+                assert await queue.claim(1, "w3") == []
+                [dead] = await queue.dead_jobs()
+                assert dead["attempts"] == 2 and dead["last_error"] == "lease expired"
+                stats = await queue.stats()
+                assert stats["dead"] == 1 and stats["leased"] == 0
+                assert stats["totals"]["lease_expired"] == 2 and stats["totals"]["dead"] == 1
+            finally:
+                await _close(queue)
+
+        asyncio.run(run())
+
+    def test_failures_back_off_then_go_dead(self):
+        async def run() -> None:
+            queue = await _queue_or_skip(max_attempts=2, backoff_base_sec=0.1, backoff_max_sec=0.1)
+            try:
+                await queue.enqueue("google_blog", {"url": "https://x/1"})
+                [job] = await queue.claim(1, "w1")
+                assert await queue.fail(job, "boom") == "retry"
+                assert await queue.claim(1, "w1") == []  # backing off
+                assert (await queue.stats())["delayed"] == 1
+                await asyncio.sleep(0.15)
+                [job] = await queue.claim(1, "w1")
+                assert job.attempts == 1 and job.last_error == "boom"
+                assert await queue.fail(job, "boom again") == "dead"
+                [dead] = await queue.dead_jobs()
+                assert dead["attempts"] == 2 and dead["last_error"] == "boom again"
+                assert await queue.requeue_dead() == 1
+                [job] = await queue.claim(1, "w1")
+                assert job.attempts == 0
+            finally:
+                await _close(queue)
+
+        asyncio.run(run())
+
+    def test_enqueue_revives_dead_jobs_after_cooldown(self):
+        async def run() -> None:
+            queue = await _queue_or_skip(max_attempts=1, dead_cooldown_sec=0.2)
+            try:
+                await queue.enqueue("source", {"source_id": "a"})
+                [job] = await queue.claim(1, "w1")
+                assert await queue.fail(job, "boom") == "dead"
+                [dead] = await queue.dead_jobs()
+                assert dead["revive_after"] == pytest.approx(dead["dead_at"] + 0.2)
+                assert await queue.enqueue("source", {"source_id": "a"}) is None  # cooling down
+                await asyncio.sleep(0.25)
+                assert await queue.enqueue("source", {"source_id": "a"}) == job.id
+                [job] = await queue.claim(1, "w1")
+                assert job.attempts == 0
+                stats = await queue.stats()
+                assert stats["dead"] == 0
+                assert stats["totals"]["revived"] == 1 and stats["totals"]["enqueued"] == 1
+            finally:
+                await _close(queue)
+
+        asyncio.run(run())
+
+    def test_workers_drain_queue_and_retry_failures(self):
+        async def run() -> tuple[list[dict], dict]:
+            queue = await _queue_or_skip(backoff_base_sec=0.05, backoff_max_sec=0.05)
+            seen: dict[str, int] = {}
+
+            async def handler(args: dict) -> None:
+                seen[args["n"]] = seen.get(args["n"], 0) + 1
+                if args["n"] % 10 == 0 and seen[args["n"]] == 1:
+                    raise RuntimeError("flaky")
+                await asyncio.sleep(0.01)
+
+            try:
+                await queue.enqueue_many([("t", {"n": n}) for n in range(50)])
+                workers = [
+                    CrawlWorker(queue, {"t": handler}, concurrency=4, poll_sec=0.02, token=f"w{i}")
+                    for i in range(3)
+                ]
+                counts = await asyncio.gather(*(w.run(until_idle=True) for w in workers))
+                # Retries still backing off when the workers went idle
+                counts.append(await CrawlWorker(queue, {"t": handler}, poll_sec=0.02).run(until_idle=True))
+                await asyncio.sleep(0.1)
+                counts.append(await CrawlWorker(queue, {"t": handler}, poll_sec=0.02).run(until_idle=True))
+                return counts, await queue.stats()
+            finally:
+                await _close(queue)
+
+        counts, stats = asyncio.run(run())
+        assert sum(c["completed"] for c in counts) == 50
+        assert sum(c["retried"] for c in counts) == 5
+        assert stats["ready"] == stats["delayed"] == stats["leased"] == stats["dead"] == 0
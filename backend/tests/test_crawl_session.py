@@ -0,0 +1,119 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.services.crawler import session as session_module
+from app.services.crawler.session import (
+    CrawlSession,
+    RetryPolicy,
+    close_crawl_sessions,
+    get_crawl_session,
+)
+
+
+def _session(handler, *, retries: int = 2) -> CrawlSession:
+    session = CrawlSession(retry=RetryPolicy(retries=retries, backoff_sec=0.0))
+    session.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return session
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+
+def test_transient_status_is_retried_then_returned():
+    statuses = iter([503, 429, 200])
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(next(statuses), text="body")
+
+    async def run():
+        session = _session(handler)
+        res = await session.get("https://a.test/x")
+        await session.aclose()
+        return res
+
+    res = asyncio.run(run())
+    assert res.status_code == 200
+    assert seen == ["/x", "/x", "/x"]
+
+
+def test_not_modified_is_returned_and_errors_raise_after_retries():
+    def handler(request):
+        return httpx.Response(304 if request.url.path == "/cached" else 503)
+
+    async def run():
+        session = _session(handler, retries=1)
+        assert (await session.get("https://a.test/cached")).status_code == 304
+        with pytest.raises(httpx.HTTPStatusError):
+            await session.get("https://a.test/down")
+        await session.aclose()
+
+    asyncio.run(run())
+
+
+def test_transport_errors_are_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200)
+
+    async def run():
+        session = _session(handler)
+        res = await session.get("https://a.test/")
+        await session.aclose()
+        return res
+
+    assert asyncio.run(run()).status_code == 200
+    assert len(calls) == 2
+
+
+def test_session_is_shared_per_loop_and_replaced_one_is_closed(server_url):
+    async def first():
+        session = get_crawl_session()
+        assert get_crawl_session() is session
+        await session.get(server_url)
+        return session
+
+    async def second():
+        session = get_crawl_session()
+        await asyncio.sleep(0.05)  # let the detached close run
+        return session
+
+    try:
+        old = asyncio.run(first())
+        assert len(old.client._transport._pool.connections) == 1
+        new = asyncio.run(second())
+
+        assert new is not old
+        assert old.is_closed
+        assert old.client._transport._pool.connections == []
+        assert not session_module._detached
+    finally:
+        asyncio.run(close_crawl_sessions())
@@ -0,0 +1,31 @@
+from app.models.source import Source, SourceType
+from app.tasks.crawl_source import INDEX_LIMIT, crawl_kind, index_config
+
+
+def _source(source_type: SourceType, config: dict | None, url: str = "https://a.test/news") -> Source:
+    return Source(id="s", name="s", url=url, source_type=source_type, config=config)
+
+
+def test_crawler_is_chosen_from_the_source_config():
+    assert crawl_kind(_source(SourceType.PLAYWRIGHT, {"crawler": "google_blog"})) == "google_blog"
+    assert crawl_kind(_source(SourceType.RSS, {"catalog_kind": "rss"})) == "rss"
+    assert crawl_kind(_source(SourceType.PLAYWRIGHT, {"catalog_kind": "html_index"})) == "index"
+    assert crawl_kind(_source(SourceType.PLAYWRIGHT, {"mode": "article"})) == "article"
+    # A listing page is never guessed to be an article.
+    assert crawl_kind(_source(SourceType.PLAYWRIGHT, None)) is None
+    assert crawl_kind(_source(SourceType.API, {"catalog_kind": "api"})) is None
+
+
+def test_index_rules_come_from_the_catalog_entry():
+    source = _source(
+        SourceType.PLAYWRIGHT,
+        {"catalog_id": "anthropic_news_index", "catalog_kind": "html_index"},
+        url="https://www.anthropic.com/news",
+    )
+    config = index_config(source)
+    assert config["allow_prefixes"] == ["https://www.anthropic.com/news/"]
+    assert config["limit"] == 30
+
+    config = index_config(_source(SourceType.PLAYWRIGHT, {"catalog_kind": "html_index"}))
+    assert config["allow_prefixes"] == ["https://a.test/news/"]
+    assert config["limit"] == INDEX_LIMIT
@@ -0,0 +1,70 @@
+import asyncio
+
+from app.services.crawler.feed_cache import FeedValidatorCache
+from app.tasks.discover_source_urls import discover_from_catalog_async
+from tests.helpers import FakeFeedServer
+
+
+def _catalog(base_url: str, **http) -> dict:
+    return {
+        "version": 2,
+        "defaults": {"http": {"retries": 0, **http}},
+        "sources": [
+            {"id": "feed", "type": "rss", "url": f"{base_url}/feed/1.xml", "limit": 5},
+            {
+                "id": "index",
+                "type": "html_index",
+                "url": f"{base_url}/index/2",
+                "allow_prefixes": [f"{base_url}/articles/"],
+                "limit": 5,
+            },
+            {"id": "off", "type": "rss", "url": f"{base_url}/feed/3.xml", "enabled": False},
+        ],
+    }
+
+
+class TestDiscoverFromCatalog:
+    def test_concurrent_discovery_keeps_schema_and_order(self):
+        with FakeFeedServer(latency_sec=0.0, items_per_feed=8) as server:
+            result = asyncio.run(discover_from_catalog_async(_catalog(server.base_url)))
+
+        assert [s["id"] for s in result["sources"]] == ["feed", "index"]
+        assert result["skipped_ids"] == ["off"]
+        assert result["ok_sources"] == 2
+        assert all(s["count"] == 5 for s in result["sources"])
+        assert result["unique_url_count"] == 10
+
+    def test_source_deadline_marks_only_slow_source_failed(self):
+        with FakeFeedServer(latency_sec=0.0, slow_paths={"/index/": 0.5}) as server:
+            result = asyncio.run(
+                discover_from_catalog_async(
+                    _catalog(server.base_url, source_deadline_sec=0.2)
+                )
+            )
+
+        by_id = {s["id"]: s for s in result["sources"]}
+        assert result["ok_sources"] == 1
+        assert "deadline" in by_id["index"]["error"]
+        assert not by_id["feed"].get("error")
+        assert by_id["feed"]["count"] == 5
+
+    def test_validator_cache_skips_unchanged_sources(self, tmp_path):
+        cache_path = tmp_path / "feed_cache.json"
+        with FakeFeedServer(latency_sec=0.0) as server:
+            catalog = _catalog(server.base_url)
+            first = asyncio.run(
+                discover_from_catalog_async(
+                    catalog, cache=FeedValidatorCache.load(cache_path)
+                )
+            )
+            second = asyncio.run(
+                discover_from_catalog_async(
+                    catalog, cache=FeedValidatorCache.load(cache_path)
+                )
+            )
+
+        assert first["cache"]["misses"] == 2
+        assert second["cache"]["not_modified"] == 2
+        assert second["cache"]["bytes_saved"] > 0
+        assert second["cache"]["bytes_downloaded"] == 0
+        assert second["urls"] == first["urls"]
@@ -0,0 +1,118 @@
+import asyncio
+
+from app.services.vector import embedding_batcher
+from app.services.vector.embedding_batcher import EmbeddingBatcher, get_embedding_batcher
+
+
+class FakeModel:
+    def __init__(self, latency_sec: float = 0.01):
+        self.latency_sec = latency_sec
+        self.batches: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_sec)
+        finally:
+            self.in_flight -= 1
+        return [[float(len(t))] for t in texts]
+
+
+def test_concurrent_single_texts_share_one_request():
+    async def run():
+        model = FakeModel()
+        batcher = EmbeddingBatcher(model, max_batch=100, linger_ms=5)
+        texts = ["a" * i for i in range(1, 21)]
+
+        results = await asyncio.gather(*(batcher.embed([t]) for t in texts))
+
+        assert len(model.batches) == 1
+        assert results == [[[float(i)]] for i in range(1, 21)]
+        assert batcher.stats()["avg_batch"] == 20
+
+    asyncio.run(run())
+
+
+def test_full_batches_go_out_without_waiting_for_linger():
+    async def run():
+        model = FakeModel(latency_sec=0)
+        batcher = EmbeddingBatcher(model, max_batch=100, linger_ms=10_000, max_concurrency=8)
+
+        task = asyncio.ensure_future(batcher.embed([str(i) for i in range(200)]))
+        results = await asyncio.wait_for(task, timeout=1)
+
+        assert [len(b) for b in model.batches] == [100, 100]
+        assert results[150] == [3.0]
+
+    asyncio.run(run())
+
+
+def test_linger_bounds_the_wait_and_batches_split_at_max():
+    async def run():
+        model = FakeModel()
+        batcher = EmbeddingBatcher(model, max_batch=4, linger_ms=20, max_concurrency=2)
+
+        first = await asyncio.gather(*(batcher.embed([f"t{i}"]) for i in range(10)))
+        await batcher.embed(["late"])
+
+        assert [len(b) for b in model.batches] == [4, 4, 2, 1]
+        assert model.max_in_flight == 2
+        assert len(first) == 10
+
+    asyncio.run(run())
+
+
+def test_errors_reach_every_caller_in_the_batch():
+    async def failing(texts):
+        raise RuntimeError("quota exceeded")
+
+    async def run():
+        batcher = EmbeddingBatcher(failing, linger_ms=1)
+        results = await asyncio.gather(
+            batcher.embed(["a"]), batcher.embed(["b"]), return_exceptions=True
+        )
+        assert [str(r) for r in results] == ["quota exceeded", "quota exceeded"]
+        assert batcher.stats()["errors"] == 1
+
+    asyncio.run(run())
+
+
+def test_cancelled_batch_fails_its_callers():
+    async def run():
+        model = FakeModel(latency_sec=10)
+        batcher = EmbeddingBatcher(model, linger_ms=1)
+        callers = asyncio.gather(batcher.embed(["a"]), batcher.embed(["b"]), return_exceptions=True)
+        while not model.batches:
+            await asyncio.sleep(0.001)
+        for task in list(batcher._tasks):
+            task.cancel()  # e.g. the loop shutting down
+        results = await asyncio.wait_for(callers, timeout=1)
+        assert [str(r) for r in results] == ["embedding batch was cancelled"] * 2
+
+    asyncio.run(run())
+
+
+def test_shared_batchers_are_keyed_by_model_and_size(monkeypatch):
+    monkeypatch.setattr(embedding_batcher, "_batchers", {})
+    calls = []
+
+    async def embed(texts, model, dims):
+        calls.append((model, dims))
+        return [[0.0] * dims for _ in texts]
+
+    first = get_embedding_batcher("m", 4, embed)
+    assert get_embedding_batcher("m", 4, embed) is first
+    assert get_embedding_batcher("m", 8, embed) is not first
+    assert asyncio.run(first.embed(["x"])) == [[0.0] * 4]
+    assert calls == [("m", 4)]
+
+
+def test_batcher_can_be_reused_from_a_new_event_loop():
+    model = FakeModel(latency_sec=0)
+    batcher = EmbeddingBatcher(model, linger_ms=1)
+    assert asyncio.run(batcher.embed(["ab"])) == [[2.0]]
+    assert asyncio.run(batcher.embed(["abc"])) == [[3.0]]
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from app.services.vector.embedding_cache import (
+    ENTRY_OVERHEAD_BYTES,
+    EmbeddingCache,
+    cache_key,
+    pack_vector,
+    unpack_vector,
+)
+
+MODEL = "models/gemini-embedding-001"
+
+
+class FakeEmbed:
+    def __init__(self, dim: int = 8):
+        self.dim = dim
+        self.calls: list[list[str]] = []
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(t) + i) / 10 for i in range(self.dim)] for t in texts]
+
+
+def test_key_ignores_whitespace_and_unicode_form_but_not_model():
+    assert cache_key(MODEL, "GPT-5  is\nout ") == cache_key(MODEL, " GPT-5 is out")
+    assert cache_key(MODEL, "café") == cache_key(MODEL, "café")
+    assert cache_key(MODEL, "GPT-5 is out") != cache_key("models/other", "GPT-5 is out")
+
+
+def test_packed_vectors_round_trip():
+    vector = [0.125, -0.5, 0.0334, 1.0]
+    assert len(pack_vector(vector)) == 16
+    assert unpack_vector(pack_vector(vector)) == pytest.approx(vector, abs=1e-7)
+    assert len(pack_vector(vector, "float16")) == 8
+    assert unpack_vector(pack_vector(vector, "float16"), "float16") == pytest.approx(vector, abs=1e-3)
+
+
+def test_only_misses_reach_the_model_and_repeats_are_embedded_once():
+    async def run():
+        cache = EmbeddingCache(memory_bytes=1 << 20)
+        embed = FakeEmbed()
+
+        first = await cache.get_or_embed(MODEL, ["a", "bb", "a"], embed)
+        second = await cache.get_or_embed(MODEL, ["bb", "ccc", " a "], embed)
+
+        assert embed.calls == [["a", "bb"], ["ccc"]]
+        assert first[0] == first[2] == second[2]
+        assert second[0] == first[1]
+        stats = cache.stats()
+        assert (stats["memory_hits"], stats["misses"]) == (2, 3)
+        assert stats["bytes_saved"] > 0
+
+    asyncio.run(run())
+
+
+def test_memory_tier_evicts_least_recently_used_within_budget():
+    async def run():
+        entry = 8 * 4 + ENTRY_OVERHEAD_BYTES
+        cache = EmbeddingCache(memory_bytes=2 * entry)
+        embed = FakeEmbed()
+        await cache.get_or_embed(MODEL, ["a"], embed)
+        await cache.get_or_embed(MODEL, ["bb"], embed)
+        await cache.get_or_embed(MODEL, ["a"], embed)  # refreshes "a"
+        await cache.get_or_embed(MODEL, ["ccc"], embed)  # evicts "bb"
+        await cache.get_or_embed(MODEL, ["a", "bb"], embed)
+
+        assert embed.calls == [["a"], ["bb"], ["ccc"], ["bb"]]
+        assert cache.stats()["memory_bytes"] <= 2 * entry
+
+    asyncio.run(run())
+
+
+def test_unreachable_redis_falls_back_to_memory_tier():
+    async def run():
+        cache = EmbeddingCache(redis_url="redis://127.0.0.1:9/0", memory_bytes=1 << 20)
+        embed = FakeEmbed()
+        await cache.get_or_embed(MODEL, ["a"], embed)
+        await cache.get_or_embed(MODEL, ["b"], embed)
+        await cache.get_or_embed(MODEL, ["a"], embed)
+
+        assert embed.calls == [["a"], ["b"]]
+        assert cache.stats()["redis_errors"] == 1  # later calls skip Redis for a while
+        await cache.aclose()
+
+    asyncio.run(run())
+
+
+def test_redis_tier_is_shared_across_processes():
+    redis = pytest.importorskip("redis.asyncio")
+
+    async def run():
+        client = redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379"))
+        try:
+            await client.ping()
+        except Exception as e:
+            await client.aclose()
+            pytest.skip(f"redis unavailable: {e}")
+        prefix = f"test:emb:{uuid.uuid4().hex[:8]}"
+        try:
+            embed = FakeEmbed()
+            writer = EmbeddingCache(client, prefix=prefix, ttl_sec=60)
+            reader = EmbeddingCache(client, prefix=prefix, ttl_sec=60)
+
+            stored = await writer.get_or_embed(MODEL, ["a", "bb"], embed)
+            loaded = await reader.get_or_embed(MODEL, ["bb", "a"], embed)
+
+            assert embed.calls == [["a", "bb"]]
+            assert loaded == [stored[1], stored[0]]
+            assert reader.stats()["redis_hits"] == 2
+            ttl = await client.ttl(f"{prefix}:float32:{cache_key(MODEL, 'a')}")
+            assert 0 < ttl <= 60
+        finally:
+            keys = await client.keys(f"{prefix}:*")
+            if keys:
+                await client.delete(*keys)
+            await client.aclose()
+
+    asyncio.run(run())
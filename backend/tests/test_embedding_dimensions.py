@@ -0,0 +1,143 @@
+import asyncio
+import dataclasses
+import math
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from qdrant_client import AsyncQdrantClient, models
+
+from app.services.vector import embedder as embedder_module
+from app.services.vector import qdrant_schema
+from app.services.vector.dimensions import embedding_dimensions, model_key, truncate_embedding
+from app.services.vector.embedder import VectorEmbedder
+from app.services.vector.qdrant_schema import (
+    CONTENT_COLLECTION,
+    ensure_collection,
+    live_spec,
+    reset_schema_readiness,
+    resize_collection,
+)
+
+
+def _norm(values: list[float]) -> float:
+    return math.sqrt(sum(v * v for v in values))
+
+
+def test_truncated_vectors_are_unit_length_prefixes():
+    full = [0.6, 0.0, 0.8, 0.0] + [0.0] * 4
+    assert truncate_embedding(full, 2) == pytest.approx([1.0, 0.0])
+    assert truncate_embedding([3.0, 4.0, 12.0], 2) == pytest.approx([0.6, 0.8])
+    assert truncate_embedding([0.0, 0.0, 1.0], 2) == [0.0, 0.0]
+    with pytest.raises(ValueError):
+        truncate_embedding([1.0], 2)
+
+
+def test_sizes_never_share_cache_or_batcher_keys():
+    model = "models/gemini-embedding-001"
+    assert model_key(model, 768) != model_key(model, 1536)
+
+
+def test_dimensions_setting_is_validated(monkeypatch):
+    settings = embedder_module.settings
+    monkeypatch.setattr(settings, "EMBEDDING_DIMENSIONS", 1536)
+    assert embedding_dimensions() == 1536
+    monkeypatch.setattr(settings, "EMBEDDING_DIMENSIONS", 4096)
+    with pytest.raises(ValueError):
+        embedding_dimensions()
+
+
+def test_embedder_requests_and_renormalizes_the_configured_size(monkeypatch):
+    calls = []
+
+    async def embed_content(*, model, contents, config):
+        calls.append(config.output_dimensionality)
+        # An API that ignores output_dimensionality: full-size, unnormalized.
+        return SimpleNamespace(embeddings=[SimpleNamespace(values=[2.0] * 3072) for _ in contents])
+
+    fake = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(embed_content=embed_content)))
+    monkeypatch.setattr(embedder_module, "client", fake)
+    monkeypatch.setattr(embedder_module.settings, "EMBEDDING_DIMENSIONS", 256)
+
+    embedder = VectorEmbedder(session=None)
+    vectors = asyncio.run(embedder_module.embed_texts(["a", "b"], embedder.model, embedder.dimensions))
+
+    assert calls == [256]
+    assert [len(v) for v in vectors] == [256, 256]
+    assert _norm(vectors[0]) == pytest.approx(1.0)
+    assert embedder.model_key.endswith("@256")
+
+
+def test_resize_collection_truncates_points_in_place():
+    wide = dataclasses.replace(CONTENT_COLLECTION, name="resize_test", size=8)
+    narrow = dataclasses.replace(wide, size=4)
+
+    async def run():
+        reset_schema_readiness()
+        qdrant = AsyncQdrantClient(location=":memory:")
+        await ensure_collection(qdrant, wide)
+        ids = [str(uuid.uuid4()) for _ in range(5)]
+        await qdrant.upsert(
+            wide.name,
+            points=[
+                models.PointStruct(id=pid, vector=[3.0, 4.0, 0.0, 0.0] + [float(i + 1)] * 4, payload={"n": i})
+                for i, pid in enumerate(ids)
+            ],
+            wait=True,
+        )
+
+        result = await resize_collection(qdrant, narrow, batch_size=2)
+
+        assert result == {"collection": "resize_test", "from": 8, "to": 4, "points": 5}
+        assert live_spec(await qdrant.get_collection(wide.name))["size"] == 4
+        assert not await qdrant.collection_exists("resize_test__resize_4")
+        points = await qdrant.retrieve(wide.name, ids, with_vectors=True)
+        assert sorted(p.payload["n"] for p in points) == [0, 1, 2, 3, 4]
+        assert all(p.vector == pytest.approx([0.6, 0.8, 0.0, 0.0]) for p in points)
+
+        assert (await resize_collection(qdrant, narrow))["points"] == 0
+        with pytest.raises(ValueError):
+            await resize_collection(qdrant, wide)
+        await qdrant.close()
+        reset_schema_readiness()
+
+    asyncio.run(run())
+
+
+def test_resize_resumes_when_the_copy_back_failed(monkeypatch):
+    wide = dataclasses.replace(CONTENT_COLLECTION, name="resize_resume_test", size=8)
+    narrow = dataclasses.replace(wide, size=4)
+    copy_points = qdrant_schema._copy_points
+
+    async def crash_on_copy_back(client, source, target, **kwargs):
+        if target == wide.name:
+            raise RuntimeError("connection lost")
+        return await copy_points(client, source, target, **kwargs)
+
+    async def run():
+        reset_schema_readiness()
+        qdrant = AsyncQdrantClient(location=":memory:")
+        await ensure_collection(qdrant, wide)
+        ids = [str(uuid.uuid4()) for _ in range(3)]
+        await qdrant.upsert(
+            wide.name,
+            points=[models.PointStruct(id=pid, vector=[3.0, 4.0] + [1.0] * 6) for pid in ids],
+            wait=True,
+        )
+
+        monkeypatch.setattr(qdrant_schema, "_copy_points", crash_on_copy_back)
+        with pytest.raises(RuntimeError):
+            await resize_collection(qdrant, narrow)
+        assert live_spec(await qdrant.get_collection(wide.name))["size"] == 4
+        assert (await qdrant.count(wide.name)).count == 0
+        monkeypatch.setattr(qdrant_schema, "_copy_points", copy_points)
+
+        result = await resize_collection(qdrant, narrow)
+
+        assert result["points"] == 3
+        assert (await qdrant.count(wide.name)).count == 3
+        assert not await qdrant.collection_exists("resize_resume_test__resize_4")
+        await qdrant.close()
+        reset_schema_readiness()
+
+    asyncio.run(run())
@@ -0,0 +1,71 @@
+"""Extraction output on the fixture pages, pinned as golden JSON.
+
+The goldens were recorded from the multi-pass extractor that the
+single-pass one replaced, so a diff here is a behavior change. To accept
+an intended change, rerun with ``UPDATE_GOLDEN=1`` and review the diff.
+"""
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+
+import pytest
+
+from app.services.crawler.generic_article import extract_generic_article
+from app.services.crawler.google_blog import _build_item_from_html
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "html").glob("*.html"))
+GOLDEN = Path(__file__).parent / "fixtures" / "golden"
+URL = "https://blog.google/technology/ai/gemini-3/"
+
+ITEM_FIELDS = (
+    "title",
+    "canonical_url",
+    "content",
+    "summary_hint",
+    "author",
+    "published_at",
+    "image_urls",
+    "image_positions",
+    "outbound_urls",
+    "content_type",
+    "content_hash",
+)
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def google_item_output(html: str) -> dict:
+    item = _build_item_from_html(URL, html)
+    return {name: getattr(item, name) for name in ITEM_FIELDS}
+
+
+def generic_article_output(html: str) -> dict:
+    article = asdict(extract_generic_article(URL, html))
+    article.pop("raw_payload")
+    return article
+
+
+def _check(path: Path, kind: str, output: dict) -> None:
+    actual = json.loads(json.dumps(output, default=_plain))
+    golden = GOLDEN / f"{path.stem}.{kind}.json"
+    if os.environ.get("UPDATE_GOLDEN"):
+        golden.write_text(json.dumps(actual, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    assert actual == json.loads(golden.read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda p: p.name)
+class TestSinglePassExtraction:
+    def test_google_item_matches_golden(self, path):
+        _check(path, "google_item", google_item_output(path.read_text(encoding="utf-8")))
+
+    def test_generic_article_matches_golden(self, path):
+        _check(path, "generic_article", generic_article_output(path.read_text(encoding="utf-8")))
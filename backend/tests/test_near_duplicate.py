@@ -0,0 +1,86 @@
+import random
+
+from app.models.source import ThreadStatus
+from app.services.crawler.near_duplicate import NearDuplicateIndex, hamming, simhash
+
+WORDS = [f"word{i}" for i in range(5000)]
+
+
+def _article(seed: int, words: int = 300) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _edited(text: str, byline: str = "By Staff Writer") -> str:
+    """A syndicated copy: same body wrapped in another site's byline and footer."""
+    return f"{byline} {text} Copyright 2026 all rights reserved"
+
+
+def _row(url: str, title: str, content: str) -> dict:
+    return {"source_url": url, "canonical_url": url, "title": title, "content": content, "extra_data": {}}
+
+
+class TestSimHash:
+    def test_edited_copy_is_close_and_unrelated_text_is_far(self):
+        original = _article(1)
+        assert hamming(simhash(original), simhash(_edited(original))) <= 6
+        assert hamming(simhash(original), simhash(_article(2))) > 20
+        assert simhash("too short to fingerprint") is None
+
+
+class TestNearDuplicateIndex:
+    def test_flag_rows_marks_copies_and_persists(self, tmp_path):
+        path = tmp_path / "near_dup.jsonl"
+        body = _article(7)
+        index = NearDuplicateIndex(path)
+        rows = [
+            _row("https://a.test/story", "Story", body),
+            _row("https://b.test/copy", "Story", _edited(body)),
+            _row("https://c.test/other", "Other", _article(8)),
+        ]
+        staged = index.flag_rows(rows)
+        assert staged.flagged == 1
+        assert len(index) == 0  # nothing is indexed until the rows are stored
+        index.commit(staged)
+        assert rows[1]["extra_data"]["duplicate_of"]["url"] == "https://a.test/story"
+        assert rows[1]["thread_status"] == ThreadStatus.FAILED
+        assert "duplicate_of" not in rows[0]["extra_data"] and "thread_status" not in rows[2]
+        assert index.stats()["embedding_calls_avoided"] == 1
+        index.save()
+
+        reloaded = NearDuplicateIndex(path)
+        assert len(reloaded) == 2
+        # A re-crawl of the original under its own URL is not its own duplicate
+        assert reloaded.check("https://a.test/story", f"Story\n{body}") is None
+        copy = _edited(body, byline="Reporting by Wire Desk")
+        match = reloaded.check_and_add("https://d.test/again", f"Story\n{copy}")
+        assert match is not None and match.key == "https://a.test/story"
+
+    def test_uncommitted_batch_leaves_no_fingerprints(self, tmp_path):
+        path = tmp_path / "near_dup.jsonl"
+        body = _article(9)
+        index = NearDuplicateIndex(path)
+        index.flag_rows([_row("https://a.test/lost", "Story", body)])  # write failed: no commit
+        index.save()
+
+        rows = [_row("https://b.test/stored", "Story", _edited(body))]
+        staged = index.flag_rows(rows)
+        assert staged.flagged == 0
+        assert "thread_status" not in rows[0]
+        index.commit(staged)
+        index.save()
+        assert len(NearDuplicateIndex(path)) == 1
+
+    def test_log_is_compacted_and_capped(self, tmp_path):
+        path = tmp_path / "near_dup.jsonl"
+        index = NearDuplicateIndex(path, max_items=5)
+        for i in range(4):
+            index.add("https://a.test/moving", _article(100 + i))
+            index.save()
+        for i in range(10):
+            index.add(f"https://a.test/{i}", _article(200 + i))
+        index.save()
+
+        assert len(index) == 5
+        assert len(path.read_text().splitlines()) <= 2 * 5
+        assert len(NearDuplicateIndex(path, max_items=5)) == 5
@@ -0,0 +1,29 @@
+import asyncio
+from pathlib import Path
+
+from app.services.crawler.offload import ExtractionPool, decode_html
+
+FIXTURE = Path(__file__).parent / "fixtures" / "html" / "news_article.html"
+URL = "https://www.example-news.com/tech/a"
+
+
+async def _extract(pool: ExtractionPool, body: bytes):
+    article = await pool.generic_article(URL, body, encoding="utf-8", http_status=200)
+    item = await pool.google_blog_item(URL, body, encoding="utf-8")
+    return article, item.model_dump(exclude={"item_id", "fetched_at"})
+
+
+class TestExtractionPool:
+    def test_process_pool_matches_inline(self):
+        body = FIXTURE.read_bytes()
+        pool = ExtractionPool(workers=1)
+        try:
+            offloaded = asyncio.run(_extract(pool, body))
+        finally:
+            pool.shutdown()
+        assert offloaded == asyncio.run(_extract(ExtractionPool(workers=0), body))
+
+    def test_decode_html_matches_httpx_fallbacks(self):
+        assert decode_html("<p>x</p>") == "<p>x</p>"
+        assert decode_html("é".encode("latin-1"), "latin-1") == "é"
+        assert decode_html(b"\xff<p>", "no-such-codec") == "�<p>"
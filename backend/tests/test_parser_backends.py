@@ -0,0 +1,49 @@
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from app.services.crawler.extract import extract_document
+from app.services.crawler.generic_article import extract_generic_article
+from app.services.crawler.google_blog import _build_item_from_html
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "html").glob("*.html"))
+URL = "https://blog.google/technology/ai/gemini-3/"
+
+def _backend(name: str, module: str):
+    try:
+        __import__(module)
+    except ImportError:
+        return pytest.param(name, marks=pytest.mark.skip(reason=f"{module} not installed"))
+    return pytest.param(name)
+
+
+BACKENDS = [_backend("lxml", "lxml.html"), _backend("selectolax", "selectolax.lexbor")]
+
+
+@pytest.mark.parametrize("parser", BACKENDS)
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda p: p.name)
+class TestParserBackends:
+    def test_document_walk_matches_html_parser(self, path, parser):
+        html = path.read_text(encoding="utf-8")
+        assert asdict(extract_document(html, parser=parser)) == asdict(
+            extract_document(html, parser="html.parser")
+        )
+
+    def test_google_item_matches_html_parser(self, path, parser):
+        html = path.read_text(encoding="utf-8")
+        exclude = {"item_id", "fetched_at"}
+        assert _build_item_from_html(URL, html, parser=parser).model_dump(
+            exclude=exclude
+        ) == _build_item_from_html(URL, html, parser="html.parser").model_dump(exclude=exclude)
+
+    def test_generic_article_matches_html_parser(self, path, parser):
+        html = path.read_text(encoding="utf-8")
+        assert extract_generic_article(URL, html, parser=parser) == extract_generic_article(
+            URL, html, parser="html.parser"
+        )
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        extract_document("<p>x</p>", parser="html5lib")
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.models.source import CrawledContent
+from app.services.crawler.payload_store import MIN_COMPRESS_BYTES, decode_payload, encode_payload
+
+
+def test_large_payload_is_compressed_and_round_trips():
+    payload = {
+        "json_ld": {"@type": "NewsArticle", "articleBody": "Results on the benchmark improved. " * 200},
+        "tags": ["llm", "eval"],
+        "title": "한국어 제목",
+    }
+    codec, data, raw_size = encode_payload(payload)
+
+    assert codec == "zlib"
+    assert raw_size == len(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode())
+    assert len(data) < raw_size / 5
+    assert decode_payload(codec, data) == payload
+
+
+def test_small_payload_is_stored_as_plain_json():
+    codec, data, raw_size = encode_payload({"a": 1})
+    assert raw_size < MIN_COMPRESS_BYTES
+    assert (codec, data) == ("json", b'{"a":1}')
+    assert decode_payload(codec, data) == {"a": 1}
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        decode_payload("lz4", b"")
+
+
+def test_hot_table_has_no_payload_column():
+    assert "raw_payload" not in CrawledContent.__table__.columns
+    assert "raw_payload" not in str(select(CrawledContent))
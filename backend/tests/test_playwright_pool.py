@@ -0,0 +1,204 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright.async_api")
+
+from app.services.crawler import archive as archive_mod  # noqa: E402
+from app.services.crawler import offload as offload_mod  # noqa: E402
+from app.services.crawler.archive import HtmlArchive  # noqa: E402
+from app.services.crawler.offload import ExtractionPool  # noqa: E402
+from app.services.crawler.playwright_scraper import (  # noqa: E402
+    BrowserPool,
+    PlaywrightCrawler,
+    RenderTimeout,
+)
+from app.services.crawler.politeness import HostScheduler, RobotsCache, RobotsDisallowed  # noqa: E402
+from tests.helpers import FakeFeedServer  # noqa: E402
+
+# The body is empty until the script runs, so only a real render extracts it.
+SCRIPTED_ARTICLE = """<html lang="en"><head><title>Scripted</title></head><body>
+<img src="/hero.png"><div id="root"></div>
+<script>
+  const paragraphs = Array.from({length: 8}, (_, k) =>
+    `<p>Rendered paragraph ${k} about models, benchmarks and product updates.</p>`).join("");
+  document.getElementById("root").innerHTML =
+    `<article><h1>Rendered headline</h1>${paragraphs}<a href="/articles/1/2">Next</a></article>`;
+</script></body></html>"""
+
+
+async def _start_or_skip(pool: BrowserPool) -> None:
+    try:
+        await pool.start()
+    except Exception as e:  # noqa: BLE001 - browser binaries not installed
+        await pool.close()
+        pytest.skip(f"chromium unavailable: {e}")
+
+
+class TestBrowserPool:
+    def test_renders_reuse_bounded_contexts(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(offload_mod, "_pool", ExtractionPool(workers=0))
+        monkeypatch.setattr(archive_mod, "_archive", HtmlArchive(tmp_path))
+
+        async def run(base_url: str):
+            pool = BrowserPool(size=2, max_page_uses=2, render_timeout_sec=10)
+            await _start_or_skip(pool)
+            try:
+                crawler = PlaywrightCrawler(pool=pool)
+                items = await asyncio.gather(
+                    *(crawler.crawl(f"{base_url}/articles/1/{i}") for i in range(5))
+                )
+                index = await crawler.crawl(
+                    f"{base_url}/articles/1/0", {"mode": "index", "allow_prefixes": [base_url]}
+                )
+                return items, index, pool.stats()
+            finally:
+                await pool.close()
+
+        with FakeFeedServer(latency_sec=0.0, article_html=SCRIPTED_ARTICLE) as server:
+            items, index, stats = asyncio.run(run(server.base_url))
+
+        assert all(batch[0].title == "Rendered headline" for batch in items)
+        assert "Rendered paragraph 7" in items[0][0].content
+        assert items[0][0].raw_payload["archive"]["extractor"] == "generic_article"
+        # Index mode crawls the linked article instead of returning a link stub.
+        assert [str(i.source_url) for i in index] == [f"{server.base_url}/articles/1/2"]
+        assert index[0].title == "Rendered headline"
+        assert stats["renders"] == 7
+        assert stats["recycled"] >= 2  # every context is replaced after 2 renders
+        assert stats["blocked_requests"] >= 7
+        assert stats["render_ms"]["p50"] is not None
+
+    def test_render_deadline_recycles_the_page(self):
+        async def run(base_url: str):
+            pool = BrowserPool(size=1, render_timeout_sec=0.2)
+            await _start_or_skip(pool)
+            try:
+                with pytest.raises(RenderTimeout):
+                    await pool.render(f"{base_url}/articles/1/0")
+                return pool.stats()
+            finally:
+                await pool.close()
+
+        with FakeFeedServer(latency_sec=1.0, article_html=SCRIPTED_ARTICLE) as server:
+            stats = asyncio.run(run(server.base_url))
+
+        assert stats["timeouts"] == 1
+        assert stats["recycled"] == 1
+        assert stats["idle"] == 1
+
+
+class _FakePage:
+    def __init__(self, browser: "_FakeBrowser"):
+        self.browser = browser
+        self.url = ""
+
+    async def goto(self, url, wait_until=None):
+        await self.browser.gate.wait()
+        if self.browser.fail_goto:
+            raise RuntimeError("page crashed")
+        self.url = url
+        return None
+
+    async def content(self):
+        return "<html></html>"
+
+
+class _FakeContext:
+    def __init__(self, browser: "_FakeBrowser"):
+        self.browser = browser
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return _FakePage(self.browser)
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.fail_goto = False
+        self.fail_new_context = 0
+        self.contexts: list[_FakeContext] = []
+
+    async def new_context(self, **kwargs):
+        if self.fail_new_context:
+            self.fail_new_context -= 1
+            raise RuntimeError("browser gone")
+        context = _FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        pass
+
+
+async def _fake_pool(size: int = 1, hosts: HostScheduler | None = None) -> tuple[BrowserPool, _FakeBrowser]:
+    pool = BrowserPool(size=size, hosts=hosts or HostScheduler(host_rate_per_sec=0))
+    browser = _FakeBrowser()
+    pool._browser = browser
+    pool._idle = asyncio.Queue()
+    for _ in range(size):
+        pool._idle.put_nowait(await pool._new_slot())
+    return pool, browser
+
+
+class TestBrowserPoolSlots:
+    def test_close_during_render_closes_the_slot(self):
+        async def run():
+            pool, browser = await _fake_pool()
+            browser.gate.clear()
+            render = asyncio.ensure_future(pool.render("https://a.test/"))
+            await asyncio.sleep(0)
+            await pool.close()
+            browser.gate.set()
+            result = await render
+            return result, browser
+
+        result, browser = asyncio.run(run())
+        assert result.final_url == "https://a.test/"
+        assert all(c.closed for c in browser.contexts)
+
+    def test_failed_recycle_drops_the_slot_and_the_next_render_relaunches_it(self):
+        async def run():
+            pool, browser = await _fake_pool()
+            broken = browser.contexts[0]
+            browser.fail_goto = True
+            browser.fail_new_context = 1
+            with pytest.raises(RuntimeError, match="page crashed"):
+                await pool.render("https://a.test/1")
+            assert broken.closed
+            assert pool._idle.get_nowait() is None
+            pool._idle.put_nowait(None)
+
+            browser.fail_goto = False
+            result = await pool.render("https://a.test/2")
+            slot = pool._idle.get_nowait()
+            return result, slot, browser
+
+        result, slot, browser = asyncio.run(run())
+        assert result.final_url == "https://a.test/2"
+        assert slot is not None and slot.context is browser.contexts[-1]
+        assert len(browser.contexts) == 2
+
+    def test_render_takes_a_host_slot_and_honours_robots(self):
+        async def robots(url):
+            return 200, "User-agent: *\nDisallow: /private/\n"
+
+        async def run():
+            hosts = HostScheduler(host_rate_per_sec=0, robots=RobotsCache(robots))
+            pool, browser = await _fake_pool(hosts=hosts)
+            with pytest.raises(RobotsDisallowed):
+                await pool.render("https://a.test/private/1")
+            await pool.render("https://a.test/public/1")
+            return hosts.stats()["hosts"]["https://a.test"], browser
+
+        host, browser = asyncio.run(run())
+        assert host["acquired"] == 1 and host["disallowed"] == 1
+        assert len(browser.contexts) == 1  # the disallowed URL never took a page
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.crawler.politeness import HostScheduler, RobotsCache, RobotsDisallowed
+
+ROBOTS = "User-agent: *\nDisallow: /private/\nCrawl-delay: 0.1\n"
+
+
+async def _hit(scheduler: HostScheduler, url: str, hold: float = 0.0) -> None:
+    async with scheduler.slot(url):
+        await asyncio.sleep(hold)
+
+
+class TestHostScheduler:
+    def test_rate_is_per_host(self):
+        async def run():
+            scheduler = HostScheduler(host_rate_per_sec=20.0, host_burst=1.0)
+            started = time.monotonic()
+            await asyncio.gather(*(_hit(scheduler, f"https://a.test/{i}") for i in range(5)))
+            one_host = time.monotonic() - started
+
+            started = time.monotonic()
+            await asyncio.gather(*(_hit(scheduler, f"https://h{i}.test/") for i in range(5)))
+            many_hosts = time.monotonic() - started
+            return one_host, many_hosts, scheduler.stats()
+
+        one_host, many_hosts, stats = asyncio.run(run())
+        assert one_host >= 0.19  # 4 waits of 1/20 s
+        assert many_hosts < 0.05
+        assert stats["hosts"]["https://a.test"]["acquired"] == 5
+        assert stats["hosts"]["https://a.test"]["wait_sec"] > 0
+        assert stats["in_flight"] == 0 and stats["queued"] == 0
+
+    def test_robots_disallow_and_crawl_delay_are_cached(self):
+        fetched: list[str] = []
+
+        async def fetch(url: str) -> tuple[int, str]:
+            fetched.append(url)
+            await asyncio.sleep(0.01)
+            return 200, ROBOTS
+
+        async def run():
+            scheduler = HostScheduler(
+                host_rate_per_sec=100.0, robots=RobotsCache(fetch, ttl_sec=60)
+            )
+            started = time.monotonic()
+            await asyncio.gather(*(_hit(scheduler, f"https://a.test/p/{i}") for i in range(3)))
+            elapsed = time.monotonic() - started
+            with pytest.raises(RobotsDisallowed):
+                await _hit(scheduler, "https://a.test/private/x")
+            return elapsed, scheduler.stats()
+
+        elapsed, stats = asyncio.run(run())
+        assert fetched == ["https://a.test/robots.txt"]
+        assert elapsed >= 0.19  # Crawl-delay 0.1 s overrides the 100/s host rate
+        host = stats["hosts"]["https://a.test"]
+        assert host["crawl_delay_sec"] == 0.1
+        assert host["disallowed"] == 1
+        assert host["in_flight"] == 0
+
+    def test_slow_host_does_not_hold_global_budget(self):
+        async def run():
+            scheduler = HostScheduler(global_limit=2, per_host_limit=1, host_rate_per_sec=0)
+            slow = [asyncio.create_task(_hit(scheduler, "https://slow.test/", hold=0.2)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            started = time.monotonic()
+            await asyncio.gather(*(_hit(scheduler, f"https://fast.test/{i}", hold=0.01) for i in range(3)))
+            fast = time.monotonic() - started
+            queued = scheduler.stats()["hosts"]["https://slow.test"]["queued"]
+            await asyncio.gather(*slow)
+            return fast, queued
+
+        fast, queued = asyncio.run(run())
+        assert fast < 0.15
+        assert queued == 2
@@ -0,0 +1,67 @@
+import asyncio
+import dataclasses
+import uuid
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+
+from app.services.vector import qdrant_embedder
+from app.services.vector.qdrant_embedder import (
+    QdrantEmbedder,
+    close_qdrant_client,
+    get_qdrant_client,
+)
+from app.services.vector.qdrant_schema import CONTENT_COLLECTION, ensure_collection, reset_schema_readiness
+
+
+def _embedder(qdrant: AsyncQdrantClient) -> QdrantEmbedder:
+    embedder = QdrantEmbedder(session=None, qdrant=qdrant)
+    vectors = {"gpt release": [1.0, 0.0, 0.0, 0.0], "new gpt model": [0.9, 0.1, 0.0, 0.0]}
+
+    async def embed(text: str) -> list[float]:
+        return vectors.get(text, [0.0, 0.0, 0.0, 1.0])
+
+    embedder.embed_text = embed
+    embedder.embed_query = embed
+    return embedder
+
+
+def test_store_search_and_delete_use_the_async_client():
+    async def run():
+        qdrant = AsyncQdrantClient(location=":memory:")
+        reset_schema_readiness()
+        await ensure_collection(qdrant, dataclasses.replace(CONTENT_COLLECTION, size=4))
+        embedder = _embedder(qdrant)
+        content_id = str(uuid.uuid4())
+
+        await embedder.embed_and_store(content_id, "gpt release", {"title": "GPT"})
+
+        hits = await embedder.search_similar("new gpt model", limit=5, threshold=0.7)
+        assert [h["content_id"] for h in hits] == [content_id]
+        assert hits[0]["metadata"] == {"title": "GPT"}
+        assert await embedder.search_similar("unrelated", threshold=0.7) == []
+
+        await embedder.delete_embedding(content_id)
+        assert await embedder.search_similar("new gpt model", threshold=0.7) == []
+        await qdrant.close()
+        reset_schema_readiness()
+
+    asyncio.run(run())
+
+
+@pytest.mark.filterwarnings("ignore:Failed to obtain server version")
+def test_shared_client_is_reused_per_loop(monkeypatch):
+    monkeypatch.setattr(qdrant_embedder.settings, "QDRANT_URL", "http://127.0.0.1:9")
+
+    async def run():
+        first = get_qdrant_client()
+        assert get_qdrant_client() is first
+        assert QdrantEmbedder(session=None).client is first
+        return first
+
+    try:
+        a = asyncio.run(run())
+        b = asyncio.run(run())
+        assert a is not b
+    finally:
+        asyncio.run(close_qdrant_client())
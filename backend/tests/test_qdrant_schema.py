@@ -0,0 +1,96 @@
+import asyncio
+import dataclasses
+
+import pytest
+from qdrant_client import AsyncQdrantClient, models
+
+from app.services.vector.qdrant_schema import (
+    CONTENT_COLLECTION,
+    CollectionSchemaError,
+    collection_report,
+    diff_spec,
+    ensure_collection,
+    ensure_collection_ready,
+    live_spec,
+    reset_schema_readiness,
+)
+
+SMALL = dataclasses.replace(CONTENT_COLLECTION, name="schema_test", size=8)
+
+
+def test_diff_reports_changed_fields_and_missing_indexes():
+    want = SMALL.spec()
+    live = {
+        **want,
+        "size": 3072,
+        "quantization": None,
+        "payload_indexes": {
+            "source_id": models.PayloadSchemaType.KEYWORD,
+            "extra": models.PayloadSchemaType.INTEGER,
+        },
+    }
+
+    drift = diff_spec(want, live)
+
+    assert drift["size"] == (8, 3072)
+    assert drift["quantization"] == ("int8", None)
+    assert drift["payload_indexes.published_at"] == (models.PayloadSchemaType.DATETIME, None)
+    assert "payload_indexes.source_id" not in drift
+    assert "payload_indexes.extra" not in drift
+    assert diff_spec(want, want) == {}
+
+
+def test_ensure_creates_once_and_marks_ready():
+    async def run():
+        reset_schema_readiness()
+        qdrant = AsyncQdrantClient(location=":memory:")
+
+        report = await ensure_collection(qdrant, SMALL, apply=False)
+        assert report.created
+        live = live_spec(await qdrant.get_collection(SMALL.name))
+        assert (live["size"], live["distance"], live["hnsw_m"]) == (8, models.Distance.COSINE, 16)
+        assert collection_report(SMALL.name) is report
+
+        calls = []
+        qdrant.collection_exists = lambda *a, **k: calls.append(a)  # would break if called
+        await ensure_collection_ready(qdrant, SMALL)
+        assert calls == []
+        await qdrant.close()
+
+    asyncio.run(run())
+
+
+def test_size_drift_is_reported_and_refused():
+    async def run():
+        reset_schema_readiness()
+        qdrant = AsyncQdrantClient(location=":memory:")
+        await qdrant.create_collection(
+            SMALL.name, vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE)
+        )
+
+        report = await ensure_collection(qdrant, SMALL)
+
+        assert not report.created
+        assert report.drift["size"] == (8, 4)
+        assert "size" not in report.applied
+        assert collection_report(SMALL.name) is None  # never marked ready
+        with pytest.raises(CollectionSchemaError, match="size expected 8, live 4"):
+            await ensure_collection_ready(qdrant, SMALL)
+        await qdrant.close()
+
+    asyncio.run(run())
+
+
+def test_check_mode_does_not_create():
+    async def run():
+        reset_schema_readiness()
+        qdrant = AsyncQdrantClient(location=":memory:")
+
+        report = await ensure_collection(qdrant, SMALL, apply=False, create=False)
+
+        assert report.drift == {"exists": (True, False)}
+        assert not await qdrant.collection_exists(SMALL.name)
+        assert collection_report(SMALL.name) is None
+        await qdrant.close()
+
+    asyncio.run(run())
@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+
+from app.services.crawler.rss import FeedState, RSSCrawler
+from app.services.crawler.session import CrawlSession, RetryPolicy
+from tests.helpers import FakeFeedServer, recorded_feed
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry><id>tag:x,2026:2</id><title>Two</title><link rel="alternate" href="https://x.test/2"/>
+    <updated>2026-01-02T00:00:00Z</updated><author><name>Ann</name></author></entry>
+  <entry><id>tag:x,2026:1</id><title>One</title><link href="https://x.test/1"/>
+    <updated>2026-01-01T00:00:00Z</updated></entry>
+</feed>"""
+
+
+class TestRSSCrawler:
+    def test_poll_stops_at_first_seen_entry(self):
+        crawler = RSSCrawler(None)
+        state = FeedState()
+        first, _ = crawler._select_new(recorded_feed(100, 100), state)
+        state.seen = [e.key for e in first]
+        state.newest_published = first[0].published.isoformat()
+
+        new, scanned = crawler._select_new(recorded_feed(103, 100), state)
+        assert [e.key for e in new] == [f"https://example.com/posts/{i}" for i in (103, 102, 101)]
+        assert scanned == 4
+
+    def test_atom_and_malformed_feeds(self):
+        crawler = RSSCrawler(None)
+        atom, _ = crawler._select_new(ATOM, FeedState())
+        assert [(e.key, e.link, e.author) for e in atom] == [
+            ("tag:x,2026:2", "https://x.test/2", "Ann"),
+            ("tag:x,2026:1", "https://x.test/1", None),
+        ]
+        # &nbsp; is not an XML entity: falls back to feedparser.
+        broken = recorded_feed(3, 3).replace(b"Entry 3", b"Entry&nbsp;3")
+        entries, _ = crawler._select_new(broken, FeedState())
+        assert len(entries) == 3
+
+    def test_parse_error_past_first_chunk_keeps_earlier_entries(self):
+        crawler = RSSCrawler(None)
+        body = recorded_feed(200, 200)
+        broken = body.replace(b"<title>Entry 50</title>", b"<title>Entry&nbsp;50</title>")
+        assert broken.index(b"&nbsp;") > 16 * 1024
+        entries, scanned = crawler._select_new(broken, FeedState())
+        assert len(entries) == 200
+        assert scanned == 200
+        assert len({e.key for e in entries}) == 200
+
+    def test_limit_returns_oldest_first_and_keeps_the_rest(self):
+        body = recorded_feed(5, 5)
+
+        class StaticFeed:
+            async def get(self, url, headers=None):
+                if (headers or {}).get("If-None-Match") == '"v1"':
+                    return httpx.Response(304)
+                return httpx.Response(200, content=body, headers={"etag": '"v1"'})
+
+        async def run() -> list[list[str]]:
+            crawler = RSSCrawler(None, session=StaticFeed())
+            polls = []
+            for _ in range(4):
+                result = await crawler.poll("https://example.com/feed", limit=2)
+                crawler.apply("https://example.com/feed", result.state)
+                polls.append([e.key.rsplit("/", 1)[1] for e in result.entries])
+            return polls
+
+        assert asyncio.run(run()) == [["2", "1"], ["4", "3"], ["5"], []]
+
+    def test_poll_state_is_kept_until_applied(self):
+        body = recorded_feed(3, 3)
+
+        class StaticFeed:
+            async def get(self, url, headers=None):
+                return httpx.Response(200, content=body, headers={"etag": '"v1"'})
+
+        async def run():
+            crawler = RSSCrawler(None, session=StaticFeed())
+            first, state = await crawler.crawl_pending("https://example.com/feed")
+            # The write failed: nothing applied, the retry gets the same entries.
+            retry, state = await crawler.crawl_pending("https://example.com/feed")
+            crawler.apply("https://example.com/feed", state)
+            after, _ = await crawler.crawl_pending("https://example.com/feed")
+            return first, retry, after
+
+        first, retry, after = asyncio.run(run())
+        assert len(first) == 3
+        assert [c.source_url for c in retry] == [c.source_url for c in first]
+        assert after == []
+
+    def test_crawl_persists_state_and_yields_only_new(self, tmp_path):
+        state_path = tmp_path / "rss_state.json"
+
+        async def run(url: str):
+            session = CrawlSession(retry=RetryPolicy(retries=0))
+            try:
+                first = await RSSCrawler(state_path, session=session).crawl(url, {"source_id": "s"})
+                again = RSSCrawler(state_path, session=session)
+                second = await again.crawl(url)
+                return first, second, again.states[url]
+            finally:
+                await session.aclose()
+
+        with FakeFeedServer(latency_sec=0.0, items_per_feed=5) as server:
+            first, second, state = asyncio.run(run(f"{server.base_url}/feed/1.xml"))
+        assert len(first) == 5 and first[0].source_id == "s"
+        assert second == []
+        assert state.polls == 2 and state.etag
@@ -0,0 +1,136 @@
+import asyncio
+import os
+from datetime import datetime, timezone
+
+import pytest
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.core.leader_lease import LeaderLease
+from app.tasks.scheduler import CrawlScheduler
+
+
+async def _noop(source_id: str) -> None:
+    return None
+
+
+class TestCrawlScheduler:
+    def test_crawl_jobs_get_jitter_and_run_limits(self):
+        async def run() -> list[dict]:
+            sched = CrawlScheduler(jobstore="memory")
+            sched.scheduler.start(paused=True)
+            sched.add_crawl_job("a", _noop, interval_minutes=30)
+            jobs = sched.get_jobs()
+            sched.scheduler.shutdown(wait=False)
+            return jobs
+
+        [job] = asyncio.run(run())
+        assert job["id"] == "crawl_a"
+        assert job["interval_minutes"] == 30
+        assert job["jitter_sec"] == 30
+        assert job["max_instances"] == 1
+        assert job["coalesce"] is True
+        assert job["last_run"] is None
+
+    def test_records_last_run_and_overlapping_runs(self):
+        async def slow() -> None:
+            await asyncio.sleep(1.2)
+
+        async def fail() -> None:
+            raise RuntimeError("boom")
+
+        async def run() -> tuple[dict, dict, dict]:
+            sched = CrawlScheduler(jobstore="memory")
+            sched.scheduler.start()
+            now = datetime.now(timezone.utc)
+            sched.scheduler.add_job(slow, IntervalTrigger(seconds=1), id="slow", next_run_time=now)
+            sched.scheduler.add_job(fail, "date", id="fail", run_date=now)
+            await asyncio.sleep(1.1)
+            overlapped = dict(sched._runs["slow"])
+            await asyncio.sleep(0.5)
+            runs = {j["id"]: j["last_run"] for j in sched.get_jobs()}
+            failed = sched._runs["fail"]
+            sched.scheduler.shutdown(wait=False)
+            return overlapped, runs["slow"], failed
+
+        overlapped, finished, failed = asyncio.run(run())
+        assert overlapped["status"] == "skipped_max_instances"
+        assert overlapped["duration_sec"] is None
+        assert finished["status"] == "ok"
+        assert finished["duration_sec"] >= 1.2
+        assert failed["status"] == "error"
+        assert "boom" in failed["error"]
+
+    def test_memory_store_runs_without_lease(self):
+        async def run() -> tuple[dict, dict]:
+            sched = CrawlScheduler(jobstore="memory")
+            sched.settings = sched.settings.model_copy(update={"CRAWL_ADAPTIVE_ENABLED": False})
+            sched.sync_source_jobs = _no_sources
+            await sched.start()
+            started = await sched.status()
+            await sched.stop()
+            return started, await sched.status()
+
+        async def _no_sources() -> dict[str, int]:
+            return {"added": 0, "removed": 0}
+
+        started, stopped = asyncio.run(run())
+        assert started["running"] and started["is_leader"]
+        assert started["leader"] == started["replica"]
+        assert not stopped["running"] and not stopped["is_leader"]
+
+    def test_unknown_jobstore(self):
+        with pytest.raises(ValueError):
+            CrawlScheduler(jobstore="sqlite")
+
+
+async def _redis_or_skip():
+    redis = pytest.importorskip("redis.asyncio")
+    client = redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379"))
+    try:
+        await client.ping()
+    except Exception as e:
+        await client.aclose()
+        pytest.skip(f"redis unavailable: {e}")
+    return client
+
+
+class TestLeaderLease:
+    def test_single_holder_until_release(self):
+        async def run() -> None:
+            client = await _redis_or_skip()
+            key = "test:scheduler:leader"
+            await client.delete(key)
+            a = LeaderLease(client, key, ttl_sec=5, token="a")
+            b = LeaderLease(client, key, ttl_sec=5, token="b")
+            try:
+                assert await a.acquire()
+                assert not await b.acquire()
+                assert await a.renew()
+                assert not await b.release()
+                assert await a.holder() == "a"
+                assert await a.release()
+                assert await b.acquire()
+                assert not await a.renew()
+            finally:
+                await client.delete(key)
+                await client.aclose()
+
+        asyncio.run(run())
+
+    def test_expired_lease_moves_to_another_replica(self):
+        async def run() -> None:
+            client = await _redis_or_skip()
+            key = "test:scheduler:leader-expiry"
+            await client.delete(key)
+            a = LeaderLease(client, key, ttl_sec=0.2, token="a")
+            b = LeaderLease(client, key, ttl_sec=0.2, token="b")
+            try:
+                assert await a.acquire()
+                await asyncio.sleep(0.3)
+                assert await b.acquire()
+                assert not await a.renew()
+            finally:
+                await client.delete(key)
+                await client.aclose()
+
+        asyncio.run(run())
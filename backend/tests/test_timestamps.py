@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from dateutil import parser as dt_parser
+
+from app.services.crawler.timestamps import (
+    _fast_parse,
+    clear_timestamp_cache,
+    parse_timestamp,
+    parse_timestamp_utc,
+    parse_timestamp_utc_naive,
+    timestamp_cache_info,
+)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "Wed, 25 Feb 2026 00:00:00 -0500",
+        "Tue, 24 Feb 2026 16:57:21 +0000",
+        "Fri, 06 Feb 2026 10:00:00 GMT",
+        "6 Feb 2026 10:00 +0930",
+        "Fri, 06 Feb 26 10:00:00 GMT",
+        "2026-02-05T18:00:00Z",
+        "2026-02-05T18:00:00.123+09:00",
+        "2026-02-05T18:00:00-05:00",
+        "2026-02-05",
+        "2026-02-05 18:00:00",
+        "Feb 25, 2026",
+        "February 5, 2026",
+    ],
+)
+def test_fast_path_matches_dateutil(raw):
+    fast = _fast_parse(raw)
+    assert fast is not None
+    ref = dt_parser.parse(raw)
+    assert (fast.tzinfo is None) == (ref.tzinfo is None)
+    assert fast == ref
+
+
+def test_rfc822_zone_names_are_resolved():
+    # dateutil returns naive datetimes for these
+    assert parse_timestamp("Fri, 06 Feb 2026 10:00:00 EST").utcoffset() == timedelta(hours=-5)
+    assert parse_timestamp("Fri, 06 Feb 2026 10:00:00 UT").utcoffset() == timedelta(0)
+
+
+@pytest.mark.parametrize("raw", ["5th of February 2026", "2026/02/05 6pm", "Thursday, February 5th, 2026"])
+def test_other_formats_fall_back_to_dateutil(raw):
+    assert _fast_parse(raw) is None
+    assert parse_timestamp(raw) == dt_parser.parse(raw)
+
+
+@pytest.mark.parametrize("raw", [None, "", "   ", "not a date", "Wed, 31 Feb 2026 00:00:00 GMT", 123])
+def test_unparseable_values_return_none(raw):
+    assert parse_timestamp(raw) is None
+
+
+def test_utc_helpers():
+    assert parse_timestamp_utc_naive("2026-02-05T18:00:00+09:00") == datetime(2026, 2, 5, 9, 0)
+    assert parse_timestamp_utc_naive("2026-02-05T18:00:00") == datetime(2026, 2, 5, 18, 0)
+    assert parse_timestamp_utc("2026-02-05T18:00:00") == datetime(2026, 2, 5, 18, 0, tzinfo=timezone.utc)
+    assert parse_timestamp_utc("Wed, 25 Feb 2026 00:00:00 -0500") == datetime(
+        2026, 2, 25, 5, 0, tzinfo=timezone.utc
+    )
+
+
+def test_repeated_strings_are_memoized():
+    clear_timestamp_cache()
+    for _ in range(5):
+        parse_timestamp(" Wed, 25 Feb 2026 00:00:00 -0500 ")
+        parse_timestamp("Wed, 25 Feb 2026 00:00:00 -0500")
+    info = timestamp_cache_info()
+    assert (info.misses, info.hits) == (1, 9)
@@ -0,0 +1,43 @@
+from app.services.crawler.url_filter import UrlFilter, compile_prefixes, url_filter_for
+
+
+class TestUrlFilter:
+    def test_prefix_trie_matches_like_startswith(self):
+        prefixes = [
+            "https://openai.com/index/",
+            "https://openai.com/news/",
+            "https://openai.com/news/product/",  # covered by the shorter prefix
+            "https://a.test/x.y/",
+        ]
+        match = compile_prefixes(prefixes)
+        urls = [
+            "https://openai.com/index/gpt",
+            "https://openai.com/news/product/launch",
+            "https://openai.com/research/",
+            "https://openai.com/new",
+            "https://a.test/x.y/1",
+            "https://a.test/xzy/1",  # "." is literal, not a wildcard
+        ]
+        assert [bool(match(u)) for u in urls] == [any(u.startswith(p) for p in prefixes) for u in urls]
+
+    def test_rules_combine_like_the_catalog_loop(self):
+        src = {
+            "allow_prefixes": ["https://huggingface.co/"],
+            "allow_regexes": [r"^https://huggingface\.co/[^/?#]+/[^/?#]+$"],
+            "deny_regexes": ["/datasets/", "/spaces/"],
+            "deny_prefixes": ["https://huggingface.co/blog/"],
+        }
+        url_filter = url_filter_for(src)
+        assert url_filter_for(dict(src)) is url_filter
+        assert url_filter("https://huggingface.co/meta/llama")
+        assert not url_filter("https://huggingface.co/datasets/x")
+        assert not url_filter("https://huggingface.co/blog/post")
+        assert not url_filter("https://huggingface.co/meta/llama/tree/main")
+        assert not url_filter("https://github.com/meta/llama")
+        assert UrlFilter()("anything")
+
+    def test_uncombinable_regexes_fall_back_to_separate_patterns(self):
+        # Duplicate group names cannot share one alternation
+        patterns = [r"(?P<id>\d+)/a$", r"(?P<id>\d+)/b$"]
+        url_filter = UrlFilter(allow_regexes=patterns)
+        assert url_filter("https://x.test/1/b") and not url_filter("https://x.test/1/c")
@@ -0,0 +1,99 @@
+import asyncio
+
+from app.services.crawler.url_frontier import UrlFrontier, canonicalize_url
+from app.tasks.discover_source_urls import _extract_index_items, discover_from_catalog_async
+from tests.helpers import FakeFeedServer
+
+
+class TestCanonicalizeUrl:
+    def test_tracking_query_host_and_slash_are_normalized(self):
+        variants = [
+            "https://Example.com:443/posts/1/?b=2&a=1",
+            "https://example.com/posts/1?a=1&utm_source=rss&b=2&fbclid=xyz#top",
+            "HTTPS://EXAMPLE.COM./posts/1?a=1&b=2",
+        ]
+        assert {canonicalize_url(u) for u in variants} == {"https://example.com/posts/1?a=1&b=2"}
+        assert canonicalize_url("http://example.com") == "http://example.com/"
+        assert canonicalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+
+class TestUrlFrontier:
+    def test_seen_set_persists_across_runs(self, tmp_path):
+        first = UrlFrontier(tmp_path, capacity=100)
+        assert first.filter_new(["https://a.test/1", "https://a.test/1/", "https://a.test/2"]) == [
+            "https://a.test/1",
+            "https://a.test/2",
+        ]
+        first.save()
+        first.close()
+
+        second = UrlFrontier(tmp_path, capacity=100)
+        new = second.filter_new(["https://a.test/2?utm_medium=x", "https://a.test/3"], mark=False)
+        assert new == ["https://a.test/3"]
+        assert not second.seen("https://a.test/3")
+        assert second.add("https://a.test/3") and second.seen("https://a.test/3/")
+        stats = second.stats()
+        assert stats["urls"] == 3 and stats["pending"] == 1
+        assert stats["hit_rate"] is not None and stats["bloom_bytes_per_million_urls"] > 0
+        second.close()
+
+    def test_bloom_grows_past_capacity(self, tmp_path):
+        frontier = UrlFrontier(tmp_path, capacity=10)
+        urls = [f"https://a.test/{i}" for i in range(200)]
+        assert len(frontier.filter_new(urls)) == 200
+        assert frontier.bloom.capacity >= 200
+        assert frontier.filter_new(urls) == []
+
+
+def test_discovery_forwards_only_new_urls(tmp_path):
+    catalog = {
+        "defaults": {"http": {"retries": 0}},
+        "sources": [{"id": "feed", "type": "rss", "url": "", "limit": 4}],
+    }
+
+    async def run(base_url: str, limit: int):
+        catalog["sources"][0].update(url=f"{base_url}/feed/1.xml", limit=limit)
+        frontier = UrlFrontier(tmp_path)
+        try:
+            return await discover_from_catalog_async(catalog, frontier=frontier, mark_seen=True)
+        finally:
+            frontier.close()
+
+    with FakeFeedServer(latency_sec=0.0) as server:
+        first = asyncio.run(run(server.base_url, 4))
+        second = asyncio.run(run(server.base_url, 6))
+
+    assert first["new_url_count"] == 4
+    assert second["unique_url_count"] == 6
+    assert second["new_urls"] == second["urls"][4:]
+    assert [it["seen"] for it in second["sources"][0]["items"]] == [True] * 4 + [False] * 2
+    assert second["frontier"]["hits"] == 4
+
+
+def test_discovery_does_not_mark_by_default_and_keeps_the_fetched_url(tmp_path):
+    catalog = {
+        "defaults": {"http": {"retries": 0}},
+        "sources": [{"id": "feed", "type": "rss", "url": "", "limit": 4}],
+    }
+
+    async def run(base_url: str):
+        catalog["sources"][0]["url"] = f"{base_url}/feed/1.xml"
+        frontier = UrlFrontier(tmp_path)
+        try:
+            return await discover_from_catalog_async(catalog, frontier=frontier)
+        finally:
+            frontier.close()
+
+    with FakeFeedServer(latency_sec=0.0) as server:
+        first = asyncio.run(run(server.base_url))
+        second = asyncio.run(run(server.base_url))
+
+    # Discovery alone never records URLs as seen (that means "ingested").
+    assert first["new_url_count"] == second["new_url_count"] == 4
+
+    html = '<a href="/posts/1/?b=2&a=1&utm_source=x#top">one</a><a href="/posts/1?a=1&b=2">dup</a>'
+    items = _extract_index_items("https://example.com/", html, url_filter=None, limit=None)
+    assert [it["url"] for it in items] == [
+        "https://example.com/posts/1/?b=2&a=1&utm_source=x",
+        "https://example.com/posts/1?a=1&b=2",
+    ]
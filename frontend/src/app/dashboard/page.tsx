@@ -404,12 +404,14 @@ export default function Dashboard() {
                       {contents.filter(c => c.thread_status === 'ready').slice(0, 3).map((content) => (
                         <div
                           key={content.id}
-                          onClick={() => {
+                          onClick={async () => {
                             setSelectedContent(content);
+                            // The list omits the generated text; load it from the detail.
+                            const detail = await contentAPI.getContent(content.id);
                             setGeneratedPost({
-                              content: content.extra_data?.generated_post as string || '',
-                              analysis: content.extra_data?.analysis as string || '',
-                              webSearch: content.extra_data?.web_search_results as string,
+                              content: detail.extra_data?.generated_post as string || '',
+                              analysis: detail.extra_data?.analysis as string || '',
+                              webSearch: detail.extra_data?.web_search_results as string,
                             });
                             setShowModal(true);
                             setShowNotifications(false);